@@ -0,0 +1,5 @@
+"""性能基准测试模块
+
+离线运行（无需win32/游戏窗口），用于对比图像匹配/OCR流程优化前后的耗时与内存分配。
+运行方式（项目根目录）：python -m benchmarks.<脚本名>
+"""
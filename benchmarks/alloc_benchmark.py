@@ -0,0 +1,119 @@
+"""内存分配基准：统计 exists()/text_click 对应处理流程每次调用的额外内存分配
+
+用法：
+    python -m benchmarks.alloc_benchmark [--resolution 1920x1080] [--repeat 20]
+
+统计方式：tracemalloc记录每次调用期间的峰值增量（numpy/cv2返回数组均计入），
+与整帧字节数对比即可判断流程中是否存在整帧拷贝。优化前后分别运行本脚本对比输出。
+"""
+
+import argparse
+import importlib.util
+import statistics
+import tracemalloc
+import types
+from typing import Callable, Dict, List
+
+from benchmarks.common import create_bench_logger, create_image_processor, render_screen
+
+# exists() 典型调用：返回键模板列表 + ROI
+EXISTS_TEMPLATES = ["public/返回键1", "public/返回键2"]
+EXISTS_ROI = (120, 20, 100, 66)
+MAIN_MENU_TEMPLATE = "public/主界面"
+MAIN_MENU_ROI = (1720, 20, 120, 70)
+
+
+def measure_peak_alloc(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    测量函数每次调用期间的峰值内存增量
+
+    Args:
+        func: 待测函数（无参）
+        repeat: 重复次数
+
+    Returns:
+        Dict[str, float]: 峰值增量的中位数/最大值（字节）
+    """
+    func()  # 预热：加载模板、填充缩放缓存
+    peaks: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(repeat):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(max(0, peak - base))
+    finally:
+        tracemalloc.stop()
+    return {"median_bytes": statistics.median(peaks), "max_bytes": max(peaks)}
+
+
+def run(resolution=(1920, 1080), repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    执行内存分配基准
+
+    Args:
+        resolution: 合成画面分辨率（宽, 高）
+        repeat: 每个场景的重复次数
+
+    Returns:
+        Dict: 场景名 → 分配统计
+    """
+    # 关闭结果记忆化，重复调用时测量完整匹配流程
+    processor = create_image_processor(client_res=resolution, config=types.SimpleNamespace(USE_RESULT_MEMO=False))
+    screen = render_screen(processor, EXISTS_TEMPLATES[1], base_pos=(EXISTS_ROI[0] + 10, EXISTS_ROI[1] + 5))
+    frame_bytes = screen.nbytes
+
+    results = {
+        "frame": {"median_bytes": frame_bytes, "max_bytes": frame_bytes},
+        "match_template_roi": measure_peak_alloc(
+            lambda: processor.match_template(screen, MAIN_MENU_TEMPLATE, roi=MAIN_MENU_ROI), repeat
+        ),
+        "match_template_full": measure_peak_alloc(lambda: processor.match_template(screen, MAIN_MENU_TEMPLATE), repeat),
+        "exists_list_roi": measure_peak_alloc(
+            lambda: processor.match_templates(screen, EXISTS_TEMPLATES, roi=EXISTS_ROI), repeat
+        ),
+    }
+
+    # text_click 流程依赖EasyOCR模型，未安装时跳过
+    if importlib.util.find_spec("easyocr") is not None:
+        from src.auto_control.ocr.ocr_processor import OCRProcessor
+
+        logger = create_bench_logger()
+        ocr = OCRProcessor(
+            logger=logger,
+            coord_transformer=processor.coord_transformer,
+            display_context=processor.display_context,
+        )
+
+        def text_click_once():
+            ocr.result_memo.clear()  # 排除结果记忆化，测量完整识别流程
+            ocr.find_text_position(screen, "确认", region=(795, 906, 399, 137))
+
+        results["text_click_roi"] = measure_peak_alloc(text_click_once, max(1, repeat // 5))
+    else:
+        print("未安装easyocr，跳过text_click场景")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="exists()/text_click 内存分配基准")
+    parser.add_argument("--resolution", default="1920x1080", help="合成画面分辨率，格式WxH")
+    parser.add_argument("--repeat", type=int, default=20, help="每个场景的重复次数")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    results = run((width, height), args.repeat)
+
+    frame_bytes = results["frame"]["median_bytes"]
+    print(f"{'场景':<22}{'中位峰值(KB)':>14}{'最大峰值(KB)':>14}{'相对整帧':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<22}{stats['median_bytes'] / 1024:>14.1f}{stats['max_bytes'] / 1024:>14.1f}"
+            f"{stats['median_bytes'] / frame_bytes:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""调试图标注基准：统计一张典型OCR调试图（默认30个识别结果）的标注耗时（不含编码写盘）
+
+用法：
+    python -m benchmarks.annotation_benchmark [--resolution 1920x1080] [--results 30] [--repeat 20] [--font simhei.ttf]
+
+识别结果为中英文混合文本（中文走PIL绘制），均匀分布在画面中。未找到字体文件时使用PIL默认字体。
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.common import create_bench_logger
+from src.auto_control.utils.debug_image_saver import DebugImageSaver
+
+
+def build_ocr_results(width: int, height: int, count: int) -> List[Dict]:
+    """生成均匀分布的模拟OCR识别结果"""
+    cols = 5
+    rows = -(-count // cols)
+    cell_w, cell_h = width // cols, (height - 200) // max(1, rows)
+    results = []
+    for idx in range(count):
+        row, col = divmod(idx, cols)
+        results.append(
+            {
+                "bbox": (col * cell_w + 20, 100 + row * cell_h + 20, 160, 32),
+                "text": f"领取奖励{idx}" if idx % 2 == 0 else f"Stage {idx}",
+                "confidence": 0.9,
+            }
+        )
+    return results
+
+
+def run(resolution=(1920, 1080), result_count: int = 30, repeat: int = 20, font_path: str = "simhei.ttf") -> Dict:
+    """
+    执行标注基准
+
+    Args:
+        resolution: 调试图分辨率（宽, 高）
+        result_count: OCR识别结果数量
+        repeat: 重复次数
+        font_path: 中文字体文件路径
+
+    Returns:
+        Dict: 单张调试图标注耗时的p50/p95/均值（毫秒）
+    """
+    width, height = resolution
+    saver = DebugImageSaver(
+        logger=create_bench_logger(), debug_dir=tempfile.mkdtemp(), chinese_font_path=font_path, async_write=False
+    )
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    ocr_results = build_ocr_results(width, height, result_count)
+    target = ocr_results[0]
+
+    def render():
+        saver._render_ocr_debug(
+            image, target["text"], True, 0.9, 0.6, False, ocr_results, target["bbox"], (0, 0, width, height), (0, 0)
+        )
+
+    render()  # 预热
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(float(np.percentile(timings, 95)), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="调试图标注耗时基准")
+    parser.add_argument("--resolution", default="1920x1080", help="调试图分辨率，格式WxH")
+    parser.add_argument("--results", type=int, default=30, help="OCR识别结果数量")
+    parser.add_argument("--repeat", type=int, default=20, help="重复次数")
+    parser.add_argument("--font", default="simhei.ttf", help="中文字体文件路径")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    stats = run((width, height), args.results, args.repeat, args.font)
+    print(
+        f"OCR调试图标注（{args.results}个结果，{width}x{height}）| p50: {stats['p50_ms']:.2f}ms | "
+        f"p95: {stats['p95_ms']:.2f}ms | 均值: {stats['mean_ms']:.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""截图缓冲区转换基准：用合成BGRX字节缓冲验证 frame_buffer 与原 PIL 转换路径逐像素一致，并对比耗时
+
+用法：
+    python -m benchmarks.capture_convert_benchmark [--resolutions 1280x720,1920x1080,2560x1440] [--roi 120x70]
+        [--repeat 20]
+
+对比项：
+    转换    Image.frombuffer → np.array → cvtColor(RGB2BGR)  vs  bgrx_to_bgr
+    ROI转换  只转换画面中央ROI区域（与整帧转换后裁剪的结果一致）
+    黑屏检测  np.mean 全图                                     vs  is_black_frame 抽样
+另外用全黑/暗色噪声/正常画面验证黑屏判定与全图均值判定一致。存在不一致时以非零状态码退出。
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.auto_control.image.frame_buffer import BLACK_MEAN_THRESHOLD, bgrx_to_bgr, is_black_frame
+
+
+def _legacy_convert(buffer: bytes, width: int, height: int) -> np.ndarray:
+    """原截图路径的转换方式（三次整帧拷贝 + 通道交换）"""
+    img_pil = Image.frombuffer("RGB", (width, height), buffer, "raw", "BGRX", 0, 1)
+    return cv2.cvtColor(np.array(img_pil), cv2.COLOR_RGB2BGR)
+
+
+def _median_ms(func: Callable[[], object], repeat: int) -> float:
+    """重复调用并返回耗时中位数（毫秒）"""
+    func()  # 预热
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def _synthetic_buffer(width: int, height: int, high: int, seed: int) -> bytes:
+    """生成合成BGRX字节缓冲（X通道填充随机值，验证其被正确丢弃）"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, high, size=width * height * 4, dtype=np.uint8).tobytes()
+
+
+def run(resolutions: List[Tuple[int, int]], roi_size: Tuple[int, int] = (120, 70), repeat: int = 20) -> Dict:
+    """
+    执行转换一致性验证与耗时对比
+
+    Args:
+        resolutions: 合成缓冲区分辨率列表
+        roi_size: ROI转换的区域尺寸（宽, 高）
+        repeat: 计时重复次数
+
+    Returns:
+        Dict: {"rows": 各分辨率耗时对比, "mismatches": 不一致项列表}
+    """
+    rows, mismatches = [], []
+    for width, height in resolutions:
+        buffer = _synthetic_buffer(width, height, 256, seed=width)
+        legacy = _legacy_convert(buffer, width, height)
+        converted = bgrx_to_bgr(buffer, width, height)
+        if not np.array_equal(legacy, converted):
+            mismatches.append({"resolution": [width, height], "item": "convert"})
+        region = ((width - roi_size[0]) // 2, (height - roi_size[1]) // 2, roi_size[0], roi_size[1])
+        x, y, w, h = region
+        if not np.array_equal(bgrx_to_bgr(buffer, width, height, region), legacy[y : y + h, x : x + w]):
+            mismatches.append({"resolution": [width, height], "item": "roi_convert"})
+
+        # 黑屏判定：全黑、暗色噪声（均值约2）、正常画面
+        for name, high in (("black", 1), ("dark", 5), ("normal", 256)):
+            image = bgrx_to_bgr(_synthetic_buffer(width, height, high, seed=height), width, height)
+            if is_black_frame(image) != (float(np.mean(image)) < BLACK_MEAN_THRESHOLD):
+                mismatches.append({"resolution": [width, height], "item": f"black:{name}"})
+
+        rows.append(
+            {
+                "resolution": f"{width}x{height}",
+                "legacy_convert_ms": _median_ms(lambda: _legacy_convert(buffer, width, height), repeat),
+                "convert_ms": _median_ms(lambda: bgrx_to_bgr(buffer, width, height), repeat),
+                "roi_convert_ms": _median_ms(lambda: bgrx_to_bgr(buffer, width, height, region), repeat),
+                "legacy_black_ms": _median_ms(lambda: np.mean(converted) < BLACK_MEAN_THRESHOLD, repeat),
+                "black_ms": _median_ms(lambda: is_black_frame(converted), repeat),
+            }
+        )
+    return {"rows": rows, "mismatches": mismatches}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="截图缓冲区转换一致性与耗时基准")
+    parser.add_argument("--resolutions", default="1280x720,1920x1080,2560x1440", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--roi", default="120x70", help="ROI转换的区域尺寸，格式WxH")
+    parser.add_argument("--repeat", type=int, default=20, help="计时重复次数")
+    args = parser.parse_args()
+    resolutions = [tuple(int(v) for v in item.lower().split("x")) for item in args.resolutions.split(",") if item]
+    roi_size = tuple(int(v) for v in args.roi.lower().split("x"))
+
+    report = run(resolutions, roi_size, args.repeat)
+    print(f"{'分辨率':<12}{'原转换(ms)':>12}{'新转换(ms)':>12}{'ROI转换(ms)':>13}{'原黑屏(ms)':>12}{'新黑屏(ms)':>12}")
+    for row in report["rows"]:
+        print(
+            f"{row['resolution']:<12}{row['legacy_convert_ms']:>12.2f}{row['convert_ms']:>12.2f}"
+            f"{row['roi_convert_ms']:>13.3f}{row['legacy_black_ms']:>12.2f}{row['black_ms']:>12.2f}"
+        )
+    if report["mismatches"]:
+        print(f"发现不一致: {report['mismatches']}")
+        sys.exit(1)
+    print("转换结果与原路径逐像素一致，黑屏判定一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""后台截图服务验证：用 FakeFrameSource 在无win32环境下验证 FrameCaptureService 的语义，并对比检查延迟
+
+用法：
+    python -m benchmarks.capture_service_validation [--fps 20] [--latency 0.02] [--polls 20]
+
+验证项：
+    newer_than   返回帧的截图开始时间晚于指定时间（模拟"输入操作之后的帧"）
+    所有权       已交给消费者的帧不会被后续截图覆盖
+    预分配复用   无消费者取帧时不产生新的分配
+    失败容忍     帧源间歇失败时服务继续运行
+延迟对比：同步截图（每次检查调用帧源）与从服务取最新帧的单次检查耗时。存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from src.auto_control.devices.capture_service import FakeFrameSource, FrameCaptureService
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+def run(fps: float = 20.0, latency: float = 0.02, polls: int = 20) -> Dict:
+    """
+    执行验证与延迟对比
+
+    Args:
+        fps: 服务截图帧率
+        latency: 模拟的单次截图耗时（秒）
+        polls: 延迟对比的检查次数
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "latency_ms": 同步/服务两种方式的检查耗时中位数}
+    """
+    checks: List[Dict] = []
+    size = (640, 360)
+
+    # 预分配复用：无消费者时分配次数不超过槽位数
+    source = FakeFrameSource(size=size)
+    service = FrameCaptureService(source, fps=fps, buffer_size=3)
+    for _ in range(30):
+        service.capture_once()
+    _check(checks, "预分配复用", service.allocations == 3, f"截图30帧，分配{service.allocations}次")
+
+    # 所有权：取走的帧在后续截图后保持不变
+    _, frame = service.get_latest_frame()
+    taken_index = FakeFrameSource.frame_index_of(frame)
+    snapshot = frame.copy()
+    for _ in range(10):
+        service.capture_once()
+    _check(
+        checks,
+        "所有权",
+        FakeFrameSource.frame_index_of(frame) == taken_index and (frame == snapshot).all(),
+        f"取走第{taken_index}帧后再截图10帧",
+    )
+
+    # newer_than：线程模式下等待输入之后的帧
+    source = FakeFrameSource(size=size, latency=latency, fail_every=7)
+    service = FrameCaptureService(source, fps=fps, buffer_size=3)
+    service.start()
+    try:
+        time.sleep(0.2)
+        input_time = time.monotonic()
+        latest = service.get_latest_frame(newer_than=input_time, timeout=1.0)
+        _check(
+            checks,
+            "newer_than",
+            latest is not None and latest[0] > input_time,
+            f"等待到帧: {latest is not None}",
+        )
+
+        # 延迟对比：每次检查前等待一个帧间隔，模拟轮询
+        service_ms = []
+        for _ in range(polls):
+            time.sleep(1.0 / fps)
+            start = time.perf_counter()
+            service.get_latest_frame(timeout=1.0)
+            service_ms.append((time.perf_counter() - start) * 1000)
+        _check(
+            checks,
+            "失败容忍",
+            service.capture_failures > 0 and service.is_running,
+            f"失败{service.capture_failures}次，仍在运行: {service.is_running}",
+        )
+    finally:
+        service.stop()
+    _check(checks, "停止", not service.is_running, "")
+
+    sync_source = FakeFrameSource(size=size, latency=latency)
+    sync_ms = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        sync_source(None)
+        sync_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "checks": checks,
+        "latency_ms": {
+            "sync_p50": round(statistics.median(sync_ms), 3),
+            "service_p50": round(statistics.median(service_ms), 3),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="后台截图服务验证")
+    parser.add_argument("--fps", type=float, default=20.0, help="服务截图帧率")
+    parser.add_argument("--latency", type=float, default=0.02, help="模拟的单次截图耗时（秒）")
+    parser.add_argument("--polls", type=int, default=20, help="延迟对比的检查次数")
+    args = parser.parse_args()
+
+    report = run(args.fps, args.latency, args.polls)
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    print(json.dumps(report["latency_ms"], ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""基准测试公共工具：构建无窗口依赖的处理器实例、生成合成画面"""
+
+import logging
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.auto_control.image.image_processor import ImageProcessor
+from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
+from src.auto_control.utils.display_context import RuntimeDisplayContext
+
+BASE_RESOLUTION: Tuple[int, int] = (1920, 1080)
+
+
+def create_bench_logger(name: str = "Benchmark", level: int = logging.WARNING) -> logging.Logger:
+    """
+    创建基准测试用日志器（仅控制台输出，避免日志文件I/O干扰计时）
+
+    Args:
+        name: 日志器名称
+        level: 日志级别，默认WARNING
+
+    Returns:
+        logging.Logger: 日志实例
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+    logger.propagate = False
+    return logger
+
+
+def create_display_context(
+    client_res: Tuple[int, int] = BASE_RESOLUTION, dpi_scale: float = 1.0, is_fullscreen: bool = False
+) -> RuntimeDisplayContext:
+    """
+    构建模拟的运行时显示上下文
+
+    Args:
+        client_res: 客户区物理分辨率（宽, 高）
+        dpi_scale: DPI缩放因子
+        is_fullscreen: 是否全屏
+
+    Returns:
+        RuntimeDisplayContext: 显示上下文实例
+    """
+    phys_w, phys_h = client_res
+    ctx = RuntimeDisplayContext(original_base_width=BASE_RESOLUTION[0], original_base_height=BASE_RESOLUTION[1])
+    ctx.update_from_window(
+        is_fullscreen=is_fullscreen,
+        dpi_scale=dpi_scale,
+        client_logical=(int(round(phys_w / dpi_scale)), int(round(phys_h / dpi_scale))),
+        client_physical=(phys_w, phys_h),
+        screen_physical=(phys_w, phys_h),
+        client_origin=(0, 0),
+    )
+    return ctx
+
+
+def create_image_processor(
+    client_res: Tuple[int, int] = BASE_RESOLUTION,
+    dpi_scale: float = 1.0,
+    logger: Optional[logging.Logger] = None,
+    config: Optional[object] = None,
+) -> ImageProcessor:
+    """
+    构建无窗口依赖的图像处理器（模板目录使用项目内置模板）
+
+    Args:
+        client_res: 客户区物理分辨率（宽, 高）
+        dpi_scale: DPI缩放因子
+        logger: 日志实例，默认使用基准测试日志器
+        config: 配置对象（可选，支持MATCH_WORKERS等属性覆盖；未设置USE_SPATIAL_PRIORS时不读写模板位置记录，
+            避免合成画面的匹配位置写入用户的 runtime/<env>/spatial_priors.json）
+
+    Returns:
+        ImageProcessor: 图像处理器实例
+    """
+    logger = logger or create_bench_logger()
+    ctx = create_display_context(client_res, dpi_scale)
+    transformer = CoordinateTransformer(display_context=ctx, logger=logger)
+    return ImageProcessor(
+        original_base_res=BASE_RESOLUTION,
+        logger=logger,
+        coord_transformer=transformer,
+        display_context=ctx,
+        config=config,
+    )
+
+
+def render_screen(
+    processor: ImageProcessor,
+    template_name: str,
+    base_pos: Tuple[int, int],
+    noise_sigma: float = 0.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    将模板按当前显示比例贴到随机背景上，生成合成画面
+
+    Args:
+        processor: 图像处理器（提供模板与显示上下文）
+        template_name: 模板名称
+        base_pos: 模板左上角基准坐标（1920x1080坐标系）
+        noise_sigma: 高斯噪声标准差，0表示无噪声
+        seed: 随机种子
+
+    Returns:
+        np.ndarray: 合成画面（BGR格式，尺寸为客户区物理分辨率）
+    """
+    ctx = processor.display_context
+    phys_w, phys_h = ctx.client_physical_res
+    rng = np.random.default_rng(seed)
+    # 低频背景：小尺寸随机图放大，避免纯噪声背景导致匹配分数失真
+    small = rng.integers(0, 256, size=(phys_h // 40 + 1, phys_w // 40 + 1, 3), dtype=np.uint8)
+    screen = cv2.resize(small, (phys_w, phys_h), interpolation=cv2.INTER_CUBIC)
+
+    template = processor.get_template(template_name)
+    if template is not None:
+        ratio = ctx.content_scale_ratio
+        tw = max(1, int(round(template.shape[1] * ratio)))
+        th = max(1, int(round(template.shape[0] * ratio)))
+        scaled = cv2.resize(template, (tw, th), interpolation=cv2.INTER_AREA if ratio < 1 else cv2.INTER_CUBIC)
+        x = min(max(0, int(round(base_pos[0] * ratio))), phys_w - tw)
+        y = min(max(0, int(round(base_pos[1] * ratio))), phys_h - th)
+        screen[y : y + th, x : x + tw] = scaled
+
+    if noise_sigma > 0:
+        noise = rng.normal(0, noise_sigma, size=screen.shape)
+        screen = np.clip(screen.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    return screen
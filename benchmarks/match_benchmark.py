@@ -0,0 +1,279 @@
+"""模板匹配基准：用内置模板生成合成画面，统计 ImageProcessor.match_template 的耗时、内存分配与命中准确率
+
+用法：
+    python -m benchmarks.match_benchmark [--resolutions 1280x720,1920x1080,2560x1440] [--dpi-scales 1.0,1.5]
+        [--noise 0,8] [--repeat 5] [--templates public/] [--output PATH] [--baseline PATH]
+
+场景组合：分辨率 × DPI缩放 × 噪声 × 搜索方式（全图 / 模板周围ROI），每个组合遍历全部（或指定前缀的）模板：
+    正样本  画面中贴入目标模板，匹配结果与贴入位置的IoU≥0.5视为命中
+    负样本  画面中贴入另一模板，仍返回结果视为误检
+耗时取正样本重复调用的 p50/p95（首次调用作为预热，不计入）；内存分配为tracemalloc统计的单次调用峰值增量。
+结果写入JSON（默认 runtime/<env>/benchmarks/match_<时间戳>.json），指定 --baseline 时输出各组合相对基线的耗时变化。
+位置先验默认关闭，避免历史记录影响计时并污染运行时数据。
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+import tracemalloc
+import types
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.common import BASE_RESOLUTION, create_image_processor, render_screen
+from src.core.path_manager import path_manager
+
+THRESHOLD = 0.8
+HIT_IOU = 0.5
+ROI_MARGIN = 60  # ROI场景：模板基准矩形四周留白（基准像素）
+
+
+def _parse_list(value: str, cast=float) -> List:
+    """解析逗号分隔的参数列表"""
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_resolutions(value: str) -> List[Tuple[int, int]]:
+    """解析 WxH,WxH 格式的分辨率列表"""
+    return [tuple(int(v) for v in item.lower().split("x")) for item in value.split(",") if item.strip()]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """计算百分位数（线性插值）"""
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def _iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """计算两个 (x, y, w, h) 矩形的交并比"""
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    inter = max(0, x1 - x0) * max(0, y1 - y0)
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _measure_alloc(func) -> int:
+    """测量单次调用期间的峰值内存增量（字节）"""
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - base)
+
+
+def _benchmark_template(
+    processor, name: str, other: str, base_pos: Tuple[int, int], noise: float, use_roi: bool, repeat: int, seed: int
+) -> Optional[Dict]:
+    """
+    对单个模板执行一个场景组合的基准
+
+    Returns:
+        Optional[Dict]: 单模板结果（模板读取失败返回None）
+    """
+    template = processor.get_template(name)
+    if template is None:
+        return None
+    th, tw = template.shape[:2]
+    base_rect = (base_pos[0], base_pos[1], tw, th)
+    roi = None
+    if use_roi:
+        x0, y0 = max(0, base_pos[0] - ROI_MARGIN), max(0, base_pos[1] - ROI_MARGIN)
+        x1 = min(BASE_RESOLUTION[0], base_pos[0] + tw + ROI_MARGIN)
+        y1 = min(BASE_RESOLUTION[1], base_pos[1] + th + ROI_MARGIN)
+        roi = (x0, y0, x1 - x0, y1 - y0)
+
+    screen = render_screen(processor, name, base_pos, noise_sigma=noise, seed=seed)
+    negative = render_screen(processor, other, base_pos, noise_sigma=noise, seed=seed + 1)
+    expected = processor.coord_transformer.convert_original_rect_to_current_client(base_rect)
+
+    bbox = processor.match_template(screen, name, threshold=THRESHOLD, roi=roi)  # 预热：缩放缓存、预过滤签名
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        processor.match_template(screen, name, threshold=THRESHOLD, roi=roi)
+        latencies.append((time.perf_counter() - start) * 1000)
+    alloc = _measure_alloc(lambda: processor.match_template(screen, name, threshold=THRESHOLD, roi=roi))
+    false_positive = processor.match_template(negative, name, threshold=THRESHOLD, roi=roi) is not None
+
+    return {
+        "template": name,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "alloc_peak_kb": round(alloc / 1024, 1),
+        "hit": bbox is not None and _iou(tuple(bbox), tuple(expected)) >= HIT_IOU,
+        "false_positive": false_positive,
+        "bbox": list(bbox) if bbox else None,
+        "expected": list(expected),
+    }
+
+
+def run(
+    resolutions: List[Tuple[int, int]],
+    dpi_scales: List[float],
+    noise_levels: List[float],
+    repeat: int = 5,
+    template_prefix: str = "",
+    seed: int = 0,
+) -> Dict:
+    """
+    执行模板匹配基准
+
+    Args:
+        resolutions: 客户区物理分辨率列表
+        dpi_scales: DPI缩放因子列表
+        noise_levels: 高斯噪声标准差列表
+        repeat: 每个模板的计时重复次数
+        template_prefix: 只测试名称以该前缀开头的模板（空字符串表示全部）
+        seed: 随机种子（决定模板贴入位置与背景）
+
+    Returns:
+        Dict: {"meta": 运行参数, "scenarios": 各场景组合的汇总与逐模板结果}
+    """
+    config = types.SimpleNamespace(USE_SPATIAL_PRIORS=False, USE_RESULT_MEMO=False)
+    scenarios = []
+    for resolution in resolutions:
+        for dpi_scale in dpi_scales:
+            processor = create_image_processor(client_res=resolution, dpi_scale=dpi_scale, config=config)
+            all_names = sorted(processor.all_template_paths)
+            names = [n for n in all_names if n.startswith(template_prefix)]
+            if not names:
+                continue
+            rng = np.random.default_rng(seed)
+            positions = {}
+            for name in names:
+                template = processor.get_template(name)
+                if template is None:
+                    continue
+                positions[name] = (
+                    int(rng.integers(0, max(1, BASE_RESOLUTION[0] - template.shape[1]))),
+                    int(rng.integers(0, max(1, BASE_RESOLUTION[1] - template.shape[0]))),
+                )
+
+            for noise in noise_levels:
+                for use_roi in (False, True):
+                    results = []
+                    for idx, name in enumerate(names):
+                        if name not in positions:
+                            continue
+                        # 负样本从全部模板中选取，避免前缀过滤后只剩目标模板自身
+                        other = all_names[(all_names.index(name) + 1) % len(all_names)]
+                        item = _benchmark_template(
+                            processor, name, other, positions[name], noise, use_roi, repeat, seed + idx
+                        )
+                        if item:
+                            results.append(item)
+                    p50s = [r["p50_ms"] for r in results]
+                    scenarios.append(
+                        {
+                            "key": f"{resolution[0]}x{resolution[1]}@{dpi_scale}|noise={noise}|{'roi' if use_roi else 'full'}",
+                            "resolution": list(resolution),
+                            "dpi_scale": dpi_scale,
+                            "noise": noise,
+                            "roi": use_roi,
+                            "templates": len(results),
+                            "p50_ms": round(statistics.median(p50s), 3) if p50s else 0.0,
+                            "p95_ms": round(_percentile([r["p95_ms"] for r in results], 95), 3),
+                            "alloc_peak_kb_max": max((r["alloc_peak_kb"] for r in results), default=0.0),
+                            "hit_rate": round(sum(r["hit"] for r in results) / len(results), 4) if results else 0.0,
+                            "false_positive_rate": (
+                                round(sum(r["false_positive"] for r in results) / len(results), 4) if results else 0.0
+                            ),
+                            "results": results,
+                        }
+                    )
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "threshold": THRESHOLD,
+            "repeat": repeat,
+            "seed": seed,
+            "template_prefix": template_prefix,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(report: Dict, baseline: Dict) -> List[Dict]:
+    """
+    对比本次结果与基线（按场景键匹配）
+
+    Returns:
+        List[Dict]: 各场景的 p50/p95 变化比例与命中率变化
+    """
+    if baseline.get("meta", {}).get("template_prefix") != report["meta"]["template_prefix"]:
+        print("警告：基线与本次的模板过滤前缀不同，对比结果仅供参考")
+    base_map = {s["key"]: s for s in baseline.get("scenarios", [])}
+    rows = []
+    for scenario in report["scenarios"]:
+        base = base_map.get(scenario["key"])
+        if not base:
+            continue
+        rows.append(
+            {
+                "key": scenario["key"],
+                "p50_change": round(scenario["p50_ms"] / base["p50_ms"] - 1, 4) if base["p50_ms"] else 0.0,
+                "p95_change": round(scenario["p95_ms"] / base["p95_ms"] - 1, 4) if base["p95_ms"] else 0.0,
+                "hit_rate_change": round(scenario["hit_rate"] - base["hit_rate"], 4),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="模板匹配耗时/内存分配/准确率基准")
+    parser.add_argument("--resolutions", default="1280x720,1920x1080,2560x1440", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--dpi-scales", default="1.0,1.5", help="DPI缩放因子列表")
+    parser.add_argument("--noise", default="0,8", help="高斯噪声标准差列表")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模板的计时重复次数")
+    parser.add_argument("--templates", default="", help="模板名前缀过滤（如 public/）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default=None, help="结果JSON路径")
+    parser.add_argument("--baseline", default=None, help="基线结果JSON路径（输出耗时变化）")
+    args = parser.parse_args()
+
+    report = run(
+        _parse_resolutions(args.resolutions),
+        _parse_list(args.dpi_scales),
+        _parse_list(args.noise),
+        repeat=args.repeat,
+        template_prefix=args.templates,
+        seed=args.seed,
+    )
+
+    output = args.output or os.path.join(
+        path_manager.dynamic_base, "benchmarks", f"match_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'场景':<40}{'模板数':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'峰值分配(KB)':>14}{'命中率':>8}{'误检率':>8}")
+    for s in report["scenarios"]:
+        print(
+            f"{s['key']:<40}{s['templates']:>6}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}"
+            f"{s['alloc_peak_kb_max']:>14.1f}{s['hit_rate']:>8.1%}{s['false_positive_rate']:>8.1%}"
+        )
+    print(f"结果已写入: {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("相对基线：")
+        for row in compare(report, baseline):
+            print(
+                f"  {row['key']:<40} p50 {row['p50_change']:+.1%} | p95 {row['p95_change']:+.1%} | "
+                f"命中率 {row['hit_rate_change']:+.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""OCR结果记忆化基准：统计识别区域指纹的耗时，并验证同一子图上的多个文本查询只识别一次
+
+用法：
+    python -m benchmarks.ocr_memo_benchmark [--frames 50] [--queries 5] [--ocr-engine easyocr] [--font simhei.ttf]
+
+画面来自合成画面生成器（benchmarks.synthetic_screens），识别区域为真值文本的配对ROI或文本周围区域：
+    指纹耗时   按 OCRProcessor 的方式处理ROI后计算区域指纹，与整帧MD5（原缓存键）对比单次耗时
+    多文本查询 OCR引擎可用时，每个区域依次查询真值文本与若干其他文本，统计识别次数（记忆化未命中数）、
+               首次/后续查询耗时，并与关闭记忆化时的结果逐项比对
+引擎不可用时只输出指纹耗时。
+"""
+
+import argparse
+import hashlib
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks.common import create_bench_logger
+from benchmarks.synthetic_screens import DEFAULT_FONT, SyntheticScreenGenerator
+from benchmarks.vision_stress_benchmark import _around, _create_ocr
+from src.auto_control.image.result_memo import region_fingerprint
+
+
+def _median_ms(values: List[float]) -> float:
+    return round(statistics.median(values), 3) if values else 0.0
+
+
+def run(frames: int = 50, queries: int = 5, ocr_engine: str = "easyocr", font_path: str = DEFAULT_FONT) -> Dict:
+    """
+    执行基准
+
+    Args:
+        frames: 合成帧数
+        queries: 每个区域查询的文本数（含真值文本）
+        ocr_engine: OCR引擎类型
+        font_path: 中文字体文件路径
+
+    Returns:
+        Dict: {"fingerprint_ms": 指纹/整帧MD5耗时, "queries": 多文本查询统计（引擎不可用时为跳过原因）}
+    """
+    logger = create_bench_logger("OCRMemoBenchmark")
+    generator = SyntheticScreenGenerator(font_path=font_path, logger=logger)
+    transformer = generator.variants[0].processor.coord_transformer
+    ocr, skipped = _create_ocr(ocr_engine, logger, use_memo=True)
+
+    md5_ms, fingerprint_ms = [], []
+    first_ms, repeat_ms, mismatches, regions = [], [], 0, 0
+    misses_before = ocr.result_memo.misses if ocr else 0
+    for image, truth in generator.iter_frames(frames):
+        img_h, img_w = image.shape[:2]
+        for item in truth["texts"]:
+            region = tuple(item["roi_rect"]) if item["roi_rect"] else _around(item["base_rect"])
+            region_phys, _ = transformer.process_roi(
+                roi=region, boundary_width=img_w, boundary_height=img_h, enable_expand=True, expand_pixel=10
+            )
+            start = time.perf_counter()
+            hashlib.md5(image.tobytes()).hexdigest()
+            md5_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            region_fingerprint(image, region_phys, checksum=True)
+            fingerprint_ms.append((time.perf_counter() - start) * 1000)
+
+            if ocr is None:
+                continue
+            regions += 1
+            others = [label for label in generator.labels if label != item["text"]][: max(0, queries - 1)]
+            for idx, text in enumerate([item["text"]] + others):
+                start = time.perf_counter()
+                result = ocr.find_text_position(image, text, region=region)
+                (first_ms if idx == 0 else repeat_ms).append((time.perf_counter() - start) * 1000)
+                # 关闭记忆化重新识别，结果应与经缓存的结果一致
+                ocr.result_memo.enabled = False
+                mismatches += result != ocr.find_text_position(image, text, region=region)
+                ocr.result_memo.enabled = True
+
+    report = {
+        "fingerprint_ms": {
+            "full_frame_md5_p50": _median_ms(md5_ms),
+            "region_fingerprint_p50": _median_ms(fingerprint_ms),
+        }
+    }
+    if ocr is None:
+        report["queries"] = {"skipped": skipped}
+    else:
+        report["queries"] = {
+            "regions": regions,
+            "queries_per_region": queries,
+            "recognitions": ocr.result_memo.misses - misses_before,
+            "first_query_p50_ms": _median_ms(first_ms),
+            "repeat_query_p50_ms": _median_ms(repeat_ms),
+            "mismatches_vs_uncached": mismatches,
+        }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OCR结果记忆化基准")
+    parser.add_argument("--frames", type=int, default=50, help="合成帧数")
+    parser.add_argument("--queries", type=int, default=5, help="每个区域查询的文本数")
+    parser.add_argument("--ocr-engine", default="easyocr", help="OCR引擎类型")
+    parser.add_argument("--font", default=DEFAULT_FONT, help="中文字体文件路径")
+    args = parser.parse_args()
+
+    report = run(args.frames, args.queries, args.ocr_engine, args.font)
+    for key, value in report.items():
+        print(json.dumps({key: value}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""预过滤安全阈值验证：在内置模板上确认颜色包含预过滤不会产生漏检，并统计负样本跳过率
+
+用法：
+    python -m benchmarks.prefilter_validation [--resolutions 1280x720,1920x1080,2560x1440] [--seeds 2]
+
+正样本：把模板按当前分辨率缩放贴入合成画面（原样/高斯噪声/半透明黑色遮罩三种变体），
+凡是全图matchTemplate分数达到阈值的样本，预过滤缺失比例都必须不超过安全阈值。
+负样本：画面中贴入其他模板，统计matchTemplate未命中时预过滤的跳过比例。
+存在漏检时以非零状态码退出。
+"""
+
+import argparse
+import json
+import sys
+import types
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.common import create_image_processor, render_screen
+from src.auto_control.image.match_prefilter import cell_histogram_integral, color_signature, min_missing_fraction
+
+THRESHOLD = 0.8
+VARIANTS = ("plain", "noise", "dimmed")
+
+
+def _apply_variant(screen: np.ndarray, variant: str, seed: int) -> np.ndarray:
+    """对合成画面施加变体（噪声/遮罩）"""
+    if variant == "noise":
+        rng = np.random.default_rng(seed)
+        noisy = screen.astype(np.float32) + rng.normal(0, 8, size=screen.shape)
+        return np.clip(noisy, 0, 255).astype(np.uint8)
+    if variant == "dimmed":
+        return (screen.astype(np.float32) * 0.55).astype(np.uint8)
+    return screen
+
+
+def _evaluate(processor, screen: np.ndarray, template_name: str) -> Tuple[float, float]:
+    """返回 (全图matchTemplate最高分, 预过滤最小缺失比例)"""
+    frame = processor._prepare_match_frame(screen, None)
+    prepared = processor._prepare_template_for_frame(frame, template_name)
+    if prepared is None:
+        return -1.0, 0.0
+    _, template_gray, _, scaled_size = prepared
+    score, _ = processor._run_match(frame, template_gray, THRESHOLD, factor=1)
+    integral = frame.get("prefilter_integral")
+    if integral is None:
+        integral = cell_histogram_integral(screen, processor.prefilter_stride, processor.prefilter_cell)
+        frame["prefilter_integral"] = integral
+    signature = color_signature(processor.get_template(template_name))
+    missing = min_missing_fraction(
+        integral, signature, scaled_size, processor.prefilter_stride, processor.prefilter_cell
+    )
+    return score, missing
+
+
+def run(resolutions: List[Tuple[int, int]], seeds: int = 2) -> Dict:
+    """
+    执行验证
+
+    Args:
+        resolutions: 合成画面分辨率列表
+        seeds: 每个模板/分辨率/变体的随机背景数量
+
+    Returns:
+        Dict: 验证汇总（漏检列表、正样本最大缺失比例、负样本跳过率等）
+    """
+    config = types.SimpleNamespace(USE_SPATIAL_PRIORS=False, MATCH_WORKERS=0, USE_RESULT_MEMO=False)
+    summary = {"positives": 0, "false_negatives": [], "max_positive_missing": 0.0, "negatives": 0, "skipped": 0}
+    for resolution in resolutions:
+        processor = create_image_processor(client_res=resolution, config=config)
+        bound = processor.prefilter_max_missing
+        names = sorted(processor.all_template_paths)
+        base_w, base_h = 1920, 1080
+        for seed in range(seeds):
+            rng = np.random.default_rng(seed)
+            for idx, name in enumerate(names):
+                template = processor.get_template(name)
+                if template is None:
+                    continue
+                pos = (
+                    int(rng.integers(0, max(1, base_w - template.shape[1]))),
+                    int(rng.integers(0, max(1, base_h - template.shape[0]))),
+                )
+                other = names[(idx + 1 + seed) % len(names)]
+                for variant in VARIANTS:
+                    screen = _apply_variant(render_screen(processor, name, pos, seed=seed), variant, seed)
+                    score, missing = _evaluate(processor, screen, name)
+                    if score >= THRESHOLD:
+                        summary["positives"] += 1
+                        summary["max_positive_missing"] = max(summary["max_positive_missing"], missing)
+                        if missing > bound:
+                            summary["false_negatives"].append(
+                                {"template": name, "resolution": resolution, "variant": variant, "missing": missing}
+                            )
+
+                    negative = _apply_variant(render_screen(processor, other, pos, seed=seed + 100), variant, seed)
+                    score, missing = _evaluate(processor, negative, name)
+                    if score < THRESHOLD:
+                        summary["negatives"] += 1
+                        summary["skipped"] += int(missing > bound)
+    summary["max_positive_missing"] = round(summary["max_positive_missing"], 4)
+    summary["negative_skip_rate"] = round(summary["skipped"] / summary["negatives"], 4) if summary["negatives"] else 0.0
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="预过滤安全阈值验证")
+    parser.add_argument("--resolutions", default="1280x720,1920x1080,2560x1440", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--seeds", type=int, default=2, help="每个组合的随机背景数量")
+    args = parser.parse_args()
+    resolutions = [tuple(int(v) for v in item.lower().split("x")) for item in args.resolutions.split(",") if item]
+
+    summary = run(resolutions, args.seeds)
+    print(json.dumps(summary, ensure_ascii=False))
+    if summary["false_negatives"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
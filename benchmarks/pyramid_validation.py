@@ -0,0 +1,135 @@
+"""金字塔匹配一致性验证：在内置模板上对比粗到精匹配与原分辨率全图匹配的结果，确认不会产生漏检或错位
+
+用法：
+    python -m benchmarks.pyramid_validation [--resolutions 1280x720,1920x1080,2560x1440] [--dpi-scales 1.0,1.5] [--seeds 2]
+
+每个模板按当前分辨率/DPI缩放贴入合成画面（原样/高斯噪声/半透明黑色遮罩/模糊四种变体），
+分别以自动模式选择的降采样倍数与原分辨率全图匹配：两者对是否达到阈值的判断必须一致，
+均命中时位置偏差不超过 MAX_OFFSET 像素。自动模式下金字塔自检未通过的模板不使用金字塔，计为“已禁用”。
+存在不一致时以非零状态码退出。
+"""
+
+import argparse
+import json
+import sys
+import types
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.common import create_image_processor, render_screen
+
+THRESHOLD = 0.8
+MAX_OFFSET = 2
+VARIANTS = ("plain", "noise", "dimmed", "blur")
+
+
+def _apply_variant(screen: np.ndarray, variant: str, seed: int) -> np.ndarray:
+    """对合成画面施加变体（噪声/遮罩/模糊）"""
+    if variant == "noise":
+        rng = np.random.default_rng(seed)
+        noisy = screen.astype(np.float32) + rng.normal(0, 8, size=screen.shape)
+        return np.clip(noisy, 0, 255).astype(np.uint8)
+    if variant == "dimmed":
+        return (screen.astype(np.float32) * 0.55).astype(np.uint8)
+    if variant == "blur":
+        return cv2.GaussianBlur(screen, (3, 3), 0)
+    return screen
+
+
+def _compare(processor, screen: np.ndarray, template_name: str) -> Dict:
+    """对同一画面执行金字塔匹配与全图匹配，返回倍数、两者分数与位置"""
+    frame = processor._prepare_match_frame(screen, None)
+    prepared = processor._prepare_template_for_frame(frame, template_name)
+    if prepared is None:
+        return {}
+    _, template_gray, _, _ = prepared
+    factor = processor._plan_pyramid_factor(frame, template_gray, template_name)
+    exhaustive_score, exhaustive_loc = processor._run_match(frame, template_gray, THRESHOLD, factor=1)
+    if factor > 1:
+        pyramid_score, pyramid_loc = processor._run_match(frame, template_gray, THRESHOLD, factor=factor)
+    else:
+        pyramid_score, pyramid_loc = exhaustive_score, exhaustive_loc
+    return {
+        "factor": factor,
+        "exhaustive": (exhaustive_score, exhaustive_loc),
+        "pyramid": (pyramid_score, pyramid_loc),
+    }
+
+
+def run(resolutions: List[Tuple[int, int]], dpi_scales: List[float], seeds: int = 2) -> Dict:
+    """
+    执行验证
+
+    Args:
+        resolutions: 合成画面分辨率列表
+        dpi_scales: DPI缩放因子列表
+        seeds: 每个模板/分辨率/变体的随机背景数量
+
+    Returns:
+        Dict: 验证汇总（不一致列表、使用金字塔的样本数、自检禁用的模板等）
+    """
+    config = types.SimpleNamespace(USE_SPATIAL_PRIORS=False, MATCH_WORKERS=0, USE_RESULT_MEMO=False)
+    summary = {"samples": 0, "pyramid_samples": 0, "positives": 0, "mismatches": [], "disabled": []}
+    disabled = set()
+    for resolution in resolutions:
+        for dpi_scale in dpi_scales:
+            processor = create_image_processor(client_res=resolution, dpi_scale=dpi_scale, config=config)
+            names = sorted(processor.all_template_paths)
+            base_w, base_h = 1920, 1080
+            for seed in range(seeds):
+                rng = np.random.default_rng(seed)
+                for name in names:
+                    template = processor.get_template(name)
+                    if template is None:
+                        continue
+                    pos = (
+                        int(rng.integers(0, max(1, base_w - template.shape[1]))),
+                        int(rng.integers(0, max(1, base_h - template.shape[0]))),
+                    )
+                    for variant in VARIANTS:
+                        screen = _apply_variant(render_screen(processor, name, pos, seed=seed), variant, seed)
+                        result = _compare(processor, screen, name)
+                        if not result:
+                            continue
+                        summary["samples"] += 1
+                        summary["pyramid_samples"] += int(result["factor"] > 1)
+                        (full_score, full_loc), (pyr_score, pyr_loc) = result["exhaustive"], result["pyramid"]
+                        full_hit, pyr_hit = full_score >= THRESHOLD, pyr_score >= THRESHOLD
+                        summary["positives"] += int(full_hit)
+                        offset = max(abs(full_loc[0] - pyr_loc[0]), abs(full_loc[1] - pyr_loc[1]))
+                        if full_hit != pyr_hit or (full_hit and offset > MAX_OFFSET):
+                            summary["mismatches"].append(
+                                {
+                                    "template": name,
+                                    "resolution": resolution,
+                                    "dpi_scale": dpi_scale,
+                                    "variant": variant,
+                                    "factor": result["factor"],
+                                    "exhaustive": [round(full_score, 4), list(full_loc)],
+                                    "pyramid": [round(pyr_score, 4), list(pyr_loc)],
+                                }
+                            )
+            disabled.update(name for name, _ in processor.get_pyramid_disabled())
+    summary["disabled"] = sorted(disabled)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="金字塔匹配一致性验证")
+    parser.add_argument("--resolutions", default="1280x720,1920x1080,2560x1440", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--dpi-scales", default="1.0,1.5", help="DPI缩放因子列表")
+    parser.add_argument("--seeds", type=int, default=2, help="每个组合的随机背景数量")
+    args = parser.parse_args()
+    resolutions = [tuple(int(v) for v in item.lower().split("x")) for item in args.resolutions.split(",") if item]
+    dpi_scales = [float(item) for item in args.dpi_scales.split(",") if item.strip()]
+
+    summary = run(resolutions, dpi_scales, args.seeds)
+    print(json.dumps(summary, ensure_ascii=False))
+    if summary["mismatches"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
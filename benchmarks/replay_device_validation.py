@@ -0,0 +1,226 @@
+"""回放设备验证：用合成画面构建录制，在无win32环境下通过 DeviceManager 验证 ReplayDevice 的状态机语义
+
+用法：
+    python -m benchmarks.replay_device_validation [--resolution 1920x1080]
+
+验证项：
+    连接           replay:// URI 经 DeviceManager（默认 AutoConfig，与 Auto 的组装方式一致）创建并连接，
+                   显示上下文按录制分辨率设置，帧缓存始终禁用
+    模板检查       exists 在当前状态画面上匹配模板
+    点击转换       点击模板命中规则矩形后转换状态，未命中规则时状态不变
+    按键转换       按键名匹配规则（不区分大小写）
+    截图转换       after_captures 在指定截图次数后自动转换
+    输入日志       记录全部输入及转换前后状态
+    确定性         同一录制、同一输入序列重复运行，输入日志一致
+    zip归档        从zip归档加载的录制行为与目录一致
+    错误处理       录制不存在/初始状态不存在时连接失败
+存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from threading import Event
+from typing import Dict, List, Tuple
+
+import cv2
+
+from benchmarks.common import create_bench_logger, create_image_processor, render_screen
+from src.auto_control.core.auto_base import AutoConfig
+from src.auto_control.devices.device_manager import DeviceManager
+
+BACK_TEMPLATE = "public/返回键2"
+MENU_TEMPLATE = "public/返回键1"
+BACK_POS = (130, 25)
+MENU_POS = (900, 500)
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+def build_recording(directory: str, resolution: Tuple[int, int]) -> None:
+    """
+    生成合成录制：main（返回键2）⇄ menu（返回键1），main 按F1进入 loading，截图2次后回到 main
+
+    Args:
+        directory: 录制输出目录
+        resolution: 画面分辨率（宽, 高）
+    """
+    processor = create_image_processor(client_res=resolution)
+    frames = {
+        "frames/main.png": render_screen(processor, BACK_TEMPLATE, base_pos=BACK_POS, seed=1),
+        "frames/menu.png": render_screen(processor, MENU_TEMPLATE, base_pos=MENU_POS, seed=2),
+        "frames/loading_0.png": render_screen(processor, MENU_TEMPLATE, base_pos=(1500, 800), seed=3),
+        "frames/loading_1.png": render_screen(processor, MENU_TEMPLATE, base_pos=(1520, 800), seed=4),
+    }
+    os.makedirs(os.path.join(directory, "frames"), exist_ok=True)
+    for name, image in frames.items():
+        cv2.imwrite(os.path.join(directory, name), image)
+
+    template = processor.get_template(BACK_TEMPLATE)
+    back_rect = [BACK_POS[0], BACK_POS[1], int(template.shape[1]), int(template.shape[0])]
+    manifest = {
+        "version": 1,
+        "resolution": list(resolution),
+        "dpi_scale": 1.0,
+        "initial_state": "main",
+        "states": {
+            "main": {
+                "frames": ["frames/main.png"],
+                "transitions": [
+                    {"on": "click", "rect": back_rect, "button": "left", "to": "menu"},
+                    {"on": "key", "key": "f1", "to": "loading"},
+                ],
+            },
+            "menu": {"frames": ["frames/menu.png"], "transitions": [{"on": "key", "key": "esc", "to": "main"}]},
+            "loading": {
+                "frames": ["frames/loading_0.png", "frames/loading_1.png"],
+                "transitions": [{"after_captures": 2, "to": "main"}],
+            },
+        },
+    }
+    with open(os.path.join(directory, "replay.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def _create_manager(resolution: Tuple[int, int]) -> DeviceManager:
+    """按 Auto 的方式（默认配置）构建无窗口依赖的设备管理器"""
+    logger = create_bench_logger("ReplayValidation")
+    processor = create_image_processor(client_res=resolution, logger=logger)
+    return DeviceManager(
+        logger=logger,
+        image_processor=processor,
+        coord_transformer=processor.coord_transformer,
+        display_context=processor.display_context,
+        stop_event=Event(),
+        config=AutoConfig(),
+    )
+
+
+def _run_script(device) -> List[Tuple]:
+    """执行固定输入序列，返回每一步后的（动作, 状态, 检查结果）"""
+    steps = [("连接", device.current_state, device.exists(BACK_TEMPLATE) is not None)]
+    device.click((1800, 1000), coord_type="BASE")
+    steps.append(("点击空白", device.current_state, None))
+    device.click(BACK_TEMPLATE)
+    steps.append(("点击模板", device.current_state, device.exists(MENU_TEMPLATE) is not None))
+    device.key_press("ESC")
+    steps.append(("按键ESC", device.current_state, device.exists(BACK_TEMPLATE) is not None))
+    device.key_press("f1")
+    states = [device.current_state]
+    for _ in range(3):
+        device.capture_screen()
+        states.append(device.current_state)
+    steps.append(("截图转换", tuple(states), None))
+    return steps
+
+
+def run(resolution: Tuple[int, int] = (1920, 1080)) -> Dict:
+    """
+    执行验证
+
+    Args:
+        resolution: 合成画面分辨率（宽, 高）
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "stats": 回放统计}
+    """
+    checks: List[Dict] = []
+    workdir = tempfile.mkdtemp(prefix="replay_validation_")
+    try:
+        recording_dir = os.path.join(workdir, "demo")
+        build_recording(recording_dir, resolution)
+        zip_path = os.path.join(workdir, "demo.zip")
+        with zipfile.ZipFile(zip_path, "w") as archive:
+            for root, _, files in os.walk(recording_dir):
+                for name in files:
+                    full = os.path.join(root, name)
+                    archive.write(full, os.path.relpath(full, recording_dir).replace(os.sep, "/"))
+
+        manager = _create_manager(resolution)
+        uri = f"replay://{recording_dir}"
+        connected = manager.add_device(uri)
+        device = manager.get_device(uri)
+        ctx = manager.display_context
+        _check(
+            checks,
+            "连接",
+            connected and device is not None and ctx.client_physical_res == resolution and device.frame_cache_ttl == 0,
+            f"连接: {connected} | 物理分辨率: {ctx.client_physical_res} | "
+            f"帧缓存: {device.frame_cache_ttl if device else None}秒（配置{manager.config.FRAME_CACHE_MS}毫秒）",
+        )
+        if not connected:
+            return {"checks": checks, "stats": {}}
+
+        steps = _run_script(device)
+        _check(checks, "模板检查", steps[0][2] and steps[2][2] and steps[3][2], f"{steps}")
+        _check(
+            checks,
+            "点击转换",
+            steps[1][1] == "main" and steps[2][1] == "menu",
+            f"点击空白后: {steps[1][1]} | 点击模板后: {steps[2][1]}",
+        )
+        _check(checks, "按键转换", steps[3][1] == "main", f"按键ESC后: {steps[3][1]}")
+        _check(
+            checks,
+            "截图转换",
+            steps[4][1] == ("loading", "loading", "loading", "main"),
+            f"按F1后逐次截图的状态: {steps[4][1]}",
+        )
+        log = device.get_input_log()
+        transitions = [(entry["type"], entry["from"], entry["to"]) for entry in log]
+        _check(
+            checks,
+            "输入日志",
+            transitions
+            == [
+                ("click", "main", "main"),
+                ("click", "main", "menu"),
+                ("key", "menu", "main"),
+                ("key", "main", "loading"),
+            ],
+            f"{transitions}",
+        )
+        stats = device.get_replay_stats()
+
+        device.connect()
+        _run_script(device)
+        _check(checks, "确定性", device.get_input_log() == log, f"两次运行输入事件数: {len(log)}")
+
+        zip_manager = _create_manager(resolution)
+        zip_uri = f"replay://{zip_path}"
+        zip_steps = _run_script(zip_manager.get_device(zip_uri)) if zip_manager.add_device(zip_uri) else None
+        _check(checks, "zip归档", zip_steps == steps, f"zip回放步骤: {zip_steps}")
+
+        missing = _create_manager(resolution).add_device(f"replay://{os.path.join(workdir, 'missing')}")
+        bad_start = _create_manager(resolution).add_device(f"replay://{recording_dir}?start=unknown")
+        _check(
+            checks, "错误处理", not missing and not bad_start, f"录制不存在: {missing} | 初始状态不存在: {bad_start}"
+        )
+        return {"checks": checks, "stats": stats}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="回放设备验证")
+    parser.add_argument("--resolution", default="1920x1080", help="合成画面分辨率，格式WxH")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    report = run((width, height))
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    print(json.dumps(report["stats"], ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
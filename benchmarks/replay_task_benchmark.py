@@ -0,0 +1,110 @@
+"""回放任务基准：在回放设备上运行 src/auto_tasks/tasks 中的真实任务函数，统计耗时与输入序列
+
+用法：
+    python -m benchmarks.replay_task_benchmark --recording <录制目录或zip> --task get_email [--repeat 3] [--param timeout=60] [--real-clock]
+
+每次运行重新连接回放设备（回到初始状态），输出任务结果、耗时、截图次数、输入事件数与结束状态；
+默认使用虚拟时钟（等待快进，输出快进的秒数），--real-clock 使用系统时钟，用于对比快进前后的耗时；
+多次运行的输入序列不一致时给出提示（回放确定时应完全一致）。需要完整运行环境（OCR引擎），无需win32/游戏窗口。
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from src.auto_control.core.auto import Auto
+from src.auto_control.utils.clock import SYSTEM_CLOCK
+from src.core.task_loader import load_task_modules
+
+
+def _parse_params(items: List[str]) -> Dict[str, Any]:
+    """解析 key=value 形式的任务参数（值按JSON解析，失败时作为字符串）"""
+    params = {}
+    for item in items:
+        key, _, value = item.partition("=")
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
+
+
+def run(recording: str, task: str, repeat: int = 1, params: Dict[str, Any] = None, real_clock: bool = False) -> Dict:
+    """
+    在回放设备上重复运行任务
+
+    Args:
+        recording: 录制路径（目录或zip，相对路径按当前目录/录制目录解析）
+        task: 任务模块名（与任务函数同名）
+        repeat: 运行次数
+        params: 任务函数参数（不含auto）
+        real_clock: 是否使用系统时钟（默认回放设备使用虚拟时钟）
+
+    Returns:
+        Dict: {"runs": 每次运行的结果与统计, "elapsed_p50": 耗时中位数（秒）, "deterministic": 输入序列是否一致}
+    """
+    tasks = load_task_modules()
+    if task not in tasks:
+        raise ValueError(f"任务不存在: {task}（可用: {', '.join(sorted(tasks))}）")
+    task_func = tasks[task]["function"]
+    device_uri = f"replay://{recording}"
+
+    auto = Auto(device_uri=device_uri, clock=SYSTEM_CLOCK if real_clock else None)
+    runs, input_logs = [], []
+    try:
+        for _ in range(repeat):
+            if auto.running:
+                auto.stop()
+            auto.set_should_stop(False)
+            start_result = auto.start()
+            if not start_result.success:
+                raise RuntimeError(f"回放设备启动失败: {start_result.error_msg}")
+            device = auto.device_manager.get_device(device_uri)
+
+            start = time.perf_counter()
+            result = task_func(auto, **(params or {}))
+            elapsed = time.perf_counter() - start
+
+            input_log = device.get_input_log()
+            input_logs.append(
+                [(e["type"], e.get("point") or e.get("key") or e.get("text"), e["to"]) for e in input_log]
+            )
+            skipped = auto.clock.get_stats()["skipped_s"] if auto.clock.is_virtual else 0.0
+            runs.append(
+                {
+                    "result": bool(result),
+                    "elapsed_s": round(elapsed, 3),
+                    "skipped_s": skipped,
+                    **device.get_replay_stats(),
+                }
+            )
+    finally:
+        if auto.running:
+            auto.stop()
+
+    return {
+        "runs": runs,
+        "elapsed_p50": round(statistics.median(r["elapsed_s"] for r in runs), 3),
+        "deterministic": all(log == input_logs[0] for log in input_logs),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="回放任务基准")
+    parser.add_argument("--recording", required=True, help="录制目录或zip归档")
+    parser.add_argument("--task", required=True, help="任务模块名，如 get_email")
+    parser.add_argument("--repeat", type=int, default=1, help="运行次数")
+    parser.add_argument("--param", action="append", default=[], help="任务参数，格式key=value，可重复")
+    parser.add_argument("--real-clock", action="store_true", help="使用系统时钟（不快进等待）")
+    args = parser.parse_args()
+
+    report = run(args.recording, args.task, args.repeat, _parse_params(args.param), args.real_clock)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if not report["deterministic"]:
+        print("警告：多次运行的输入序列不一致，回放结果依赖计时（如wait_for超时），需检查录制的状态转换")
+
+
+if __name__ == "__main__":
+    main()
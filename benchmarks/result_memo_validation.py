@@ -0,0 +1,176 @@
+"""识别结果记忆化验证：用合成画面验证ROI级脏区域判断与严格模式，并对比命中/未命中耗时
+
+用法：
+    python -m benchmarks.result_memo_validation [--resolution 1920x1080] [--repeat 20]
+
+验证项：
+    静态画面     同一画面重复匹配命中缓存，结果与首次一致
+    ROI外变化    ROI外的画面变化不影响命中
+    ROI内变化    ROI内的画面变化（模板移动/消失）不命中，返回新结果
+    细微变化     计数数字、勾选标记、按钮高亮等小范围变化（整图与ROI内）都不命中
+    OCR指纹      OCR使用的校验和指纹（checksum=True）在整图单个像素变化时也会改变，画面不变时保持一致
+    严格模式     一系列变化画面上严格模式校验无不一致
+耗时对比：完整匹配（关闭记忆化）与命中缓存（含区域指纹计算）的单次耗时中位数。存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import types
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.common import create_image_processor, render_screen
+from src.auto_control.image.result_memo import region_fingerprint
+
+TEMPLATE = "public/返回键2"
+ROI = (120, 20, 100, 66)
+INSIDE_POS = (130, 25)
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+def _small_changes(screen: np.ndarray) -> Dict[str, Tuple[np.ndarray, Tuple[int, int, int, int]]]:
+    """生成小范围变化的画面：{名称: (画面, 识别ROI（None表示整图）)}"""
+    digit_before = screen.copy()
+    cv2.putText(digit_before, "3/5", (1500, 900), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    digit_after = screen.copy()
+    cv2.putText(digit_after, "4/5", (1500, 900), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    checkmark = digit_before.copy()
+    cv2.polylines(checkmark, [np.array([[1200, 300], [1204, 305], [1212, 294]])], False, (0, 255, 0), 2)
+    highlight = digit_before.copy()
+    highlight[700:724, 400:460] = cv2.add(highlight[700:724, 400:460], (10, 10, 10, 0))
+    roi_pixel = screen.copy()
+    x, y = ROI[0] + ROI[2] - 4, ROI[1] + ROI[3] - 4
+    roi_pixel[y : y + 2, x : x + 2] = 255 - roi_pixel[y : y + 2, x : x + 2]
+    return {
+        "整图基准": (digit_before, None),
+        "计数数字": (digit_after, None),
+        "勾选标记": (checkmark, None),
+        "按钮高亮": (highlight, None),
+        "ROI内2x2像素": (roi_pixel, ROI),
+    }
+
+
+def _median_ms(func, repeat: int) -> float:
+    """重复调用并返回耗时中位数（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def run(resolution: Tuple[int, int] = (1920, 1080), repeat: int = 20) -> Dict:
+    """
+    执行验证与耗时对比
+
+    Args:
+        resolution: 合成画面分辨率（宽, 高）
+        repeat: 计时重复次数
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "latency_ms": 完整匹配/命中缓存的耗时中位数, "stats": 记忆化统计}
+    """
+    checks: List[Dict] = []
+    config = types.SimpleNamespace(USE_SPATIAL_PRIORS=False)
+    processor = create_image_processor(client_res=resolution, config=config)
+    memo = processor.result_memo
+    screen = render_screen(processor, TEMPLATE, base_pos=INSIDE_POS, seed=1)
+
+    first = processor.match_template(screen, TEMPLATE, roi=ROI)
+    second = processor.match_template(screen.copy(), TEMPLATE, roi=ROI)
+    _check(checks, "静态画面", memo.hits == 1 and first == second and first is not None, f"结果: {first}")
+
+    outside = screen.copy()
+    outside[600:900, 600:1200] = 255 - outside[600:900, 600:1200]
+    hits_before = memo.hits
+    result = processor.match_template(outside, TEMPLATE, roi=ROI)
+    _check(checks, "ROI外变化", memo.hits == hits_before + 1 and result == first, f"结果: {result}")
+
+    misses_before = memo.misses
+    moved = render_screen(processor, TEMPLATE, base_pos=(INSIDE_POS[0] + 12, INSIDE_POS[1] + 8), seed=1)
+    moved_result = processor.match_template(moved, TEMPLATE, roi=ROI)
+    absent = render_screen(processor, TEMPLATE, base_pos=(900, 500), seed=1)
+    absent_result = processor.match_template(absent, TEMPLATE, roi=ROI)
+    _check(
+        checks,
+        "ROI内变化",
+        memo.misses == misses_before + 2 and moved_result not in (None, first) and absent_result is None,
+        f"移动后: {moved_result} | 消失后: {absent_result}",
+    )
+
+    changes = _small_changes(screen)
+    processor.match_template(screen, TEMPLATE, roi=None)
+    missed = {}
+    for name, (image, roi) in changes.items():
+        misses_before = memo.misses
+        processor.match_template(image, TEMPLATE, roi=roi)
+        missed[name] = memo.misses == misses_before + 1
+    _check(checks, "细微变化", all(missed.values()), f"未命中: {missed}")
+
+    digit_before, digit_after = changes["整图基准"][0], changes["计数数字"][0]
+    one_pixel = digit_before.copy()
+    one_pixel[901, 1503, 0] ^= 1
+    base_key = region_fingerprint(digit_before, checksum=True)
+    ocr_changed = {
+        "计数数字": region_fingerprint(digit_after, checksum=True) != base_key,
+        "单个像素": region_fingerprint(one_pixel, checksum=True) != base_key,
+    }
+    stable = region_fingerprint(digit_before.copy(), checksum=True) == base_key
+    _check(checks, "OCR指纹", stable and all(ocr_changed.values()), f"画面不变一致: {stable} | 指纹变化: {ocr_changed}")
+
+    strict_processor = create_image_processor(
+        client_res=resolution, config=types.SimpleNamespace(USE_SPATIAL_PRIORS=False, RESULT_MEMO_STRICT=True)
+    )
+    for seed in range(4):
+        for dx in (0, 3, 6):
+            frame = render_screen(strict_processor, TEMPLATE, base_pos=(INSIDE_POS[0] + dx, INSIDE_POS[1]), seed=seed)
+            for _ in range(2):
+                strict_processor.match_template(frame, TEMPLATE, roi=ROI)
+                strict_processor.match_templates(frame, [TEMPLATE, "public/返回键1"], roi=ROI)
+    strict_stats = strict_processor.result_memo.get_stats()
+    _check(
+        checks,
+        "严格模式",
+        strict_stats["strict_checks"] > 0 and strict_stats["strict_mismatches"] == 0,
+        f"校验{strict_stats['strict_checks']}次，不一致{strict_stats['strict_mismatches']}次",
+    )
+
+    uncached = create_image_processor(
+        client_res=resolution, config=types.SimpleNamespace(USE_SPATIAL_PRIORS=False, USE_RESULT_MEMO=False)
+    )
+    latency = {}
+    for name, roi in (("roi", ROI), ("full", None)):
+        latency[f"{name}_match"] = _median_ms(lambda: uncached.match_template(screen, TEMPLATE, roi=roi), repeat)
+        processor.match_template(screen, TEMPLATE, roi=roi)
+        latency[f"{name}_memo_hit"] = _median_ms(lambda: processor.match_template(screen, TEMPLATE, roi=roi), repeat)
+    return {"checks": checks, "latency_ms": latency, "stats": memo.get_stats()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="识别结果记忆化验证")
+    parser.add_argument("--resolution", default="1920x1080", help="合成画面分辨率，格式WxH")
+    parser.add_argument("--repeat", type=int, default=20, help="计时重复次数")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    report = run((width, height), args.repeat)
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    print(json.dumps(report["latency_ms"], ensure_ascii=False))
+    print(json.dumps(report["stats"], ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
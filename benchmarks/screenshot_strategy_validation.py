@@ -0,0 +1,189 @@
+"""截图策略记录验证：在临时目录下验证 ScreenshotStrategyStore 的键生成、版本校验、原子保存与失效重检（无需win32）
+
+用法：
+    python -m benchmarks.screenshot_strategy_validation
+
+验证项：
+    键生成       按窗口类名/进程名/显示上下文（分辨率、DPI）/截图模式生成键，进程名不区分大小写，
+                 background以外的截图模式视为foreground
+    复用         新实例从文件加载记录，有效性检查通过时复用且不执行完整检测，命中次数落盘
+    失效重检     有效性检查失败时删除记录并执行一次完整检测，写入新记录
+    版本校验     旧版本/损坏的记录文件被丢弃，从空记录开始
+    原子保存     保存后不残留临时文件；写入失败时保留原文件内容
+    并发写入     多线程同时写入/保存均成功，文件仍可解析且包含全部记录
+存在验证失败时以非零状态码退出。
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Dict, List
+
+from benchmarks.common import create_bench_logger, create_display_context
+from src.auto_control.devices.screenshot_strategy_store import (
+    STRATEGY_STORE_VERSION,
+    ScreenshotStrategyStore,
+    context_strategy_key,
+)
+
+WINDOW_CLASS = "UnityWndClass"
+EXE_NAME = "BrownDust2.exe"
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+def _detected(best_method: str = "printwindow") -> Dict:
+    """模拟一次完整检测的结果"""
+    return {
+        "best_method": best_method,
+        "available_methods": [best_method, "bitblt"],
+        "mode": "background",
+        "timings_ms": {best_method: 12.0, "bitblt": 8.0},
+        "similarity": {best_method: 0.99, "bitblt": 0.97},
+    }
+
+
+def run() -> Dict:
+    """
+    执行验证
+
+    Returns:
+        Dict: {"checks": 各验证项结果}
+    """
+    checks: List[Dict] = []
+    logger = create_bench_logger("ScreenshotStrategyValidation")
+    workdir = tempfile.mkdtemp(prefix="screenshot_strategy_validation_")
+    try:
+        path = os.path.join(workdir, "screenshot_strategy.json")
+
+        ctx = create_display_context((1920, 1080), 1.0)
+        key = context_strategy_key(WINDOW_CLASS, EXE_NAME, ctx, "background")
+        variants = {
+            "分辨率": context_strategy_key(
+                WINDOW_CLASS, EXE_NAME, create_display_context((2560, 1440), 1.0), "background"
+            ),
+            "DPI": context_strategy_key(
+                WINDOW_CLASS, EXE_NAME, create_display_context((1920, 1080), 1.5), "background"
+            ),
+            "截图模式": context_strategy_key(WINDOW_CLASS, EXE_NAME, ctx, "foreground"),
+            "窗口类名": context_strategy_key("OtherClass", EXE_NAME, ctx, "background"),
+        }
+        same = context_strategy_key(
+            WINDOW_CLASS, EXE_NAME.upper(), create_display_context((1920, 1080), 1.0), "background"
+        )
+        foreground_modes = {
+            context_strategy_key(WINDOW_CLASS, EXE_NAME, ctx, mode) for mode in (None, "bitblt", "dxcam")
+        }
+        _check(
+            checks,
+            "键生成",
+            same == key
+            and len(set(variants.values()) | {key}) == len(variants) + 1
+            and foreground_modes == {variants["截图模式"]},
+            f"键: {key} | 进程名大小写一致: {same == key} | foreground模式键: {sorted(foreground_modes)}",
+        )
+
+        ScreenshotStrategyStore(path, logger=logger).put(key, _detected())
+        store = ScreenshotStrategyStore(path, logger=logger)
+        detect_calls = []
+        entry, reused = store.resolve(
+            key, verify=lambda stored: True, detect=lambda: detect_calls.append(1) or _detected("dxcam")
+        )
+        hits = ScreenshotStrategyStore(path, logger=logger).get(key)["hits"]
+        _check(
+            checks,
+            "复用",
+            reused and entry["best_method"] == "printwindow" and not detect_calls and hits == 1,
+            f"复用: {reused} | 最优方法: {entry['best_method']} | 完整检测次数: {len(detect_calls)} | 落盘命中次数: {hits}",
+        )
+
+        verified = []
+        entry, reused = store.resolve(
+            key,
+            verify=lambda stored: verified.append(stored["best_method"]) or False,
+            detect=lambda: detect_calls.append(1) or _detected("dxcam"),
+        )
+        reloaded = ScreenshotStrategyStore(path, logger=logger).get(key)
+        _check(
+            checks,
+            "失效重检",
+            not reused
+            and verified == ["printwindow"]
+            and len(detect_calls) == 1
+            and reloaded["best_method"] == "dxcam"
+            and reloaded["hits"] == 0
+            and "detect_ms" in reloaded,
+            f"检查的记录: {verified} | 完整检测次数: {len(detect_calls)} | 新记录: {reloaded['best_method']}",
+        )
+
+        old_path = os.path.join(workdir, "old.json")
+        with open(old_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STRATEGY_STORE_VERSION - 1, "entries": {key: _detected()}}, f)
+        corrupt_path = os.path.join(workdir, "corrupt.json")
+        with open(corrupt_path, "w", encoding="utf-8") as f:
+            f.write('{"version": ')
+        old_entry = ScreenshotStrategyStore(old_path, logger=logger).get(key)
+        corrupt_entry = ScreenshotStrategyStore(corrupt_path, logger=logger).get(key)
+        _check(
+            checks,
+            "版本校验",
+            old_entry is None and corrupt_entry is None,
+            f"旧版本记录: {old_entry} | 损坏文件记录: {corrupt_entry}",
+        )
+
+        with open(path, "r", encoding="utf-8") as f:
+            before = f.read()
+        no_tmp = not os.path.exists(f"{path}.tmp")
+        os.makedirs(f"{path}.tmp")
+        store.put(variants["DPI"], _detected("bitblt"))
+        with open(path, "r", encoding="utf-8") as f:
+            after = f.read()
+        shutil.rmtree(f"{path}.tmp")
+        saved = store.save()
+        _check(
+            checks,
+            "原子保存",
+            no_tmp and before == after and saved and not os.path.exists(f"{path}.tmp"),
+            f"无残留临时文件: {no_tmp} | 写入失败时原文件不变: {before == after} | 恢复后保存: {saved}",
+        )
+
+        concurrent_path = os.path.join(workdir, "concurrent.json")
+        concurrent = ScreenshotStrategyStore(concurrent_path, logger=logger)
+        threads = [
+            threading.Thread(target=concurrent.put, args=(f"{WINDOW_CLASS}|{idx}", _detected())) for idx in range(16)
+        ]
+        saved_results: List[bool] = []
+        threads += [threading.Thread(target=lambda: saved_results.append(concurrent.save())) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(concurrent_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)["entries"]
+        _check(
+            checks,
+            "并发写入",
+            len(entries) == 16 and all(saved_results),
+            f"记录数: {len(entries)}/16 | 保存成功: {sum(saved_results)}/{len(saved_results)}",
+        )
+        return {"checks": checks}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    report = run()
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""会话录制基准：用合成帧序列验证录制归档逐像素还原、按时间定位与异常退出恢复，并统计截图线程开销与归档大小
+
+用法：
+    python -m benchmarks.session_recorder_benchmark [--resolution 1920x1080] [--frames 200] [--interval 0.03]
+
+合成序列模拟常见画面：大部分帧只有计数器/小动画变化，每隔一段时间切换场景（整屏变化），穿插ROI截图与输入事件。
+验证项：
+    逐像素还原   读取的每一帧与录制时完全一致（整帧与ROI画布）
+    时间定位     按每帧时间戳二分查找返回该帧
+    输入事件     事件数量、顺序与时间范围查询一致
+    异常恢复     截断索引与末条记录后，顺序扫描重建索引，已完整写入的帧仍可读取
+统计：record_frame 单次耗时（截图线程开销）p50/p95/最大值、编码平均耗时、归档大小与原始/逐帧PNG大小之比、随机读取耗时。
+存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.common import create_image_processor, render_screen
+from src.auto_control.devices.session_recorder import SessionReader, SessionRecorder
+
+TEMPLATE = "public/返回键2"
+SCENE_LENGTH = 60  # 每个场景的帧数（场景切换时整屏变化）
+ROI_EVERY = 7  # 每隔多少帧穿插一次ROI截图
+EVENT_EVERY = 10  # 每隔多少帧录制一次输入事件
+ROI_REGION = (100, 20, 200, 100)
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+class SyntheticSequence:
+    """确定性合成帧序列（可按序号重新生成，用于逐像素比对）"""
+
+    def __init__(self, resolution: Tuple[int, int]):
+        self.processor = create_image_processor(client_res=resolution)
+        self.resolution = resolution
+        self._scene: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def frame(self, index: int) -> np.ndarray:
+        """第index帧：场景背景 + 帧计数器 + 移动的小方块"""
+        scene = index // SCENE_LENGTH
+        if self._scene[0] != scene:
+            base = render_screen(self.processor, TEMPLATE, base_pos=(130 + scene * 40, 25), seed=scene)
+            self._scene = (scene, base)
+        frame = self._scene[1].copy()
+        w, h = self.resolution
+        cv2.putText(frame, f"{index:05d}", (w - 260, h - 40), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        x = (index * 17) % (w - 60)
+        cv2.rectangle(frame, (x, h // 2), (x + 40, h // 2 + 40), (0, 0, 255), -1)
+        return frame
+
+    def roi(self, index: int) -> np.ndarray:
+        """第index帧的ROI截图（裁剪区域）"""
+        x, y, w, h = ROI_REGION
+        return self.frame(index)[y : y + h, x : x + w].copy()
+
+
+def _record(
+    path: str, sequence: SyntheticSequence, frames: int, keyframe_interval: int, interval: float
+) -> Tuple[List, Dict]:
+    """
+    录制合成序列（按截图间隔投递帧，模拟任务轮询）
+
+    Returns:
+        Tuple: (录制清单[(类型, 帧序号)], 录制统计与record_frame耗时)
+    """
+    recorder = SessionRecorder(path, keyframe_interval=keyframe_interval, metadata={"source": "benchmark"}).start()
+    manifest, timings = [], []
+    for index in range(frames):
+        image = sequence.frame(index)
+        start = time.perf_counter()
+        recorder.record_frame(image)
+        timings.append((time.perf_counter() - start) * 1000)
+        manifest.append(("frame", index))
+        if index % ROI_EVERY == 0:
+            recorder.record_frame(sequence.roi(index), region=ROI_REGION, full_size=sequence.resolution)
+            manifest.append(("roi", index))
+        if index % EVENT_EVERY == 0:
+            recorder.record_event("click", pos=[index, index], button="left")
+        time.sleep(interval)
+    stats = recorder.close()
+    stats["record_frame_ms"] = {
+        "p50": round(statistics.median(timings), 3),
+        "p95": round(sorted(timings)[int(len(timings) * 0.95) - 1], 3),
+        "max": round(max(timings), 3),
+    }
+    return manifest, stats
+
+
+def _verify_frames(reader: SessionReader, sequence: SyntheticSequence, manifest: List, count: int) -> List[int]:
+    """逐像素比对前count帧，返回不一致的帧序号"""
+    mismatched = []
+    for i in range(count):
+        _, image, _ = reader.read_frame(i)
+        kind, index = manifest[i]
+        if kind == "roi":
+            expected = np.zeros_like(image)
+            x, y, w, h = ROI_REGION
+            expected[y : y + h, x : x + w] = sequence.roi(index)
+        else:
+            expected = sequence.frame(index)
+        if image.shape != expected.shape or not np.array_equal(image, expected):
+            mismatched.append(i)
+    return mismatched
+
+
+def run(
+    resolution: Tuple[int, int] = (1920, 1080), frames: int = 200, keyframe_interval: int = 100, interval: float = 0.03
+) -> Dict:
+    """
+    执行验证与统计
+
+    Args:
+        resolution: 合成画面分辨率（宽, 高）
+        frames: 整帧数
+        keyframe_interval: 关键帧间隔
+        interval: 模拟的截图间隔（秒）
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "stats": 录制统计, "sizes": 大小对比, "read_ms": 随机读取耗时}
+    """
+    checks: List[Dict] = []
+    sequence = SyntheticSequence(resolution)
+    workdir = tempfile.mkdtemp(prefix="session_benchmark_")
+    try:
+        path = os.path.join(workdir, "session.bdsr")
+        manifest, stats = _record(path, sequence, frames, keyframe_interval, interval)
+
+        with SessionReader(path) as reader:
+            mismatched = _verify_frames(reader, sequence, manifest, reader.frame_count)
+            _check(
+                checks,
+                "逐像素还原",
+                reader.frame_count == len(manifest) and not mismatched,
+                f"帧数: {reader.frame_count}/{len(manifest)} | 不一致: {mismatched[:10]}",
+            )
+
+            times = [reader.frame_time(i) for i in range(reader.frame_count)]
+            wrong_seek = [i for i, t in enumerate(times) if reader.find_frame(t) != i]
+            _check(checks, "时间定位", not wrong_seek, f"定位错误: {wrong_seek[:10]}")
+
+            events = reader.events()
+            expected_events = len(range(0, frames, EVENT_EVERY))
+            mid = reader.duration / 2
+            first_half = reader.events(0.0, mid)
+            _check(
+                checks,
+                "输入事件",
+                len(events) == expected_events
+                and [e["pos"][0] for e in events] == list(range(0, frames, EVENT_EVERY))
+                and all(e["time"] <= mid for e in first_half)
+                and 0 < len(first_half) < len(events),
+                f"事件数: {len(events)}/{expected_events} | 前半段: {len(first_half)}",
+            )
+
+            rng = random.Random(0)
+            read_ms = []
+            for _ in range(50):
+                index = rng.randrange(reader.frame_count)
+                start = time.perf_counter()
+                reader.frame_at(reader.frame_time(index))
+                read_ms.append((time.perf_counter() - start) * 1000)
+
+        truncated = os.path.join(workdir, "truncated.bdsr")
+        with open(path, "rb") as src, open(truncated, "wb") as dst:
+            data = src.read()
+            dst.write(data[: int(len(data) * 0.6)])
+        with SessionReader(truncated) as reader:
+            mismatched = _verify_frames(reader, sequence, manifest, reader.frame_count)
+            _check(
+                checks,
+                "异常恢复",
+                reader.recovered and 0 < reader.frame_count < len(manifest) and not mismatched,
+                f"重建索引: {reader.recovered} | 可读帧数: {reader.frame_count}/{len(manifest)} | 不一致: {mismatched[:10]}",
+            )
+
+        sample = [sequence.frame(i) for i in range(0, frames, max(1, frames // 10))]
+        png_per_frame = statistics.mean(
+            len(cv2.imencode(".png", f, [cv2.IMWRITE_PNG_COMPRESSION, 1])[1]) for f in sample
+        )
+        sizes = {
+            "archive_mb": round(stats["archive_bytes"] / 1e6, 2),
+            "raw_mb": round(stats["raw_bytes"] / 1e6, 2),
+            "png_per_frame_mb": round(png_per_frame * frames / 1e6, 2),
+        }
+        read = {"p50": round(statistics.median(read_ms), 3), "max": round(max(read_ms), 3)}
+        return {"checks": checks, "stats": stats, "sizes": sizes, "read_ms": read}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="会话录制基准")
+    parser.add_argument("--resolution", default="1920x1080", help="合成画面分辨率，格式WxH")
+    parser.add_argument("--frames", type=int, default=200, help="整帧数")
+    parser.add_argument("--keyframe-interval", type=int, default=100, help="关键帧间隔")
+    parser.add_argument("--interval", type=float, default=0.03, help="模拟的截图间隔（秒）")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    report = run((width, height), args.frames, args.keyframe_interval, args.interval)
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    for key in ("stats", "sizes", "read_ms"):
+        print(json.dumps({key: report[key]}, ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+"""合成游戏画面生成器：用内置模板与ROI配置组合场景并输出真值，供视觉流水线的准确率与压力测试使用
+
+用法：
+    python -m benchmarks.synthetic_screens [--count 1000] [--resolutions 1920x1080,1280x720] [--dpi-scales 1.0,1.25]
+        [--noise 0,4,8] [--jpeg 0,75,90] [--distractors 2] [--workers 4] [--font simhei.ttf] [--output DIR]
+
+场景组成（每帧由 seed+序号 决定，可复现、可并行生成）：
+    背景      低频随机背景 + 若干半透明面板
+    模板      内置模板按显示比例缩放后贴入；任务脚本中与ROI配对使用的模板（如 "public/主界面" ↔ main_menu）
+              贴在 rois.json 对应区域内，其余随机放置，互不重叠
+    文本      任务脚本中的识别文本（text_click/wait_text/verify目标）用中文字体绘制，同样优先放入配对的ROI；
+              中文字体不可用时只绘制ASCII文本，保证真值可被识别
+    干扰项    其他模板遮挡一半并交换颜色通道后贴入，匹配阈值下不应命中
+    画质      高斯噪声、JPEG压缩（按参数列表轮换），分辨率/DPI按参数列表轮换
+真值与 ImageProcessor/OCRProcessor 的返回值同一坐标系：rect 为客户区逻辑矩形，base_rect 为1920x1080基准矩形，
+physical_rect 为画面中的实际像素矩形；模板/文本的 roi 为配对ROI名称（基准坐标在 roi_rect 中），未配对为None。
+输出目录（默认 runtime/<env>/benchmarks/synthetic_<时间戳>/）包含逐帧图片与 ground_truth.json。
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from benchmarks.common import BASE_RESOLUTION, create_bench_logger, create_image_processor
+from src.auto_tasks.utils.roi_config import roi_config
+from src.core.path_manager import path_manager
+
+DEFAULT_FONT = "simhei.ttf"  # 与调试图标注使用的中文字体一致
+# 任务脚本中"名称 ... get_roi("roi名")"同一行出现的配对（模板名含"/"，否则为识别文本；中间只允许出现字典键）
+ANCHOR_PATTERN = re.compile(r'"([^"\n]+)"(?!\s*:)(?:[^"\n]|"[A-Za-z_]+"\s*:){0,80}?get_roi\("([A-Za-z0-9_]+)"')
+TEXT_PATTERN = re.compile(r'(?:text_click|wait_text)\(\s*"([^"\n]+)"|"target":\s*"([^"/\n]+)"')
+# 游戏界面常见的数值/状态文本（中文字体不可用时仍可生成文本真值）
+EXTRA_LABELS = ("MAX", "3/5", "x10", "Lv.30", "100%", "AUTO")
+TEXT_SIZES = (22, 28, 34, 40)  # 文本字号（基准像素）
+PLACE_TRIES = 20  # 单个元素放置的最大尝试次数（避免重叠）
+
+
+def _parse_list(value: str, cast=float) -> List:
+    """解析逗号分隔的参数列表"""
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_resolutions(value: str) -> List[Tuple[int, int]]:
+    """解析 WxH,WxH 格式的分辨率列表"""
+    return [tuple(int(v) for v in item.lower().split("x")) for item in value.split(",") if item.strip()]
+
+
+def _overlaps(rect: Tuple[int, int, int, int], occupied: List[Tuple[int, int, int, int]], margin: int = 4) -> bool:
+    """判断矩形与已占用矩形是否重叠（含间距）"""
+    x, y, w, h = rect
+    for ox, oy, ow, oh in occupied:
+        if x < ox + ow + margin and ox < x + w + margin and y < oy + oh + margin and oy < y + h + margin:
+            return True
+    return False
+
+
+def scan_anchors(template_names: Sequence[str]) -> Tuple[Dict[str, Tuple], Dict[str, Tuple], List[str]]:
+    """
+    扫描任务脚本，提取模板/文本与ROI的配对及识别文本词表
+
+    Args:
+        template_names: 可用的模板名称
+
+    Returns:
+        Tuple: (模板配对{模板名: (roi名, 基准ROI)}, 文本配对{文本: (roi名, 基准ROI)}, 识别文本词表)
+    """
+    templates, texts, vocabulary = {}, {}, set()
+    available = set(template_names)
+    for path in sorted(glob.glob(os.path.join(path_manager.get("task_path"), "*.py"))):
+        task_name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        for name, roi_name in ANCHOR_PATTERN.findall(source):
+            roi = roi_config.get_roi(roi_name, task_name=task_name)
+            if not roi:
+                continue
+            if "/" in name:
+                if name in available:
+                    templates.setdefault(name, (roi_name, tuple(roi)))
+            else:
+                texts.setdefault(name, (roi_name, tuple(roi)))
+        for match in TEXT_PATTERN.findall(source):
+            text = (match[0] or match[1]).strip()
+            if text:
+                vocabulary.add(text)
+    vocabulary.update(texts)
+    return templates, texts, sorted(vocabulary)
+
+
+class _Variant:
+    """单个分辨率/DPI组合：显示上下文、缩放后的模板缓存"""
+
+    def __init__(self, resolution: Tuple[int, int], dpi_scale: float, logger):
+        self.resolution = resolution
+        self.dpi_scale = dpi_scale
+        self.processor = create_image_processor(client_res=resolution, dpi_scale=dpi_scale, logger=logger)
+        self.ratio = self.processor.display_context.content_scale_ratio
+        self._scaled: Dict[str, Optional[np.ndarray]] = {}
+
+    def scaled_template(self, name: str) -> Optional[np.ndarray]:
+        """按显示比例缩放的模板（缓存）"""
+        if name not in self._scaled:
+            template = self.processor.get_template(name)
+            if template is not None:
+                tw = max(1, int(round(template.shape[1] * self.ratio)))
+                th = max(1, int(round(template.shape[0] * self.ratio)))
+                interp = cv2.INTER_AREA if self.ratio < 1 else cv2.INTER_CUBIC
+                template = np.ascontiguousarray(cv2.resize(template, (tw, th), interpolation=interp)[:, :, :3])
+            self._scaled[name] = template
+        return self._scaled[name]
+
+    def to_rect(self, physical: Tuple[int, int, int, int]) -> Dict[str, List[int]]:
+        """实际像素矩形 → 真值矩形（基准/逻辑/物理）"""
+        x, y, w, h = physical
+        base = [
+            int(round(x / self.ratio)),
+            int(round(y / self.ratio)),
+            int(round(w / self.ratio)),
+            int(round(h / self.ratio)),
+        ]
+        base[2], base[3] = max(1, base[2]), max(1, base[3])
+        rect = self.processor.coord_transformer.convert_original_rect_to_current_client(tuple(base))
+        return {"base_rect": base, "rect": list(rect), "physical_rect": [x, y, w, h]}
+
+
+class SyntheticScreenGenerator:
+    """合成画面生成器（线程安全：每帧使用独立随机源，缓存只写入确定的值）"""
+
+    def __init__(
+        self,
+        resolutions: Sequence[Tuple[int, int]] = (BASE_RESOLUTION,),
+        dpi_scales: Sequence[float] = (1.0,),
+        noise_levels: Sequence[float] = (0.0,),
+        jpeg_qualities: Sequence[int] = (0,),
+        templates_per_frame: Tuple[int, int] = (3, 6),
+        texts_per_frame: Tuple[int, int] = (2, 4),
+        distractors: int = 2,
+        font_path: str = DEFAULT_FONT,
+        seed: int = 0,
+        logger=None,
+    ):
+        """
+        Args:
+            resolutions: 客户区物理分辨率列表（逐帧轮换）
+            dpi_scales: DPI缩放因子列表（与分辨率组合后逐帧轮换）
+            noise_levels: 高斯噪声标准差列表（逐帧随机选取，0表示无噪声）
+            jpeg_qualities: JPEG压缩质量列表（逐帧随机选取，0表示不压缩）
+            templates_per_frame: 每帧模板数范围（闭区间）
+            texts_per_frame: 每帧文本数范围（闭区间）
+            distractors: 每帧干扰项数量
+            font_path: 中文字体文件路径（不可用时使用默认字体，仅绘制ASCII文本）
+            seed: 随机种子
+            logger: 日志实例，默认使用基准测试日志器
+        """
+        self.logger = logger or create_bench_logger("SyntheticScreens")
+        self.variants = [_Variant(res, dpi, self.logger) for res in resolutions for dpi in dpi_scales]
+        self.noise_levels = list(noise_levels)
+        self.jpeg_qualities = list(jpeg_qualities)
+        self.templates_per_frame = templates_per_frame
+        self.texts_per_frame = texts_per_frame
+        self.distractors = distractors
+        self.seed = seed
+
+        self.template_names = sorted(self.variants[0].processor.all_template_paths)
+        self.template_anchors, self.text_anchors, vocabulary = scan_anchors(self.template_names)
+
+        self.font_path = font_path
+        self.cjk_font = True
+        try:
+            ImageFont.truetype(font_path, TEXT_SIZES[0])
+        except (FileNotFoundError, OSError):
+            self.cjk_font = False
+            self.logger.warning(f"中文字体文件'{font_path}'未找到，使用默认字体，仅生成ASCII文本")
+        labels = list(vocabulary) + [label for label in EXTRA_LABELS if label not in vocabulary]
+        self.labels = labels if self.cjk_font else [label for label in labels if label.isascii()]
+        self._fonts: Dict[int, ImageFont.ImageFont] = {}
+        self._text_masks: Dict[Tuple[str, int], np.ndarray] = {}
+        self._noise: Dict[Tuple[int, float], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def meta(self) -> Dict:
+        """生成参数（写入真值文件）"""
+        return {
+            "seed": self.seed,
+            "variants": [{"resolution": list(v.resolution), "dpi_scale": v.dpi_scale} for v in self.variants],
+            "noise_levels": self.noise_levels,
+            "jpeg_qualities": self.jpeg_qualities,
+            "distractors": self.distractors,
+            "font": self.font_path if self.cjk_font else "default",
+            "cjk_font": self.cjk_font,
+            "templates": len(self.template_names),
+            "labels": self.labels,
+            "template_anchors": {k: v[0] for k, v in self.template_anchors.items()},
+            "text_anchors": {k: v[0] for k, v in self.text_anchors.items()},
+        }
+
+    # ======================== 绘制元素 ========================
+    def _font(self, size: int):
+        font = self._fonts.get(size)
+        if font is None:
+            try:
+                font = ImageFont.truetype(self.font_path, size)
+            except (FileNotFoundError, OSError):
+                font = ImageFont.load_default(size=size)
+            self._fonts[size] = font
+        return font
+
+    def _text_mask(self, text: str, size: int) -> np.ndarray:
+        """文本的alpha蒙版（0~1，按文本与字号缓存）"""
+        key = (text, size)
+        mask = self._text_masks.get(key)
+        if mask is None:
+            font = self._font(size)
+            left, top, right, bottom = font.getbbox(text)
+            canvas = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+            ImageDraw.Draw(canvas).text((-left, -top), text, font=font, fill=255)
+            mask = np.asarray(canvas, dtype=np.float32)[:, :, None] / 255.0
+            self._text_masks[key] = mask
+        return mask
+
+    def _noise_fields(self, variant: _Variant, sigma: float) -> Tuple[np.ndarray, np.ndarray]:
+        """噪声场（正/负两部分，uint8饱和加减；比画面大64像素，按随机偏移切片复用）"""
+        key = (id(variant), sigma)
+        fields = self._noise.get(key)
+        if fields is None:
+            w, h = variant.resolution
+            noise = np.random.default_rng(self.seed).normal(0, sigma, size=(h + 64, w + 64, 3))
+            fields = (np.clip(noise, 0, 255).astype(np.uint8), np.clip(-noise, 0, 255).astype(np.uint8))
+            self._noise[key] = fields
+        return fields
+
+    @staticmethod
+    def _background(rng: np.random.Generator, size: Tuple[int, int]) -> np.ndarray:
+        """低频随机背景 + 半透明面板"""
+        w, h = size
+        small = rng.integers(0, 256, size=(h // 40 + 1, w // 40 + 1, 3), dtype=np.uint8)
+        screen = cv2.resize(small, (w, h), interpolation=cv2.INTER_CUBIC)
+        for _ in range(int(rng.integers(1, 4))):
+            pw, ph = int(rng.integers(w // 8, w // 3)), int(rng.integers(h // 8, h // 3))
+            px, py = int(rng.integers(0, w - pw)), int(rng.integers(0, h - ph))
+            panel = screen[py : py + ph, px : px + pw]
+            cv2.addWeighted(panel, 0.4, np.full_like(panel, int(rng.integers(20, 60))), 0.6, 0, dst=panel)
+        return screen
+
+    @staticmethod
+    def _position(
+        rng: np.random.Generator,
+        size: Tuple[int, int],
+        screen: Tuple[int, int],
+        occupied: List[Tuple[int, int, int, int]],
+        area: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """在区域内（默认整屏）随机选取不重叠的位置，区域小于元素时以区域中心为准"""
+        w, h = size
+        sw, sh = screen
+        if w > sw or h > sh:
+            return None
+        ax, ay, aw, ah = area or (0, 0, sw, sh)
+        for _ in range(PLACE_TRIES if area is None else 3):
+            x = ax + int(rng.integers(0, aw - w + 1)) if aw >= w else ax + (aw - w) // 2
+            y = ay + int(rng.integers(0, ah - h + 1)) if ah >= h else ay + (ah - h) // 2
+            x, y = min(max(0, x), sw - w), min(max(0, y), sh - h)
+            if not _overlaps((x, y, w, h), occupied):
+                return x, y, w, h
+        return None
+
+    def _roi_area(self, variant: _Variant, roi: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """基准ROI → 画面像素区域"""
+        return tuple(int(round(v * variant.ratio)) for v in roi)
+
+    # ======================== 生成 ========================
+    def generate(self, index: int) -> Tuple[np.ndarray, Dict]:
+        """
+        生成第index帧
+
+        Args:
+            index: 帧序号（与seed共同决定画面内容）
+
+        Returns:
+            Tuple[np.ndarray, Dict]: (画面BGR图像, 该帧真值)
+        """
+        rng = np.random.default_rng((self.seed, index))
+        variant = self.variants[index % len(self.variants)]
+        size = variant.resolution
+        screen = self._background(rng, size)
+        occupied: List[Tuple[int, int, int, int]] = []
+        truth = {
+            "index": index,
+            "resolution": list(size),
+            "dpi_scale": variant.dpi_scale,
+            "templates": [],
+            "texts": [],
+            "distractors": [],
+        }
+
+        # 1. 模板：配对模板优先放入对应ROI
+        count = int(rng.integers(self.templates_per_frame[0], self.templates_per_frame[1] + 1))
+        chosen = [self.template_names[i] for i in rng.permutation(len(self.template_names))[:count]]
+        for name in chosen:
+            template = variant.scaled_template(name)
+            if template is None:
+                continue
+            anchor = self.template_anchors.get(name)
+            area = self._roi_area(variant, anchor[1]) if anchor else None
+            rect = self._position(rng, template.shape[1::-1], size, occupied, area)
+            if rect is None and anchor:
+                anchor, rect = None, self._position(rng, template.shape[1::-1], size, occupied)
+            if rect is None:
+                continue
+            x, y, w, h = rect
+            screen[y : y + h, x : x + w] = template
+            occupied.append(rect)
+            truth["templates"].append(
+                {
+                    "name": name,
+                    "roi": anchor[0] if anchor else None,
+                    "roi_rect": list(anchor[1]) if anchor else None,
+                    **variant.to_rect(rect),
+                }
+            )
+
+        # 2. 文本：带底板的文字标签
+        count = int(rng.integers(self.texts_per_frame[0], self.texts_per_frame[1] + 1)) if self.labels else 0
+        for label_idx in rng.permutation(len(self.labels))[:count]:
+            text = self.labels[label_idx]
+            font_size = max(8, int(round(TEXT_SIZES[int(rng.integers(0, len(TEXT_SIZES)))] * variant.ratio)))
+            mask = self._text_mask(text, font_size)
+            pad = max(2, font_size // 4)
+            box = (mask.shape[1] + pad * 2, mask.shape[0] + pad * 2)
+            anchor = self.text_anchors.get(text)
+            area = self._roi_area(variant, anchor[1]) if anchor else None
+            rect = self._position(rng, box, size, occupied, area)
+            if rect is None and anchor:
+                anchor, rect = None, self._position(rng, box, size, occupied)
+            if rect is None:
+                continue
+            x, y, w, h = rect
+            plate = int(rng.integers(0, 70))
+            screen[y : y + h, x : x + w] = plate
+            tx, ty = x + pad, y + pad
+            region = screen[ty : ty + mask.shape[0], tx : tx + mask.shape[1]]
+            color = np.array([int(rng.integers(200, 256)) for _ in range(3)], dtype=np.float32)
+            region[:] = (region * (1.0 - mask) + color * mask).astype(np.uint8)
+            occupied.append(rect)
+            truth["texts"].append(
+                {
+                    "text": text,
+                    "font_size": font_size,
+                    "roi": anchor[0] if anchor else None,
+                    "roi_rect": list(anchor[1]) if anchor else None,
+                    **variant.to_rect((tx, ty, mask.shape[1], mask.shape[0])),
+                }
+            )
+
+        # 3. 干扰项：未使用的模板遮挡一半并交换颜色通道
+        placed = {item["name"] for item in truth["templates"]}
+        candidates = [n for n in self.template_names if n not in placed]
+        for cand_idx in rng.permutation(len(candidates))[: self.distractors]:
+            name = candidates[cand_idx]
+            template = variant.scaled_template(name)
+            if template is None or min(template.shape[:2]) < 8:
+                continue
+            rect = self._position(rng, template.shape[1::-1], size, occupied)
+            if rect is None:
+                continue
+            x, y, w, h = rect
+            target = screen[y : y + h, x : x + w]
+            altered = template[:, :, [1, 2, 0]]
+            if rng.integers(0, 2):
+                target[:, : w // 2] = altered[:, : w // 2]
+            else:
+                target[: h // 2] = altered[: h // 2]
+            occupied.append(rect)
+            truth["distractors"].append({"source": name, "transform": "half+channel", **variant.to_rect(rect)})
+
+        # 4. 画质：噪声与JPEG压缩
+        sigma = float(self.noise_levels[int(rng.integers(0, len(self.noise_levels)))]) if self.noise_levels else 0.0
+        if sigma > 0:
+            positive, negative = self._noise_fields(variant, sigma)
+            ox, oy = int(rng.integers(0, 64)), int(rng.integers(0, 64))
+            h, w = screen.shape[:2]
+            cv2.add(screen, positive[oy : oy + h, ox : ox + w], dst=screen)
+            cv2.subtract(screen, negative[oy : oy + h, ox : ox + w], dst=screen)
+        quality = int(self.jpeg_qualities[int(rng.integers(0, len(self.jpeg_qualities)))]) if self.jpeg_qualities else 0
+        if quality > 0:
+            _, encoded = cv2.imencode(".jpg", screen, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            screen = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+        truth["noise_sigma"] = sigma
+        truth["jpeg_quality"] = quality or None
+        return screen, truth
+
+    def iter_frames(self, count: int, start: int = 0, workers: int = 1) -> Iterator[Tuple[np.ndarray, Dict]]:
+        """
+        按序号顺序生成多帧（workers>1时多线程并行生成，输出顺序不变）
+
+        Args:
+            count: 帧数
+            start: 起始序号
+            workers: 生成线程数
+
+        Yields:
+            Tuple[np.ndarray, Dict]: (画面, 真值)
+        """
+        indices = range(start, start + count)
+        if workers <= 1:
+            for index in indices:
+                yield self.generate(index)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SyntheticScreens") as pool:
+            yield from pool.map(self.generate, indices)
+
+
+def export(
+    generator: SyntheticScreenGenerator, output: str, count: int, workers: int = 1, image_format: str = "png"
+) -> Dict:
+    """
+    生成并写出数据集（逐帧图片 + ground_truth.json）
+
+    Args:
+        generator: 生成器
+        output: 输出目录
+        count: 帧数
+        workers: 生成/编码线程数
+        image_format: 图片格式（png 无损保存已含噪声/JPEG伪影的画面，jpg 更小）
+
+    Returns:
+        Dict: 统计（帧数、耗时、每分钟帧数）
+    """
+    os.makedirs(output, exist_ok=True)
+    params = [cv2.IMWRITE_PNG_COMPRESSION, 1] if image_format == "png" else [cv2.IMWRITE_JPEG_QUALITY, 95]
+
+    def produce(index: int) -> Dict:
+        image, truth = generator.generate(index)
+        truth["file"] = f"frame_{index:06d}.{image_format}"
+        cv2.imwrite(os.path.join(output, truth["file"]), image, params)
+        return truth
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="SyntheticExport") as pool:
+            frames = list(pool.map(produce, range(count)))
+    else:
+        frames = [produce(index) for index in range(count)]
+    elapsed = time.perf_counter() - start
+
+    with open(os.path.join(output, "ground_truth.json"), "w", encoding="utf-8") as f:
+        json.dump({"meta": generator.meta, "frames": frames}, f, ensure_ascii=False)
+    return {
+        "frames": count,
+        "elapsed_s": round(elapsed, 2),
+        "frames_per_min": round(count / elapsed * 60) if elapsed else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="合成游戏画面生成器")
+    parser.add_argument("--count", type=int, default=1000, help="帧数")
+    parser.add_argument("--resolutions", default="1920x1080,1280x720", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--dpi-scales", default="1.0,1.25", help="DPI缩放因子列表")
+    parser.add_argument("--noise", default="0,4,8", help="高斯噪声标准差列表")
+    parser.add_argument("--jpeg", default="0,75,90", help="JPEG压缩质量列表（0表示不压缩）")
+    parser.add_argument("--distractors", type=int, default=2, help="每帧干扰项数量")
+    parser.add_argument("--workers", type=int, default=4, help="生成线程数")
+    parser.add_argument("--font", default=DEFAULT_FONT, help="中文字体文件路径")
+    parser.add_argument("--format", default="png", choices=("png", "jpg"), help="图片格式")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default=None, help="输出目录")
+    args = parser.parse_args()
+
+    generator = SyntheticScreenGenerator(
+        resolutions=_parse_resolutions(args.resolutions),
+        dpi_scales=_parse_list(args.dpi_scales),
+        noise_levels=_parse_list(args.noise),
+        jpeg_qualities=_parse_list(args.jpeg, int),
+        distractors=args.distractors,
+        font_path=args.font,
+        seed=args.seed,
+    )
+    output = args.output or os.path.join(
+        path_manager.dynamic_base, "benchmarks", f"synthetic_{datetime.datetime.now():%Y%m%d_%H%M%S}"
+    )
+    stats = export(generator, output, args.count, args.workers, args.format)
+    print(json.dumps(stats, ensure_ascii=False))
+    print(f"数据集已写入: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""文本场景索引验证：用随机文本行构建 TextScene，与逐行扫描的结果对比精确/子串/相似/区域查询，并统计查询耗时
+
+用法：
+    python -m benchmarks.text_scene_validation [--lines 200] [--queries 2000] [--seed 0]
+
+不依赖OCR引擎。验证项：
+    精确匹配   find_exact 与逐行比较规范化文本的结果一致
+    子串匹配   find_substring 与逐行子串判断的结果一致
+    相似匹配   find_fuzzy 与逐行计算 difflib 相似度的结果一致
+    区域查询   query_region（网格索引）与逐行判断中心点的结果一致，带区域的查询只返回区域内文本行
+    覆盖判断   整图场景覆盖任意区域，ROI场景只覆盖其内部区域
+存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import difflib
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+
+from src.auto_control.ocr.text_scene import TextScene, normalize_text
+
+ALPHABET = "每日任务领取奖励通行证竞技场商店确定取消返回ABC123"
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+def _random_lines(rng: random.Random, count: int, width: int = 1920, height: int = 1080) -> List[Dict]:
+    """生成随机文本行（含空格与重复文本）"""
+    lines = []
+    for _ in range(count):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 6)))
+        if rng.random() < 0.2:
+            pos = rng.randint(1, len(text) - 1)
+            text = f"{text[:pos]} {text[pos:]}"
+        w, h = rng.randint(40, 300), rng.randint(20, 40)
+        x, y = rng.randint(0, width - w), rng.randint(0, height - h)
+        lines.append({"text": text, "bbox": (x, y, w, h), "bbox_orig_phys": (x, y, w, h), "confidence": rng.random()})
+    return lines
+
+
+def _inside(line: Dict, region) -> bool:
+    x, y, w, h = line["bbox_orig_phys"]
+    rx, ry, rw, rh = region
+    cx, cy = x + w // 2, y + h // 2
+    return rx <= cx < rx + rw and ry <= cy < ry + rh
+
+
+def run(lines: int = 200, queries: int = 2000, seed: int = 0) -> Dict:
+    """
+    执行验证
+
+    Args:
+        lines: 场景文本行数
+        queries: 查询次数
+        seed: 随机种子
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "stats": 构建与查询耗时}
+    """
+    rng = random.Random(seed)
+    checks: List[Dict] = []
+    data = _random_lines(rng, lines)
+
+    start = time.perf_counter()
+    scene = TextScene(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    targets = [
+        rng.choice(data)["text"] if rng.random() < 0.5 else "".join(rng.sample(ALPHABET, 2)) for _ in range(queries)
+    ]
+    regions = []
+    for _ in range(queries):
+        w, h = rng.randint(50, 800), rng.randint(50, 500)
+        regions.append((rng.randint(0, 1920 - w), rng.randint(0, 1080 - h), w, h))
+
+    exact_ok = substring_ok = region_ok = scoped_ok = True
+    index_s = scan_s = 0.0
+    for target, region in zip(targets, regions):
+        norm = normalize_text(target)
+        t0 = time.perf_counter()
+        exact = scene.find_exact(target)
+        substring = scene.find_substring(target)
+        in_region = scene.query_region(region)
+        scoped, _ = scene.find(target, region=region)
+        t1 = time.perf_counter()
+        expected_exact = [line for line in data if normalize_text(line["text"]) == norm]
+        expected_substring = [
+            line for line in data if norm != normalize_text(line["text"]) and norm in normalize_text(line["text"])
+        ]
+        expected_region = [line for line in data if _inside(line, region)]
+        t2 = time.perf_counter()
+        index_s += t1 - t0
+        scan_s += t2 - t1
+        exact_ok &= exact == expected_exact
+        substring_ok &= substring == expected_substring
+        region_ok &= in_region == expected_region
+        scoped_ok &= all(_inside(line, region) for line in scoped)
+
+    _check(checks, "精确匹配", exact_ok, f"查询次数: {queries}")
+    _check(checks, "子串匹配", substring_ok, f"查询次数: {queries}")
+    _check(checks, "区域查询", region_ok and scoped_ok, f"区域内查询结果均在区域内: {scoped_ok}")
+
+    fuzzy_ok = True
+    for target in targets[:200]:
+        norm = normalize_text(target)
+        expected = sorted(
+            (
+                (line, round(ratio, 4))
+                for line in data
+                for ratio in [difflib.SequenceMatcher(None, normalize_text(line["text"]), norm, autojunk=False).ratio()]
+                if ratio >= 0.6
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        fuzzy_ok &= [score for _, score in scene.find_fuzzy(target, 0.6)] == [score for _, score in expected]
+    _check(checks, "相似匹配", fuzzy_ok, "阈值: 0.6")
+
+    roi_scene = TextScene([], region_phys=(100, 100, 400, 300))
+    _check(
+        checks,
+        "覆盖判断",
+        scene.covers((0, 0, 10, 10))
+        and roi_scene.covers((150, 150, 100, 100))
+        and not roi_scene.covers((50, 150, 100, 100))
+        and not roi_scene.covers(None),
+        "整图场景覆盖任意区域，ROI场景只覆盖内部区域",
+    )
+
+    stats = {
+        "lines": lines,
+        "queries": queries,
+        "build_ms": round(build_ms, 3),
+        "index_query_us": round(index_s / queries * 1e6, 2),
+        "scan_query_us": round(scan_s / queries * 1e6, 2),
+    }
+    return {"checks": checks, "stats": stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="文本场景索引验证")
+    parser.add_argument("--lines", type=int, default=200, help="场景文本行数")
+    parser.add_argument("--queries", type=int, default=2000, help="查询次数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    report = run(args.lines, args.queries, args.seed)
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    print(json.dumps(report["stats"], ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""虚拟时钟验证：在回放设备上对比系统时钟与虚拟时钟下核心层的等待/超时语义，并统计快进后的真实耗时
+
+用法：
+    python -m benchmarks.virtual_clock_validation [--resolution 1920x1080] [--timeout 20]
+
+按 Auto 的组装方式（默认 AutoConfig）连接设备/操作/验证处理器（不初始化OCR引擎），设备为 benchmarks.replay_device_validation 生成的合成录制。
+验证项：
+    延迟快进       DelayManager 延迟立即返回，虚拟时间推进延迟时长
+    等待超时       wait_element 等待不存在的模板，虚拟耗时落在[超时, 超时+轮询间隔+检查延迟]内，真实耗时远小于超时
+    等待成功       wait_element 等待存在的模板立即成功
+    轮询一致       同一短超时下，系统时钟与虚拟时钟的条件检查次数一致（±1）
+    步骤链总超时   步骤链在虚拟时间达到总超时时失败
+    剩余超时       calculate_remaining_timeout 按虚拟时间计算剩余时长
+    中断           stop_event 置位时虚拟等待立即返回中断
+    截图转换等待   默认配置（帧缓存开启）下按F1后等待 after_captures 转换回的画面，在超时内成功
+    帧缓存过期     帧缓存新鲜度按设备时钟计算，虚拟等待后缓存帧过期、未等待时复用
+    时钟选择       Auto 启动时对非实时设备选择虚拟时钟，注入的时钟优先，并同步到设备
+存在验证失败时以非零状态码退出。
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from threading import Event
+from typing import Dict, List, Tuple
+
+from benchmarks.common import create_bench_logger, create_image_processor
+from benchmarks.replay_device_validation import BACK_TEMPLATE, MENU_TEMPLATE, build_recording
+from src.auto_control.core.auto import Auto
+from src.auto_control.core.auto_base import AutoConfig
+from src.auto_control.core.auto_chain import ChainManager
+from src.auto_control.core.auto_devices import DeviceHandler
+from src.auto_control.core.auto_operations import OperationHandler
+from src.auto_control.core.auto_utils import DelayManager
+from src.auto_control.core.auto_verify import VerifyHandler
+from src.auto_control.devices.device_manager import DeviceManager
+from src.auto_control.devices.replay_device import ReplayDevice
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock, VirtualClock
+from src.auto_tasks.tasks.public import calculate_remaining_timeout
+
+
+def _check(results: List[Dict], name: str, passed: bool, detail: str = "") -> None:
+    """记录一项验证结果"""
+    results.append({"check": name, "passed": bool(passed), "detail": detail})
+
+
+class _ReplayHost:
+    """按 Auto 的方式组装核心处理器（不含OCR），只暴露计时相关验证用到的接口"""
+
+    def __init__(self, recording_dir: str, resolution: Tuple[int, int], clock: Clock):
+        logger = create_bench_logger("VirtualClockValidation")
+        processor = create_image_processor(client_res=resolution, logger=logger)
+        self.config = AutoConfig()
+        self.logger = logger
+        self.stop_event = Event()
+        self.clock = clock
+        self.image_processor = processor
+        self.ocr_processor = None
+        self.coord_transformer = processor.coord_transformer
+        self.display_context = processor.display_context
+        self.device_manager = DeviceManager(
+            logger=logger,
+            image_processor=processor,
+            coord_transformer=processor.coord_transformer,
+            display_context=processor.display_context,
+            stop_event=self.stop_event,
+            config=self.config,
+        )
+        self.device_manager.set_clock(clock)
+        self.default_device_uri = f"replay://{recording_dir}"
+        self._clock_override = None
+        if not self.device_manager.add_device(self.default_device_uri):
+            raise RuntimeError(f"回放设备连接失败: {self.default_device_uri}")
+        self.device_handler = DeviceHandler(self, self.config)
+        self.operation_handler = OperationHandler(self, self.config)
+        self.verify_handler = VerifyHandler(self, self.config)
+
+    def check_should_stop(self) -> bool:
+        return self.stop_event.is_set()
+
+    def begin_debug_capture(self) -> None:
+        pass
+
+    def end_debug_capture(self, failed: bool) -> None:
+        pass
+
+    def sleep(self, secs: float = 1.0):
+        return self.operation_handler.sleep(secs)
+
+    def verify(self, *args, **kwargs):
+        return self.verify_handler.verify(*args, **kwargs)
+
+    def chain(self) -> ChainManager:
+        return ChainManager(self)
+
+
+def _timed_wait(host: _ReplayHost, template: str, timeout: float) -> Dict:
+    """执行一次 wait_element 并统计条件检查次数、虚拟/真实耗时"""
+    device = host.device_manager.get_active_device()
+    captures_before = device.captures
+    real_start = time.perf_counter()
+    result = host.verify_handler.wait_element(template, wait_timeout=timeout)
+    return {
+        "success": result.success,
+        "elapsed": result.elapsed_time,
+        "real_s": time.perf_counter() - real_start,
+        "checks": device.captures - captures_before,
+    }
+
+
+def run(resolution: Tuple[int, int] = (1920, 1080), timeout: float = 20.0) -> Dict:
+    """
+    执行验证
+
+    Args:
+        resolution: 合成画面分辨率（宽, 高）
+        timeout: 虚拟时钟下等待超时验证使用的超时（秒）
+
+    Returns:
+        Dict: {"checks": 各验证项结果, "stats": 耗时与快进统计}
+    """
+    checks: List[Dict] = []
+    workdir = tempfile.mkdtemp(prefix="virtual_clock_validation_")
+    try:
+        recording_dir = os.path.join(workdir, "demo")
+        build_recording(recording_dir, resolution)
+        clock = VirtualClock()
+        host = _ReplayHost(recording_dir, resolution, clock)
+        config = host.config
+
+        start, real_start = clock.time(), time.perf_counter()
+        delay = DelayManager.apply_delay(30, host.stop_event, clock=clock)
+        advanced, real = clock.time() - start, time.perf_counter() - real_start
+        _check(
+            checks,
+            "延迟快进",
+            delay.success and 30 <= advanced < 30.5 and real < 0.5,
+            f"虚拟推进: {advanced:.2f}秒 | 真实耗时: {real * 1000:.1f}毫秒",
+        )
+
+        missing = _timed_wait(host, MENU_TEMPLATE, timeout)
+        upper = timeout + 0.5 + config.CHECK_ELEMENT_DELAY + 1.0
+        _check(
+            checks,
+            "等待超时",
+            not missing["success"] and timeout <= missing["elapsed"] <= upper and missing["real_s"] < timeout / 4,
+            f"虚拟耗时: {missing['elapsed']:.2f}秒（上限{upper:.2f}） | 真实耗时: {missing['real_s']:.2f}秒 | 检查次数: {missing['checks']}",
+        )
+
+        found = _timed_wait(host, BACK_TEMPLATE, timeout)
+        _check(
+            checks, "等待成功", found["success"], f"虚拟耗时: {found['elapsed']:.2f}秒 | 检查次数: {found['checks']}"
+        )
+
+        short = 2.0
+        real_host = _ReplayHost(recording_dir, resolution, SYSTEM_CLOCK)
+        system_wait = _timed_wait(real_host, MENU_TEMPLATE, short)
+        virtual_wait = _timed_wait(host, MENU_TEMPLATE, short)
+        _check(
+            checks,
+            "轮询一致",
+            abs(system_wait["checks"] - virtual_wait["checks"]) <= 1,
+            f"{short}秒超时检查次数 系统: {system_wait['checks']} | 虚拟: {virtual_wait['checks']}",
+        )
+
+        device = host.device_manager.get_active_device()
+        device.key_press("f1")
+        loading = _timed_wait(host, BACK_TEMPLATE, 5.0)
+        _check(
+            checks,
+            "截图转换等待",
+            loading["success"] and loading["elapsed"] < 5.0 and device.current_state == "main",
+            f"虚拟耗时: {loading['elapsed']:.2f}秒 | 检查次数: {loading['checks']} | 状态: {device.current_state}",
+        )
+
+        cached_device = ReplayDevice(
+            device_uri=host.default_device_uri,
+            logger=host.logger,
+            image_processor=host.image_processor,
+            coord_transformer=host.coord_transformer,
+            display_context=host.display_context,
+            stop_event=host.stop_event,
+            frame_cache_ms=config.FRAME_CACHE_MS,
+        )
+        cached_device.use_clock(clock)
+        cached_device.connect()
+        cached_device.capture_screen()
+        cached_device.capture_screen()
+        reused = cached_device.captures
+        clock.sleep(0.5)
+        cached_device.capture_screen()
+        expired = cached_device.captures - reused
+        cached_device.disconnect()
+        _check(
+            checks,
+            "帧缓存过期",
+            reused == 1 and expired == 1,
+            f"新鲜度窗口: {config.FRAME_CACHE_MS}毫秒 | 连续两次截图实际截图: {reused} | 虚拟等待后重新截图: {expired}",
+        )
+
+        chain = host.chain()
+        chain.set_total_timeout(15)
+        for _ in range(3):
+            chain.then().custom_step(lambda: host.sleep(10).success, timeout=60)
+        chain_start = clock.time()
+        chain_result = chain.execute()
+        chain_elapsed = clock.time() - chain_start
+        _check(
+            checks,
+            "步骤链总超时",
+            not chain_result.success and "总超时" in chain_result.error_msg and 15 <= chain_elapsed < 25,
+            f"结果: {chain_result.error_msg} | 虚拟耗时: {chain_elapsed:.2f}秒",
+        )
+
+        task_start = clock.time()
+        host.sleep(25)
+        remaining = calculate_remaining_timeout(60, task_start, clock)
+        _check(checks, "剩余超时", remaining == 35, f"60秒超时、快进25秒后剩余: {remaining}秒")
+
+        host.stop_event.set()
+        interrupted = DelayManager.apply_delay(5, host.stop_event, clock=clock)
+        host.stop_event.clear()
+        _check(checks, "中断", interrupted.is_interrupted, f"{interrupted.error_msg}")
+
+        host.config = dataclasses.replace(host.config, VIRTUAL_CLOCK=True)
+        Auto._select_clock(host)
+        auto_selected = host.clock
+        injected = VirtualClock()
+        host._clock_override = injected
+        Auto._select_clock(host)
+        synced = host.device_manager.get_active_device().clock is injected
+        _check(
+            checks,
+            "时钟选择",
+            isinstance(auto_selected, VirtualClock) and host.clock is injected and synced,
+            f"回放设备: {type(auto_selected).__name__} | 注入优先: {host.clock is injected} | 设备同步: {synced}",
+        )
+
+        stats = {
+            "wait_timeout_s": timeout,
+            "wait_virtual_s": round(missing["elapsed"], 3),
+            "wait_real_s": round(missing["real_s"], 3),
+            **clock.get_stats(),
+        }
+        return {"checks": checks, "stats": stats}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="虚拟时钟验证")
+    parser.add_argument("--resolution", default="1920x1080", help="合成画面分辨率，格式WxH")
+    parser.add_argument("--timeout", type=float, default=20.0, help="等待超时验证使用的超时（秒）")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    report = run((width, height), args.timeout)
+    for item in report["checks"]:
+        print(f"{'通过' if item['passed'] else '失败'} | {item['check']} | {item['detail']}")
+    print(json.dumps(report["stats"], ensure_ascii=False))
+    if not all(item["passed"] for item in report["checks"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
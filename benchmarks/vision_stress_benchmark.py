@@ -0,0 +1,236 @@
+"""视觉流水线压力基准：用合成画面生成器批量生成带真值的画面，统计 ImageProcessor/OCRProcessor 的吞吐、耗时与准确率
+
+用法：
+    python -m benchmarks.vision_stress_benchmark [--frames 300] [--resolutions 1920x1080,1280x720] [--dpi-scales 1.0,1.25]
+        [--noise 0,4,8] [--jpeg 0,75,90] [--workers 4] [--ocr] [--font simhei.ttf] [--output PATH]
+
+流程：
+    生成吞吐   只生成不识别，统计每分钟帧数（多线程）
+    模板匹配   对每帧真值中的模板调用 match_template（配对ROI的模板在该ROI内匹配，其余全图），IoU≥0.5视为命中；
+               干扰项（遮挡+换色的模板）在其周围区域匹配源模板，命中干扰项视为误检
+    文字识别   指定 --ocr 且OCR引擎可用时，对每帧真值文本调用 find_text_position（配对ROI或文本周围区域），IoU≥0.3视为命中
+结果记忆化与位置先验关闭，耗时为单次识别的真实开销。结果写入JSON（默认 runtime/<env>/benchmarks/vision_stress_<时间戳>.json）。
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import time
+import types
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import BASE_RESOLUTION, create_bench_logger, create_image_processor
+from benchmarks.match_benchmark import _iou, _parse_list, _parse_resolutions, _percentile
+from benchmarks.synthetic_screens import DEFAULT_FONT, SyntheticScreenGenerator
+from src.core.path_manager import path_manager
+
+THRESHOLD = 0.8
+HIT_IOU = 0.5
+TEXT_HIT_IOU = 0.3
+DISTRACTOR_IOU = 0.3
+SEARCH_MARGIN = 30  # 未配对ROI的文本/干扰项：真值矩形四周扩展的搜索区域（基准像素）
+
+
+def _around(base_rect: List[int], margin: int = SEARCH_MARGIN) -> Tuple[int, int, int, int]:
+    """基准矩形四周扩展后的搜索区域（限制在基准分辨率内）"""
+    x, y, w, h = base_rect
+    x0, y0 = max(0, x - margin), max(0, y - margin)
+    x1, y1 = min(BASE_RESOLUTION[0], x + w + margin), min(BASE_RESOLUTION[1], y + h + margin)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def _summary(latencies: List[float], hits: int, total: int) -> Dict:
+    """耗时分位数与命中率汇总"""
+    return {
+        "count": total,
+        "p50_ms": round(statistics.median(latencies), 3) if latencies else 0.0,
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def _create_ocr(engine: str, logger, use_memo: bool = False) -> Tuple[Optional[object], str]:
+    """创建OCR处理器（默认关闭记忆化），引擎不可用时返回原因"""
+    try:
+        from src.auto_control.ocr.ocr_processor import OCRProcessor
+
+        ocr_processor = create_image_processor(logger=logger)
+        ocr = OCRProcessor(
+            engine=engine,
+            logger=logger,
+            coord_transformer=ocr_processor.coord_transformer,
+            display_context=ocr_processor.display_context,
+            config=types.SimpleNamespace(USE_RESULT_MEMO=use_memo),
+        )
+        return ocr, ""
+    except Exception as e:
+        return None, f"OCR引擎不可用: {e}"
+
+
+def _apply_variant(ocr, resolution: Tuple[int, int], dpi_scale: float) -> None:
+    """按帧的分辨率/DPI更新OCR处理器共享的显示上下文（与运行中窗口尺寸变化一致）"""
+    phys_w, phys_h = resolution
+    ocr.display_context.update_from_window(
+        is_fullscreen=False,
+        dpi_scale=dpi_scale,
+        client_logical=(int(round(phys_w / dpi_scale)), int(round(phys_h / dpi_scale))),
+        client_physical=(phys_w, phys_h),
+        screen_physical=(phys_w, phys_h),
+        client_origin=(0, 0),
+    )
+
+
+def run(
+    frames: int = 300,
+    resolutions: List[Tuple[int, int]] = (BASE_RESOLUTION,),
+    dpi_scales: List[float] = (1.0,),
+    noise_levels: List[float] = (0.0,),
+    jpeg_qualities: List[int] = (0,),
+    workers: int = 4,
+    use_ocr: bool = False,
+    ocr_engine: str = "easyocr",
+    font_path: str = DEFAULT_FONT,
+    seed: int = 0,
+) -> Dict:
+    """
+    执行压力基准
+
+    Args:
+        frames: 帧数
+        resolutions: 客户区物理分辨率列表
+        dpi_scales: DPI缩放因子列表
+        noise_levels: 高斯噪声标准差列表
+        jpeg_qualities: JPEG压缩质量列表（0表示不压缩）
+        workers: 生成线程数
+        use_ocr: 是否测试文字识别
+        ocr_engine: OCR引擎类型
+        font_path: 中文字体文件路径
+        seed: 随机种子
+
+    Returns:
+        Dict: {"meta": 运行参数, "generation": 生成吞吐, "templates"/"distractors"/"ocr": 各项汇总, "variants": 按分辨率/DPI的模板命中率}
+    """
+    logger = create_bench_logger("VisionStress")
+    generator = SyntheticScreenGenerator(
+        resolutions=resolutions,
+        dpi_scales=dpi_scales,
+        noise_levels=noise_levels,
+        jpeg_qualities=jpeg_qualities,
+        font_path=font_path,
+        seed=seed,
+        logger=logger,
+    )
+
+    # 1. 生成吞吐（只生成不识别）
+    start = time.perf_counter()
+    for _ in generator.iter_frames(frames, workers=workers):
+        pass
+    gen_elapsed = time.perf_counter() - start
+
+    # 2. 模板匹配 / 文字识别
+    config = types.SimpleNamespace(USE_SPATIAL_PRIORS=False, USE_RESULT_MEMO=False)
+    processors = {
+        (tuple(v.resolution), v.dpi_scale): create_image_processor(v.resolution, v.dpi_scale, logger, config)
+        for v in generator.variants
+    }
+    ocr, ocr_skipped = _create_ocr(ocr_engine, logger) if use_ocr else (None, "未启用（--ocr）")
+
+    match_ms, match_hits, variant_hits = [], 0, {}
+    distractor_total, distractor_fp = 0, 0
+    ocr_ms, ocr_hits, ocr_total = [], 0, 0
+    for image, truth in generator.iter_frames(frames, workers=workers):
+        key = (tuple(truth["resolution"]), truth["dpi_scale"])
+        processor = processors[key]
+        stats = variant_hits.setdefault(f"{key[0][0]}x{key[0][1]}@{key[1]}", [0, 0])
+
+        for item in truth["templates"]:
+            roi = tuple(item["roi_rect"]) if item["roi_rect"] else None
+            t0 = time.perf_counter()
+            bbox = processor.match_template(image, item["name"], threshold=THRESHOLD, roi=roi)
+            match_ms.append((time.perf_counter() - t0) * 1000)
+            hit = bbox is not None and _iou(tuple(bbox), tuple(item["rect"])) >= HIT_IOU
+            match_hits += hit
+            stats[0] += hit
+            stats[1] += 1
+
+        for item in truth["distractors"]:
+            bbox = processor.match_template(image, item["source"], threshold=THRESHOLD, roi=_around(item["base_rect"]))
+            distractor_total += 1
+            distractor_fp += bbox is not None and _iou(tuple(bbox), tuple(item["rect"])) >= DISTRACTOR_IOU
+
+        if ocr is not None:
+            _apply_variant(ocr, *key)
+            for item in truth["texts"]:
+                region = tuple(item["roi_rect"]) if item["roi_rect"] else _around(item["base_rect"])
+                t0 = time.perf_counter()
+                bbox = ocr.find_text_position(image, item["text"], region=region)
+                ocr_ms.append((time.perf_counter() - t0) * 1000)
+                ocr_total += 1
+                ocr_hits += bbox is not None and _iou(tuple(bbox), tuple(item["rect"])) >= TEXT_HIT_IOU
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "frames": frames,
+            "workers": workers,
+            "threshold": THRESHOLD,
+            **generator.meta,
+        },
+        "generation": {
+            "elapsed_s": round(gen_elapsed, 2),
+            "frames_per_min": round(frames / gen_elapsed * 60) if gen_elapsed else 0,
+        },
+        "templates": _summary(match_ms, match_hits, len(match_ms)),
+        "variants": {k: round(h / n, 4) if n else 0.0 for k, (h, n) in variant_hits.items()},
+        "distractors": {
+            "count": distractor_total,
+            "false_positive_rate": round(distractor_fp / distractor_total, 4) if distractor_total else 0.0,
+        },
+        "ocr": _summary(ocr_ms, ocr_hits, ocr_total) if ocr is not None else {"skipped": ocr_skipped},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="视觉流水线压力基准")
+    parser.add_argument("--frames", type=int, default=300, help="帧数")
+    parser.add_argument("--resolutions", default="1920x1080,1280x720", help="分辨率列表，格式WxH,WxH")
+    parser.add_argument("--dpi-scales", default="1.0,1.25", help="DPI缩放因子列表")
+    parser.add_argument("--noise", default="0,4,8", help="高斯噪声标准差列表")
+    parser.add_argument("--jpeg", default="0,75,90", help="JPEG压缩质量列表（0表示不压缩）")
+    parser.add_argument("--workers", type=int, default=4, help="生成线程数")
+    parser.add_argument("--ocr", action="store_true", help="测试文字识别（需OCR引擎）")
+    parser.add_argument("--ocr-engine", default="easyocr", help="OCR引擎类型")
+    parser.add_argument("--font", default=DEFAULT_FONT, help="中文字体文件路径")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--output", default=None, help="结果JSON路径")
+    args = parser.parse_args()
+
+    report = run(
+        frames=args.frames,
+        resolutions=_parse_resolutions(args.resolutions),
+        dpi_scales=_parse_list(args.dpi_scales),
+        noise_levels=_parse_list(args.noise),
+        jpeg_qualities=_parse_list(args.jpeg, int),
+        workers=args.workers,
+        use_ocr=args.ocr,
+        ocr_engine=args.ocr_engine,
+        font_path=args.font,
+        seed=args.seed,
+    )
+
+    output = args.output or os.path.join(
+        path_manager.dynamic_base, "benchmarks", f"vision_stress_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for key in ("generation", "templates", "variants", "distractors", "ocr"):
+        print(json.dumps({key: report[key]}, ensure_ascii=False))
+    print(f"结果已写入: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,14 @@
 import logging
 import threading
 import time
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 from src.auto_control.devices.device_manager import DeviceManager
 from src.auto_control.image.image_processor import ImageProcessor
 from src.auto_control.ocr.ocr_processor import OCRProcessor
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock, VirtualClock
 from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
+from src.auto_control.utils.debug_image_saver import DebugImageSaver
 from src.auto_control.utils.display_context import RuntimeDisplayContext
 from src.auto_control.utils.logger import Logger
 
@@ -48,6 +50,7 @@ class Auto:
         path_manager: PathManager = None,
         config: AutoConfig = None,
         settings_manager=None,
+        clock: Clock = None,
     ):
         """
         初始化自动化系统核心实例
@@ -59,6 +62,7 @@ class Auto:
         :param path_manager: 路径管理器实例，默认使用全局单例
         :param config: 自动化配置实例，默认创建新实例
         :param settings_manager: 设置管理器实例，用于获取永久置顶等设置
+        :param clock: 计时与等待使用的时钟，默认启动时按设备选择（非实时设备使用虚拟时钟）
         """
         # 记录总初始化开始时间
         total_init_start = time.time()
@@ -150,6 +154,7 @@ class Auto:
             test_mode=self.test_mode,
             stop_event=self.stop_event,
             fuzzy_match=self.config.DEFAULT_TEXT_FUZZY_MATCH,
+            config=self.config,
         )
         ocr_time = round(time.time() - ocr_start, 3)
 
@@ -162,6 +167,10 @@ class Auto:
         else:
             self.default_device_uri = device_uri
 
+        # 时钟（核心层与任务脚本统一通过 auto.clock 计时/等待）
+        self._clock_override = clock
+        self.clock: Clock = clock or SYSTEM_CLOCK
+
         # 初始化子模块处理器
         self.delay_manager = DelayManager()
         self.device_handler = DeviceHandler(self, self.config)
@@ -247,8 +256,9 @@ class Auto:
                 if not device_result.success:
                     raise AutoBaseError(f"默认设备初始化失败: {device_result.error_msg}")
 
+                self._select_clock()
                 self.running = True
-                self.start_time = time.time()
+                self.start_time = self.clock.time()
                 elapsed = time.time() - start_time
                 self.logger.info(f"自动化系统启动成功，耗时: {elapsed:.2f}秒")
                 return AutoResult.success_result(data=True, elapsed_time=elapsed)
@@ -257,6 +267,30 @@ class Auto:
                 self.logger.error(f"自动化系统启动失败: {str(e)}", exc_info=True)
                 return AutoResult.fail_result(error_msg=str(e), elapsed_time=elapsed)
 
+    def _select_clock(self) -> None:
+        """按默认设备选择时钟：显式注入的时钟优先，非实时设备（录制回放）按配置使用虚拟时钟快进等待"""
+        if self._clock_override is not None:
+            self.clock = self._clock_override
+            self.device_manager.set_clock(self.clock)
+            return
+        device = self.device_manager.get_device(self.default_device_uri) or self.device_manager.get_active_device()
+        if self.config.VIRTUAL_CLOCK and device is not None and not getattr(device, "is_live", True):
+            self.clock = VirtualClock()
+            self.logger.info("非实时设备，启用虚拟时钟：等待与延迟将快进执行")
+        else:
+            self.clock = SYSTEM_CLOCK
+        self.device_manager.set_clock(self.clock)
+
+    def use_clock(self, clock: Clock) -> None:
+        """
+        注入时钟（覆盖启动时的自动选择）
+
+        :param clock: 时钟实例，None表示恢复自动选择
+        """
+        self._clock_override = clock
+        self.clock = clock or SYSTEM_CLOCK
+        self.device_manager.set_clock(self.clock)
+
     def stop(self) -> AutoResult:
         """
         停止自动化系统（释放设备+清理资源）
@@ -281,11 +315,15 @@ class Auto:
                 # 释放设备资源
                 self.device_manager.disconnect_all()
 
+                # 等待后台调试图写盘完成（须在资源清理前，避免与清理并发）
+                self.image_processor.debug_saver.flush()
+                self.ocr_processor.debug_saver.flush()
+
                 # 使用统一资源管理器清理资源
                 self.resource_manager.cleanup_on_stop()
 
-                # 清理图像处理器缓存
-                self.image_processor.clear_screenshot_cache()
+                # 保存模板位置记录
+                self.image_processor.flush_spatial_priors()
 
                 # 重置运行状态
                 self.running = False
@@ -347,6 +385,10 @@ class Auto:
         """代理调用操作处理器的文本点击方法"""
         return self.operation_handler.text_click(*args, **kwargs)
 
+    def find_all(self, *args, **kwargs) -> AutoResult:
+        """代理调用操作处理器的多实例查找（可选依次点击）方法"""
+        return self.operation_handler.find_all(*args, **kwargs)
+
     def swipe(self, *args, **kwargs) -> AutoResult:
         """代理调用操作处理器的滑动方法"""
         return self.operation_handler.swipe(*args, **kwargs)
@@ -374,7 +416,7 @@ class Auto:
         """查询系统运行时长（秒）"""
         if not self.start_time:
             return 0.0
-        return time.time() - self.start_time
+        return self.clock.time() - self.start_time
 
     def get_device_info(self, device_uri: str = None) -> Dict[str, Any]:
         """获取设备详细信息"""
@@ -396,6 +438,92 @@ class Auto:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def get_template_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取模板缓存统计（命中/未命中/淘汰次数、占用字节数）
+
+        :return: 模板缓存统计字典
+        """
+        return self.image_processor.get_template_cache_stats()
+
+    def get_match_stats(self) -> Dict[str, Any]:
+        """
+        获取模板匹配相关统计（模板缓存、缩放模板缓存、位置先验、预过滤、结果记忆化）
+
+        :return: 各项统计字典
+        """
+        return self.image_processor.get_match_stats()
+
+    def get_result_memo_stats(self) -> Dict[str, Any]:
+        """
+        获取识别结果记忆化统计（ROI区域画面未变化时直接返回上次结果）
+
+        :return: {"template": 模板匹配记忆化统计, "ocr": OCR记忆化统计}
+        """
+        return {
+            "template": self.image_processor.result_memo.get_stats(),
+            "ocr": self.ocr_processor.get_memo_stats(),
+        }
+
+    def get_frame_cache_stats(self, device_uri: str = None) -> Dict[str, Any]:
+        """
+        获取设备帧缓存统计（实际截图次数、节省的截图次数、失效次数等）
+
+        :param device_uri: 设备URI，None表示默认设备
+        :return: 帧缓存统计字典，设备不存在时返回空字典
+        """
+        try:
+            return self.device_handler.get_device(device_uri or self.default_device_uri).get_frame_cache_stats()
+        except Exception:
+            return {}
+
+    # ======================== 失败调试图捕获 ========================
+    def _debug_savers(self) -> Tuple[DebugImageSaver, DebugImageSaver]:
+        """模板匹配与OCR的调试图保存器"""
+        return self.image_processor.debug_saver, self.ocr_processor.debug_saver
+
+    def begin_debug_capture(self) -> None:
+        """开始失败捕获范围：范围内的调试图先暂存，由end_debug_capture决定是否落盘"""
+        for saver in self._debug_savers():
+            saver.begin_capture()
+
+    def end_debug_capture(self, failed: bool) -> None:
+        """
+        结束失败捕获范围
+
+        :param failed: 等待/步骤是否最终失败（失败时落盘暂存的调试图，成功时丢弃）
+        """
+        for saver in self._debug_savers():
+            saver.end_capture(failed)
+
+    def save_debug_capture(self) -> int:
+        """
+        立即落盘当前暂存的调试图（显式请求）
+
+        :return: 提交写盘的调试图数量
+        """
+        return sum(saver.save_capture() for saver in self._debug_savers())
+
+    def get_debug_image_stats(self) -> Dict[str, Any]:
+        """
+        获取调试图写入统计（已写入/已丢弃/写入失败/待写入数量）
+
+        :return: {"template": 模板匹配调试图统计, "ocr": OCR调试图统计}
+        """
+        return {
+            "template": self.image_processor.debug_saver.get_stats(),
+            "ocr": self.ocr_processor.debug_saver.get_stats(),
+        }
+
+    def preload_templates(self, entries: List[str]) -> int:
+        """
+        按清单预加载模板（任务开始前调用，避免首次匹配时的冷加载）
+
+        :param entries: 预加载清单，以"/"结尾的项为模板目录前缀，其余为完整模板名
+        :return: 本次新加载的模板数量
+        """
+        return self.image_processor.preload_templates(entries)
+
     def get_task_logger(self, task_name: str) -> "Logger":
         """
         获取任务日志器（向后兼容方法）
@@ -83,6 +83,53 @@ class AutoConfig:
     TEMPLATE_EXTENSIONS: Tuple[str, ...] = field(
         default_factory=lambda: tuple(config.get("framework.template_extensions", (".png", ".jpg", ".jpeg", ".bmp")))
     )
+    # 多模板批量匹配并发线程数（0/1为串行）
+    MATCH_WORKERS: int = field(default_factory=lambda: config.get("framework.match_workers", 0))
+    # 金字塔粗到精匹配模式（auto/always/off）
+    PYRAMID_MATCH_MODE: str = field(default_factory=lambda: config.get("framework.pyramid_match_mode", "auto"))
+    # 是否优先从预编译模板图集加载模板（图集缺失/过期时自动回退PNG）
+    USE_TEMPLATE_ATLAS: bool = field(default_factory=lambda: config.get("framework.use_template_atlas", True))
+    # 是否启用模板位置先验（优先在历史匹配位置附近搜索，逐级扩大到ROI/全图）
+    USE_SPATIAL_PRIORS: bool = field(default_factory=lambda: config.get("framework.use_spatial_priors", True))
+    # 是否启用颜色包含预过滤（颜色分布明显不符时跳过matchTemplate）
+    USE_MATCH_PREFILTER: bool = field(default_factory=lambda: config.get("framework.use_match_prefilter", True))
+    # 是否启用识别结果记忆化（ROI区域画面未变化时直接返回上次的模板匹配/OCR结果）
+    USE_RESULT_MEMO: bool = field(default_factory=lambda: config.get("framework.use_result_memo", True))
+    # 识别结果记忆化的最大条目数
+    RESULT_MEMO_SIZE: int = field(default_factory=lambda: config.get("framework.result_memo_size", 256))
+    # 记忆化严格模式（命中时仍重新识别并比对结果，仅用于测试）
+    RESULT_MEMO_STRICT: bool = field(default_factory=lambda: config.get("framework.result_memo_strict", False))
+    # 模板缓存字节预算（MB，按最近最少使用淘汰）
+    TEMPLATE_CACHE_MB: float = field(default_factory=lambda: config.get("framework.template_cache_mb", 64))
+    # 帧缓存新鲜度窗口（毫秒，窗口内无输入操作的连续检查复用同一次截图，0表示禁用）
+    FRAME_CACHE_MS: float = field(default_factory=lambda: config.get("framework.frame_cache_ms", 80))
+    # 指定ROI的只读检查是否只截取ROI区域（截图成本与ROI面积成正比）
+    ROI_CAPTURE: bool = field(default_factory=lambda: config.get("framework.roi_capture", True))
+    # 后台截图帧率（0表示不启用；启用后检查直接取后台线程的最新帧，不再同步截图）
+    # 仅在截图模式为background/printwindow时生效：其余模式截图时可能临时激活窗口，后台持续截图会抢占焦点
+    CAPTURE_FPS: float = field(default_factory=lambda: config.get("framework.capture_fps", 0))
+    # 后台截图环形缓冲槽位数
+    CAPTURE_BUFFER_SIZE: int = field(default_factory=lambda: config.get("framework.capture_buffer_size", 3))
+    # 是否持久化截图策略检测结果（按窗口类名/进程/分辨率/DPI复用，单帧检查失败时重新检测）
+    PERSIST_SCREENSHOT_STRATEGY: bool = field(
+        default_factory=lambda: config.get("framework.persist_screenshot_strategy", True)
+    )
+    # 是否录制会话（截取的帧与输入事件写入 runtime/<env>/sessions 下的归档，用于复现慢/不稳定的运行）
+    RECORD_SESSION: bool = field(default_factory=lambda: config.get("framework.record_session", False))
+    # 会话录制关键帧间隔（整帧数，其余帧只保存相对关键帧变化的图块）
+    SESSION_KEYFRAME_INTERVAL: int = field(
+        default_factory=lambda: config.get("framework.session_keyframe_interval", 100)
+    )
+    # 非实时设备（录制回放）是否使用虚拟时钟：等待/延迟立即返回并推进虚拟时间，超时语义不变
+    VIRTUAL_CLOCK: bool = field(default_factory=lambda: config.get("framework.virtual_clock", True))
+
+    # 调试图配置（后台线程写盘，队列满时丢弃最早的调试图）
+    DEBUG_IMAGE_FORMAT: str = field(default_factory=lambda: config.get("framework.debug_image_format", "png"))
+    DEBUG_PNG_COMPRESSION: int = field(default_factory=lambda: config.get("framework.debug_png_compression", 3))
+    DEBUG_IMAGE_QUALITY: int = field(default_factory=lambda: config.get("framework.debug_image_quality", 90))
+    DEBUG_QUEUE_SIZE: int = field(default_factory=lambda: config.get("framework.debug_queue_size", 8))
+    # 等待/步骤内暂存的最近调试图数量（仅最终失败时落盘）
+    DEBUG_CAPTURE_SIZE: int = field(default_factory=lambda: config.get("framework.debug_capture_size", 5))
 
     # 滑动配置
     DEFAULT_SWIPE_DURATION: float = 3.0
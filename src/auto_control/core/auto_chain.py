@@ -1,6 +1,5 @@
 """链式调用模块：包含Step类和ChainManager类，实现线性步骤执行"""
 
-import time
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
@@ -170,6 +169,58 @@ class ChainManager:
         self._current_pre_verify = None
         return self
 
+    def template_click_all(
+        self,
+        template: str,
+        threshold: float = 0.8,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        max_results: int = 50,
+        interval: float = None,
+        delay: float = None,
+        device_uri: Optional[str] = None,
+        duration: float = 0.1,
+        right_click: bool = False,
+        verify: Optional[dict] = None,
+        timeout: float = None,
+        step_retry: int = None,
+        retry_on_failure: bool = True,
+    ) -> "ChainManager":
+        """链式调用-模板全部实例点击（单次截图，依次点击所有实例）"""
+        delay = delay or self.config.CLICK_DELAY
+        timeout = timeout or self.config.DEFAULT_WAIT_TIMEOUT
+        step_retry = step_retry or self.config.DEFAULT_STEP_RETRY
+
+        self.steps.append(
+            Step(
+                step_type="template_click_all",
+                params={
+                    "template": template,
+                    "click": True,
+                    "threshold": threshold,
+                    "roi": roi,
+                    "max_results": max_results,
+                    "interval": interval,
+                    "delay": delay,
+                    "device_uri": device_uri,
+                    "duration": duration,
+                    "right_click": right_click,
+                    "retry": 0,
+                },
+                timeout=timeout,
+                step_retry=step_retry,
+                retry_on_failure=retry_on_failure,
+                pre_verify=self._current_pre_verify,
+                pre_verify_retry=(
+                    self._current_pre_verify.get("retry", self.config.DEFAULT_VERIFY_RETRY)
+                    if self._current_pre_verify
+                    else self.config.DEFAULT_VERIFY_RETRY
+                ),
+                post_verify=verify,
+            )
+        )
+        self._current_pre_verify = None
+        return self
+
     def click(
         self,
         pos: Tuple[int, int],
@@ -343,13 +394,13 @@ class ChainManager:
         2. 步骤执行失败 → 重试当前步骤（直到单步重试耗尽）→ 步骤仍失败则整体失败
         3. 回退重试时，重置到上一个步骤重新执行
         """
-        start_time = time.time()
+        start_time = self.auto.clock.time()
         step_results: List[AutoResult] = []
 
         # 总超时检查
         if self._check_total_timeout(start_time):
             return AutoResult.fail_result(
-                error_msg=f"步骤链总超时（{self.total_timeout}秒）", elapsed_time=time.time() - start_time
+                error_msg=f"步骤链总超时（{self.total_timeout}秒）", elapsed_time=self.auto.clock.time() - start_time
             )
 
         # 逐个执行步骤，使用while循环替代for循环，支持回退重试
@@ -358,13 +409,14 @@ class ChainManager:
             step = self.steps[idx]
             step_idx = idx + 1
             step_name = step.step_type
-            step_start = time.time()
+            step_start = self.auto.clock.time()
             self.logger.info(f"\n--- 执行步骤 {step_idx}/{len(self.steps)}: {step_name} ---")
 
             # 总超时检查
             if self._check_total_timeout(start_time):
                 return AutoResult.fail_result(
-                    error_msg=f"步骤链总超时（{self.total_timeout}秒）", elapsed_time=time.time() - start_time
+                    error_msg=f"步骤链总超时（{self.total_timeout}秒）",
+                    elapsed_time=self.auto.clock.time() - start_time,
                 )
 
             # 步骤1：执行前置验证（带单步重试）
@@ -402,7 +454,7 @@ class ChainManager:
 
                 # 无法回退，返回失败结果
                 if step.retry_on_failure:
-                    return AutoResult.fail_result(error_msg=error_msg, elapsed_time=time.time() - start_time)
+                    return AutoResult.fail_result(error_msg=error_msg, elapsed_time=self.auto.clock.time() - start_time)
                 else:
                     # 允许跳过，继续执行下一个步骤
                     self.logger.warning(f"步骤{step_idx}失败，但允许跳过，继续执行下一个步骤")
@@ -419,7 +471,7 @@ class ChainManager:
                 error_msg = f"步骤{step_idx}执行异常：{str(e)}"
                 self.logger.error(error_msg)
                 if step.retry_on_failure:
-                    return AutoResult.fail_result(error_msg=error_msg, elapsed_time=time.time() - start_time)
+                    return AutoResult.fail_result(error_msg=error_msg, elapsed_time=self.auto.clock.time() - start_time)
                 else:
                     # 允许跳过，继续执行下一个步骤
                     self.logger.warning(f"步骤{step_idx}失败，但允许跳过，继续执行下一个步骤")
@@ -431,7 +483,9 @@ class ChainManager:
                 self.logger.error(error_msg)
                 if step.retry_on_failure:
                     return AutoResult.fail_result(
-                        error_msg=error_msg, elapsed_time=time.time() - start_time, retry_count=step.step_retry
+                        error_msg=error_msg,
+                        elapsed_time=self.auto.clock.time() - start_time,
+                        retry_count=step.step_retry,
                     )
                 else:
                     # 允许跳过，继续执行下一个步骤
@@ -444,14 +498,14 @@ class ChainManager:
                 step_results[idx] = step_result
             else:
                 step_results.append(step_result)
-            self.logger.info(f"步骤{step_idx}执行成功，耗时: {time.time()-step_start:.1f}秒")
+            self.logger.info(f"步骤{step_idx}执行成功，耗时: {self.auto.clock.time()-step_start:.1f}秒")
 
             # 重置回退状态，准备执行下一个步骤
             step.is_back_retried = False
             idx += 1
 
         # 所有步骤执行成功
-        total_elapsed = time.time() - start_time
+        total_elapsed = self.auto.clock.time() - start_time
         return AutoResult.success_result(data=[r.data for r in step_results], elapsed_time=total_elapsed, retry_count=0)
 
     # ======================== 辅助方法 ========================
@@ -491,7 +545,17 @@ class ChainManager:
         return False
 
     def _execute_step_with_retry(self, step: Step, step_start: float) -> Tuple[bool, Optional[AutoResult]]:
-        """执行单个步骤，失败时重试（直到单步重试耗尽）"""
+        """执行单个步骤，失败时重试（直到单步重试耗尽）；各次尝试的调试图仅在步骤最终失败时落盘"""
+        step_success = False
+        self.auto.begin_debug_capture()
+        try:
+            step_success, step_result = self._run_step_attempts(step, step_start)
+            return step_success, step_result
+        finally:
+            self.auto.end_debug_capture(failed=not step_success and not self.auto.check_should_stop())
+
+    def _run_step_attempts(self, step: Step, step_start: float) -> Tuple[bool, Optional[AutoResult]]:
+        """按单步重试次数依次尝试执行步骤（含后置验证）"""
         max_retry = step.step_retry
         step_timeout = step.timeout
 
@@ -501,7 +565,7 @@ class ChainManager:
                 raise StepExecuteError("步骤执行被中断")
 
             # 超时检查
-            if time.time() - step_start > step_timeout:
+            if self.auto.clock.time() - step_start > step_timeout:
                 raise StepExecuteError(f"步骤超时（{step_timeout}秒）")
 
             attempt_idx = attempt + 1
@@ -547,6 +611,8 @@ class ChainManager:
                 return self.auto.template_click(**step.params)
             elif step.step_type == "text_click":
                 return self.auto.text_click(**step.params)
+            elif step.step_type == "template_click_all":
+                return self.auto.find_all(**step.params)
             elif step.step_type == "click":
                 return self.auto.click(**step.params)
             elif step.step_type == "swipe":
@@ -571,5 +637,5 @@ class ChainManager:
         """检查步骤链总超时"""
         if self.total_timeout <= 0:
             return False
-        elapsed = time.time() - start_time
+        elapsed = self.auto.clock.time() - start_time
         return elapsed >= self.total_timeout
@@ -1,6 +1,5 @@
 """装饰器模块：包含重试/中断检查等通用装饰器"""
 
-import time
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
 
@@ -12,6 +11,16 @@ def with_retry_and_check(func: Callable) -> Callable:
 
     @wraps(func)
     def wrapper(self, *args, **kwargs) -> AutoResult:
+        # 各次尝试的调试图先暂存，重试耗尽仍失败时才落盘
+        result = None
+        self.auto.begin_debug_capture()
+        try:
+            result = run_with_retry(self, *args, **kwargs)
+            return result
+        finally:
+            self.auto.end_debug_capture(failed=result is None or (not result.success and not result.is_interrupted))
+
+    def run_with_retry(self, *args, **kwargs) -> AutoResult:
         # 提取通用参数（兼容原有调用）
         config: AutoConfig = self.config
         
@@ -21,14 +30,14 @@ def with_retry_and_check(func: Callable) -> Callable:
         delay = kwargs.get("delay", config.CLICK_DELAY)
         device_uri = kwargs.get("device_uri")
         verify = kwargs.get("verify")
-        total_start_time = time.time()
+        total_start_time = self.auto.clock.time()
         actual_retry_count = 0
 
         # 通用重试循环
         for attempt in range(retry + 1):
             # 1. 中断检查（最高优先级）
             if self.auto.check_should_stop():
-                elapsed = time.time() - total_start_time
+                elapsed = self.auto.clock.time() - total_start_time
                 self.logger.debug(f"[{func.__name__}] 任务被中断（尝试{attempt+1}）")
                 return AutoResult.fail_result(
                     error_msg=f"{func.__name__}任务被中断",
@@ -38,7 +47,7 @@ def with_retry_and_check(func: Callable) -> Callable:
                 )
 
             # 2. 执行前延迟
-            delay_result = self.delay_manager.apply_delay(delay, self.auto.stop_event)
+            delay_result = self.delay_manager.apply_delay(delay, self.auto.stop_event, clock=self.auto.clock)
             if not delay_result.success:
                 actual_retry_count += 1
                 continue
@@ -82,11 +91,11 @@ def with_retry_and_check(func: Callable) -> Callable:
 
             # 6. 无需验证，直接返回成功
             if not verify:
-                elapsed = time.time() - total_start_time
+                elapsed = self.auto.clock.time() - total_start_time
                 return AutoResult.success_result(data=result.data, elapsed_time=elapsed, retry_count=actual_retry_count)
 
             # 7. 执行验证逻辑
-            verify_start = time.time()
+            verify_start = self.auto.clock.time()
             try:
                 verify_result = self.auto.verify(
                     verify_type=verify.get("type"),
@@ -97,11 +106,11 @@ def with_retry_and_check(func: Callable) -> Callable:
             except VerifyError as e:
                 verify_result = AutoResult.fail_result(error_msg=str(e))
 
-            verify_elapsed = time.time() - verify_start
+            verify_elapsed = self.auto.clock.time() - verify_start
 
             # 8. 验证成功
             if verify_result.success:
-                total_elapsed = time.time() - total_start_time
+                total_elapsed = self.auto.clock.time() - total_start_time
                 self.logger.info(f"[{func.__name__}] 验证成功，总耗时{total_elapsed:.1f}秒")
                 return AutoResult.success_result(
                     data=result.data, elapsed_time=total_elapsed, retry_count=actual_retry_count
@@ -114,7 +123,7 @@ def with_retry_and_check(func: Callable) -> Callable:
                 )
 
         # 重试耗尽，返回失败
-        elapsed = time.time() - total_start_time
+        elapsed = self.auto.clock.time() - total_start_time
         error_msg = f"{func.__name__}已达最大重试次数{retry}，操作失败"
         self.logger.error(error_msg)
         return AutoResult.fail_result(error_msg=error_msg, elapsed_time=elapsed, retry_count=actual_retry_count)
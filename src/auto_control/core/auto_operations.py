@@ -1,6 +1,5 @@
 """操作模块：包含点击、滑动、输入、按键等核心操作方法"""
 
-import time
 from typing import Any, List, Optional, Tuple, Union
 
 from .auto_base import AutoBaseError, AutoConfig, AutoResult, CoordinateError, DeviceError, VerifyError
@@ -62,7 +61,7 @@ class OperationHandler:
             return AutoResult.fail_result(error_msg=str(e))
 
         # 点击后等待
-        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event)
+        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event, clock=self.auto.clock)
         self.logger.info(f"点击成功: {coord_type_str}{pos} | 点击次数{click_time}")
         return AutoResult.success_result(data=pos)
 
@@ -94,12 +93,14 @@ class OperationHandler:
             return AutoResult.fail_result(error_msg=str(e))
 
         # 按键后等待
-        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event)
+        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event, clock=self.auto.clock)
         self.logger.info(f"按键成功: {key} | 按住时长{duration}s")
         return AutoResult.success_result(data=key)
 
     def _check_window_state(self, _device) -> bool:
         """检查窗口状态，无限等待直到窗口在前台且可见"""
+        if not getattr(_device, "is_live", True):
+            return True  # 回放设备无真实窗口
         try:
             import ctypes
             import win32con
@@ -239,10 +240,88 @@ class OperationHandler:
             return AutoResult.fail_result(error_msg=str(e))
 
         # 点击后等待
-        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event)
+        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event, clock=self.auto.clock)
         self.logger.info(f"[点击成功] {template_info}{roi_info} | 右键={right_click}")
         return AutoResult.success_result(data=result)
 
+    @with_retry_and_check
+    def find_all(
+        self,
+        template: str,
+        click: bool = False,
+        threshold: float = 0.8,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        max_results: int = 50,
+        interval: float = None,
+        delay: float = None,
+        device_uri: Optional[str] = None,
+        duration: float = 0.1,
+        right_click: bool = False,
+        verify: Optional[dict] = None,
+        retry: int = None,
+        _device: Optional[Any] = None,
+        _attempt: int = 0,
+    ) -> AutoResult:
+        """查找模板的全部实例（单次截图），可选按从上到下、从左到右的顺序依次点击，点击之间不重新截图"""
+        # 参数默认值
+        interval = interval or self.config.AFTER_CLICK_DELAY
+        delay = delay or self.config.CLICK_DELAY
+        retry = retry or self.config.DEFAULT_OPERATION_RETRY
+
+        roi_info = LogFormatter.format_roi(roi)
+        self.logger.info(f"[多实例查找] 模板: {template}{roi_info} | 点击: {click}，尝试: {_attempt + 1}")
+
+        # 检查窗口状态
+        if click and not self._check_window_state(_device):
+            return AutoResult.fail_result(error_msg="窗口状态异常，无法执行多实例点击")
+
+        # 截图（整个流程仅截图一次）
+        try:
+            screen = _device.capture_frame(roi)
+            if screen is None:
+                raise DeviceError("[多实例查找] 截图失败")
+        except Exception as e:
+            return AutoResult.fail_result(error_msg=str(e))
+
+        matches = self.image_processor.match_all(
+            image=screen, template=template, threshold=threshold, roi=roi, max_results=max_results
+        )
+        if not matches:
+            return AutoResult.fail_result(error_msg=f"[多实例查找] 未找到模板 {template}")
+
+        # 按行排序（与行首y差小于半个模板高度视为同一行），行内从左到右，保证格子/列表按阅读顺序处理
+        row_height = max(1, matches[0]["bbox"][3] // 2)
+        rows: List[List[Tuple[int, int, int, int]]] = []
+        for bbox in sorted((m["bbox"] for m in matches), key=lambda b: b[1]):
+            if not rows or bbox[1] - rows[-1][0][1] >= row_height:
+                rows.append([])
+            rows[-1].append(bbox)
+        bboxes = [bbox for row in rows for bbox in sorted(row, key=lambda b: b[0])]
+        self.logger.info(f"[多实例查找] 模板: {template} | 实例数: {len(bboxes)} | 矩形: {bboxes}")
+
+        if click:
+            coord_type = self.device_handler.get_coord_type_enum("LOGICAL")
+            for idx, bbox in enumerate(bboxes):
+                if self.auto.check_should_stop():
+                    return AutoResult.fail_result(error_msg="多实例点击被中断", is_interrupted=True)
+                center = (bbox[0] + bbox[2] // 2, bbox[1] + bbox[3] // 2)
+                try:
+                    click_result = _device.click(
+                        pos=center,
+                        duration=duration,
+                        right_click=right_click,
+                        coord_type=coord_type,
+                    )
+                    if not click_result:
+                        error_msg = getattr(_device, "last_error", "") or f"第{idx + 1}个实例点击失败: {center}"
+                        raise DeviceError(error_msg)
+                except Exception as e:
+                    return AutoResult.fail_result(error_msg=str(e))
+                self.logger.debug(f"[多实例点击] {idx + 1}/{len(bboxes)} | 中心点: {center}")
+                self.delay_manager.apply_delay(interval, self.auto.stop_event, clock=self.auto.clock)
+
+        return AutoResult.success_result(data=bboxes)
+
     @with_retry_and_check
     def text_click(
         self,
@@ -273,9 +352,9 @@ class OperationHandler:
         if not self._check_window_state(_device):
             return AutoResult.fail_result(error_msg="窗口状态异常，无法执行文本点击")
 
-        # 截图
+        # 截图（只截取ROI时按OCR的安全扩展截取，避免压在ROI边缘的文本被截断）
         try:
-            screen = _device.capture_screen()
+            screen = _device.capture_frame(roi, expand=self.ocr_processor.ROI_EXPAND_PIXEL)
             if screen is None:
                 raise DeviceError("[文本点击] 截图失败")
         except Exception as e:
@@ -319,7 +398,7 @@ class OperationHandler:
                 return AutoResult.fail_result(error_msg=str(e))
 
         # 识别/点击后等待
-        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event)
+        self.delay_manager.apply_delay(self.config.AFTER_CLICK_DELAY, self.auto.stop_event, clock=self.auto.clock)
         return AutoResult.success_result(data=click_center)
 
     @with_retry_and_check
@@ -426,31 +505,31 @@ class OperationHandler:
             self.logger.error(str(e))
             return AutoResult.fail_result(error_msg=str(e))
 
-        # 清除截图缓存
-        self.image_processor.clear_screenshot_cache()
         self.logger.info(f"文本输入成功: {log_text}")
         return AutoResult.success_result(data=text)
 
     def sleep(self, secs: float = 1.0) -> AutoResult:
         """带中断检查的睡眠操作"""
-        start_time = time.time()
+        clock = self.auto.clock
+        start_time = clock.time()
         if self.auto.check_should_stop():
             self.logger.debug("睡眠任务被中断")
             return AutoResult.fail_result(error_msg="睡眠任务被中断", elapsed_time=0.0, is_interrupted=True)
 
         try:
             device = self.device_handler.get_device()
-            if device:
+            # 虚拟时钟下不走设备休眠，直接快进
+            if device and not clock.is_virtual:
                 result = device.sleep(secs, stop_event=self.auto.stop_event)
             else:
-                self.delay_manager.apply_delay(secs, self.auto.stop_event)
+                self.delay_manager.apply_delay(secs, self.auto.stop_event, clock=clock)
                 result = True
 
-            elapsed = time.time() - start_time
+            elapsed = clock.time() - start_time
             self.logger.debug(f"睡眠完成: {secs}秒")
             return AutoResult.success_result(data=result, elapsed_time=elapsed)
         except Exception as e:
-            elapsed = time.time() - start_time
+            elapsed = clock.time() - start_time
             error_msg = f"睡眠失败: {str(e)}"
             self.logger.error(error_msg)
             return AutoResult.fail_result(error_msg=error_msg, elapsed_time=elapsed)
@@ -1,7 +1,9 @@
 """工具模块：包含日志格式化、延迟处理、锁管理等通用工具函数"""
-import time
 import threading
 from typing import Optional, Tuple, Union, List
+
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock
+
 from .auto_base import AutoConfig, AutoResult, AutoBaseError
 
 
@@ -43,19 +45,20 @@ class LogFormatter:
 class DelayManager:
     """延迟管理工具类（带中断检查的延迟）"""
     @staticmethod
-    def apply_delay(secs: float, stop_event: threading.Event) -> AutoResult:
-        """执行延迟，支持中断检查"""
+    def apply_delay(secs: float, stop_event: threading.Event, clock: Optional[Clock] = None) -> AutoResult:
+        """执行延迟，支持中断检查（clock为虚拟时钟时立即返回并推进虚拟时间）"""
         if secs <= 0:
             return AutoResult.success_result()
-        
-        start_time = time.time()
-        if stop_event.wait(timeout=secs):
+
+        clock = clock or SYSTEM_CLOCK
+        start_time = clock.time()
+        if clock.sleep(secs, stop_event):
             return AutoResult.fail_result(
                 error_msg=f"延迟{secs}秒被中断",
-                elapsed_time=time.time() - start_time,
+                elapsed_time=clock.time() - start_time,
                 is_interrupted=True
             )
-        return AutoResult.success_result(elapsed_time=time.time() - start_time)
+        return AutoResult.success_result(elapsed_time=clock.time() - start_time)
 
 
 class LockManager:
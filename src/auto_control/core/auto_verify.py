@@ -20,6 +20,8 @@ class VerifyHandler:
 
     def _check_window_topmost(self, device) -> bool:
         """检查窗口是否在前台且可见，用于控制层等待逻辑"""
+        if not getattr(device, "is_live", True):
+            return True  # 回放设备无真实窗口
         try:
             import win32con
             import win32gui
@@ -57,19 +59,32 @@ class VerifyHandler:
     def wait_for(
         self, condition: Callable[[], bool], timeout: int = None, interval: float = 0.5, desc: str = "条件验证"
     ) -> AutoResult:
-        """等待条件满足，支持超时和中断检查，窗口未置顶时不计入超时时间"""
+        """等待条件满足，支持超时和中断检查，窗口未置顶时不计入超时时间（轮询调试图仅在最终超时时落盘）"""
+        result = None
+        self.auto.begin_debug_capture()
+        try:
+            result = self._poll_condition(condition, timeout, interval, desc)
+            return result
+        finally:
+            self.auto.end_debug_capture(failed=result is None or (not result.success and not result.is_interrupted))
+
+    def _poll_condition(
+        self, condition: Callable[[], bool], timeout: Optional[int], interval: float, desc: str
+    ) -> AutoResult:
+        """轮询条件直到满足/超时/中断"""
         timeout = timeout or self.config.DEFAULT_WAIT_TIMEOUT
-        start_time = time.time()
+        start_time = self.auto.clock.time()
         productive_start_time = start_time  # 有效等待开始时间（仅窗口有效时计数）
         self.logger.info(f"[等待] {desc}，超时: {timeout}秒")
 
         # 获取当前活动设备用于窗口状态检查
         active_device = self.device_handler.get_device()
+        last_check_time = None  # 上次条件检查的时间（time.monotonic）
 
         while True:
             # 中断检查（最高优先级）
             if self.auto.check_should_stop():
-                total_elapsed = time.time() - start_time
+                total_elapsed = self.auto.clock.time() - start_time
                 self.logger.info(f"[等待中断] {desc}")
                 return AutoResult.fail_result(
                     error_msg=f"{desc}被中断", elapsed_time=total_elapsed, is_interrupted=True
@@ -80,7 +95,7 @@ class VerifyHandler:
 
             # 窗口有效时更新有效等待开始时间
             if window_valid:
-                current_time = time.time()
+                current_time = self.auto.clock.time()
                 # 超时检查（仅在窗口有效时计数）
                 productive_elapsed = current_time - productive_start_time
                 if productive_elapsed >= timeout:
@@ -90,18 +105,23 @@ class VerifyHandler:
                         error_msg=f"等待{desc}超时（{timeout}秒）", elapsed_time=total_elapsed
                     )
 
+                # 启用后台截图时，确保本次检查拿到的是上次检查之后截取的新帧
+                if last_check_time is not None:
+                    active_device.wait_for_frame(last_check_time, timeout=max(interval, 1.0))
+                last_check_time = time.monotonic()
+
                 # 窗口有效时才执行条件检查
                 if condition():
-                    total_elapsed = time.time() - start_time
+                    total_elapsed = self.auto.clock.time() - start_time
                     self.logger.info(f"[等待成功] {desc}，耗时: {total_elapsed:.1f}秒")
                     return AutoResult.success_result(data=True, elapsed_time=total_elapsed)
             else:
                 # 窗口无效时重置有效等待开始时间，不计入超时
-                productive_start_time = time.time()
-                self.logger.debug(f"窗口无效，跳过条件检查，当前时间: {time.time()}")
+                productive_start_time = self.auto.clock.time()
+                self.logger.debug(f"窗口无效，跳过条件检查，当前时间: {self.auto.clock.time()}")
 
             # 等待间隔
-            self.delay_manager.apply_delay(interval, self.stop_event)
+            self.delay_manager.apply_delay(interval, self.stop_event, clock=self.auto.clock)
 
     def _wait_with_condition(
         self, condition_func: Callable[[], bool], desc: str, timeout: int, start_time: float, result: Any = None
@@ -118,7 +138,7 @@ class VerifyHandler:
             return condition_func()
 
         wait_result = self.wait_for(enhanced_condition, timeout, desc=desc)
-        elapsed = time.time() - start_time
+        elapsed = self.auto.clock.time() - start_time
 
         if wait_result.success and not wait_result.is_interrupted:
             return AutoResult.success_result(data=result.data if result else True, elapsed_time=elapsed)
@@ -149,7 +169,7 @@ class VerifyHandler:
             return AutoResult.fail_result(error_msg="检查元素任务被中断", is_interrupted=True)
 
         # 执行延迟
-        self.delay_manager.apply_delay(delay, self.stop_event)
+        self.delay_manager.apply_delay(delay, self.stop_event, clock=self.auto.clock)
 
         # 获取设备
         try:
@@ -207,7 +227,7 @@ class VerifyHandler:
         # 处理参数优先级
         actual_timeout = wait_timeout if wait_timeout is not None else (timeout or self.config.DEFAULT_WAIT_TIMEOUT)
         delay = delay or self.config.CHECK_ELEMENT_DELAY
-        start_time = time.time()
+        start_time = self.auto.clock.time()
 
         if actual_timeout > 0:
             result = None
@@ -231,7 +251,7 @@ class VerifyHandler:
     def wait_text(self, text: str, timeout: int = None, roi: Optional[Tuple[int, int, int, int]] = None) -> AutoResult:
         """等待文本出现并返回坐标"""
         timeout = timeout or self.config.DEFAULT_WAIT_TIMEOUT
-        start_time = time.time()
+        start_time = self.auto.clock.time()
         result = None
 
         def condition_func():
@@ -276,7 +296,7 @@ class VerifyHandler:
     ) -> AutoResult:
         """统一的屏幕验证方法"""
         timeout = timeout or self.config.DEFAULT_WAIT_TIMEOUT
-        start_time = time.time()
+        start_time = self.auto.clock.time()
 
         # 使用提取的独立方法作为条件
         def condition() -> bool:
@@ -1,8 +1,15 @@
+import datetime
+import os
+import time
 from abc import ABC, abstractmethod
 from enum import Enum, auto
 from functools import wraps
 from threading import Lock
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from src.auto_control.devices.session_recorder import SESSION_SUFFIX, SessionRecorder
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock
+from src.core.path_manager import path_manager
 
 
 class DeviceState(Enum):
@@ -21,9 +28,13 @@ class BaseDevice(ABC):
     2. 标准化的错误记录与清空机制
     3. 操作前置校验装饰器（确保设备可操作状态）
     4. 设备控制核心接口的抽象定义
+    5. 帧缓存：新鲜度窗口内的连续只读检查复用同一次截图，任何输入操作都会使其失效
+    6. 会话录制：把截取的帧与输入事件写入归档（见 session_recorder），用于复现慢/不稳定的运行
     """
 
-    def __init__(self, device_uri: str, logger=None):
+    is_live: bool = True  # 是否为真实设备（回放设备为False，跳过窗口前台检查等真实环境逻辑）
+
+    def __init__(self, device_uri: str, logger=None, frame_cache_ms: float = 0.0):
         self.device_uri = device_uri
         self.last_error: Optional[str] = None
         self._state = DeviceState.DISCONNECTED
@@ -37,6 +48,23 @@ class BaseDevice(ABC):
         self._click_mode: Optional[str] = None  # 点击模式：foreground/background
         self._available_screenshot_methods: List[str] = []  # 可用截图方法列表
 
+        # 帧缓存（新鲜度窗口为0时禁用；新鲜度按注入的时钟计算，虚拟时钟下轮询等待同样使缓存过期）
+        self.clock: Clock = SYSTEM_CLOCK
+        self.frame_cache_ttl = max(0.0, float(frame_cache_ms)) / 1000.0
+        self._frame_lock = Lock()
+        self._cached_frame: Optional[Any] = None
+        self._cached_frame_time = 0.0
+        self._cached_frame_generation = -1
+        self.input_generation = 0  # 输入代数：每次输入操作后递增，缓存帧代数不一致即失效
+        self.last_input_time = 0.0  # 最近一次输入操作结束的时间（time.monotonic）
+        self.frame_captures = 0  # 实际截图次数
+        self.roi_captures = 0  # 其中只截取ROI区域的次数
+        self.frame_cache_hits = 0  # 复用缓存帧的次数（即节省的截图次数）
+        self.frame_cache_invalidations = 0
+
+        # 会话录制（未开启时为None）
+        self.session_recorder: Optional[SessionRecorder] = None
+
     @property
     def state(self) -> DeviceState:
         """
@@ -158,6 +186,167 @@ class BaseDevice(ABC):
 
         return wrapper
 
+    # -------------------------- 帧缓存 --------------------------
+    def _capture_with_cache(self, capture_func: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        带新鲜度窗口的全屏截图：缓存帧未过期且期间没有输入操作时直接复用，否则调用capture_func重新截图。
+
+        缓存帧由多个调用方共享，调用方不得原地修改返回的图像。
+
+        Args:
+            capture_func: 实际截图函数（无参数，失败返回None）
+
+        Returns:
+            Optional[Any]: 截图图像，失败返回None
+        """
+        if self.frame_cache_ttl <= 0:
+            with self._frame_lock:
+                self.frame_captures += 1
+            return capture_func()
+
+        cached = self._get_cached_frame()
+        if cached is not None:
+            return cached
+        generation = self.input_generation
+
+        # 以截图开始时间计算新鲜度，截图期间发生输入操作时不缓存该帧
+        start = self.clock.time()
+        frame = capture_func()
+        with self._frame_lock:
+            self.frame_captures += 1
+            if frame is not None and generation == self.input_generation:
+                self._cached_frame = frame
+                self._cached_frame_time = start
+                self._cached_frame_generation = generation
+        return frame
+
+    def _get_cached_frame(self) -> Optional[Any]:
+        """
+        获取仍然有效的缓存帧（新鲜度窗口内且期间没有输入操作），命中时计入节省次数。
+
+        Returns:
+            Optional[Any]: 缓存帧，无有效缓存返回None
+        """
+        with self._frame_lock:
+            if (
+                self._cached_frame is not None
+                and self._cached_frame_generation == self.input_generation
+                and self.clock.time() - self._cached_frame_time <= self.frame_cache_ttl
+            ):
+                self.frame_cache_hits += 1
+                return self._cached_frame
+        return None
+
+    def capture_frame(self, roi: Optional[Tuple[int, int, int, int]] = None, expand: int = 0) -> Optional[Any]:
+        """
+        供只读检查（模板/文本检查）使用的截图，返回图像与整帧截图的坐标系一致。
+
+        默认实现为全屏截图；子类可在指定ROI且无有效缓存帧时只截取该区域。
+
+        Args:
+            roi: 检查所用的感兴趣区域，格式为 (x, y, width, height)，None表示全屏
+            expand: 只截取ROI时向四周扩展的物理像素数（OCR按扩展后的区域裁剪）
+
+        Returns:
+            Optional[Any]: 截图图像，失败返回None
+        """
+        return self.capture_screen()
+
+    def use_clock(self, clock: Clock) -> None:
+        """
+        注入计时使用的时钟（与Auto的时钟保持一致），并丢弃按旧时钟计时的缓存帧。
+
+        Args:
+            clock: 时钟实例，None表示系统时钟
+        """
+        with self._frame_lock:
+            self.clock = clock or SYSTEM_CLOCK
+            self._cached_frame = None
+
+    def invalidate_frame_cache(self) -> None:
+        """输入操作（点击/滑动/按键/文本输入）后调用：递增输入代数并丢弃缓存帧"""
+        with self._frame_lock:
+            self.input_generation += 1
+            self.last_input_time = time.monotonic()
+            self._cached_frame = None
+            self.frame_cache_invalidations += 1
+
+    def wait_for_frame(self, newer_than: float, timeout: float) -> bool:
+        """
+        等待截图开始时间晚于 newer_than 的帧可用（仅后台截图服务生效，默认立即返回）。
+
+        Args:
+            newer_than: 时间下限（time.monotonic）
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 有新帧可用返回True
+        """
+        return True
+
+    # -------------------------- 会话录制 --------------------------
+    def start_session_recording(self, path: Optional[str] = None, **options) -> Optional[str]:
+        """
+        开始录制会话（已在录制时直接返回当前归档路径）。
+
+        Args:
+            path: 归档路径，默认写入会话录制目录（path_manager的sessions）并按时间命名
+            **options: SessionRecorder参数（tile_size/keyframe_interval/max_queue）
+
+        Returns:
+            Optional[str]: 归档路径，创建失败返回None
+        """
+        if self.session_recorder and self.session_recorder.is_recording:
+            return self.session_recorder.path
+        if not path:
+            name = f"session_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}{SESSION_SUFFIX}"
+            path = os.path.join(path_manager.get("sessions"), name)
+        try:
+            self.session_recorder = SessionRecorder(
+                path, metadata={"device_uri": self.device_uri}, logger=self.logger, **options
+            ).start()
+            return path
+        except Exception as e:
+            self.session_recorder = None
+            if self.logger:
+                self.logger.error(f"会话录制启动失败 | 路径: {path} | 错误: {str(e)}")
+            return None
+
+    def stop_session_recording(self) -> Optional[Dict[str, Any]]:
+        """
+        结束会话录制（写入索引并关闭归档）。
+
+        Returns:
+            Optional[Dict[str, Any]]: 录制统计，未在录制时返回None
+        """
+        recorder, self.session_recorder = self.session_recorder, None
+        return recorder.close() if recorder else None
+
+    def _record_session_input(self, event: str, **detail) -> None:
+        """录制一次输入事件（未开启会话录制时忽略）"""
+        recorder = self.session_recorder
+        if recorder:
+            recorder.record_event(event, **detail)
+
+    def get_frame_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取帧缓存统计。
+
+        Returns:
+            Dict[str, Any]: 新鲜度窗口、实际截图次数（含ROI截图次数）、节省的截图次数、节省比例、失效次数与当前输入代数
+        """
+        with self._frame_lock:
+            total = self.frame_captures + self.frame_cache_hits
+            return {
+                "ttl_ms": round(self.frame_cache_ttl * 1000, 1),
+                "captures": self.frame_captures,
+                "roi_captures": self.roi_captures,
+                "saved": self.frame_cache_hits,
+                "saved_ratio": round(self.frame_cache_hits / total, 4) if total else 0.0,
+                "invalidations": self.frame_cache_invalidations,
+                "generation": self.input_generation,
+            }
+
     @abstractmethod
     def connect(self, timeout: float = 10.0) -> bool:
         """
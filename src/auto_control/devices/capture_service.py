@@ -0,0 +1,280 @@
+"""后台截图服务：生产者线程按固定帧率截图写入环形缓冲，消费者获取比指定时间更新的最新帧
+
+任务线程的检查不再同步等待截图，截图延迟从每次轮询中移除。
+环形缓冲的每个槽位预分配一块图像内存，帧源支持写入给定数组时（见 FrameSource）不产生新的分配；
+帧被消费者取走后所有权随之转移，槽位下次写入时重新分配，保证已交出的帧不会被覆盖
+（调试图延迟渲染、帧缓存共享都依赖这一点）。
+纯Python实现，不依赖win32，可配合 FakeFrameSource 在任意平台运行。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# 帧源：接收可写入的预分配数组（首帧或槽位已交出时为None），返回本次截图（可以就是传入的数组），失败返回None
+FrameSource = Callable[[Optional[np.ndarray]], Optional[np.ndarray]]
+
+
+class _FrameSlot:
+    """环形缓冲槽位"""
+
+    __slots__ = ("image", "timestamp", "seq", "taken")
+
+    def __init__(self):
+        self.image: Optional[np.ndarray] = None
+        self.timestamp = 0.0  # 截图开始时间（time.monotonic）
+        self.seq = 0
+        self.taken = False  # 图像是否已交给消费者（交出后槽位不再复用该内存）
+
+
+class FrameCaptureService:
+    """后台截图服务（单生产者，多消费者）"""
+
+    def __init__(
+        self,
+        frame_source: FrameSource,
+        fps: float = 10.0,
+        buffer_size: int = 3,
+        logger=None,
+        name: str = "FrameCapture",
+    ):
+        """
+        初始化后台截图服务
+
+        Args:
+            frame_source: 帧源（见 FrameSource）
+            fps: 目标截图帧率
+            buffer_size: 环形缓冲槽位数（至少2）
+            logger: 日志实例（可选）
+            name: 生产者线程名
+        """
+        if fps <= 0:
+            raise ValueError(f"截图帧率必须大于0: {fps}")
+        self.frame_source = frame_source
+        self.interval = 1.0 / fps
+        self.logger = logger
+        self.name = name
+
+        self._slots: List[_FrameSlot] = [_FrameSlot() for _ in range(max(2, int(buffer_size)))]
+        self._latest: Optional[_FrameSlot] = None
+        self._next_index = 0
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计
+        self.frames_captured = 0
+        self.capture_failures = 0
+        self.allocations = 0  # 槽位重新分配次数（帧源未写入预分配数组或槽位已交出）
+        self.frames_served = 0
+        self.wait_timeouts = 0
+        self._capture_time_total = 0.0
+
+    # -------------------------- 生命周期 --------------------------
+    @property
+    def is_running(self) -> bool:
+        """生产者线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """启动生产者线程（已启动时忽略）"""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        if self.logger:
+            self.logger.info(f"后台截图已启动 | 帧率: {1.0 / self.interval:.1f} | 缓冲槽位: {len(self._slots)}")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """
+        停止生产者线程并唤醒所有等待中的消费者
+
+        Args:
+            timeout: 等待线程退出的最长时间（秒）
+        """
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+        with self._cond:
+            self._latest = None
+            for slot in self._slots:
+                slot.image = None
+                slot.taken = False
+        if self.logger:
+            self.logger.info(f"后台截图已停止 | 统计: {self.get_stats()}")
+
+    # -------------------------- 生产者 --------------------------
+    def _run(self) -> None:
+        """生产者循环：按帧率截图，截图耗时超过帧间隔时立即开始下一帧"""
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            self.capture_once()
+            next_time = max(next_time + self.interval, time.monotonic())
+            self._stop_event.wait(max(0.0, next_time - time.monotonic()))
+
+    def capture_once(self) -> bool:
+        """
+        截取一帧写入环形缓冲（生产者线程调用，也可在测试中直接调用）
+
+        Returns:
+            bool: 截图成功返回True
+        """
+        with self._cond:
+            slot = self._slots[self._next_index]
+            out = None if slot.taken else slot.image
+
+        start = time.monotonic()
+        try:
+            image = self.frame_source(out)
+        except Exception as e:
+            image = None
+            if self.logger:
+                self.logger.debug(f"后台截图异常: {e}")
+        elapsed = time.monotonic() - start
+        if image is None:
+            self.capture_failures += 1
+            return False
+
+        with self._cond:
+            if image is not out:
+                self.allocations += 1
+            slot.image = image
+            slot.timestamp = start
+            self._seq += 1
+            slot.seq = self._seq
+            slot.taken = False
+            self._latest = slot
+            self._next_index = (self._next_index + 1) % len(self._slots)
+            self.frames_captured += 1
+            self._capture_time_total += elapsed
+            self._cond.notify_all()
+        return True
+
+    # -------------------------- 消费者 --------------------------
+    def get_latest_frame(self, newer_than: float = 0.0, timeout: float = 0.0) -> Optional[Tuple[float, np.ndarray]]:
+        """
+        获取截图开始时间晚于 newer_than 的最新帧，没有时最多等待 timeout 秒
+
+        返回的图像归调用方所有（不会再被生产者覆盖），但可能与其他消费者共享，调用方不得原地修改。
+
+        Args:
+            newer_than: 时间下限（time.monotonic），如最近一次输入操作的时间
+            timeout: 最长等待时间（秒），0表示不等待
+
+        Returns:
+            Optional[Tuple[float, np.ndarray]]: (截图开始时间, 图像)，超时/服务已停止返回None
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while True:
+                slot = self._latest
+                if slot is not None and slot.image is not None and slot.timestamp > newer_than:
+                    slot.taken = True
+                    self.frames_served += 1
+                    return slot.timestamp, slot.image
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_event.is_set():
+                    if timeout > 0:
+                        self.wait_timeouts += 1
+                    return None
+                self._cond.wait(remaining)
+
+    def wait_for_frame(self, newer_than: float, timeout: float) -> bool:
+        """
+        等待截图开始时间晚于 newer_than 的帧出现（不取走该帧）
+
+        Args:
+            newer_than: 时间下限（time.monotonic）
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 等到新帧返回True，超时/服务已停止返回False
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while self._latest is None or self._latest.timestamp <= newer_than:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_event.is_set():
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        获取后台截图统计
+
+        Returns:
+            Dict: 已截帧数、失败次数、重新分配次数、交付帧数、等待超时次数、平均截图耗时（毫秒）
+        """
+        with self._cond:
+            return {
+                "running": self.is_running,
+                "fps": round(1.0 / self.interval, 2),
+                "frames_captured": self.frames_captured,
+                "capture_failures": self.capture_failures,
+                "allocations": self.allocations,
+                "frames_served": self.frames_served,
+                "wait_timeouts": self.wait_timeouts,
+                "avg_capture_ms": (
+                    round(self._capture_time_total / self.frames_captured * 1000, 3) if self.frames_captured else 0.0
+                ),
+            }
+
+
+class FakeFrameSource:
+    """
+    合成帧源：生成带帧序号的纯色画面，可模拟截图耗时与间歇失败（用于在无win32环境下运行/验证截图服务）
+
+    帧序号写入左上角像素（B, G, R = 序号低位, 序号中位, 序号高位），便于消费者确认拿到的是哪一帧。
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = (1920, 1080),
+        latency: float = 0.0,
+        fail_every: int = 0,
+        base_image: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            size: 画面尺寸（宽, 高）
+            latency: 每次截图的模拟耗时（秒）
+            fail_every: 每N次截图失败一次（0表示不失败）
+            base_image: 可选，作为每帧背景的BGR图像（尺寸需与size一致）
+        """
+        self.width, self.height = size
+        self.latency = latency
+        self.fail_every = fail_every
+        self.base_image = base_image
+        self.calls = 0
+        self.frame_index = 0
+
+    @staticmethod
+    def frame_index_of(image: np.ndarray) -> int:
+        """读取画面左上角像素中编码的帧序号"""
+        b, g, r = (int(v) for v in image[0, 0, :3])
+        return b | (g << 8) | (r << 16)
+
+    def __call__(self, out: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if self.fail_every and self.calls % self.fail_every == 0:
+            return None
+        if out is None or out.shape != (self.height, self.width, 3):
+            out = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.frame_index += 1
+        if self.base_image is not None:
+            np.copyto(out, self.base_image)
+        else:
+            out.fill(self.frame_index % 256)
+        idx = self.frame_index
+        out[0, 0] = (idx & 0xFF, (idx >> 8) & 0xFF, (idx >> 16) & 0xFF)
+        return out
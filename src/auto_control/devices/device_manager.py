@@ -4,11 +4,17 @@ from typing import Dict, List, Optional, Tuple
 
 from src.auto_control.devices.adb_device import ADBDevice
 from src.auto_control.devices.base_device import BaseDevice, DeviceState
-from src.auto_control.devices.windows import WindowsDevice
+from src.auto_control.devices.replay_device import ReplayDevice
 from src.auto_control.image.image_processor import ImageProcessor
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock
 from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
 from src.auto_control.utils.display_context import RuntimeDisplayContext
 
+# Windows设备依赖pywin32，非Windows环境（离线基准测试/回放）下不可用
+from src.auto_control.devices.windows import WindowsDevice
+
+WINDOWS_DEVICE_AVAILABLE = WindowsDevice is not None
+
 
 class DeviceManager:
     """
@@ -77,6 +83,8 @@ class DeviceManager:
         self.display_context = display_context
         self.stop_event = stop_event
         self.settings_manager = settings_manager
+        # 设备计时使用的时钟（与Auto的时钟保持一致，见set_clock）
+        self.clock: Clock = SYSTEM_CLOCK
 
         self.logger.info("设备管理器初始化完成")
 
@@ -274,10 +282,10 @@ class DeviceManager:
     # ======================== 设备管理方法 ========================
     def add_device(self, device_uri: str, timeout: float = 10.0) -> bool:
         """
-        添加设备并自动连接（支持Windows/ADB设备）
+        添加设备并自动连接（支持Windows/ADB/回放设备）
 
         Args:
-            device_uri: 设备URI（格式：windows://xxx 或 adb://xxx）
+            device_uri: 设备URI（格式：windows://xxx、adb://xxx 或 replay://<录制路径>）
             timeout: 连接超时时间（秒，默认10s）
 
         Returns:
@@ -304,8 +312,13 @@ class DeviceManager:
             device_type = "Windows"
         elif lower_uri.startswith(("android://", "adb://")):
             device_type = "ADB"
+        elif lower_uri.startswith("replay://"):
+            device_type = "Replay"
         else:
-            self.logger.error(f"添加设备失败：无法识别URI类型 - {device_uri}（支持windows:// / adb://）")
+            self.logger.error(f"添加设备失败：无法识别URI类型 - {device_uri}（支持windows:// / adb:// / replay://）")
+            return False
+        if device_type == "Windows" and not WINDOWS_DEVICE_AVAILABLE:
+            self.logger.error(f"添加设备失败：当前环境缺少pywin32，无法创建Windows设备 - {device_uri}")
             return False
 
         try:
@@ -321,9 +334,30 @@ class DeviceManager:
                     display_context=self.display_context,
                     stop_event=self.stop_event,
                     settings_manager=self.settings_manager,
+                    frame_cache_ms=getattr(self.config, "FRAME_CACHE_MS", 0),
+                    roi_capture=getattr(self.config, "ROI_CAPTURE", True),
+                    capture_fps=getattr(self.config, "CAPTURE_FPS", 0),
+                    capture_buffer_size=getattr(self.config, "CAPTURE_BUFFER_SIZE", 3),
+                    persist_screenshot_strategy=getattr(self.config, "PERSIST_SCREENSHOT_STRATEGY", True),
+                    record_session=getattr(self.config, "RECORD_SESSION", False),
+                    session_keyframe_interval=getattr(self.config, "SESSION_KEYFRAME_INTERVAL", 100),
+                )
+            elif device_type == "Replay":
+                device = ReplayDevice(
+                    device_uri=device_uri,
+                    logger=self.logger,
+                    image_processor=self.image_processor,
+                    coord_transformer=self.coord_transformer,
+                    display_context=self.display_context,
+                    stop_event=self.stop_event,
+                    # 回放画面按截图次数推进，帧缓存会让推进依赖真实耗时，回放始终禁用帧缓存以保证确定性
+                    frame_cache_ms=0,
+                    record_session=getattr(self.config, "RECORD_SESSION", False),
+                    session_keyframe_interval=getattr(self.config, "SESSION_KEYFRAME_INTERVAL", 100),
                 )
             else:  # ADB设备
                 device = ADBDevice(device_uri=device_uri, logger=self.logger)
+            device.use_clock(self.clock)
 
             # 尝试连接设备
             start_time = time.time()
@@ -348,7 +382,9 @@ class DeviceManager:
                 self.logger.error(
                     f"设备连接失败: {device_uri} | " f"耗时: {elapsed_time:.2f}s | " f"错误原因: {error_msg}"
                 )
-                self.logger.error(f"设备连接失败时的详细状态: hwnd={device.hwnd}, last_error={device.last_error}")
+                self.logger.error(
+                    f"设备连接失败时的详细状态: hwnd={getattr(device, 'hwnd', None)}, last_error={device.last_error}"
+                )
                 return False
 
         except Exception as e:
@@ -438,6 +474,17 @@ class DeviceManager:
         )
         return True
 
+    def set_clock(self, clock: Clock) -> None:
+        """
+        设置设备计时使用的时钟（应用到已添加的设备与之后添加的设备）
+
+        Args:
+            clock: 时钟实例，None表示系统时钟
+        """
+        self.clock = clock or SYSTEM_CLOCK
+        for device in self.devices.values():
+            device.use_clock(self.clock)
+
     def sync_active_device_resolution(self) -> bool:
         """
         主动同步当前活动设备的分辨率（供窗口操作后调用）
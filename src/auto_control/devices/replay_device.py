@@ -0,0 +1,679 @@
+"""回放设备：用录制的画面和状态转换脚本代替真实窗口，在无win32环境下确定性地运行/基准测试完整任务
+
+录制为目录或zip归档，根目录下的 replay.json 描述状态机：
+
+    {
+      "version": 1,
+      "resolution": [1920, 1080],          客户区物理分辨率（所有画面尺寸须一致）
+      "dpi_scale": 1.0,
+      "initial_state": "main",
+      "states": {
+        "main": {
+          "frames": ["frames/main.png"],   每次截图依次轮换（循环），模拟动画
+          "transitions": [
+            {"on": "click", "rect": [x, y, w, h], "button": "left", "to": "map"},
+            {"on": "key", "key": "esc", "to": "main"},
+            {"on": "swipe", "rect": [x, y, w, h], "to": "list_bottom"},
+            {"on": "text", "text": "abc", "to": "searched"},
+            {"after_captures": 5, "to": "result"}
+          ]
+        }
+      }
+    }
+
+rect 为基准坐标（与 rois.json 的ROI一致，click/swipe 分别匹配点击点/滑动起点），省略表示任意位置；
+button/key/text 省略表示任意值。输入按顺序匹配第一条规则，未匹配时状态不变；
+after_captures 表示该状态被截图指定次数后自动转换。每次输入都会记录到输入日志。
+"""
+
+import json
+import os
+import time
+import zipfile
+from threading import Event
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+import cv2
+import numpy as np
+
+from src.auto_control.devices.base_device import BaseDevice, DeviceState
+from src.auto_control.image.image_processor import ImageProcessor
+from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
+from src.auto_control.utils.display_context import RuntimeDisplayContext
+from src.core.path_manager import path_manager
+
+REPLAY_MANIFEST = "replay.json"
+REPLAY_VERSION = 1
+REPLAY_URI_PREFIX = "replay://"
+
+
+class ReplayState:
+    """回放状态：画面序列与转换规则"""
+
+    __slots__ = ("name", "frames", "transitions")
+
+    def __init__(self, name: str, frames: List[np.ndarray], transitions: List[Dict[str, Any]]):
+        self.name = name
+        self.frames = frames
+        self.transitions = transitions
+
+
+class ReplayRecording:
+    """回放录制：解析 replay.json 并预先解码全部画面（回放过程中不产生磁盘I/O）"""
+
+    def __init__(
+        self,
+        resolution: Tuple[int, int],
+        dpi_scale: float,
+        initial_state: str,
+        states: Dict[str, ReplayState],
+        source: str = "",
+    ):
+        self.resolution = resolution
+        self.dpi_scale = dpi_scale
+        self.initial_state = initial_state
+        self.states = states
+        self.source = source
+
+    @staticmethod
+    def resolve_path(path: str) -> str:
+        """
+        解析录制路径：存在则直接使用，否则在录制目录（path_manager的recordings）下查找
+
+        Args:
+            path: 录制目录或zip归档路径
+
+        Returns:
+            str: 录制的实际路径
+
+        Raises:
+            FileNotFoundError: 两处均不存在时触发
+        """
+        if os.path.exists(path):
+            return path
+        candidate = os.path.join(path_manager.get("recordings"), path)
+        if os.path.exists(candidate):
+            return candidate
+        raise FileNotFoundError(f"回放录制不存在: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayRecording":
+        """
+        加载录制（目录或zip归档）
+
+        Args:
+            path: 录制路径（相对路径先按当前目录、再按录制目录解析）
+
+        Returns:
+            ReplayRecording: 录制实例
+
+        Raises:
+            FileNotFoundError: 录制或画面文件不存在
+            ValueError: replay.json 格式错误/状态引用无效/画面尺寸不一致
+        """
+        path = cls.resolve_path(path)
+        if os.path.isdir(path):
+
+            def read_bytes(name: str) -> bytes:
+                with open(os.path.join(path, name), "rb") as f:
+                    return f.read()
+
+            return cls._parse(read_bytes, path)
+
+        with zipfile.ZipFile(path) as archive:
+            return cls._parse(archive.read, path)
+
+    @classmethod
+    def _parse(cls, read_bytes, source: str) -> "ReplayRecording":
+        """按 replay.json 解析状态机并解码画面（同名画面只解码一次）"""
+        try:
+            manifest = json.loads(read_bytes(REPLAY_MANIFEST).decode("utf-8"))
+        except KeyError:
+            raise FileNotFoundError(f"回放录制缺少{REPLAY_MANIFEST}: {source}")
+        if manifest.get("version") != REPLAY_VERSION:
+            raise ValueError(f"回放录制版本不支持: {manifest.get('version')}（当前支持{REPLAY_VERSION}）")
+
+        resolution = tuple(int(v) for v in manifest.get("resolution", ()))
+        if len(resolution) != 2 or resolution[0] <= 0 or resolution[1] <= 0:
+            raise ValueError(f"回放录制分辨率无效: {manifest.get('resolution')}")
+        states_cfg = manifest.get("states") or {}
+        initial_state = manifest.get("initial_state") or next(iter(states_cfg), None)
+        if initial_state not in states_cfg:
+            raise ValueError(f"回放录制初始状态不存在: {initial_state}")
+
+        decoded: Dict[str, np.ndarray] = {}
+        states: Dict[str, ReplayState] = {}
+        for name, state_cfg in states_cfg.items():
+            frames = []
+            for frame_name in state_cfg.get("frames") or []:
+                if frame_name not in decoded:
+                    data = np.frombuffer(read_bytes(frame_name), dtype=np.uint8)
+                    image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+                    if image is None:
+                        raise ValueError(f"回放画面解码失败: {frame_name}")
+                    if (image.shape[1], image.shape[0]) != resolution:
+                        raise ValueError(
+                            f"回放画面尺寸与录制分辨率不一致: {frame_name} | "
+                            f"{image.shape[1]}x{image.shape[0]} != {resolution[0]}x{resolution[1]}"
+                        )
+                    decoded[frame_name] = image
+                frames.append(decoded[frame_name])
+            if not frames:
+                raise ValueError(f"回放状态没有画面: {name}")
+            transitions = list(state_cfg.get("transitions") or [])
+            for rule in transitions:
+                if rule.get("to") not in states_cfg:
+                    raise ValueError(f"回放状态转换目标不存在: {name} → {rule.get('to')}")
+            states[name] = ReplayState(name, frames, transitions)
+
+        return cls(
+            resolution=resolution,
+            dpi_scale=float(manifest.get("dpi_scale", 1.0) or 1.0),
+            initial_state=initial_state,
+            states=states,
+            source=source,
+        )
+
+
+class ReplayDevice(BaseDevice):
+    """
+    回放设备控制器：截图返回录制画面，点击/按键/滑动/文本输入按脚本驱动状态转换。
+
+    URI格式：replay://<录制路径>[?start=<初始状态>]，如 replay://runtime/dev/recordings/pvp.zip
+    """
+
+    is_live = False
+
+    def __init__(
+        self,
+        device_uri: str,
+        logger,
+        image_processor: ImageProcessor,
+        coord_transformer: CoordinateTransformer,
+        display_context: RuntimeDisplayContext,
+        stop_event: Event,
+        frame_cache_ms: float = 0.0,
+        record_session: bool = False,
+        session_keyframe_interval: int = 100,
+    ):
+        """
+        初始化回放设备。
+
+        Args:
+            device_uri: 设备URI（replay://<录制路径>[?start=<初始状态>]）
+            logger: 日志记录器对象
+            image_processor: 图像处理器实例，用于模板匹配
+            coord_transformer: 坐标转换器实例
+            display_context: 显示上下文实例（连接时按录制分辨率设置）
+            stop_event: 线程停止事件
+            frame_cache_ms: 帧缓存新鲜度窗口（毫秒），默认0（每次截图都推进画面序列，保证确定性）
+            record_session: 连接后是否录制会话（回放的帧与收到的输入写入归档）
+            session_keyframe_interval: 会话录制关键帧间隔（整帧数）
+
+        Raises:
+            ValueError: 任一必填参数为空或类型不匹配、URI格式错误时触发
+        """
+        super().__init__(device_uri, logger, frame_cache_ms=frame_cache_ms)
+
+        if not logger:
+            raise ValueError("[ReplayDevice.__init__] 参数logger不能为空")
+        if not image_processor:
+            raise ValueError("[ReplayDevice.__init__] 参数image_processor不能为空")
+        if not isinstance(coord_transformer, CoordinateTransformer):
+            raise ValueError("[ReplayDevice.__init__] 参数coord_transformer必须是CoordinateTransformer实例")
+        if not isinstance(display_context, RuntimeDisplayContext):
+            raise ValueError("[ReplayDevice.__init__] 参数display_context必须是RuntimeDisplayContext实例")
+        if not isinstance(stop_event, Event):
+            raise ValueError("[ReplayDevice.__init__] 参数stop_event必须是threading.Event实例")
+        if not device_uri.lower().startswith(REPLAY_URI_PREFIX):
+            raise ValueError(f"[ReplayDevice.__init__] URI格式错误（需以{REPLAY_URI_PREFIX}开头）: {device_uri}")
+
+        self.image_processor = image_processor
+        self.coord_transformer = coord_transformer
+        self.display_context = display_context
+        self.stop_event = stop_event
+        self.record_session = record_session
+        self.session_keyframe_interval = session_keyframe_interval
+        self.hwnd: Optional[int] = None  # 无真实窗口（兼容DeviceManager的日志输出）
+
+        path, _, query = device_uri[len(REPLAY_URI_PREFIX) :].partition("?")
+        self.recording_path = path
+        self.start_state: Optional[str] = (parse_qs(query).get("start") or [None])[0]
+
+        self.recording: Optional[ReplayRecording] = None
+        self.current_state: Optional[str] = None
+        self._state_captures = 0  # 当前状态已被截图的次数
+        self._frame_index = 0
+        self.captures = 0  # 本次连接以来的截图次数（输入日志记录该值，保证重复回放可比对）
+        self.input_log: List[Dict[str, Any]] = []
+        self.transitions = 0
+
+    # -------------------------- 连接管理 --------------------------
+    def connect(self, timeout: float = 10.0) -> bool:
+        """
+        加载录制并进入初始状态。
+
+        Args:
+            timeout: 兼容参数（录制加载不受超时控制）
+
+        Returns:
+            bool: 加载成功返回True，失败返回False
+        """
+        self.clear_last_error()
+        try:
+            start_time = time.time()
+            self.recording = ReplayRecording.load(self.recording_path)
+            start_state = self.start_state or self.recording.initial_state
+            if start_state not in self.recording.states:
+                raise ValueError(f"初始状态不存在: {start_state}")
+            self._enter_state(start_state)
+            self.input_log.clear()
+            self.transitions = 0
+            self.captures = 0
+            self._update_dynamic_window_info()
+            self._update_state(DeviceState.CONNECTED)
+            if self.record_session:
+                self.start_session_recording(keyframe_interval=self.session_keyframe_interval)
+            self.logger.info(
+                f"回放设备连接成功 | 录制: {self.recording.source} | 状态数: {len(self.recording.states)} | "
+                f"初始状态: {start_state} | 分辨率: {self.recording.resolution} | "
+                f"加载耗时: {time.time() - start_time:.2f}s"
+            )
+            return True
+        except Exception as e:
+            self._record_error("connect", f"回放录制加载失败：{str(e)}")
+            self.logger.error(self.last_error)
+            self._update_state(DeviceState.DISCONNECTED)
+            return False
+
+    def disconnect(self) -> bool:
+        """
+        断开回放设备（释放已解码的画面）。
+
+        Returns:
+            bool: 始终返回True
+        """
+        self.invalidate_frame_cache()
+        self.stop_session_recording()
+        self.recording = None
+        self.current_state = None
+        self._update_state(DeviceState.DISCONNECTED)
+        self.logger.info(f"回放设备已断开 | 输入事件: {len(self.input_log)} | 状态转换: {self.transitions}")
+        return True
+
+    def _update_dynamic_window_info(self) -> bool:
+        """
+        按录制分辨率/DPI设置显示上下文（窗口模式，客户区位于原点）。
+
+        Returns:
+            bool: 已加载录制返回True
+        """
+        if not self.recording:
+            return False
+        phys_w, phys_h = self.recording.resolution
+        dpi_scale = max(1.0, self.recording.dpi_scale)
+        self.display_context.update_from_window(
+            is_fullscreen=False,
+            dpi_scale=dpi_scale,
+            client_logical=(int(round(phys_w / dpi_scale)), int(round(phys_h / dpi_scale))),
+            client_physical=(phys_w, phys_h),
+            screen_physical=(phys_w, phys_h),
+            client_origin=(0, 0),
+        )
+        return True
+
+    def get_state(self) -> DeviceState:
+        """
+        获取设备当前状态。
+
+        Returns:
+            DeviceState: 设备状态枚举值
+        """
+        return self.state
+
+    # -------------------------- 状态机 --------------------------
+    def _enter_state(self, name: str) -> None:
+        """进入指定状态（重置该状态的截图计数与画面序号）"""
+        self.current_state = name
+        self._state_captures = 0
+        self._frame_index = 0
+
+    def _transition(self, rule: Dict[str, Any], reason: str) -> None:
+        """按规则转换到目标状态（输入触发的转换由输入方法统一使帧缓存失效）"""
+        target = rule["to"]
+        self.logger.debug(f"[回放] 状态转换 | {self.current_state} → {target} | 触发: {reason}")
+        self._enter_state(target)
+        self.transitions += 1
+
+    def _to_base_point(self, x: float, y: float) -> Tuple[int, int]:
+        """客户区物理坐标 → 基准坐标（窗口模式按轴对齐缩放）"""
+        base_w, base_h = self.display_context.original_base_res
+        phys_w, phys_h = self.recording.resolution
+        return int(round(x * base_w / phys_w)), int(round(y * base_h / phys_h))
+
+    @staticmethod
+    def _rect_contains(rect: Optional[List[int]], point: Optional[Tuple[int, int]]) -> bool:
+        """规则矩形（基准坐标）是否包含点，规则未指定矩形时视为任意位置"""
+        if not rect:
+            return True
+        if point is None:
+            return False
+        x, y, w, h = rect
+        return x <= point[0] < x + w and y <= point[1] < y + h
+
+    def _find_rule(self, event: str, **attrs) -> Optional[Dict[str, Any]]:
+        """
+        在当前状态的转换规则中查找第一条匹配输入事件的规则。
+
+        Args:
+            event: 事件类型（click/key/swipe/text）
+            **attrs: 事件属性（point基准坐标、button、key、text）
+
+        Returns:
+            Optional[Dict]: 匹配的规则，无匹配返回None
+        """
+        for rule in self.recording.states[self.current_state].transitions:
+            if rule.get("on") != event:
+                continue
+            if not self._rect_contains(rule.get("rect"), attrs.get("point")):
+                continue
+            if "button" in rule and rule["button"] != attrs.get("button"):
+                continue
+            if "key" in rule and str(rule["key"]).lower() != str(attrs.get("key", "")).lower():
+                continue
+            if "text" in rule and rule["text"] != attrs.get("text"):
+                continue
+            return rule
+        return None
+
+    def _handle_input(self, event: str, detail: Dict[str, Any]) -> None:
+        """
+        处理一次输入事件：匹配规则、转换状态、记录输入日志。
+
+        Args:
+            event: 事件类型（click/key/swipe/text）
+            detail: 事件详情（写入输入日志，其中point/button/key/text参与规则匹配）
+        """
+        state_before = self.current_state
+        rule = self._find_rule(event, **detail)
+        if rule:
+            self._transition(rule, event)
+        entry = {
+            "seq": len(self.input_log) + 1,
+            "type": event,
+            **detail,
+            "from": state_before,
+            "to": self.current_state,
+            "captures": self.captures,
+        }
+        self.input_log.append(entry)
+        self._record_session_input(event, **detail, state=self.current_state)
+        self.logger.info(
+            f"[回放输入] #{entry['seq']} {event} | {detail} | 状态: {state_before} → {self.current_state}"
+            f"{'' if rule else '（未触发转换）'}"
+        )
+
+    def _next_frame(self) -> Optional[np.ndarray]:
+        """返回当前状态的下一帧画面，并按截图次数触发自动转换"""
+        if not self.recording or not self.current_state:
+            return None
+        for rule in self.recording.states[self.current_state].transitions:
+            after = rule.get("after_captures")
+            if after is not None and self._state_captures >= int(after):
+                self._transition(rule, f"截图{self._state_captures}次")
+                break
+        frames = self.recording.states[self.current_state].frames
+        frame = frames[self._frame_index % len(frames)]
+        self._frame_index += 1
+        self._state_captures += 1
+        self.captures += 1
+        if self.session_recorder:
+            self.session_recorder.record_frame(frame)
+        return frame
+
+    # -------------------------- 核心功能方法 --------------------------
+    def capture_screen(self, roi: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
+        """
+        返回当前状态的录制画面（整帧，坐标系与真实截图一致；画面由多次截图共享，调用方不得原地修改）。
+
+        Args:
+            roi: 兼容参数（回放画面已在内存中，始终返回整帧）
+
+        Returns:
+            Optional[np.ndarray]: 录制画面（BGR格式），未连接返回None
+        """
+        return self._capture_with_cache(self._next_frame)
+
+    def _resolve_click_point(
+        self, pos: Union[Tuple[int, int], str, List[str]], coord_type: Any, roi: Optional[Tuple[int, int, int, int]]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        将点击位置解析为客户区物理坐标（模板名称先匹配当前画面）。
+
+        Args:
+            pos: 坐标元组、模板名称或模板名称列表
+            coord_type: 坐标类型（CoordType枚举或名称字符串，None视为逻辑坐标）
+            roi: 模板匹配的ROI区域
+
+        Returns:
+            Optional[Tuple[int, int]]: 客户区物理坐标，模板未匹配/坐标无效返回None
+        """
+        if isinstance(pos, (str, list)):
+            processed_roi = roi
+            if roi:
+                is_valid, err_msg = self.coord_transformer.validate_roi_format(roi)
+                if not is_valid:
+                    self.logger.warning(f"ROI预处理失败: {err_msg}，切换为全图匹配")
+                    processed_roi = None
+            screen_img = self.capture_frame(processed_roi)
+            templates = [pos] if isinstance(pos, str) else pos
+            match_results = self.image_processor.match_templates(
+                image=screen_img, templates=templates, threshold=0.6, roi=processed_roi
+            )
+            match = next((r for r in match_results if r["bbox"] is not None), None)
+            if match is None:
+                self._record_error("click", f"所有模板匹配失败: {templates}")
+                return None
+            logical = self.coord_transformer.get_rect_center(
+                self.coord_transformer._convert_numpy_to_tuple(match["bbox"])
+            )
+            return self.coord_transformer.convert_client_logical_to_physical(*logical)
+
+        point = self.coord_transformer._convert_numpy_to_tuple(pos)
+        if not isinstance(point, tuple) or len(point) != 2 or point[0] < 0 or point[1] < 0:
+            self._record_error("click", f"点击坐标无效: {pos}")
+            return None
+        coord_name = str(getattr(coord_type, "name", coord_type) or "LOGICAL").upper()
+        if coord_name == "PHYSICAL":
+            return int(point[0]), int(point[1])
+        if coord_name == "BASE":
+            point = self.coord_transformer.convert_original_to_current_client(*point)
+        return self.coord_transformer.convert_client_logical_to_physical(*point)
+
+    @BaseDevice.require_operable
+    def click(
+        self,
+        pos: Union[Tuple[int, int], str, List[str]],
+        click_time: int = 1,
+        duration: float = 0.1,
+        right_click: bool = False,
+        coord_type: Any = None,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+    ) -> bool:
+        """
+        模拟点击：解析点击位置后按次数逐次匹配转换规则（每次点击都基于当时的状态）。
+
+        Args:
+            pos: 点击位置，可以是坐标元组、模板名称或模板名称列表
+            click_time: 点击次数
+            duration: 兼容参数（回放不等待按住时长）
+            right_click: 是否为右键点击
+            coord_type: 坐标类型
+            roi: 可选，感兴趣区域，用于模板匹配
+
+        Returns:
+            bool: 点击位置有效返回True，否则返回False
+        """
+        try:
+            point_phys = self._resolve_click_point(pos, coord_type, roi)
+            if point_phys is None:
+                self.logger.error(self.last_error)
+                return False
+            point = self._to_base_point(*point_phys)
+            for _ in range(max(1, int(click_time))):
+                self._handle_input("click", {"point": point, "button": "right" if right_click else "left"})
+            return True
+        finally:
+            self.invalidate_frame_cache()
+
+    @BaseDevice.require_operable
+    def swipe(
+        self,
+        start_x: int,
+        start_y: int,
+        end_x: int,
+        end_y: int,
+        duration: float = 0.3,
+        steps: int = 10,
+        coord_type: Any = None,
+    ) -> bool:
+        """
+        模拟滑动：按滑动起点匹配转换规则。
+
+        Args:
+            start_x: 起始X坐标
+            start_y: 起始Y坐标
+            end_x: 结束X坐标
+            end_y: 结束Y坐标
+            duration: 兼容参数
+            steps: 兼容参数
+            coord_type: 坐标类型
+
+        Returns:
+            bool: 坐标有效返回True，否则返回False
+        """
+        try:
+            start_phys = self._resolve_click_point((start_x, start_y), coord_type, None)
+            end_phys = self._resolve_click_point((end_x, end_y), coord_type, None)
+            if start_phys is None or end_phys is None:
+                self.logger.error(self.last_error)
+                return False
+            self._handle_input(
+                "swipe", {"point": self._to_base_point(*start_phys), "end": self._to_base_point(*end_phys)}
+            )
+            return True
+        finally:
+            self.invalidate_frame_cache()
+
+    @BaseDevice.require_operable
+    def key_press(self, key: str, duration: float = 0.1) -> bool:
+        """
+        模拟按键：按键名匹配转换规则（不区分大小写）。
+
+        Args:
+            key: 按键名称
+            duration: 兼容参数
+
+        Returns:
+            bool: 始终返回True
+        """
+        try:
+            self._handle_input("key", {"key": key})
+            return True
+        finally:
+            self.invalidate_frame_cache()
+
+    @BaseDevice.require_operable
+    def text_input(self, text: str, interval: float = 0.05) -> bool:
+        """
+        模拟文本输入：输入文本匹配转换规则。
+
+        Args:
+            text: 待输入的文本内容
+            interval: 兼容参数
+
+        Returns:
+            bool: 始终返回True
+        """
+        try:
+            self._handle_input("text", {"text": text})
+            return True
+        finally:
+            self.invalidate_frame_cache()
+
+    def exists(
+        self,
+        template_name: Union[str, List[str]],
+        threshold: float = 0.8,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        检查指定模板是否存在于当前画面，返回匹配到的模板中心点坐标。
+
+        Args:
+            template_name: 模板名称（str）或模板列表（list）
+            threshold: 模板匹配阈值（0-1），默认0.8
+            roi: 模板匹配的ROI区域，None表示全图
+
+        Returns:
+            Optional[Tuple[int, int]]: 匹配到的逻辑中心点坐标，未匹配/失败返回None
+        """
+        self.clear_last_error()
+        try:
+            if not self.is_connected:
+                self._record_error("exists", "设备未连接")
+                self.logger.error(self.last_error)
+                return None
+            processed_roi = roi
+            if roi:
+                is_valid, err_msg = self.coord_transformer.validate_roi_format(roi)
+                if not is_valid:
+                    self.logger.warning(f"ROI无效: {err_msg}，切换为全图搜索")
+                    processed_roi = None
+
+            screen_img = self.capture_frame(processed_roi)
+            templates = [template_name] if isinstance(template_name, str) else template_name
+            match_results = self.image_processor.match_templates(
+                image=screen_img, templates=templates, threshold=threshold, roi=processed_roi
+            )
+            for result in match_results:
+                if result["bbox"] is not None:
+                    match_rect = self.coord_transformer._convert_numpy_to_tuple(result["bbox"])
+                    center_pos = tuple(map(int, self.coord_transformer.get_rect_center(match_rect)))
+                    self.logger.info(
+                        f"模板找到 | 名称: {result['template']} | 匹配矩形: {match_rect} | 逻辑中心点: {center_pos}"
+                    )
+                    return center_pos
+
+            scores = {r["template"]: round(r["score"], 4) for r in match_results}
+            self.logger.debug(f"所有模板未找到: {templates} | 回放状态: {self.current_state} | 匹配分数: {scores}")
+            return None
+        except Exception as e:
+            self._record_error("exists", f"模板检查异常：{str(e)}")
+            self.logger.error(self.last_error, exc_info=True)
+            return None
+
+    # -------------------------- 统计 --------------------------
+    def get_input_log(self) -> List[Dict[str, Any]]:
+        """
+        获取收到的输入事件日志（副本）。
+
+        Returns:
+            List[Dict[str, Any]]: 按顺序的输入事件（类型、参数、转换前后状态、此前的截图次数）
+        """
+        return [dict(entry) for entry in self.input_log]
+
+    def get_replay_stats(self) -> Dict[str, Any]:
+        """
+        获取回放统计。
+
+        Returns:
+            Dict[str, Any]: 当前状态、截图次数、输入事件数、状态转换次数
+        """
+        return {
+            "state": self.current_state,
+            "captures": self.captures,
+            "inputs": len(self.input_log),
+            "transitions": self.transitions,
+        }
@@ -0,0 +1,179 @@
+"""截图策略检测结果持久化：按窗口类名/进程名/客户区分辨率/DPI/截图模式记录最优截图方法
+
+完整检测需要激活窗口、多次截图并计算SSIM，耗时数秒；命中记录时只需用记录的方法截一帧做有效性检查。
+
+记录文件结构（JSON）：
+    version   格式版本
+    entries   键 → {best_method, available_methods, mode, timings_ms, similarity, detect_ms, detected_at, hits}
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+STRATEGY_STORE_VERSION = 1
+
+
+def strategy_key(
+    window_class: str, exe_name: str, client_size: Tuple[int, int], dpi_scale: float, screenshot_mode: Optional[str]
+) -> str:
+    """
+    生成截图策略记录键
+
+    Args:
+        window_class: 窗口类名
+        exe_name: 进程可执行文件名（未知时为空字符串）
+        client_size: 客户区物理分辨率（宽, 高）
+        dpi_scale: DPI缩放因子
+        screenshot_mode: 检测时的截图模式（background/foreground，None视为foreground）
+
+    Returns:
+        str: 记录键
+    """
+    return (
+        f"{window_class}|{exe_name.lower()}|{int(client_size[0])}x{int(client_size[1])}|"
+        f"{float(dpi_scale):.2f}|{screenshot_mode or 'foreground'}"
+    )
+
+
+def context_strategy_key(window_class: str, exe_name: str, display_context, screenshot_mode: Optional[str]) -> str:
+    """
+    按显示上下文生成截图策略记录键（客户区物理分辨率与DPI取自显示上下文，截图模式只区分background/foreground）
+
+    Args:
+        window_class: 窗口类名
+        exe_name: 进程可执行文件名（未知时为空字符串）
+        display_context: 运行时显示上下文（RuntimeDisplayContext）
+        screenshot_mode: 当前截图模式（background以外均视为foreground）
+
+    Returns:
+        str: 记录键
+    """
+    return strategy_key(
+        window_class,
+        exe_name,
+        display_context.client_physical_res,
+        display_context.dpi_scale,
+        "background" if screenshot_mode == "background" else "foreground",
+    )
+
+
+class ScreenshotStrategyStore:
+    """截图策略检测结果记录（线程安全，每次更新立即原子落盘）"""
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: 记录文件路径
+            logger: 日志实例
+        """
+        self.path = path
+        self.logger = logger or logging.getLogger("ScreenshotStrategyStore")
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 串行落盘：多个线程共用同一个临时文件
+        self.load()
+
+    def load(self) -> None:
+        """从文件加载记录（文件缺失/损坏/版本不一致时从空记录开始）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"截图策略记录读取失败，重新检测 | 路径: {self.path} | 错误: {str(e)}")
+            return
+        if data.get("version") != STRATEGY_STORE_VERSION:
+            self.logger.info(f"截图策略记录版本不一致，丢弃旧记录 | 路径: {self.path}")
+            return
+        self._entries = data.get("entries", {})
+
+    def save(self) -> bool:
+        """
+        落盘记录（原子替换）
+
+        Returns:
+            bool: 写入成功返回True
+        """
+        with self._save_lock:
+            with self._lock:
+                payload = json.dumps(
+                    {"version": STRATEGY_STORE_VERSION, "entries": self._entries}, ensure_ascii=False, indent=2
+                )
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+                return True
+            except Exception as e:
+                self.logger.warning(f"截图策略记录保存失败 | 路径: {self.path} | 错误: {str(e)}")
+                return False
+
+    def get(self, key: str) -> Optional[Dict]:
+        """获取记录，无记录返回None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry else None
+
+    def put(self, key: str, entry: Dict) -> None:
+        """
+        写入检测结果并落盘
+
+        Args:
+            key: 记录键（strategy_key生成）
+            entry: 检测结果（best_method、available_methods、mode、timings_ms、similarity、detect_ms）
+        """
+        with self._lock:
+            self._entries[key] = {
+                **entry,
+                "detected_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "hits": 0,
+            }
+        self.save()
+
+    def record_hit(self, key: str) -> None:
+        """记录一次复用（命中次数+1并落盘）"""
+        with self._lock:
+            if key not in self._entries:
+                return
+            self._entries[key]["hits"] = self._entries[key].get("hits", 0) + 1
+        self.save()
+
+    def invalidate(self, key: str) -> None:
+        """删除记录（有效性检查失败时调用）并落盘"""
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return
+        self.save()
+
+    def resolve(self, key: str, verify: Callable[[Dict], bool], detect: Callable[[], Dict]) -> Tuple[Dict, bool]:
+        """
+        获取截图策略：记录存在且有效性检查通过时复用（命中次数+1），否则删除记录、执行完整检测并记录结果
+
+        Args:
+            key: 记录键
+            verify: 有效性检查（参数为记录，返回是否可复用）
+            detect: 完整检测（返回检测结果，见put）
+
+        Returns:
+            Tuple[Dict, bool]: (记录, 是否复用了已有记录)
+        """
+        entry = self.get(key)
+        if entry:
+            if verify(entry):
+                self.record_hit(key)
+                return entry, True
+            self.logger.warning(f"截图策略记录有效性检查失败，重新检测 | 记录: {key}")
+            self.invalidate(key)
+
+        start_time = time.time()
+        detected = detect()
+        self.put(key, {**detected, "detect_ms": round((time.time() - start_time) * 1000, 1)})
+        return self.get(key), False
@@ -0,0 +1,594 @@
+"""会话录制：把运行中截取的每一帧、每次输入事件及时间戳写入单个归档，用于复现慢/不稳定的运行
+
+截图线程只把帧引用放入队列（截图返回的都是新数组，调用方不会原地修改），编码在后台写入线程完成，
+单次截图增加的开销为入队耗时（微秒级，队列满时等待写入线程）。
+整帧按关键帧 + 差分帧编码：差分帧只保存相对上一个关键帧变化的图块（默认64x64），
+距上一关键帧超过指定帧数或变化图块超过一半时写入新的关键帧，读取任意帧最多解码一个关键帧和一个差分帧。
+ROI截图（只截取了ROI区域）单独保存裁剪图与区域，读取时还原为与截图时一致的画布（ROI外像素为0）。
+
+归档结构（小端）：
+    文件头   MAGIC | 版本(H) | 元数据长度(I) | 元数据JSON（创建时间、图块尺寸、设备信息等）
+    记录     类型(B) | 相对时间戳秒(d) | 负载长度(I) | 负载
+             KEYFRAME  高(H) 宽(H) | PNG
+             DELTA     高(H) 宽(H) 图块尺寸(H) 关键帧序号(I) 图块数(I) | 图块序号(uint32数组) | 图块竖向拼接的PNG
+             ROI       整帧高(H) 整帧宽(H) x(H) y(H) | 裁剪区域PNG
+             EVENT     JSON（事件类型、参数、此前已录制的帧数）
+             INDEX     帧数(I) 事件数(I) | 帧索引(时间戳, 偏移, 关键帧偏移) | 事件索引(时间戳, 偏移)
+    文件尾   INDEX记录偏移(Q) | END_MAGIC
+正常关闭时写入索引与文件尾，读取时按时间戳二分查找（O(log n)）；进程异常退出没有索引时顺序扫描重建（忽略截断的末条记录）。
+纯numpy/cv2实现，不依赖win32。
+"""
+
+import bisect
+import datetime
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+SESSION_MAGIC = b"BDSR"
+SESSION_END_MAGIC = b"BDSE"
+SESSION_VERSION = 1
+SESSION_SUFFIX = ".bdsr"
+
+KIND_KEYFRAME = 1
+KIND_DELTA = 2
+KIND_ROI = 3
+KIND_EVENT = 4
+KIND_INDEX = 5
+
+_HEADER = struct.Struct("<4sHI")
+_RECORD = struct.Struct("<BdI")
+_KEYFRAME = struct.Struct("<HH")
+_DELTA = struct.Struct("<HHHII")
+_ROI = struct.Struct("<HHHH")
+_INDEX = struct.Struct("<II")
+_TRAILER = struct.Struct("<Q4s")
+
+_FRAME_INDEX_DTYPE = np.dtype([("t", "<f8"), ("offset", "<u8"), ("key_offset", "<u8")])
+_EVENT_INDEX_DTYPE = np.dtype([("t", "<f8"), ("offset", "<u8")])
+
+_PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]  # 低压缩级别：编码速度优先（差分帧本身已很小）
+_STOP = object()
+
+
+def _encode_png(image: np.ndarray) -> bytes:
+    """无损PNG编码"""
+    ok, buf = cv2.imencode(".png", image, _PNG_PARAMS)
+    if not ok:
+        raise ValueError(f"帧编码失败: {image.shape}")
+    return buf.tobytes()
+
+
+def _decode_png(data: bytes) -> np.ndarray:
+    """PNG解码为BGR图像"""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("帧解码失败")
+    return image
+
+
+def changed_tiles(frame: np.ndarray, keyframe: np.ndarray, tile_size: int) -> np.ndarray:
+    """
+    计算相对关键帧发生变化的图块序号（按行优先编号，边缘不足一块的部分单独成块）
+
+    Args:
+        frame: 当前帧（BGR）
+        keyframe: 关键帧（与当前帧同尺寸）
+        tile_size: 图块边长
+
+    Returns:
+        np.ndarray: 变化图块序号（uint32，升序）
+    """
+    # 逐像素差值按行展开为 (h, w*3)，先按图块行取最大值，再按图块列归约（均为连续内存上的向量化操作）
+    h, w = frame.shape[:2]
+    diff = cv2.absdiff(frame, keyframe).reshape(h, -1)
+    full_rows = h // tile_size
+    parts = []
+    if full_rows:
+        parts.append(diff[: full_rows * tile_size].reshape(full_rows, tile_size, -1).max(axis=1))
+    if h % tile_size:
+        parts.append(diff[full_rows * tile_size :].max(axis=0, keepdims=True))
+    row_max = np.vstack(parts)
+    channels = diff.shape[1] // w
+    tiles = np.maximum.reduceat(row_max, np.arange(0, w * channels, tile_size * channels), axis=1)
+    return np.flatnonzero(tiles).astype(np.uint32)
+
+
+class SessionRecorder:
+    """会话录制器（后台线程编码写入，线程安全）"""
+
+    def __init__(
+        self,
+        path: str,
+        tile_size: int = 64,
+        keyframe_interval: int = 100,
+        max_queue: int = 16,
+        metadata: Optional[Dict[str, Any]] = None,
+        logger=None,
+    ):
+        """
+        Args:
+            path: 归档文件路径
+            tile_size: 差分图块边长（像素）
+            keyframe_interval: 关键帧间隔（整帧数）
+            max_queue: 待写入队列长度（队列满时截图线程等待写入线程）
+            metadata: 写入文件头的附加元数据（设备URI、分辨率等）
+            logger: 日志实例（可选）
+        """
+        self.path = path
+        self.tile_size = max(8, int(tile_size))
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.metadata = dict(metadata or {})
+        self.logger = logger
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._start_time = 0.0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 写入线程状态
+        self._keyframe: Optional[np.ndarray] = None
+        self._keyframe_seq = 0
+        self._keyframe_offset = 0
+        self._frames_since_key = 0
+        self._frame_index: List[Tuple[float, int, int]] = []
+        self._event_index: List[Tuple[float, int]] = []
+
+        # 统计
+        self.frames_queued = 0
+        self.events_queued = 0
+        self.keyframes = 0
+        self.delta_frames = 0
+        self.roi_frames = 0
+        self.raw_bytes = 0
+        self.write_errors = 0
+        self._enqueue_time_total = 0.0
+        self._enqueue_time_max = 0.0
+        self._encode_time_total = 0.0
+
+    # -------------------------- 生命周期 --------------------------
+    @property
+    def is_recording(self) -> bool:
+        """是否正在录制"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "SessionRecorder":
+        """
+        创建归档、写入文件头并启动写入线程
+
+        Returns:
+            SessionRecorder: 自身（便于链式调用）
+        """
+        if self.is_recording:
+            return self
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._start_time = time.monotonic()
+        header = {
+            **self.metadata,
+            "created_at": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "tile_size": self.tile_size,
+            "keyframe_interval": self.keyframe_interval,
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        self._file.write(_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, len(header_bytes)))
+        self._file.write(header_bytes)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+        if self.logger:
+            self.logger.info(
+                f"会话录制已开始 | 路径: {self.path} | 图块: {self.tile_size} | 关键帧间隔: {self.keyframe_interval}"
+            )
+        return self
+
+    def close(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        等待队列写完，写入索引与文件尾并关闭归档
+
+        Args:
+            timeout: 等待写入线程完成的最长时间（秒）
+
+        Returns:
+            Dict[str, Any]: 录制统计（见 get_stats）
+        """
+        with self._lock:
+            if self._closed:
+                return self.get_stats()
+            self._closed = True
+        if self._thread:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+        if self._file:
+            try:
+                self._write_index()
+            except Exception as e:
+                self.write_errors += 1
+                if self.logger:
+                    self.logger.warning(f"会话录制索引写入失败（读取时将顺序扫描重建）: {str(e)}")
+            self._file.close()
+            self._file = None
+        self._keyframe = None
+        stats = self.get_stats()
+        if self.logger:
+            self.logger.info(f"会话录制已结束 | 路径: {self.path} | 统计: {stats}")
+        return stats
+
+    # -------------------------- 录制接口（截图/输入线程调用） --------------------------
+    def record_frame(
+        self,
+        image: Optional[np.ndarray],
+        region: Optional[Tuple[int, int, int, int]] = None,
+        full_size: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """
+        录制一帧（只入队，编码在写入线程完成；调用方之后不得原地修改该图像）
+
+        Args:
+            image: 截图图像（BGR）
+            region: 只截取ROI时的物理截取区域 (x, y, w, h)，None表示整帧
+            full_size: 只截取ROI时的客户区物理尺寸（宽, 高），用于读取时还原画布
+        """
+        if image is None or self._closed or not self.is_recording:
+            return
+        start = time.perf_counter()
+        timestamp = time.monotonic() - self._start_time
+        self._queue.put((KIND_ROI if region else KIND_KEYFRAME, timestamp, image, region, full_size))
+        elapsed = time.perf_counter() - start
+        self.frames_queued += 1
+        self._enqueue_time_total += elapsed
+        self._enqueue_time_max = max(self._enqueue_time_max, elapsed)
+
+    def record_event(self, event: str, **detail) -> None:
+        """
+        录制一次输入事件
+
+        Args:
+            event: 事件类型（click/swipe/key_press/text_input等）
+            **detail: 事件参数（需可JSON序列化，不可序列化的值按字符串保存）
+        """
+        if self._closed or not self.is_recording:
+            return
+        timestamp = time.monotonic() - self._start_time
+        payload = {"event": event, **detail, "frame": self.frames_queued}
+        self._queue.put((KIND_EVENT, timestamp, payload, None, None))
+        self.events_queued += 1
+
+    # -------------------------- 写入线程 --------------------------
+    def _run(self) -> None:
+        """写入循环：依次编码队列中的帧/事件，收到停止标记后退出"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            kind, timestamp, data, region, full_size = item
+            start = time.perf_counter()
+            try:
+                if kind == KIND_EVENT:
+                    self._write_event(timestamp, data)
+                elif kind == KIND_ROI:
+                    self._write_roi(timestamp, data, region, full_size)
+                else:
+                    self._write_frame(timestamp, data)
+            except Exception as e:
+                self.write_errors += 1
+                if self.logger:
+                    self.logger.warning(f"会话录制写入失败: {str(e)}")
+            self._encode_time_total += time.perf_counter() - start
+
+    def _write_record(self, kind: int, timestamp: float, *parts: bytes) -> int:
+        """写入一条记录，返回记录起始偏移"""
+        offset = self._file.tell()
+        self._file.write(_RECORD.pack(kind, timestamp, sum(len(p) for p in parts)))
+        for part in parts:
+            self._file.write(part)
+        return offset
+
+    def _write_frame(self, timestamp: float, image: np.ndarray) -> None:
+        """整帧：尺寸变化/到达关键帧间隔/变化图块过半时写关键帧，否则写差分帧"""
+        h, w = image.shape[:2]
+        self.raw_bytes += image.nbytes
+        key = self._keyframe
+        tiles = None
+        if key is not None and key.shape == image.shape and self._frames_since_key < self.keyframe_interval:
+            tiles = changed_tiles(image, key, self.tile_size)
+            total_tiles = -(-h // self.tile_size) * -(-w // self.tile_size)
+            if len(tiles) * 2 > total_tiles:
+                tiles = None
+
+        if tiles is None:
+            offset = self._write_record(KIND_KEYFRAME, timestamp, _KEYFRAME.pack(h, w), _encode_png(image))
+            self._keyframe = image
+            self._keyframe_seq = len(self._frame_index)
+            self._keyframe_offset = offset
+            self._frames_since_key = 0
+            self.keyframes += 1
+            self._frame_index.append((timestamp, offset, offset))
+            return
+
+        size = self.tile_size
+        cols = -(-w // size)
+        stack = np.zeros((max(1, len(tiles)) * size, size, 3), dtype=np.uint8)
+        for i, tile in enumerate(tiles):
+            y, x = (int(tile) // cols) * size, (int(tile) % cols) * size
+            block = image[y : y + size, x : x + size]
+            stack[i * size : i * size + block.shape[0], : block.shape[1]] = block
+        offset = self._write_record(
+            KIND_DELTA,
+            timestamp,
+            _DELTA.pack(h, w, size, self._keyframe_seq, len(tiles)),
+            tiles.tobytes(),
+            _encode_png(stack),
+        )
+        self._frames_since_key += 1
+        self.delta_frames += 1
+        self._frame_index.append((timestamp, offset, self._keyframe_offset))
+
+    def _write_roi(
+        self, timestamp: float, image: np.ndarray, region: Tuple[int, int, int, int], full_size: Tuple[int, int]
+    ) -> None:
+        """ROI截图：保存裁剪图与区域（不参与关键帧/差分）"""
+        self.raw_bytes += image.nbytes
+        full_w, full_h = full_size or (region[0] + image.shape[1], region[1] + image.shape[0])
+        offset = self._write_record(
+            KIND_ROI, timestamp, _ROI.pack(full_h, full_w, region[0], region[1]), _encode_png(image)
+        )
+        self.roi_frames += 1
+        self._frame_index.append((timestamp, offset, offset))
+
+    def _write_event(self, timestamp: float, payload: Dict[str, Any]) -> None:
+        """输入事件：JSON（不可序列化的值按字符串保存）"""
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        offset = self._write_record(KIND_EVENT, timestamp, data)
+        self._event_index.append((timestamp, offset))
+
+    def _write_index(self) -> None:
+        """写入索引记录与文件尾"""
+        frames = np.array(self._frame_index, dtype=_FRAME_INDEX_DTYPE)
+        events = np.array(self._event_index, dtype=_EVENT_INDEX_DTYPE)
+        offset = self._write_record(
+            KIND_INDEX,
+            time.monotonic() - self._start_time,
+            _INDEX.pack(len(frames), len(events)),
+            frames.tobytes(),
+            events.tobytes(),
+        )
+        self._file.write(_TRAILER.pack(offset, SESSION_END_MAGIC))
+
+    # -------------------------- 统计 --------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取录制统计
+
+        Returns:
+            Dict[str, Any]: 帧数（关键帧/差分帧/ROI帧）、事件数、待写入队列长度、
+                            入队平均/最大耗时（截图线程开销）、编码平均耗时、原始/归档字节数与压缩比
+        """
+        written = self.keyframes + self.delta_frames + self.roi_frames
+        archive_bytes = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            "frames": self.frames_queued,
+            "keyframes": self.keyframes,
+            "delta_frames": self.delta_frames,
+            "roi_frames": self.roi_frames,
+            "events": self.events_queued,
+            "pending": self._queue.qsize(),
+            "enqueue_avg_ms": (
+                round(self._enqueue_time_total / self.frames_queued * 1000, 3) if self.frames_queued else 0.0
+            ),
+            "enqueue_max_ms": round(self._enqueue_time_max * 1000, 3),
+            "encode_avg_ms": round(self._encode_time_total / written * 1000, 3) if written else 0.0,
+            "raw_bytes": self.raw_bytes,
+            "archive_bytes": archive_bytes,
+            "compression_ratio": round(self.raw_bytes / archive_bytes, 1) if archive_bytes else 0.0,
+            "write_errors": self.write_errors,
+        }
+
+
+class SessionReader:
+    """会话归档读取器：按帧序号/时间戳随机访问帧，按时间范围查询输入事件"""
+
+    def __init__(self, path: str):
+        """
+        打开归档并加载索引（无索引时顺序扫描重建）
+
+        Args:
+            path: 归档文件路径
+
+        Raises:
+            ValueError: 文件格式/版本不支持时触发
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            magic, version, header_len = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != SESSION_MAGIC:
+                raise ValueError(f"不是会话录制归档: {path}")
+            if version != SESSION_VERSION:
+                raise ValueError(f"会话录制版本不支持: {version}（当前支持{SESSION_VERSION}）")
+            self.metadata: Dict[str, Any] = json.loads(self._file.read(header_len).decode("utf-8"))
+            self._data_start = self._file.tell()
+            self.recovered = False  # 索引是否由顺序扫描重建
+            if not self._load_index():
+                self._scan_index()
+                self.recovered = True
+        except Exception:
+            self._file.close()
+            raise
+        self._frame_times: List[float] = self._frames["t"].tolist()
+        self._event_times: List[float] = self._events["t"].tolist()
+        self._key_cache: Tuple[int, Optional[np.ndarray]] = (-1, None)
+
+    def __enter__(self) -> "SessionReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭归档文件"""
+        self._file.close()
+
+    @property
+    def frame_count(self) -> int:
+        """帧数（含ROI帧）"""
+        return len(self._frames)
+
+    @property
+    def event_count(self) -> int:
+        """输入事件数"""
+        return len(self._events)
+
+    @property
+    def duration(self) -> float:
+        """录制时长（秒，最后一帧/事件的时间戳）"""
+        last = [times[-1] for times in (self._frame_times, self._event_times) if times]
+        return max(last) if last else 0.0
+
+    # -------------------------- 索引 --------------------------
+    def _read_record(self, offset: int) -> Tuple[int, float, bytes]:
+        """读取指定偏移的记录"""
+        self._file.seek(offset)
+        kind, timestamp, length = _RECORD.unpack(self._file.read(_RECORD.size))
+        payload = self._file.read(length)
+        if len(payload) != length:
+            raise ValueError(f"记录不完整: 偏移{offset}")
+        return kind, timestamp, payload
+
+    def _load_index(self) -> bool:
+        """从文件尾定位索引记录，文件尾无效时返回False"""
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size - self._data_start < _TRAILER.size:
+            return False
+        self._file.seek(size - _TRAILER.size)
+        index_offset, end_magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if end_magic != SESSION_END_MAGIC or not self._data_start <= index_offset < size:
+            return False
+        kind, _, payload = self._read_record(index_offset)
+        if kind != KIND_INDEX:
+            return False
+        frame_count, event_count = _INDEX.unpack_from(payload)
+        frames_end = _INDEX.size + frame_count * _FRAME_INDEX_DTYPE.itemsize
+        self._frames = np.frombuffer(payload, dtype=_FRAME_INDEX_DTYPE, count=frame_count, offset=_INDEX.size)
+        self._events = np.frombuffer(payload, dtype=_EVENT_INDEX_DTYPE, count=event_count, offset=frames_end)
+        return True
+
+    def _scan_index(self) -> None:
+        """顺序扫描记录重建索引（录制未正常关闭时），遇到截断的记录即停止"""
+        frames, events = [], []
+        key_offset = 0
+        offset = self._data_start
+        while True:
+            self._file.seek(offset)
+            head = self._file.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                break
+            kind, timestamp, length = _RECORD.unpack(head)
+            if kind not in (KIND_KEYFRAME, KIND_DELTA, KIND_ROI, KIND_EVENT) or len(self._file.read(length)) < length:
+                break
+            if kind == KIND_KEYFRAME:
+                key_offset = offset
+            if kind == KIND_EVENT:
+                events.append((timestamp, offset))
+            else:
+                frames.append((timestamp, offset, key_offset if kind == KIND_DELTA else offset))
+            offset += _RECORD.size + length
+        self._frames = np.array(frames, dtype=_FRAME_INDEX_DTYPE)
+        self._events = np.array(events, dtype=_EVENT_INDEX_DTYPE)
+
+    # -------------------------- 帧访问 --------------------------
+    def find_frame(self, timestamp: float) -> int:
+        """
+        查找指定时间点显示的帧（时间戳不晚于该时间的最后一帧，二分查找）
+
+        Args:
+            timestamp: 相对录制开始的时间（秒）
+
+        Returns:
+            int: 帧序号，早于第一帧时返回0
+        """
+        return max(0, bisect.bisect_right(self._frame_times, timestamp) - 1)
+
+    def frame_time(self, index: int) -> float:
+        """获取帧的相对时间戳（秒）"""
+        return self._frame_times[index]
+
+    def _decode_keyframe(self, offset: int) -> np.ndarray:
+        """解码关键帧（缓存最近一个，顺序读取差分帧时只解码一次）"""
+        if self._key_cache[0] != offset:
+            _, _, payload = self._read_record(offset)
+            self._key_cache = (offset, _decode_png(payload[_KEYFRAME.size :]))
+        return self._key_cache[1]
+
+    def read_frame(self, index: int) -> Tuple[float, np.ndarray, Dict[str, Any]]:
+        """
+        读取指定帧（最多解码一个关键帧和一个差分帧）
+
+        Args:
+            index: 帧序号（支持负数索引）
+
+        Returns:
+            Tuple[float, np.ndarray, Dict]: (相对时间戳, 图像, 帧信息{"kind": keyframe/delta/roi, "region"}),
+                                            ROI帧返回与截图时一致的画布（ROI外像素为0）
+        """
+        timestamp, offset, key_offset = self._frames[index].tolist()
+        kind, _, payload = self._read_record(offset)
+        if kind == KIND_KEYFRAME:
+            return timestamp, self._decode_keyframe(offset).copy(), {"kind": "keyframe", "region": None}
+        if kind == KIND_ROI:
+            full_h, full_w, x, y = _ROI.unpack_from(payload)
+            crop = _decode_png(payload[_ROI.size :])
+            canvas = np.zeros((full_h, full_w, 3), dtype=np.uint8)
+            canvas[y : y + crop.shape[0], x : x + crop.shape[1]] = crop[: full_h - y, : full_w - x]
+            return timestamp, canvas, {"kind": "roi", "region": (x, y, crop.shape[1], crop.shape[0])}
+
+        h, w, size, _, count = _DELTA.unpack_from(payload)
+        tiles = np.frombuffer(payload, dtype=np.uint32, count=count, offset=_DELTA.size)
+        stack = _decode_png(payload[_DELTA.size + tiles.nbytes :])
+        frame = self._decode_keyframe(key_offset).copy()
+        cols = -(-w // size)
+        for i, tile in enumerate(tiles.tolist()):
+            y, x = (tile // cols) * size, (tile % cols) * size
+            block_h, block_w = min(size, h - y), min(size, w - x)
+            frame[y : y + block_h, x : x + block_w] = stack[i * size : i * size + block_h, :block_w]
+        return timestamp, frame, {"kind": "delta", "region": None, "tiles": count}
+
+    def frame_at(self, timestamp: float) -> Tuple[float, np.ndarray, Dict[str, Any]]:
+        """读取指定时间点显示的帧（见 find_frame/read_frame）"""
+        return self.read_frame(self.find_frame(timestamp))
+
+    def iter_frames(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray, Dict]]:
+        """按顺序迭代帧 [start, end)"""
+        for index in range(start, self.frame_count if end is None else min(end, self.frame_count)):
+            yield self.read_frame(index)
+
+    # -------------------------- 事件访问 --------------------------
+    def events(self, start: float = 0.0, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        查询时间范围 [start, end] 内的输入事件（二分定位范围）
+
+        Args:
+            start: 起始相对时间（秒）
+            end: 结束相对时间（秒），None表示到结尾
+
+        Returns:
+            List[Dict]: 事件列表（含 time 字段）
+        """
+        lo = bisect.bisect_left(self._event_times, start)
+        hi = len(self._event_times) if end is None else bisect.bisect_right(self._event_times, end)
+        result = []
+        for offset in self._events["offset"][lo:hi].tolist():
+            _, timestamp, payload = self._read_record(offset)
+            result.append({"time": timestamp, **json.loads(payload.decode("utf-8"))})
+        return result
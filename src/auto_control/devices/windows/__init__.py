@@ -1,4 +1,9 @@
-from .device import WindowsDevice
 from .constants import CoordType
 
+# WindowsDevice依赖pywin32；非Windows环境下仍可单独导入常量（回放设备/离线基准测试使用CoordType）
+try:
+    from .device import WindowsDevice
+except ImportError:
+    WindowsDevice = None
+
 __all__ = ['WindowsDevice', 'CoordType']
@@ -1,6 +1,6 @@
 import time
 from threading import Event
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import win32api
@@ -9,6 +9,7 @@ import win32gui
 import win32process
 
 from src.auto_control.devices.base_device import BaseDevice, DeviceState
+from src.auto_control.devices.capture_service import FrameCaptureService
 from src.auto_control.image.image_processor import ImageProcessor
 from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
 from src.auto_control.utils.display_context import RuntimeDisplayContext
@@ -18,6 +19,9 @@ from .input_controller import InputController
 from .screenshot_manager import ScreenshotManager
 from .window_manager import WindowManager
 
+# 允许后台截图服务的截图模式：其余模式截图时可能临时激活窗口，后台线程持续截图会反复抢占焦点
+BACKGROUND_CAPTURE_MODES = ("background", "printwindow")
+
 
 class WindowsDevice(BaseDevice):
     """
@@ -44,6 +48,13 @@ class WindowsDevice(BaseDevice):
         display_context: RuntimeDisplayContext,
         stop_event: Event,
         settings_manager=None,
+        frame_cache_ms: float = 0.0,
+        roi_capture: bool = True,
+        capture_fps: float = 0.0,
+        capture_buffer_size: int = 3,
+        persist_screenshot_strategy: bool = True,
+        record_session: bool = False,
+        session_keyframe_interval: int = 100,
     ):
         """
         初始化Windows设备控制器。
@@ -56,11 +67,18 @@ class WindowsDevice(BaseDevice):
             display_context: 显示上下文实例，维护窗口动态信息
             stop_event: 线程停止事件，用于中断阻塞操作
             settings_manager: 设置管理器实例（保留参数以兼容）
+            frame_cache_ms: 帧缓存新鲜度窗口（毫秒），0表示每次都重新截图
+            roi_capture: 指定ROI的只读检查是否只截取ROI区域
+            capture_fps: 后台截图帧率，0表示不启用后台截图（检查时同步截图）
+            capture_buffer_size: 后台截图环形缓冲槽位数
+            persist_screenshot_strategy: 是否持久化并复用截图策略检测结果
+            record_session: 连接后是否录制会话（截取的帧与输入事件写入归档）
+            session_keyframe_interval: 会话录制关键帧间隔（整帧数）
 
         Raises:
             ValueError: 任一必填参数为空或类型不匹配时触发
         """
-        super().__init__(device_uri)
+        super().__init__(device_uri, frame_cache_ms=frame_cache_ms)
 
         # 必填参数校验
         if not logger:
@@ -81,6 +99,14 @@ class WindowsDevice(BaseDevice):
         self.display_context = display_context
         self.stop_event = stop_event
         self.settings_manager = settings_manager
+        self.roi_capture = roi_capture
+        self.capture_fps = capture_fps
+        self.capture_buffer_size = capture_buffer_size
+        self.persist_screenshot_strategy = persist_screenshot_strategy
+        self.record_session = record_session
+        self.session_keyframe_interval = session_keyframe_interval
+        self.capture_service: Optional[FrameCaptureService] = None
+        self.service_frames = 0  # 由后台截图服务提供的检查帧数
 
         # 窗口基础属性
         self.hwnd: Optional[int] = None
@@ -280,7 +306,7 @@ class WindowsDevice(BaseDevice):
 
                     # 检测截图策略
                     self.screenshot_manager._best_screenshot_strategy = (
-                        self.screenshot_manager._detect_best_screenshot_strategy()
+                        self.screenshot_manager.detect_screenshot_strategy()
                     )
 
                     # 初始化点击模式（默认foreground）
@@ -322,11 +348,13 @@ class WindowsDevice(BaseDevice):
                     # 同步hwnd属性，确保device.hwnd与window_manager.hwnd保持一致
                     self.hwnd = self.window_manager.hwnd
                     self._update_state(DeviceState.CONNECTED)
+                    if self.record_session:
+                        self.start_session_recording(keyframe_interval=self.session_keyframe_interval)
+                    self._start_capture_service()
                     self.logger.info(
                         f"Windows设备连接成功 | "
                         f"标题: {self.window_manager.window_title} | 句柄: {self.window_manager.hwnd} | "
-                        f"类名: {self.window_manager.
-                    window_class} | PID: {self.window_manager.process_id} | "
+                        f"类名: {self.window_manager.window_class} | PID: {self.window_manager.process_id} | "
                         f"截图策略: {self.screenshot_manager._best_screenshot_strategy} | 截图模式: {self.screenshot_manager._screenshot_mode} | "
                         f"点击模式: {self._click_mode}"
                     )
@@ -355,6 +383,8 @@ class WindowsDevice(BaseDevice):
             bool: 断开成功返回True
         """
         self.clear_last_error()
+        self._stop_capture_service()
+        self.stop_session_recording()
 
         if self.window_manager.hwnd:
             self.logger.info(
@@ -381,6 +411,7 @@ class WindowsDevice(BaseDevice):
             self.screenshot_manager._best_screenshot_strategy = None
             self.screenshot_manager._screenshot_mode = None
             self._click_mode = None
+            self.invalidate_frame_cache()
 
             self._update_state(DeviceState.DISCONNECTED)
             return True
@@ -402,13 +433,122 @@ class WindowsDevice(BaseDevice):
         """
         屏幕截图，支持多种截图策略和ROI裁剪。
 
+        全屏截图经过帧缓存：新鲜度窗口内且期间没有输入操作时复用上一帧（调用方不得原地修改返回的图像）。
+
         Args:
             roi: 可选，感兴趣区域，格式为(x, y, width, height)
 
         Returns:
             Optional[np.ndarray]: 截图图像（BGR格式），失败返回None
         """
-        return self.screenshot_manager.capture_screen(roi)
+        if roi is not None:
+            return self.screenshot_manager.capture_screen(roi)
+        return self._capture_with_cache(self.screenshot_manager.capture_screen)
+
+    def capture_frame(self, roi: Optional[Tuple[int, int, int, int]] = None, expand: int = 0) -> Optional[np.ndarray]:
+        """
+        供只读检查使用的截图：优先复用有效的缓存帧；指定ROI时只截取该区域，
+        放入客户区尺寸的画布返回（ROI外像素为0，坐标与整帧一致，不写入帧缓存）。
+
+        Args:
+            roi: 检查所用的感兴趣区域，格式为(x, y, width, height)，None表示全屏
+            expand: 只截取ROI时向四周扩展的物理像素数（OCR按扩展后的区域裁剪）
+
+        Returns:
+            Optional[np.ndarray]: 截图图像（BGR格式），失败返回None
+        """
+        service_frame = self._get_service_frame()
+        if service_frame is not None:
+            return service_frame
+        if roi is None or not self.roi_capture:
+            return self.capture_screen()
+        cached = self._get_cached_frame()
+        if cached is not None:
+            return cached
+        with self._frame_lock:
+            self.frame_captures += 1
+            self.roi_captures += 1
+        return self.screenshot_manager.capture_roi_frame(roi, expand)
+
+    # -------------------------- 后台截图 --------------------------
+    def _background_capture_allowed(self) -> bool:
+        """当前截图模式是否允许后台截图服务（仅background/printwindow，截图不会激活窗口）"""
+        return self.screenshot_manager._screenshot_mode in BACKGROUND_CAPTURE_MODES
+
+    def _service_capture(self) -> Optional[np.ndarray]:
+        """后台截图服务的帧源：截图模式切换为可能激活窗口的模式后不再截图"""
+        if not self._background_capture_allowed():
+            return None
+        return self.screenshot_manager.capture_screen()
+
+    def _start_capture_service(self) -> None:
+        """按配置启动后台截图服务（capture_fps为0或截图模式不是background/printwindow时不启用）"""
+        if self.capture_fps <= 0 or (self.capture_service and self.capture_service.is_running):
+            return
+        if not self._background_capture_allowed():
+            mode = self.screenshot_manager._screenshot_mode
+            self.logger.info(f"截图模式 {mode} 可能激活窗口，不启用后台截图（仅支持background/printwindow）")
+            return
+        self.capture_service = FrameCaptureService(
+            frame_source=lambda out: self._service_capture(),
+            fps=self.capture_fps,
+            buffer_size=self.capture_buffer_size,
+            logger=self.logger,
+            name="WindowsFrameCapture",
+        )
+        self.capture_service.start()
+
+    def _stop_capture_service(self) -> None:
+        """停止后台截图服务"""
+        if self.capture_service:
+            self.capture_service.stop()
+            self.capture_service = None
+
+    def _get_service_frame(self) -> Optional[np.ndarray]:
+        """
+        从后台截图服务获取最近一次输入操作之后截取的最新帧。
+
+        Returns:
+            Optional[np.ndarray]: 整帧图像，服务未启用或等待超时返回None（调用方改为同步截图）
+        """
+        service = self.capture_service
+        if not service or not service.is_running or not self._background_capture_allowed():
+            return None
+        latest = service.get_latest_frame(newer_than=self.last_input_time, timeout=max(0.2, 3.0 / self.capture_fps))
+        if latest is None:
+            self.logger.debug("后台截图等待超时，改为同步截图")
+            return None
+        self.service_frames += 1
+        return latest[1]
+
+    def wait_for_frame(self, newer_than: float, timeout: float) -> bool:
+        """
+        等待后台截图服务产出截图开始时间晚于 newer_than 的帧（未启用后台截图时立即返回）。
+
+        Args:
+            newer_than: 时间下限（time.monotonic）
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 有新帧可用返回True
+        """
+        service = self.capture_service
+        if not service or not service.is_running:
+            return True
+        return service.wait_for_frame(newer_than, timeout)
+
+    def get_frame_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取帧缓存统计，启用后台截图时附带后台截图统计。
+
+        Returns:
+            Dict[str, Any]: 帧缓存统计（见BaseDevice.get_frame_cache_stats）
+        """
+        stats = super().get_frame_cache_stats()
+        if self.capture_service:
+            stats["service_frames"] = self.service_frames
+            stats["capture_service"] = self.capture_service.get_stats()
+        return stats
 
     def click(
         self,
@@ -433,7 +573,10 @@ class WindowsDevice(BaseDevice):
         Returns:
             bool: 操作成功返回True，否则返回False
         """
-        return self.input_controller.click(pos, click_time, duration, right_click, coord_type, roi)
+        try:
+            return self.input_controller.click(pos, click_time, duration, right_click, coord_type, roi)
+        finally:
+            self.invalidate_frame_cache()
 
     def swipe(
         self,
@@ -460,7 +603,10 @@ class WindowsDevice(BaseDevice):
         Returns:
             bool: 操作成功返回True，否则返回False
         """
-        return self.input_controller.swipe(start_x, start_y, end_x, end_y, duration, steps, coord_type)
+        try:
+            return self.input_controller.swipe(start_x, start_y, end_x, end_y, duration, steps, coord_type)
+        finally:
+            self.invalidate_frame_cache()
 
     def key_press(self, key: str, duration: float = 0.1) -> bool:
         """
@@ -473,7 +619,10 @@ class WindowsDevice(BaseDevice):
         Returns:
             bool: 操作成功返回True，否则返回False
         """
-        return self.input_controller.key_press(key, duration)
+        try:
+            return self.input_controller.key_press(key, duration)
+        finally:
+            self.invalidate_frame_cache()
 
     def _ensure_window_foreground(self, max_attempts: int = 3) -> bool:
         """
@@ -608,8 +757,10 @@ class WindowsDevice(BaseDevice):
         finally:
             # 模式适配：恢复置顶状态（仅background点击模式生效）
             self.window_manager._restore_window_original_topmost()
+            self.invalidate_frame_cache()
 
         if input_success:
+            self._record_session_input("text_input", text=text)
             # 仅在background模式下且操作成功时恢复原始前台窗口
             if (
                 self._click_mode == "background"
@@ -644,12 +795,6 @@ class WindowsDevice(BaseDevice):
                 self.logger.error(self.last_error)
                 return None
 
-            # 根据截图模式选择对应截图策略
-            screen_img = self.capture_screen()
-            if screen_img is None:
-                self.logger.warning("截图失败，无法执行模板检查")
-                return None
-
             # ROI预处理
             processed_roi = roi
             if roi:
@@ -659,25 +804,35 @@ class WindowsDevice(BaseDevice):
 
                     processed_roi = None
 
+            # 根据截图模式选择对应截图策略（指定ROI时只截取该区域）
+            screen_img = self.capture_frame(processed_roi)
+            if screen_img is None:
+                self.logger.warning("截图失败，无法执行模板检查")
+                return None
+
             # 多模板匹配
             templates = [template_name] if isinstance(template_name, str) else template_name
             self.logger.debug(
                 f"模板检查 | 模板列表: {templates} | 阈值: {threshold} | ROI: {processed_roi} | 截图模式: {self._screenshot_mode} | 点击模式: {self._click_mode}"
             )
 
-            for template in templates:
-                match_result = self.image_processor.match_template(
-                    image=screen_img, template=template, threshold=threshold, roi=processed_roi
-                )
-                if match_result is not None:
+            # 批量匹配：截图仅预处理一次，返回全部模板分数，按列表顺序取第一个命中项
+            match_results = self.image_processor.match_templates(
+                image=screen_img, templates=templates, threshold=threshold, roi=processed_roi
+            )
+            for result in match_results:
+                if result["bbox"] is not None:
                     # 解析匹配结果
-                    match_rect = self.coord_transformer._convert_numpy_to_tuple(match_result)
+                    match_rect = self.coord_transformer._convert_numpy_to_tuple(result["bbox"])
                     center_pos = self.coord_transformer.get_rect_center(match_rect)
                     center_pos = tuple(map(int, center_pos))
-                    self.logger.info(f"模板找到 | 名称: {template} | 匹配矩形: {match_rect} | 逻辑中心点: {center_pos}")
+                    self.logger.info(
+                        f"模板找到 | 名称: {result['template']} | 匹配矩形: {match_rect} | 逻辑中心点: {center_pos}"
+                    )
                     return center_pos
 
-            self.logger.debug(f"所有模板未找到: {templates}")
+            scores = {r["template"]: round(r["score"], 4) for r in match_results}
+            self.logger.debug(f"所有模板未找到: {templates} | 匹配分数: {scores}")
             return None
         except Exception as e:
             self._record_error("exists", f"模板检查异常：{str(e)}")
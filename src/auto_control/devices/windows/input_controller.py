@@ -112,16 +112,10 @@ class InputController:
         target_pos: Optional[Tuple[int, int]] = None
         ctx = self.device.display_context
         click_source = "直接坐标"
+        matched_template = None
 
         if isinstance(pos, (str, list)):
             click_source = "模板匹配"
-            screen_img = self.device.screenshot_manager.capture_screen()
-            if screen_img is None:
-                self.device._record_error("click", "截图失败，无法执行模板匹配")
-                self.logger.error(self.device.last_error)
-                self.device.window_manager._restore_window_original_topmost()
-                return False
-
             processed_roi = roi
             if roi:
                 is_valid, err_msg = self.device.coord_transformer.validate_roi_format(roi)
@@ -132,15 +126,23 @@ class InputController:
                 # 统一的ROI处理逻辑会根据全屏/窗口模式自动适配不同坐标系统
                 self.logger.debug(f"使用原始ROI: {roi}")
 
+            screen_img = self.device.capture_frame(processed_roi)
+            if screen_img is None:
+                self.device._record_error("click", "截图失败，无法执行模板匹配")
+                self.logger.error(self.device.last_error)
+                self.device.window_manager._restore_window_original_topmost()
+                return False
+
             templates = [pos] if isinstance(pos, str) else pos
             matched_template = None
             match_result = None
-            for template_name in templates:
-                match_result = self.device.image_processor.match_template(
-                    image=screen_img, template=template_name, threshold=0.6, roi=processed_roi
-                )
-                if match_result is not None:
-                    matched_template = template_name
+            match_results = self.device.image_processor.match_templates(
+                image=screen_img, templates=templates, threshold=0.6, roi=processed_roi
+            )
+            for result in match_results:
+                if result["bbox"] is not None:
+                    matched_template = result["template"]
+                    match_result = result["bbox"]
                     break
 
             if match_result is None:
@@ -238,6 +240,16 @@ class InputController:
                 f"点击成功 | 类型: {click_type} | 次数: {click_time} | 按住时长: {duration}s | "
                 f"屏幕坐标: ({screen_x},{screen_y}) | 模式: {'全屏' if ctx.is_fullscreen else '窗口'} | 来源: {click_source}"
             )
+            self.device._record_session_input(
+                "click",
+                pos=[int(logical_x), int(logical_y)],
+                screen=[int(screen_x), int(screen_y)],
+                button="right" if right_click else "left",
+                click_time=click_time,
+                duration=duration,
+                source=click_source,
+                template=matched_template,
+            )
 
             # 仅在background模式下且操作成功时恢复原始前台窗口
             if (
@@ -333,6 +345,9 @@ class InputController:
 
         if swipe_success:
             self.logger.info(f"滑动成功 | 逻辑坐标: {start_pos} → {end_pos} | 时长: {duration}s | 步数: {steps}")
+            self.device._record_session_input(
+                "swipe", start=list(start_pos), end=list(end_pos), duration=duration, steps=steps
+            )
 
             # 仅在background模式下且操作成功时恢复原始前台窗口
             if (
@@ -394,6 +409,7 @@ class InputController:
 
         if press_success:
             self.logger.info(f"按键成功 | 按键: {key} | 按住时长: {duration}s")
+            self.device._record_session_input("key_press", key=key, duration=duration)
 
             # 仅在background模式下且操作成功时恢复原始前台窗口
             if (
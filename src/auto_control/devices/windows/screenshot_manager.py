@@ -1,5 +1,7 @@
 import ctypes
+import sys
 import time
+from threading import RLock
 from typing import Dict, List, Optional, Tuple
 
 import cv2
@@ -7,7 +9,10 @@ import numpy as np
 import win32con
 import win32gui
 import win32ui
-from PIL import Image
+
+from src.auto_control.devices.screenshot_strategy_store import ScreenshotStrategyStore, context_strategy_key
+from src.auto_control.image.frame_buffer import bgrx_to_bgr, bgrx_view, is_black_frame
+from src.core.path_manager import path_manager
 
 
 class ScreenshotManager:
@@ -30,6 +35,13 @@ class ScreenshotManager:
         self._best_screenshot_strategy: Optional[str] = None  # printwindow/bitblt/dxcam/temp_foreground
         self._screenshot_mode: Optional[str] = None  # 截图模式：foreground/background 或具体方法名称
         self._available_screenshot_methods: List[str] = []  # 所有可用的截图方法列表
+        self._last_detection_results: Dict[str, Dict[str, float]] = {}  # 最近一次检测的各方法相似度/耗时
+        self._strategy_store: Optional[ScreenshotStrategyStore] = None
+        # 截图串行化：后台截图服务线程与任务线程共享同一套DC/dxcam资源与窗口激活状态
+        self._capture_lock = RLock()
+        # ROI截图复用的客户区尺寸画布（见capture_roi_frame），及画布上最近一次写入的截取矩形
+        self._roi_canvas: Optional[np.ndarray] = None
+        self._roi_canvas_region: Optional[Tuple[int, int, int, int]] = None
 
         # 临时置顶相关状态
         self._original_window_ex_style: Optional[int] = None
@@ -121,6 +133,95 @@ class ScreenshotManager:
                 return method
         return default_method or method_priority[-1]
 
+    def _process_exe_name(self) -> str:
+        """获取窗口所属进程的可执行文件名（psutil未安装或获取失败时返回空字符串）"""
+        process_id = self.device.window_manager.process_id
+        if not process_id:
+            return ""
+        try:
+            import psutil
+
+            return psutil.Process(process_id).name()
+        except Exception:
+            return ""
+
+    def _verify_stored_strategy(self, entry: Dict, client_w_phys: int, client_h_phys: int) -> bool:
+        """
+        用记录的最优方法截取一帧，检查截图有效（非空且非黑屏）。
+
+        Args:
+            entry: 截图策略记录
+            client_w_phys: 客户区物理宽度
+            client_h_phys: 客户区物理高度
+
+        Returns:
+            bool: 截图有效返回True
+        """
+        capture_methods = {
+            "printwindow": self._try_print_window,
+            "bitblt": self._try_bitblt,
+            "dxcam": self._try_dxcam,
+            "temp_foreground": self._try_temp_foreground_screenshot,
+        }
+        capture = capture_methods.get(entry.get("best_method"))
+        if capture is None:
+            return False
+        img_np = capture(client_w_phys, client_h_phys)
+        return img_np is not None and not is_black_frame(img_np)
+
+    def detect_screenshot_strategy(self) -> str:
+        """
+        获取最优截图策略：优先复用持久化的检测结果（单帧有效性检查通过即可），
+        无记录或检查失败时执行完整检测并记录结果。检测期间与截图串行执行。
+
+        Returns:
+            str: 最优截图策略名称
+        """
+        with self._capture_lock:
+            return self._detect_screenshot_strategy_unlocked()
+
+    def _detect_screenshot_strategy_unlocked(self) -> str:
+        """获取最优截图策略（见detect_screenshot_strategy，调用方持有_capture_lock）"""
+        window_manager = self.device.window_manager
+        if not getattr(self.device, "persist_screenshot_strategy", False) or not window_manager._is_window_ready():
+            return self._detect_best_screenshot_strategy()
+
+        self.device._update_dynamic_window_info()
+        ctx = self.device.display_context
+        client_w_phys, client_h_phys = ctx.client_physical_res
+        if client_w_phys <= 0 or client_h_phys <= 0:
+            return self._detect_best_screenshot_strategy()
+
+        if self._strategy_store is None:
+            self._strategy_store = ScreenshotStrategyStore(path_manager.get("screenshot_strategy"), logger=self.logger)
+        key = context_strategy_key(window_manager.window_class, self._process_exe_name(), ctx, self._screenshot_mode)
+
+        start_time = time.time()
+        entry, reused = self._strategy_store.resolve(
+            key,
+            verify=lambda stored: self._verify_stored_strategy(stored, client_w_phys, client_h_phys),
+            detect=self._detect_strategy_entry,
+        )
+        if reused:
+            self._screenshot_mode = entry.get("mode") or self._screenshot_mode
+            self._available_screenshot_methods = list(entry.get("available_methods") or [entry["best_method"]])
+            self.logger.info(
+                f"复用截图策略记录 | 最优方法: {entry['best_method']} | 可用方法: {self._available_screenshot_methods} | "
+                f"检查耗时: {(time.time() - start_time) * 1000:.1f}ms（完整检测约{entry.get('detect_ms', 0):.0f}ms）"
+            )
+        return entry["best_method"]
+
+    def _detect_strategy_entry(self) -> Dict:
+        """执行完整检测，返回待持久化的检测结果"""
+        best_method = self._detect_best_screenshot_strategy()
+        return {
+            "best_method": best_method,
+            "available_methods": list(self._available_screenshot_methods),
+            "mode": self._screenshot_mode,
+            "timings_ms": {m: r["time_ms"] for m, r in self._last_detection_results.items()},
+            "similarity": {m: r["similarity"] for m, r in self._last_detection_results.items()},
+        }
+
     def _detect_best_screenshot_strategy(self) -> str:
         """
         检测并选择最优截图策略，使用截图相似度比较和性能评估。
@@ -129,6 +230,7 @@ class ScreenshotManager:
             str: 最优截图策略名称
         """
         SIMILARITY_THRESHOLD = 0.85
+        self._last_detection_results = {}
 
         window_manager = self.device.window_manager
         if not window_manager._is_window_ready():
@@ -249,6 +351,10 @@ class ScreenshotManager:
             # 添加temp_foreground到结果
             method_results["temp_foreground"] = {"screenshot": reference_img, "similarity": 1.0, "time": 0.0}
 
+        self._last_detection_results = {
+            method: {"similarity": round(float(data["similarity"]), 4), "time_ms": round(data["time"] * 1000, 1)}
+            for method, data in method_results.items()
+        }
         reliable_methods = []
         unreliable_methods = []
 
@@ -330,16 +436,14 @@ class ScreenshotManager:
                     raise RuntimeError("PrintWindow调用失败")
 
                 bmp_str = bitmap.GetBitmapBits(True)
-                img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                img_np = np.array(img_pil)
-                mean_val = np.mean(img_np)
+                is_black = is_black_frame(bgrx_view(bmp_str, client_w_phys, client_h_phys)[..., :3])
 
                 mem_dc.DeleteDC()
                 mfc_dc.DeleteDC()
                 win32gui.ReleaseDC(window_manager.hwnd, hwnd_dc)
                 win32gui.DeleteObject(bitmap.GetHandle())
 
-                return mean_val > 10
+                return not is_black
             except Exception as e:
                 self.logger.debug(f"PrintWindow检测失败: {e}")
                 return False
@@ -362,9 +466,7 @@ class ScreenshotManager:
                 mem_dc.BitBlt((0, 0), (client_w_phys, client_h_phys), mfc_dc, (0, 0), win32con.SRCCOPY)
 
                 bmp_str = bitmap.GetBitmapBits(True)
-                img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                img_np = np.array(img_pil)
-                mean_val = np.mean(img_np)
+                is_black = is_black_frame(bgrx_view(bmp_str, client_w_phys, client_h_phys)[..., :3])
 
                 mem_dc.DeleteDC()
                 mfc_dc.DeleteDC()
@@ -374,7 +476,7 @@ class ScreenshotManager:
                 if not is_already_foreground and original_foreground and original_foreground != window_manager.hwnd:
                     window_manager._restore_foreground(original_foreground)
 
-                return mean_val > 10
+                return not is_black
             except Exception as e:
                 self.logger.debug(f"BitBlt检测失败: {e}")
                 return False
@@ -401,12 +503,12 @@ class ScreenshotManager:
                 if img_np is None:
                     raise RuntimeError("DXCam返回空图像")
 
-                mean_val = np.mean(img_np)
+                is_black = is_black_frame(img_np)
 
                 if not is_already_foreground and original_foreground and original_foreground != window_manager.hwnd:
                     window_manager._restore_foreground(original_foreground)
 
-                return mean_val > 10
+                return not is_black
             except ImportError:
                 self.logger.debug("dxcam未安装，跳过硬件加速截图检测")
                 return False
@@ -469,13 +571,18 @@ class ScreenshotManager:
         self.logger.info(f"截图策略检测结果（降级模式）：{best_method}（{self._screenshot_mode}模式）")
         return best_method
 
-    def _try_print_window(self, client_w_phys: int, client_h_phys: int) -> Optional[np.ndarray]:
+    def _try_print_window(
+        self, client_w_phys: int, client_h_phys: int, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[np.ndarray]:
         """
         使用PrintWindow方法进行后台截图。
 
+        PrintWindow只能渲染整个窗口，指定region时仅转换该区域的像素。
+
         Args:
             client_w_phys: 客户区物理宽度
             client_h_phys: 客户区物理高度
+            region: 可选，只截取该客户区物理矩形 (x, y, w, h)，None表示整个客户区
 
         Returns:
             Optional[np.ndarray]: 截图图像，失败返回None
@@ -492,11 +599,11 @@ class ScreenshotManager:
                     raise RuntimeError("PrintWindow调用返回失败")
 
                 bmp_str = bitmap.GetBitmapBits(True)
-                img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                img_np = np.array(img_pil)
-                img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+                img_np = bgrx_to_bgr(bmp_str, client_w_phys, client_h_phys, region)
+                # 黑屏检测始终基于整个客户区，避免深色ROI被误判
+                is_black = is_black_frame(bgrx_view(bmp_str, client_w_phys, client_h_phys)[..., :3])
 
-            if np.mean(img_np) < 10:
+            if is_black:
                 raise RuntimeError("PrintWindow截图为黑屏")
             self.logger.debug("使用PrintWindow后台截图成功（仅客户区）")
             return img_np
@@ -504,13 +611,16 @@ class ScreenshotManager:
             self.logger.debug(f"PrintWindow执行失败: {e}")
             return None
 
-    def _try_bitblt(self, client_w_phys: int, client_h_phys: int) -> Optional[np.ndarray]:
+    def _try_bitblt(
+        self, client_w_phys: int, client_h_phys: int, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[np.ndarray]:
         """
         使用BitBlt方法进行前台截图。
 
         Args:
             client_w_phys: 客户区物理宽度
             client_h_phys: 客户区物理高度
+            region: 可选，只截取该客户区物理矩形 (x, y, w, h)，None表示整个客户区
 
         Returns:
             Optional[np.ndarray]: 截图图像，失败返回None
@@ -530,23 +640,21 @@ class ScreenshotManager:
             # 短暂延迟确保窗口重绘完成
             time.sleep(0.05)
 
-            # 直接使用设备上下文进行截图，不嵌套使用DCCtxManager
+            # 直接使用设备上下文进行截图，不嵌套使用DCCtxManager（位图仅分配截取区域大小）
+            cap_x, cap_y, cap_w, cap_h = region or (0, 0, client_w_phys, client_h_phys)
             hwnd_dc = win32gui.GetDC(window_manager.hwnd)
             mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
             mem_dc = mfc_dc.CreateCompatibleDC()
             bitmap = win32ui.CreateBitmap()
-            bitmap.CreateCompatibleBitmap(mfc_dc, client_w_phys, client_h_phys)
+            bitmap.CreateCompatibleBitmap(mfc_dc, cap_w, cap_h)
             mem_dc.SelectObject(bitmap)
 
             # 使用BitBlt复制图像，直接使用CAPTUREBLT常量值确保获取最新内容
             CAPTUREBLT = 0x40000000  # win32con中没有这个常量，直接使用值
-            mem_dc.BitBlt((0, 0), (client_w_phys, client_h_phys), mfc_dc, (0, 0), win32con.SRCCOPY | CAPTUREBLT)
+            mem_dc.BitBlt((0, 0), (cap_w, cap_h), mfc_dc, (cap_x, cap_y), win32con.SRCCOPY | CAPTUREBLT)
 
             # 获取图像数据
-            bmp_str = bitmap.GetBitmapBits(True)
-            img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-            img_np = np.array(img_pil)
-            img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+            img_np = bgrx_to_bgr(bitmap.GetBitmapBits(True), cap_w, cap_h)
 
             # 释放资源
             mem_dc.DeleteDC()
@@ -554,7 +662,8 @@ class ScreenshotManager:
             win32gui.ReleaseDC(window_manager.hwnd, hwnd_dc)
             win32gui.DeleteObject(bitmap.GetHandle())
 
-            if np.mean(img_np) < 10:
+            # 只截取ROI时不做黑屏检测（深色区域会被误判）
+            if region is None and is_black_frame(img_np):
                 self.logger.debug("BitBlt截图为黑屏")
                 return None
 
@@ -568,13 +677,16 @@ class ScreenshotManager:
             if original_foreground and original_foreground != window_manager.hwnd:
                 window_manager._restore_foreground(original_foreground)
 
-    def _try_dxcam(self, client_w_phys: int, client_h_phys: int) -> Optional[np.ndarray]:
+    def _try_dxcam(
+        self, client_w_phys: int, client_h_phys: int, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[np.ndarray]:
         """
         使用DXCam方法进行硬件加速截图。
 
         Args:
             client_w_phys: 客户区物理宽度
             client_h_phys: 客户区物理高度
+            region: 可选，只截取该客户区物理矩形 (x, y, w, h)，None表示整个客户区
 
         Returns:
             Optional[np.ndarray]: 截图图像，失败返回None
@@ -596,10 +708,11 @@ class ScreenshotManager:
                 self.logger.info("DXCam无法初始化，无可用显卡")
                 return None
 
-            # 获取客户区的屏幕坐标
-            client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (0, 0))
-            client_end_x = client_origin_x + client_w_phys
-            client_end_y = client_origin_y + client_h_phys
+            # 获取截取区域的屏幕坐标
+            cap_x, cap_y, cap_w, cap_h = region or (0, 0, client_w_phys, client_h_phys)
+            client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (cap_x, cap_y))
+            client_end_x = client_origin_x + cap_w
+            client_end_y = client_origin_y + cap_h
 
             # 验证坐标是否有效
             if (
@@ -627,7 +740,7 @@ class ScreenshotManager:
 
             # 转换颜色空间并验证截图
             img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-            if np.mean(img_np) < 10:
+            if region is None and is_black_frame(img_np):
                 self.logger.info("DXCam截图为黑屏")
                 return None
 
@@ -644,13 +757,16 @@ class ScreenshotManager:
             if original_foreground and original_foreground != window_manager.hwnd:
                 window_manager._restore_foreground(original_foreground)
 
-    def _try_temp_foreground_screenshot(self, client_w_phys: int, client_h_phys: int) -> Optional[np.ndarray]:
+    def _try_temp_foreground_screenshot(
+        self, client_w_phys: int, client_h_phys: int, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[np.ndarray]:
         """
         使用临时置顶窗口方法进行截图。
 
         Args:
             client_w_phys: 客户区物理宽度
             client_h_phys: 客户区物理高度
+            region: 可选，只截取该客户区物理矩形 (x, y, w, h)，None表示整个客户区
 
         Returns:
             Optional[np.ndarray]: 截图图像，失败返回None
@@ -688,31 +804,27 @@ class ScreenshotManager:
                 except Exception:
                     pass
 
-            client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (0, 0))
-            client_end_x = client_origin_x + client_w_phys
-            client_end_y = client_origin_y + client_h_phys
-            self.logger.debug(f"客户区屏幕坐标: ({client_origin_x}, {client_origin_y})")
+            cap_x, cap_y, cap_w, cap_h = region or (0, 0, client_w_phys, client_h_phys)
+            client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (cap_x, cap_y))
+            self.logger.debug(f"截取区域屏幕坐标: ({client_origin_x}, {client_origin_y}) | 尺寸: {cap_w}x{cap_h}")
 
             hdc_screen = win32gui.GetDC(0)
             mfc_dc = win32ui.CreateDCFromHandle(hdc_screen)
             mem_dc = mfc_dc.CreateCompatibleDC()
             bitmap = win32ui.CreateBitmap()
-            bitmap.CreateCompatibleBitmap(mfc_dc, client_w_phys, client_h_phys)
+            bitmap.CreateCompatibleBitmap(mfc_dc, cap_w, cap_h)
             mem_dc.SelectObject(bitmap)
 
             result = mem_dc.BitBlt(
                 (0, 0),
-                (client_w_phys, client_h_phys),
+                (cap_w, cap_h),
                 mfc_dc,
                 (client_origin_x, client_origin_y),
                 win32con.SRCCOPY,
             )
             self.logger.debug(f"BitBlt结果: {result}")
 
-            bmp_str = bitmap.GetBitmapBits(True)
-            img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-            img_np = np.array(img_pil)
-            img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
+            img_np = bgrx_to_bgr(bitmap.GetBitmapBits(True), cap_w, cap_h)
 
             mem_dc.DeleteDC()
             mfc_dc.DeleteDC()
@@ -731,22 +843,166 @@ class ScreenshotManager:
                     pass
             return None
 
+    def _roi_to_capture_region(
+        self, roi: Tuple[int, int, int, int], client_w_phys: int, client_h_phys: int, expand: int = 0
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        将ROI（基准坐标）转换为截图图像内的物理截取矩形。
+
+        Args:
+            roi: 感兴趣区域，格式为(x, y, width, height)
+            client_w_phys: 截图图像宽度（客户区物理宽度）
+            client_h_phys: 截图图像高度（客户区物理高度）
+            expand: 截取矩形向四周扩展的物理像素数（与CoordinateTransformer.process_roi的安全扩展一致，OCR使用）
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: 截取矩形 (x, y, w, h)，ROI无效返回None
+        """
+        is_valid, err_msg = self.device.coord_transformer.validate_roi_format(roi)
+        if not is_valid:
+            self.logger.warning(f"ROI无效: {err_msg}，改为全图截图")
+            return None
+        screen_phys_rect = self.device.coord_transformer.convert_client_logical_rect_to_screen_physical(
+            roi, is_base_coord=True
+        )
+        if not screen_phys_rect:
+            self.logger.warning(f"ROI坐标转换失败: {roi}，改为全图截图")
+            return None
+        phys_x, phys_y, phys_w, phys_h = screen_phys_rect
+
+        # 全屏/窗口模式区分处理
+        ctx = self.device.display_context
+        if ctx.is_fullscreen:
+            # 全屏模式：截图直接对应屏幕物理坐标，无需考虑客户区原点
+            crop_x = max(0, phys_x)
+            crop_y = max(0, phys_y)
+            # 使用屏幕物理尺寸作为边界
+            screen_w, screen_h = ctx.screen_physical_res
+            crop_w = min(phys_w, screen_w - crop_x)
+            crop_h = min(phys_h, screen_h - crop_y)
+        else:
+            # 窗口模式：计算相对客户区的截取坐标
+            crop_x = max(0, phys_x - ctx.client_screen_origin[0])
+            crop_y = max(0, phys_y - ctx.client_screen_origin[1])
+            crop_w = min(phys_w, client_w_phys - crop_x)
+            crop_h = min(phys_h, client_h_phys - crop_y)
+        # 截取矩形不能超出截图图像
+        crop_w = min(crop_w, client_w_phys - crop_x)
+        crop_h = min(crop_h, client_h_phys - crop_y)
+        self.logger.debug(
+            f"{'全屏' if ctx.is_fullscreen else '窗口'}模式ROI截取 | ROI: {roi} | 屏幕物理坐标: "
+            f"({phys_x},{phys_y},{phys_w},{phys_h}) → 截取区域: ({crop_x},{crop_y},{crop_w},{crop_h})"
+        )
+        if crop_w <= 0 or crop_h <= 0:
+            self.logger.warning(f"ROI转换后无效: {roi}，改为全图截图")
+            return None
+        if expand > 0:
+            expanded_x = max(0, crop_x - expand)
+            expanded_y = max(0, crop_y - expand)
+            crop_w = min(client_w_phys - expanded_x, crop_w + 2 * expand)
+            crop_h = min(client_h_phys - expanded_y, crop_h + 2 * expand)
+            crop_x, crop_y = expanded_x, expanded_y
+        return crop_x, crop_y, crop_w, crop_h
+
     def capture_screen(self, roi: Optional[Tuple[int, int, int, int]] = None) -> Optional[np.ndarray]:
         """
-        屏幕截图，支持多种截图策略和ROI裁剪。
+        屏幕截图，支持多种截图策略和ROI截取。
 
         Args:
-            roi: 可选，感兴趣区域，格式为(x, y, width, height)
+            roi: 可选，感兴趣区域，格式为(x, y, width, height)；指定时只截取该区域（返回ROI大小的图像）
 
         Returns:
             Optional[np.ndarray]: 截图图像（BGR格式），失败返回None
         """
+        img_np, _, _ = self._capture(roi)
+        return img_np
+
+    def capture_roi_frame(self, roi: Tuple[int, int, int, int], expand: int = 0) -> Optional[np.ndarray]:
+        """
+        只截取ROI区域，并放入与客户区同尺寸的画布（ROI外像素为0）。
+
+        画布与整帧截图的坐标系一致，模板匹配/OCR按原ROI裁剪时偏移无需调整；
+        截图成本与ROI面积成正比（PrintWindow只能渲染整个窗口，仅节省转换成本）。
+        画布按分辨率复用（见_acquire_roi_canvas）：返回的画布在下一次ROI截图时可能被覆盖，
+        调用方需要跨截图保留时应持有引用（持有期间不会被复用）或自行拷贝，不得原地修改。
+
+        Args:
+            roi: 感兴趣区域，格式为(x, y, width, height)
+            expand: 截取矩形向四周扩展的物理像素数（OCR识别区域的安全扩展）
+
+        Returns:
+            Optional[np.ndarray]: 客户区尺寸的BGR画布，ROI无效时返回整帧截图，失败返回None
+        """
+        with self._capture_lock:
+            img_np, region, (client_w_phys, client_h_phys) = self._capture_unlocked(roi, expand)
+            if img_np is None or region is None:
+                return img_np
+            crop_x, crop_y = region[0], region[1]
+            crop_h = min(img_np.shape[0], client_h_phys - crop_y)
+            crop_w = min(img_np.shape[1], client_w_phys - crop_x)
+            canvas = self._acquire_roi_canvas(client_w_phys, client_h_phys)
+            canvas[crop_y : crop_y + crop_h, crop_x : crop_x + crop_w] = img_np[:crop_h, :crop_w]
+            self._roi_canvas_region = (crop_x, crop_y, crop_w, crop_h)
+            return canvas
+
+    def _acquire_roi_canvas(self, client_w_phys: int, client_h_phys: int) -> np.ndarray:
+        """
+        获取ROI截图画布（调用方持有_capture_lock）：复用时只清零上一次写入的截取矩形，成本与ROI面积成正比。
+
+        画布仍被外部引用（调用方或延迟标注的调试图持有上一帧/其切片）时不复用，重新分配，避免改写其内容。
+
+        Args:
+            client_w_phys: 客户区物理宽度
+            client_h_phys: 客户区物理高度
+
+        Returns:
+            np.ndarray: ROI外像素为0的客户区尺寸画布
+        """
+        canvas = self._roi_canvas
+        # 引用计数3 = self._roi_canvas + 局部变量 + getrefcount参数，超过即存在外部引用
+        if canvas is None or canvas.shape[:2] != (client_h_phys, client_w_phys) or sys.getrefcount(canvas) > 3:
+            canvas = np.zeros((client_h_phys, client_w_phys, 3), dtype=np.uint8)
+            self._roi_canvas, self._roi_canvas_region = canvas, None
+        elif self._roi_canvas_region is not None:
+            x, y, w, h = self._roi_canvas_region
+            canvas[y : y + h, x : x + w] = 0
+        return canvas
+
+    def _capture(
+        self, roi: Optional[Tuple[int, int, int, int]] = None, expand: int = 0
+    ) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int, int, int]], Tuple[int, int]]:
+        """
+        按截图模式执行截图策略（多线程调用时串行执行），指定ROI时各策略只截取对应的物理区域。
+
+        Args:
+            roi: 可选，感兴趣区域，格式为(x, y, width, height)
+            expand: 截取矩形向四周扩展的物理像素数
+
+        Returns:
+            Tuple: (截图图像, 截取矩形（整个客户区时为None）, 客户区物理尺寸)，失败时图像为None
+        """
+        with self._capture_lock:
+            return self._capture_unlocked(roi, expand)
+
+    def _capture_unlocked(
+        self, roi: Optional[Tuple[int, int, int, int]] = None, expand: int = 0
+    ) -> Tuple[Optional[np.ndarray], Optional[Tuple[int, int, int, int]], Tuple[int, int]]:
+        """
+        按截图模式执行截图策略，指定ROI时各策略只截取对应的物理区域（调用方持有_capture_lock）。
+
+        Args:
+            roi: 可选，感兴趣区域，格式为(x, y, width, height)
+            expand: 截取矩形向四周扩展的物理像素数
+
+        Returns:
+            Tuple: (截图图像, 截取矩形（整个客户区时为None）, 客户区物理尺寸)，失败时图像为None
+        """
         self.device.clear_last_error()
         window_manager = self.device.window_manager
         if not window_manager._is_window_ready():
             self.device._record_error("capture_screen", "窗口未连接/最小化，无法截图")
             self.logger.error(self.device.last_error)
-            return None
+            return None, None, (0, 0)
 
         if not self.device._update_dynamic_window_info():
             self.logger.warning("窗口动态信息更新失败，使用缓存尺寸")
@@ -763,7 +1019,7 @@ class ScreenshotManager:
                 if all(coord == 0 for coord in window_rect):
                     self.device._record_error("capture_screen", f"窗口矩形无效: {window_rect}")
                     self.logger.error(self.device.last_error)
-                    return None
+                    return None, None, (0, 0)
 
                 client_w_phys = window_rect[2] - window_rect[0]
                 client_h_phys = window_rect[3] - window_rect[1]
@@ -771,7 +1027,7 @@ class ScreenshotManager:
             except Exception as e:
                 self.device._record_error("capture_screen", f"获取窗口矩形失败: {str(e)}")
                 self.logger.error(self.device.last_error)
-                return None
+                return None, None, (0, 0)
 
         # 最终兜底：使用屏幕分辨率
         if client_w_phys <= 0 or client_h_phys <= 0:
@@ -780,177 +1036,8 @@ class ScreenshotManager:
             client_w_phys, client_h_phys = screen_res
             self.logger.debug(f"兜底屏幕分辨率: {client_w_phys}x{client_h_phys}")
 
-        # -------------------------- 各策略实现 --------------------------
-        def try_print_window():
-            try:
-                with self._DCCtxManager(window_manager.hwnd, client_w_phys, client_h_phys) as (mem_dc, bitmap):
-                    PW_CLIENTONLY = 1
-                    PW_RENDERFULLCONTENT = 0x00000002
-                    print_flags = PW_CLIENTONLY | PW_RENDERFULLCONTENT
-
-                    result = ctypes.windll.user32.PrintWindow(window_manager.hwnd, mem_dc.GetSafeHdc(), print_flags)
-                    if not result:
-                        raise RuntimeError("PrintWindow调用返回失败")
-
-                    bmp_str = bitmap.GetBitmapBits(True)
-                    img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                    img_np = np.array(img_pil)
-                    img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-
-                if np.mean(img_np) < 10:
-                    raise RuntimeError("PrintWindow截图为黑屏")
-                self.logger.debug("使用PrintWindow后台截图成功（仅客户区）")
-                return img_np
-            except Exception as e:
-                self.logger.debug(f"PrintWindow执行失败: {e}")
-                return None
-
-        def try_bitblt():
-            """增强版bitblt：添加临时激活窗口逻辑"""
-            original_foreground = None
-            try:
-                # 临时激活窗口
-                original_foreground = window_manager._temp_activate_window()
-
-                with self._DCCtxManager(window_manager.hwnd, client_w_phys, client_h_phys) as (mem_dc, bitmap):
-                    # 获取原始DC用于BitBlt操作
-                    hwnd_dc = win32gui.GetDC(window_manager.hwnd)
-                    mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
-
-                    mem_dc.BitBlt((0, 0), (client_w_phys, client_h_phys), mfc_dc, (0, 0), win32con.SRCCOPY)
-
-                    # 释放原始DC资源
-                    win32gui.ReleaseDC(window_manager.hwnd, hwnd_dc)
-                    mfc_dc.DeleteDC()
-
-                    bmp_str = bitmap.GetBitmapBits(True)
-                    img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                    img_np = np.array(img_pil)
-                    img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-
-                if np.mean(img_np) < 10:
-                    raise RuntimeError("BitBlt截图为黑屏")
-
-                self.logger.debug("使用BitBlt截图成功（仅客户区）")
-                return img_np
-            except Exception as e:
-                self.logger.debug(f"BitBlt执行失败: {e}")
-                return None
-            finally:
-                # 恢复原始前台窗口
-                if original_foreground and original_foreground != window_manager.hwnd:
-                    window_manager._restore_foreground(original_foreground)
-
-        def try_dxcam():
-            """增强版dxcam：添加临时激活窗口逻辑"""
-            original_foreground = None
-            try:
-                import dxcam
-
-                # 临时激活窗口
-                original_foreground = window_manager._temp_activate_window()
-
-                camera = dxcam.create()
-                if not camera:
-                    raise RuntimeError("DXCam无法初始化，无可用显卡")
-
-                client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (0, 0))
-                client_end_x = client_origin_x + client_w_phys
-                client_end_y = client_origin_y + client_h_phys
-
-                img_np = camera.grab(region=(client_origin_x, client_origin_y, client_end_x, client_end_y))
-                if img_np is None:
-                    raise RuntimeError("DXCam截图返回空图像")
-
-                img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-                self.logger.debug("使用DXCam硬件加速截图成功（仅客户区）")
-                return img_np
-            except ImportError:
-                self.logger.debug("dxcam未安装，跳过硬件加速截图")
-                return None
-            except Exception as e:
-                self.logger.debug(f"DXCam执行失败: {e}")
-                return None
-            finally:
-                # 恢复原始前台窗口
-                if original_foreground and original_foreground != window_manager.hwnd:
-                    window_manager._restore_foreground(original_foreground)
-
-        def try_temp_foreground_screenshot():
-            self.logger.debug(
-                f"开始temp_foreground截图 | 窗口句柄: {window_manager.hwnd} | 尺寸: {client_w_phys}x{client_h_phys}"
-            )
-            original_foreground = window_manager._get_original_foreground()
-            try:
-                # 使用SwitchToThisWindow激活窗口（绕过SetForegroundWindow限制）
-                try:
-                    ctypes.windll.user32.SwitchToThisWindow(window_manager.hwnd, True)
-                    self.logger.debug("SwitchToThisWindow成功")
-                except Exception as e1:
-                    self.logger.debug(f"SwitchToThisWindow失败: {e1}")
-                    try:
-                        win32gui.SetForegroundWindow(window_manager.hwnd)
-                        self.logger.debug("SetForegroundWindow成功")
-                    except Exception as e2:
-                        self.logger.debug(f"SetForegroundWindow失败: {e2}")
-
-                # 等待窗口置顶，确保截图成功
-                time.sleep(window_manager.TEMP_FOREGROUND_DELAY)
-
-                # 确保窗口是当前前台窗口
-                if win32gui.GetForegroundWindow() != window_manager.hwnd:
-                    self.logger.warning(
-                        f"窗口未成功置顶，当前前台句柄: {win32gui.GetForegroundWindow()}，目标句柄: {window_manager.hwnd}"
-                    )
-                    # 再次尝试激活
-                    try:
-                        win32gui.SetForegroundWindow(window_manager.hwnd)
-                        time.sleep(window_manager.TEMP_FOREGROUND_DELAY)
-                    except Exception:
-                        pass
-
-                client_origin_x, client_origin_y = win32gui.ClientToScreen(window_manager.hwnd, (0, 0))
-                client_end_x = client_origin_x + client_w_phys
-                client_end_y = client_origin_y + client_h_phys
-                self.logger.debug(f"客户区屏幕坐标: ({client_origin_x}, {client_origin_y})")
-
-                hdc_screen = win32gui.GetDC(0)
-                mfc_dc = win32ui.CreateDCFromHandle(hdc_screen)
-                mem_dc = mfc_dc.CreateCompatibleDC()
-                bitmap = win32ui.CreateBitmap()
-                bitmap.CreateCompatibleBitmap(mfc_dc, client_w_phys, client_h_phys)
-                mem_dc.SelectObject(bitmap)
-
-                result = mem_dc.BitBlt(
-                    (0, 0),
-                    (client_w_phys, client_h_phys),
-                    mfc_dc,
-                    (client_origin_x, client_origin_y),
-                    win32con.SRCCOPY,
-                )
-                self.logger.debug(f"BitBlt结果: {result}")
-
-                bmp_str = bitmap.GetBitmapBits(True)
-                img_pil = Image.frombuffer("RGB", (client_w_phys, client_h_phys), bmp_str, "raw", "BGRX", 0, 1)
-                img_np = np.array(img_pil)
-                img_np = cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR)
-
-                mem_dc.DeleteDC()
-                mfc_dc.DeleteDC()
-                win32gui.ReleaseDC(0, hdc_screen)
-                win32gui.DeleteObject(bitmap.GetHandle())
-
-                window_manager._restore_foreground(original_foreground)
-                self.logger.debug("使用临时置顶屏幕截图成功（仅客户区，终极兜底）")
-                return img_np
-            except Exception as e:
-                self.logger.debug(f"临时置顶屏幕截图失败: {e}")
-                if original_foreground:
-                    try:
-                        window_manager._restore_foreground(original_foreground)
-                    except Exception:
-                        pass
-                return None
+        client_size = (client_w_phys, client_h_phys)
+        region = self._roi_to_capture_region(roi, client_w_phys, client_h_phys, expand) if roi else None
 
         # -------------------------- 模式适配：执行截图策略 --------------------------
         img_np = None
@@ -962,14 +1049,14 @@ class ScreenshotManager:
         if is_foreground:
             self.logger.debug("窗口在前台，优先使用更可靠的截图方法")
             # 优先使用dxcam（硬件加速，无缓存问题），失败再尝试bitblt，最后尝试printwindow
-            img_np = self._try_dxcam(client_w_phys, client_h_phys)
+            img_np = self._try_dxcam(client_w_phys, client_h_phys, region)
             if img_np is None:
-                img_np = self._try_bitblt(client_w_phys, client_h_phys)
+                img_np = self._try_bitblt(client_w_phys, client_h_phys, region)
                 # BitBlt可能有缓存问题，添加验证
                 if img_np is not None:
                     self.logger.debug("BitBlt截图完成，注意：可能存在缓存问题")
             if img_np is None:
-                img_np = self._try_print_window(client_w_phys, client_h_phys)
+                img_np = self._try_print_window(client_w_phys, client_h_phys, region)
 
         # 如果temp_foreground失败或者窗口不在前台，再尝试其他截图方法
         if img_np is None:
@@ -977,100 +1064,59 @@ class ScreenshotManager:
             if self._screenshot_mode in ["temp_foreground", "bitblt", "dxcam", "printwindow"]:
                 self.logger.debug(f"使用已设置的截图方法: {self._screenshot_mode}")
                 if self._screenshot_mode == "temp_foreground":
-                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys)
+                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys, region)
                 elif self._screenshot_mode == "bitblt":
-                    img_np = self._try_bitblt(client_w_phys, client_h_phys)
+                    img_np = self._try_bitblt(client_w_phys, client_h_phys, region)
                 elif self._screenshot_mode == "dxcam":
-                    img_np = self._try_dxcam(client_w_phys, client_h_phys)
+                    img_np = self._try_dxcam(client_w_phys, client_h_phys, region)
                 elif self._screenshot_mode == "printwindow":
-                    img_np = self._try_print_window(client_w_phys, client_h_phys)
+                    img_np = self._try_print_window(client_w_phys, client_h_phys, region)
             # background截图模式：强制使用PrintWindow，失败则降级
             elif self._screenshot_mode == "background":
-                img_np = self._try_print_window(client_w_phys, client_h_phys)
+                img_np = self._try_print_window(client_w_phys, client_h_phys, region)
             # foreground截图模式：优先使用更可靠的截图方法，避免BitBlt缓存问题
             elif self._screenshot_mode == "foreground":
                 self.logger.debug("foreground截图模式优先使用更可靠的截图方法")
                 # 优先使用dxcam（硬件加速，无缓存问题），失败再尝试bitblt，最后尝试printwindow和temp_foreground
-                img_np = self._try_dxcam(client_w_phys, client_h_phys)
+                img_np = self._try_dxcam(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_bitblt(client_w_phys, client_h_phys)
+                    img_np = self._try_bitblt(client_w_phys, client_h_phys, region)
                     # BitBlt可能有缓存问题，添加验证
                     if img_np is not None:
                         self.logger.debug("BitBlt截图完成，注意：可能存在缓存问题")
                 if img_np is None:
-                    img_np = self._try_print_window(client_w_phys, client_h_phys)
+                    img_np = self._try_print_window(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys)
+                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys, region)
             else:
                 # 兜底：优先使用更稳定的截图方法，避免temp_foreground导致的闪烁
                 self.logger.warning(f"未知截图模式: {self._screenshot_mode}，使用更稳定的截图方法兜底")
-                img_np = self._try_print_window(client_w_phys, client_h_phys)
+                img_np = self._try_print_window(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_bitblt(client_w_phys, client_h_phys)
+                    img_np = self._try_bitblt(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_dxcam(client_w_phys, client_h_phys)
+                    img_np = self._try_dxcam(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys)
+                    img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys, region)
 
             # 如果指定的截图方法失败，执行降级流程
             if img_np is None:
                 self.logger.debug(f"指定截图方法 {self._screenshot_mode} 失败，执行降级流程")
                 # 尝试所有其他可用方法，按优先级排序
-                img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys)
+                img_np = self._try_temp_foreground_screenshot(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_bitblt(client_w_phys, client_h_phys)
+                    img_np = self._try_bitblt(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_dxcam(client_w_phys, client_h_phys)
+                    img_np = self._try_dxcam(client_w_phys, client_h_phys, region)
                 if img_np is None:
-                    img_np = self._try_print_window(client_w_phys, client_h_phys)
+                    img_np = self._try_print_window(client_w_phys, client_h_phys, region)
 
         # 所有策略均失败
         if img_np is None:
             self.device._record_error("capture_screen", "所有截图策略均失败")
             self.logger.error(self.device.last_error)
-            return None
+            return None, None, client_size
 
-        # -------------------------- ROI裁剪处理 --------------------------
-        if roi:
-            is_valid, err_msg = self.device.coord_transformer.validate_roi_format(roi)
-            if not is_valid:
-                self.logger.warning(f"ROI无效: {err_msg}")
-            else:
-                screen_phys_rect = self.device.coord_transformer.convert_client_logical_rect_to_screen_physical(
-                    roi, is_base_coord=True
-                )
-                if screen_phys_rect:
-                    phys_x, phys_y, phys_w, phys_h = screen_phys_rect
-
-                    # 全屏/窗口模式区分处理
-                    ctx = self.device.display_context
-                    if ctx.is_fullscreen:
-                        # 全屏模式：截图直接对应屏幕物理坐标，无需考虑客户区原点
-                        crop_x = max(0, phys_x)
-                        crop_y = max(0, phys_y)
-                        # 使用屏幕物理尺寸作为边界
-                        screen_w, screen_h = ctx.screen_physical_res
-                        crop_w = min(phys_w, screen_w - crop_x)
-                        crop_h = min(phys_h, screen_h - crop_y)
-                        self.logger.debug(
-                            f"全屏模式ROI裁剪 | 屏幕物理坐标: ({phys_x},{phys_y},{phys_w},{phys_h}) → 裁剪区域: ({crop_x},{crop_y},{crop_w},{crop_h})"
-                        )
-                    else:
-                        # 窗口模式：计算相对客户区的裁剪坐标
-                        crop_x = max(0, phys_x - self.device.display_context.client_screen_origin[0])
-                        crop_y = max(0, phys_y - self.device.display_context.client_screen_origin[1])
-                        crop_w = min(phys_w, client_w_phys - crop_x)
-                        crop_h = min(phys_h, client_h_phys - crop_y)
-                        self.logger.debug(
-                            f"窗口模式ROI裁剪 | 屏幕物理坐标: ({phys_x},{phys_y},{phys_w},{phys_h}) → 客户区: ({crop_x},{crop_y},{crop_w},{crop_h})"
-                        )
-
-                    if crop_w > 0 and crop_h > 0:
-                        img_np = img_np[crop_y : crop_y + crop_h, crop_x : crop_x + crop_w]
-                        self.logger.debug(
-                            f"截图ROI裁剪完成 | 原始: {roi} → 实际裁剪: ({crop_x},{crop_y},{crop_w},{crop_h})"
-                        )
-                    else:
-                        self.logger.warning(f"ROI转换后无效: {roi}")
-
-        return img_np
+        if self.device.session_recorder:
+            self.device.session_recorder.record_frame(img_np, region=region, full_size=client_size)
+        return img_np, region, client_size
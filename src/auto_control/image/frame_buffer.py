@@ -0,0 +1,75 @@
+"""截图缓冲区转换：把 GetBitmapBits 返回的32位BGRX字节直接转换为BGR图像，并提供抽样黑屏检测
+
+原实现经过 Image.frombuffer → np.array → cvtColor(RGB2BGR)，产生三次整帧拷贝和一次通道交换；
+这里用 np.frombuffer 零拷贝地把字节视为 (高, 宽, 4) 数组，再一次性丢弃X通道得到连续BGR图像。
+黑屏检测只在按步长抽样的像素上求均值，避免每次截图都遍历整帧。
+纯numpy/cv2实现，不依赖win32，可在任意平台用合成字节缓冲验证。
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+BLACK_MEAN_THRESHOLD = 10  # 像素均值低于该值视为黑屏
+BLACK_SAMPLE_STEP = 8  # 黑屏检测的行列抽样步长
+
+
+def bgrx_view(buffer, width: int, height: int) -> np.ndarray:
+    """
+    将BGRX字节缓冲零拷贝地视为 (高, 宽, 4) 的uint8数组
+
+    Args:
+        buffer: GetBitmapBits(True) 返回的字节（或任意支持缓冲区协议的对象）
+        width: 图像宽度（像素）
+        height: 图像高度（像素）
+
+    Returns:
+        np.ndarray: 共享缓冲区内存的只读视图
+
+    Raises:
+        ValueError: 缓冲区长度不足 宽×高×4 字节时触发
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    expected = width * height * 4
+    if width <= 0 or height <= 0 or raw.size < expected:
+        raise ValueError(f"BGRX缓冲区长度不匹配: {raw.size}字节，期望{expected}字节（{width}x{height}）")
+    return raw[:expected].reshape(height, width, 4)
+
+
+def bgrx_to_bgr(buffer, width: int, height: int, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+    """
+    将BGRX字节缓冲转换为连续的BGR图像（单次拷贝，无需通道交换）
+
+    Args:
+        buffer: GetBitmapBits(True) 返回的字节
+        width: 图像宽度（像素）
+        height: 图像高度（像素）
+        region: 可选，只转换该矩形 (x, y, w, h)，其余像素不参与拷贝
+
+    Returns:
+        np.ndarray: 形状 (高, 宽, 3) 的BGR图像（独立内存，可写）
+    """
+    view = bgrx_view(buffer, width, height)
+    if region:
+        x, y, w, h = region
+        view = view[y : y + h, x : x + w]
+    return cv2.cvtColor(view, cv2.COLOR_BGRA2BGR)
+
+
+def is_black_frame(image: np.ndarray, threshold: float = BLACK_MEAN_THRESHOLD, step: int = BLACK_SAMPLE_STEP) -> bool:
+    """
+    抽样判断图像是否为黑屏（未渲染/被遮挡的窗口截图）
+
+    Args:
+        image: 待检测图像（BGR/RGB/灰度均可）
+        threshold: 均值阈值
+        step: 行列抽样步长（1表示全图）
+
+    Returns:
+        bool: 抽样像素均值低于阈值返回True
+    """
+    if image is None or image.size == 0:
+        return True
+    sample = image[:: max(1, step), :: max(1, step)]
+    return float(sample.mean()) < threshold
@@ -1,14 +1,25 @@
 import datetime
 import logging
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 
 
+from src.auto_control.image.match_prefilter import cell_histogram_integral, color_signature, min_missing_fraction
+from src.auto_control.image.result_memo import ResultMemo, region_fingerprint
+from src.auto_control.image.spatial_priors import SpatialPriorStore
+from src.auto_control.image.template_atlas import (
+    TemplateAtlas,
+    load_templates_parallel,
+    read_template_file,
+    scan_template_files,
+)
 from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
-from src.auto_control.utils.debug_image_saver import DebugImageSaver
+from src.auto_control.utils.debug_image_saver import DebugImageSaver, debug_saver_options
 from src.auto_control.utils.display_context import RuntimeDisplayContext
 from src.core.path_manager import path_manager
 
@@ -16,6 +27,9 @@ from src.core.path_manager import path_manager
 class ImageProcessor:
     """图像处理器：对齐OCR流程（先裁剪ROI，再模板缩放）"""
 
+    PYRAMID_FACTORS: Tuple[int, ...] = (4, 2)
+    """金字塔降采样倍数候选（按优先级排列）"""
+
     def __init__(
         self,
         original_base_res: Tuple[int, int],
@@ -63,23 +77,88 @@ class ImageProcessor:
         # 获取模板扩展名配置，支持外部配置覆盖默认值
         self.template_extensions = getattr(config, "TEMPLATE_EXTENSIONS", (".png", ".jpg", ".jpeg", ".bmp"))
 
-        # 模板缓存，采用LRU策略
-        self.templates: Dict[str, np.ndarray] = {}
-        self.template_access_time: Dict[str, float] = {}
-        self.max_template_cache_size = 100  # 最大缓存模板数量
+        # 模板缓存：按字节预算的LRU（OrderedDict尾部为最近使用，访问/淘汰均为O(1)）
+        self.templates: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.template_cache_budget = int(float(getattr(config, "TEMPLATE_CACHE_MB", 64) or 0) * 1024 * 1024)
+        self.template_cache_bytes = 0
+        self.template_cache_hits = 0
+        self.template_cache_misses = 0
+        self.template_cache_evictions = 0
+
+        # 缩放后灰度模板缓存：键为(模板名, 缩放比例)，显示几何变化时整体失效
+        self.scaled_template_cache: Dict[Tuple[str, float], np.ndarray] = {}
+        self._scaled_cache_geometry: Optional[Tuple] = None
+        self.scaled_cache_hits = 0
+        self.scaled_cache_misses = 0
 
         debug_dir = path_manager.get("match_temple_debug")
         os.makedirs(debug_dir, exist_ok=True)
 
-        self.debug_saver = DebugImageSaver(logger=logger, debug_dir=debug_dir, test_mode=test_mode)
+        self.debug_saver = DebugImageSaver(
+            logger=logger, debug_dir=debug_dir, test_mode=test_mode, **debug_saver_options(config)
+        )
 
         self.min_confidence = 0.8
         self.min_template_size = (10, 10)
         self.match_algorithm = cv2.TM_CCOEFF_NORMED
 
+        # 金字塔粗到精匹配：auto=搜索区域远大于模板时自动启用，always=尽可能启用，off=关闭
+        self.pyramid_mode = str(getattr(config, "PYRAMID_MATCH_MODE", "auto") or "auto").lower()
+        self.pyramid_area_ratio = 64.0  # 自动启用的最小面积比（搜索区域/模板）
+        self.pyramid_min_template_side = 12  # 降采样后模板短边的最小像素数
+        self.pyramid_candidates = 3  # 粗匹配候选数量
+        self.pyramid_fallback_margin = 0.15  # 粗匹配分数距阈值在此范围内且精匹配失败时回退全图匹配
+        # 金字塔自检：模板自身降采样后（各采样相位下）的粗匹配分数损失超过该值时，该模板/倍数不使用金字塔，
+        # 避免细小/低纹理模板的原分辨率匹配达到阈值、粗匹配却低于回退范围而漏检
+        self.pyramid_max_coarse_loss = self.pyramid_fallback_margin / 2
+        self._pyramid_self_checks: Dict[Tuple[str, Tuple[int, int], int], float] = {}
+
+        # 颜色包含预过滤：搜索区域远大于模板时，先排除颜色分布明显不符的模板（阈值经内置模板验证无漏检）
+        self.prefilter_enabled = bool(getattr(config, "USE_MATCH_PREFILTER", True))
+        self.prefilter_max_missing = 0.5  # 最小缺失比例超过该值判定模板不存在
+        self.prefilter_area_ratio = 16.0  # 启用预过滤的最小面积比（搜索区域/模板）
+        self.prefilter_stride = 2  # 搜索区域像素采样步长
+        self.prefilter_cell = 16  # 颜色统计网格边长（采样后像素）
+        self.template_signatures: Dict[str, np.ndarray] = {}
+        self.prefilter_checks = 0
+        self.prefilter_skips = 0
+
+        # 多模板批量匹配线程池（按需创建，0/1表示串行）
+        self.match_workers = int(getattr(config, "MATCH_WORKERS", 0) or 0)
+        self._match_executor: Optional[ThreadPoolExecutor] = None
+        self._match_executor_workers = 0
+
+        # 识别结果记忆化：ROI区域指纹未变化时直接返回上次匹配结果（严格模式用于测试校验指纹灵敏度）
+        self.result_memo = ResultMemo(
+            max_entries=int(getattr(config, "RESULT_MEMO_SIZE", 256) or 1),
+            strict=bool(getattr(config, "RESULT_MEMO_STRICT", False)),
+            enabled=bool(getattr(config, "USE_RESULT_MEMO", True)),
+            logger=logger,
+            name="模板匹配记忆化",
+        )
+
         # 记录所有模板路径，实现延迟加载
         self.all_template_paths: Dict[str, str] = {}
         self._scan_all_templates()
+
+        # 预编译模板图集（内存映射，零解码）：过期/缺失的模板回退PNG并行加载
+        self.atlas: Optional[TemplateAtlas] = None
+        self._atlas_templates: set = set()  # 图集中有效（未过期）的模板名
+        self._atlas_loaded: set = set()  # 当前缓存中来源于图集的模板名
+        self.atlas_scaled_hits = 0
+        if getattr(config, "USE_TEMPLATE_ATLAS", True):
+            self._init_template_atlas()
+
+        # 模板位置先验：优先在历史匹配位置附近搜索，未命中再逐级扩大到ROI/全图
+        # 记录文件为用户运行数据，只有配置显式启用时才读写（未传入AutoConfig的离线工具默认关闭）
+        self.spatial_priors: Optional[SpatialPriorStore] = None
+        self.prior_hits = 0
+        self.prior_misses = 0
+        if getattr(config, "USE_SPATIAL_PRIORS", False):
+            self.spatial_priors = SpatialPriorStore(
+                path_manager.get("spatial_priors"), tuple(original_base_res), logger=logger
+            )
+
         self.logger.info(
             f"初始化完成 | 加载模板数: {len(self.templates)} | "
             f"原始基准分辨率: {self.original_base_res} | 模板目录: {self.template_dir} | "
@@ -104,12 +183,13 @@ class ImageProcessor:
                 self.logger.error(f"模板不存在: {template_path}")
                 return False
 
-            template_color = cv2.imread(template_path, cv2.IMREAD_COLOR)
+            template_color = read_template_file(template_path)
             if template_color is None:
                 self.logger.error(f"读取模板失败: {template_path}")
                 return False
 
-            self.templates[template_name] = template_color
+            self._cache_put(template_name, template_color)
+            self._atlas_loaded.discard(template_name)
             self.logger.debug(f"加载模板成功: {template_name} | 原始尺寸: {template_color.shape[:2]}")
             return True
         except Exception as e:
@@ -122,40 +202,261 @@ class ImageProcessor:
             self.logger.warning(f"模板目录不存在: {self.template_dir}")
             return
 
-        for root, dirs, files in os.walk(self.template_dir):
-            for filename in files:
-                if filename.lower().endswith(self.template_extensions):
-                    rel_path = os.path.relpath(root, self.template_dir)
-                    template_name = (
-                        os.path.join(rel_path, os.path.splitext(filename)[0]).replace("\\", "/")
-                        if rel_path != "."
-                        else os.path.splitext(filename)[0]
-                    )
-                    template_path = os.path.join(root, filename)
-                    self.all_template_paths[template_name] = template_path
+        self.all_template_paths.update(scan_template_files(self.template_dir, self.template_extensions))
         self.logger.debug(f"扫描完成，共发现{len(self.all_template_paths)}个模板文件")
 
-    def _cleanup_template_cache(self) -> None:
-        """清理模板缓存，移除最少使用的模板"""
-        if len(self.templates) <= self.max_template_cache_size:
+    def _init_template_atlas(self) -> None:
+        """打开预编译模板图集并校验过期项，过期/缺失模板使用PNG并行加载"""
+        atlas = TemplateAtlas(path_manager.get("template_atlas"), logger=self.logger)
+        if not atlas.open():
             return
 
-        # 按照访问时间排序，移除最久未使用的模板
-        sorted_templates = sorted(self.template_access_time.items(), key=lambda x: x[1])
+        atlas_base = tuple(atlas.index.get("base_resolution", ()))
+        atlas_min_size = tuple(atlas.index.get("min_template_size", ()))
+        if atlas_base != tuple(self.original_base_res) or atlas_min_size != tuple(self.min_template_size):
+            self.logger.warning(
+                f"模板图集参数与当前配置不一致，忽略图集 | 图集基准分辨率: {atlas_base} | "
+                f"当前: {tuple(self.original_base_res)} | 图集最小模板尺寸: {atlas_min_size}"
+            )
+            return
 
-        # 需要清理的模板数量
-        templates_to_remove = len(self.templates) - self.max_template_cache_size
+        stale = atlas.find_stale(self.all_template_paths)
+        self.atlas = atlas
+        self._atlas_templates = set(self.all_template_paths) - set(stale)
+        if stale:
+            loaded = load_templates_parallel({name: self.all_template_paths[name] for name in stale})
+            for name, template in loaded.items():
+                self._cache_put(name, template)
+        self.logger.info(
+            f"模板图集加载完成 | 有效模板: {len(self._atlas_templates)} | 过期/缺失(PNG回退): {len(stale)} | "
+            f"预计算缩放比例: {atlas.index.get('ratios')}"
+        )
 
-        for template_name, _ in sorted_templates[:templates_to_remove]:
-            if template_name in self.templates:
-                del self.templates[template_name]
-                del self.template_access_time[template_name]
-                self.logger.debug(f"清理模板缓存: {template_name}")
+    def _cache_put(self, template_name: str, template: np.ndarray) -> None:
+        """
+        写入模板缓存并按字节预算淘汰最久未使用的模板（新写入的模板不会被淘汰）
+
+        Args:
+            template_name: 模板名称
+            template: 模板数组（BGR格式）
+        """
+        old = self.templates.pop(template_name, None)
+        if old is not None:
+            self.template_cache_bytes -= old.nbytes
+        self.templates[template_name] = template
+        self.template_cache_bytes += template.nbytes
+
+        while self.template_cache_bytes > self.template_cache_budget and len(self.templates) > 1:
+            evicted_name, evicted = self.templates.popitem(last=False)
+            self.template_cache_bytes -= evicted.nbytes
+            self.template_cache_evictions += 1
+            self._atlas_loaded.discard(evicted_name)
+            self._drop_scaled_templates(evicted_name)
+            self.logger.debug(f"淘汰模板缓存: {evicted_name} | 当前占用: {self.template_cache_bytes} 字节")
+
+    def _drop_scaled_templates(self, template_name: str) -> None:
+        """移除指定模板的所有缩放缓存项"""
+        for key in [k for k in self.scaled_template_cache if k[0] == template_name]:
+            del self.scaled_template_cache[key]
+
+    def _check_scaled_cache_geometry(self) -> None:
+        """显示几何（分辨率/DPI/全屏状态）变化时清空缩放模板缓存"""
+        signature = self.display_context.geometry_signature
+        if signature != self._scaled_cache_geometry:
+            if self.scaled_template_cache:
+                self.logger.debug(
+                    f"显示几何变化，清空缩放模板缓存 | 缓存项: {len(self.scaled_template_cache)} | "
+                    f"新几何签名: {signature}"
+                )
+            self.scaled_template_cache.clear()
+            self._scaled_cache_geometry = signature
+
+    def _get_scaled_gray_template(
+        self,
+        template_name: Optional[str],
+        template_bgr: np.ndarray,
+        scale_ratio: float,
+        scaled_size: Tuple[int, int],
+    ) -> np.ndarray:
+        """
+        获取缩放后的灰度模板，命名模板优先走缓存
+
+        Args:
+            template_name: 模板名称（自定义数组模板传None，不缓存）
+            template_bgr: 原始模板（BGR格式）
+            scale_ratio: 模板缩放比例
+            scaled_size: 目标尺寸（宽, 高），受子图尺寸限制时可能与缩放比例不一致
+
+        Returns:
+            np.ndarray: 可直接用于匹配的灰度模板
+        """
+        cache_key = (template_name, round(scale_ratio, 4)) if template_name else None
+        if cache_key is not None:
+            self._check_scaled_cache_geometry()
+            cached = self.scaled_template_cache.get(cache_key)
+            # 尺寸被子图裁剪时缓存项不适用，直接重新缩放
+            if cached is not None and (cached.shape[1], cached.shape[0]) == scaled_size:
+                self.scaled_cache_hits += 1
+                return cached
+
+        self.scaled_cache_misses += 1
+        # 图集中预计算的缩放变体（仅当当前模板来源于图集时可用，保证与原图一致）
+        if template_name in self._atlas_loaded:
+            atlas_template = self.atlas.get_scaled_gray(template_name, scale_ratio)
+            if atlas_template is not None and (atlas_template.shape[1], atlas_template.shape[0]) == scaled_size:
+                self.atlas_scaled_hits += 1
+                self.scaled_template_cache[cache_key] = atlas_template
+                return atlas_template
+
+        interpolation = cv2.INTER_LANCZOS4 if scale_ratio < 1.0 else cv2.INTER_CUBIC
+        scaled_template = cv2.resize(template_bgr, scaled_size, interpolation=interpolation)
+        template_gray = (
+            cv2.cvtColor(scaled_template, cv2.COLOR_BGR2GRAY) if len(scaled_template.shape) == 3 else scaled_template
+        )
+        self.logger.debug(
+            f"模板缩放完成 | 原始尺寸: {(template_bgr.shape[1], template_bgr.shape[0])} → 缩放后: {scaled_size} | "
+            f"插值方式: {interpolation} | 缩放比例: {scale_ratio:.4f}"
+        )
+
+        # 仅缓存未被子图尺寸截断的标准缩放结果
+        full_size = (
+            max(self.min_template_size[0], int(round(template_bgr.shape[1] * scale_ratio))),
+            max(self.min_template_size[1], int(round(template_bgr.shape[0] * scale_ratio))),
+        )
+        if cache_key is not None and scaled_size == full_size:
+            self.scaled_template_cache[cache_key] = template_gray
+        return template_gray
+
+    def get_scaled_template_cache_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        获取缩放模板缓存统计
+
+        Returns:
+            Dict: 命中数、未命中数、命中率、当前缓存项数
+        """
+        total = self.scaled_cache_hits + self.scaled_cache_misses
+        return {
+            "hits": self.scaled_cache_hits,
+            "misses": self.scaled_cache_misses,
+            "hit_rate": round(self.scaled_cache_hits / total, 4) if total else 0.0,
+            "size": len(self.scaled_template_cache),
+            "atlas_hits": self.atlas_scaled_hits,
+        }
+
+    def get_spatial_prior_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        获取模板位置先验统计
+
+        Returns:
+            Dict: 先验窗口命中数、未命中数（回退到ROI/全图）、命中率、已记录模板数
+        """
+        total = self.prior_hits + self.prior_misses
+        return {
+            "hits": self.prior_hits,
+            "misses": self.prior_misses,
+            "hit_rate": round(self.prior_hits / total, 4) if total else 0.0,
+            "templates": len(self.spatial_priors._entries) if self.spatial_priors else 0,
+        }
+
+    def get_template_cache_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        获取模板缓存统计
+
+        Returns:
+            Dict: 命中数、未命中数、命中率、淘汰数、缓存模板数、当前占用字节数、字节预算
+        """
+        total = self.template_cache_hits + self.template_cache_misses
+        return {
+            "hits": self.template_cache_hits,
+            "misses": self.template_cache_misses,
+            "hit_rate": round(self.template_cache_hits / total, 4) if total else 0.0,
+            "evictions": self.template_cache_evictions,
+            "size": len(self.templates),
+            "bytes": self.template_cache_bytes,
+            "budget_bytes": self.template_cache_budget,
+        }
+
+    def get_prefilter_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        获取预过滤统计
+
+        Returns:
+            Dict: 预过滤检查次数、跳过匹配次数、跳过率
+        """
+        return {
+            "checks": self.prefilter_checks,
+            "skips": self.prefilter_skips,
+            "skip_rate": round(self.prefilter_skips / self.prefilter_checks, 4) if self.prefilter_checks else 0.0,
+        }
+
+    def get_match_stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        汇总匹配相关统计（模板缓存、缩放模板缓存、位置先验、预过滤、结果记忆化）
+
+        Returns:
+            Dict: 各项统计
+        """
+        return {
+            "template_cache": self.get_template_cache_stats(),
+            "scaled_template_cache": self.get_scaled_template_cache_stats(),
+            "spatial_priors": self.get_spatial_prior_stats(),
+            "prefilter": self.get_prefilter_stats(),
+            "result_memo": self.result_memo.get_stats(),
+        }
+
+    def flush_spatial_priors(self) -> None:
+        """立即将模板位置记录写入磁盘（系统停止时调用）"""
+        if self.spatial_priors:
+            self.spatial_priors.save(force=True)
 
     def load_all_templates(self) -> None:
-        """遍历模板目录，加载所有符合扩展名的模板文件"""
-        for template_name, template_path in self.all_template_paths.items():
-            self.load_template(template_name, template_path)
+        """遍历模板目录，加载所有符合扩展名的模板文件（受模板缓存字节预算约束）"""
+        self.preload_templates([""])
+
+    def preload_templates(self, entries: List[str]) -> int:
+        """
+        按清单预加载模板（图集有效项直接映射，其余并行读取PNG），避免任务首次匹配时的冷加载
+
+        Args:
+            entries: 预加载清单，以"/"结尾（或为空字符串）的项表示模板目录前缀，其余为完整模板名
+
+        Returns:
+            int: 本次新加载的模板数量（已在缓存中的模板只刷新LRU顺序）
+        """
+        names = []
+        for entry in entries:
+            if not entry or entry.endswith("/"):
+                names.extend(sorted(name for name in self.all_template_paths if name.startswith(entry)))
+            elif entry in self.all_template_paths:
+                names.append(entry)
+            else:
+                self.logger.warning(f"预加载清单中的模板不存在: {entry}")
+
+        png_paths = {}
+        loaded_count = 0
+        for template_name in dict.fromkeys(names):
+            if template_name in self.templates:
+                self.templates.move_to_end(template_name)
+            elif template_name in self._atlas_templates:
+                self._cache_put(template_name, self.atlas.get_bgr(template_name))
+                self._atlas_loaded.add(template_name)
+                loaded_count += 1
+            else:
+                png_paths[template_name] = self.all_template_paths[template_name]
+
+        loaded = load_templates_parallel(png_paths)
+        for template_name, template in loaded.items():
+            self._cache_put(template_name, template)
+            self._atlas_loaded.discard(template_name)
+        for template_name in set(png_paths) - set(loaded):
+            self.logger.error(f"读取模板失败: {png_paths[template_name]}")
+        loaded_count += len(loaded)
+
+        self.logger.debug(
+            f"模板预加载完成 | 清单: {entries} | 新加载: {loaded_count} | "
+            f"缓存占用: {self.template_cache_bytes / 1024 / 1024:.1f}/{self.template_cache_budget / 1024 / 1024:.0f} MB"
+        )
+        return loaded_count
 
     def get_template(self, template_name: str) -> Optional[np.ndarray]:
         """
@@ -167,11 +468,19 @@ class ImageProcessor:
         Returns:
             Optional[np.ndarray]: 模板数组（BGR格式），获取失败返回None
         """
-        import time
-        current_time = time.time()
-        
         # 检查模板是否在缓存中
         template = self.templates.get(template_name)
+        if template is not None:
+            self.templates.move_to_end(template_name)
+            self.template_cache_hits += 1
+            return template
+
+        self.template_cache_misses += 1
+        if template_name in self._atlas_templates:
+            # 图集命中：内存映射只读视图，无解码开销
+            template = self.atlas.get_bgr(template_name)
+            self._cache_put(template_name, template)
+            self._atlas_loaded.add(template_name)
         if template is None:
             self.logger.debug(f"模板未在缓存中，尝试加载: {template_name}")
             # 检查是否有记录的模板路径
@@ -181,15 +490,592 @@ class ImageProcessor:
                     template = self.templates.get(template_name)
             else:
                 self.logger.warning(f"未找到模板路径: {template_name}")
-        
-        # 更新访问时间
-        if template is not None:
-            self.template_access_time[template_name] = current_time
-            # 清理缓存
-            self._cleanup_template_cache()
-        
+
         return template
 
+    def _resolve_template(self, template: Union[str, np.ndarray]) -> Tuple[Optional[np.ndarray], str]:
+        """
+        解析模板参数为BGR数组和模板名称
+
+        Args:
+            template: 模板名称或模板数组（BGR格式）
+
+        Returns:
+            Tuple[Optional[np.ndarray], str]: (模板数组, 模板名称)，无效时数组为None
+        """
+        if isinstance(template, str):
+            template_bgr = self.get_template(template)
+            if template_bgr is None:
+                self.logger.error(f"模板匹配失败：模板「{template}」不存在或加载失败")
+            return template_bgr, template
+        if not isinstance(template, np.ndarray) or template.size == 0:
+            self.logger.error("模板匹配失败：自定义模板为无效numpy数组")
+            return None, "custom_template"
+        return template, "custom_template"
+
+    def _prepare_match_frame(
+        self, image: np.ndarray, roi: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Dict]:
+        """
+        预处理待匹配图像：ROI裁剪、灰度转换、计算模板缩放比例（多模板共享一次预处理）
+
+        Args:
+            image: 待匹配的原始图像（BGR格式）
+            roi: 感兴趣区域（逻辑坐标，x,y,w,h），可选
+
+        Returns:
+            Optional[Dict]: 预处理结果（原图、灰度子图、ROI偏移、缩放比例等），图像无效返回None
+        """
+        is_fullscreen = self.display_context.is_fullscreen
+        ctx = self.display_context
+        self.logger.debug(
+            f"上下文全屏状态: {is_fullscreen} | ROI: {roi} | "
+            f"客户区逻辑尺寸: {ctx.client_logical_res} | 屏幕物理尺寸: {ctx.screen_physical_res}"
+        )
+
+        if image is None or image.size == 0:
+            self.logger.error("模板匹配失败：输入图像为空或无效")
+            return None
+        # 原图仅以只读方式引用（ROI裁剪为切片视图），标注所需的拷贝由DebugImageSaver在实际落盘时完成
+        orig_image = image
+        image_phys_h, image_phys_w = orig_image.shape[:2]
+        orig_roi_phys = None
+        processed_roi = roi
+        roi_offset_phys = (0, 0)
+
+        cropped_image = orig_image
+        if roi:
+            processed_roi_phys, roi_offset_phys = self.coord_transformer.process_roi(
+                roi=roi, boundary_width=image_phys_w, boundary_height=image_phys_h, enable_expand=False
+            )
+            if processed_roi_phys:
+                orig_roi_phys = processed_roi_phys
+                rx_phys, ry_phys, rw_phys, rh_phys = processed_roi_phys
+                cropped_image = orig_image[ry_phys : ry_phys + rh_phys, rx_phys : rx_phys + rw_phys]
+                if cropped_image.size == 0:
+                    self.logger.warning(
+                        f"ROI裁剪后子图为空，使用原图进行匹配 | 原始ROI: {roi} | 处理后ROI物理坐标: {processed_roi_phys}"
+                    )
+                    cropped_image = orig_image
+                    roi_offset_phys = (0, 0)
+                    orig_roi_phys = None
+                else:
+                    self.logger.debug(
+                        f"ROI裁剪完成 | 子图尺寸: (宽={cropped_image.shape[1]}, 高={cropped_image.shape[0]}) | "
+                        f"原图偏移: {roi_offset_phys} | 裁剪后图像是否有效: {cropped_image.size > 0}"
+                    )
+            else:
+                processed_roi = None
+                roi_offset_phys = (0, 0)
+                orig_roi_phys = None
+
+        if is_fullscreen:
+            target_phys_size = self.display_context.screen_physical_res
+        else:
+            target_phys_size = self.display_context.client_physical_res
+
+        scale_ratio = self.coord_transformer.calculate_template_scale_ratio(
+            target_phys_size=target_phys_size, has_roi=False
+        )
+        self.logger.debug(
+            f"模板缩放比例计算完成 | 基准分辨率: {self.original_base_res} | "
+            f"当前整体物理尺寸: {target_phys_size} | 缩放比例: {scale_ratio:.4f}"
+        )
+
+        cropped_gray = (
+            cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY) if len(cropped_image.shape) == 3 else cropped_image
+        )
+        return {
+            "orig_image": orig_image,
+            "cropped_gray": cropped_gray,
+            "roi_offset_phys": roi_offset_phys,
+            "orig_roi_phys": orig_roi_phys,
+            "processed_roi": processed_roi,
+            "scale_ratio": scale_ratio,
+            "is_fullscreen": is_fullscreen,
+        }
+
+    def _prepare_template_for_frame(
+        self, frame: Dict, template: Union[str, np.ndarray]
+    ) -> Optional[Tuple[str, np.ndarray, Tuple[int, int], Tuple[int, int]]]:
+        """
+        按预处理结果准备可直接匹配的灰度模板
+
+        Args:
+            frame: _prepare_match_frame 的返回结果
+            template: 模板名称或模板数组（BGR格式）
+
+        Returns:
+            Optional[Tuple]: (模板名称, 灰度模板, 原始尺寸, 缩放后尺寸)，失败返回None
+        """
+        template_bgr, template_name = self._resolve_template(template)
+        if template_bgr is None:
+            return None
+        cropped_gray = frame["cropped_gray"]
+        scale_ratio = frame["scale_ratio"]
+
+        template_orig_h, template_orig_w = template_bgr.shape[:2]
+        template_orig_size = (template_orig_w, template_orig_h)
+        self.logger.debug(
+            f"开始模板匹配 | 模板: {template_name} | 原始尺寸: {template_orig_size} | "
+            f"子图尺寸: (宽={cropped_gray.shape[1]}, 高={cropped_gray.shape[0]}) | "
+            f"ROI: {frame['processed_roi']} | 上下文全屏状态: {frame['is_fullscreen']}"
+        )
+
+        scaled_w = max(self.min_template_size[0], int(round(template_orig_w * scale_ratio)))
+        scaled_h = max(self.min_template_size[1], int(round(template_orig_h * scale_ratio)))
+        scaled_w = min(scaled_w, cropped_gray.shape[1] - 2)
+        scaled_h = min(scaled_h, cropped_gray.shape[0] - 2)
+        template_scaled_size = (scaled_w, scaled_h)
+
+        if scaled_w <= 0 or scaled_h <= 0:
+            self.logger.error(
+                f"模板缩放失败 | 缩放后尺寸无效: {template_scaled_size} | "
+                f"子图尺寸: (宽={cropped_gray.shape[1]}, 高={cropped_gray.shape[0]}) | 比例: {scale_ratio:.4f}"
+            )
+            return None
+
+        template_gray = self._get_scaled_gray_template(
+            template_name=template if isinstance(template, str) else None,
+            template_bgr=template_bgr,
+            scale_ratio=scale_ratio,
+            scaled_size=template_scaled_size,
+        )
+
+        if (template_gray.shape[0] > cropped_gray.shape[0]) or (template_gray.shape[1] > cropped_gray.shape[1]):
+            self.logger.error(
+                f"模板匹配失败：模板尺寸超过子图尺寸 | "
+                f"模板尺寸: (宽={template_gray.shape[1]}, 高={template_gray.shape[0]}) | "
+                f"子图尺寸: (宽={cropped_gray.shape[1]}, 高={cropped_gray.shape[0]})"
+            )
+            return None
+        return template_name, template_gray, template_orig_size, template_scaled_size
+
+    def _prefilter_rejects(self, frame: Dict, template_name: str, template_scaled_size: Tuple[int, int]) -> bool:
+        """
+        颜色包含预过滤：判断模板是否明显不在搜索区域中（需在调用线程中执行，积分图按帧共享）
+
+        Args:
+            frame: _prepare_match_frame 的返回结果
+            template_name: 模板名称（自定义模板数组不做预过滤）
+            template_scaled_size: 模板缩放后尺寸（宽, 高）
+
+        Returns:
+            bool: 判定模板不存在（可跳过matchTemplate）返回True
+        """
+        orig_image = frame["orig_image"]
+        if not self.prefilter_enabled or template_name == "custom_template" or orig_image.ndim != 3:
+            return False
+        search_h, search_w = frame["cropped_gray"].shape[:2]
+        tpl_w, tpl_h = template_scaled_size
+        if (search_w * search_h) / max(1, tpl_w * tpl_h) < self.prefilter_area_ratio:
+            return False
+
+        signature = self.template_signatures.get(template_name)
+        if signature is None:
+            template_bgr = self.get_template(template_name)
+            if template_bgr is None or template_bgr.ndim != 3:
+                return False
+            signature = color_signature(template_bgr)
+            self.template_signatures[template_name] = signature
+
+        integral = frame.get("prefilter_integral")
+        if integral is None:
+            if frame["orig_roi_phys"]:
+                rx, ry, rw, rh = frame["orig_roi_phys"]
+                cropped_bgr = orig_image[ry : ry + rh, rx : rx + rw]
+            else:
+                cropped_bgr = orig_image
+            integral = cell_histogram_integral(cropped_bgr, self.prefilter_stride, self.prefilter_cell)
+            frame["prefilter_integral"] = integral
+
+        missing = min_missing_fraction(
+            integral, signature, template_scaled_size, self.prefilter_stride, self.prefilter_cell
+        )
+        self.prefilter_checks += 1
+        if missing <= self.prefilter_max_missing:
+            return False
+        self.prefilter_skips += 1
+        self.logger.debug(
+            f"预过滤跳过匹配 | 模板: {template_name} | 颜色缺失比例: {missing:.3f} > {self.prefilter_max_missing}"
+        )
+        return True
+
+    def _plan_pyramid_factor(self, frame: Dict, template_gray: np.ndarray, template_name: Optional[str] = None) -> int:
+        """
+        选择金字塔降采样倍数，并预先生成对应层级的子图（需在调用线程中执行，避免并发重复计算）
+
+        自动模式规则：搜索区域面积 / 模板面积 ≥ pyramid_area_ratio，
+        且降采样后模板短边 ≥ pyramid_min_template_side 时启用，优先选择更大的倍数。
+        金字塔自检（见 _pyramid_coarse_loss）未通过的模板/倍数不使用金字塔。
+
+        Args:
+            frame: _prepare_match_frame 的返回结果
+            template_gray: 灰度模板
+            template_name: 模板名称（用于缓存自检结果，自定义模板不缓存）
+
+        Returns:
+            int: 降采样倍数（1表示不使用金字塔匹配）
+        """
+        if self.pyramid_mode == "off":
+            return 1
+        cropped_gray = frame["cropped_gray"]
+        search_h, search_w = cropped_gray.shape[:2]
+        tpl_h, tpl_w = template_gray.shape[:2]
+        area_ratio = (search_w * search_h) / max(1, tpl_w * tpl_h)
+
+        for factor in self.PYRAMID_FACTORS:
+            if min(tpl_w, tpl_h) // factor < self.pyramid_min_template_side:
+                continue
+            if self.pyramid_mode == "auto" and area_ratio < self.pyramid_area_ratio:
+                break
+            if self._pyramid_coarse_loss(template_gray, factor, template_name) > self.pyramid_max_coarse_loss:
+                continue
+            levels = frame.setdefault("pyramid_levels", {})
+            if factor not in levels:
+                levels[factor] = cv2.resize(
+                    cropped_gray, (search_w // factor, search_h // factor), interpolation=cv2.INTER_AREA
+                )
+            return factor
+        return 1
+
+    def _pyramid_coarse_loss(
+        self, template_gray: np.ndarray, factor: int, template_name: Optional[str] = None
+    ) -> float:
+        """
+        金字塔自检：把模板按全部采样相位降采样后与粗模板匹配，返回最差相位下的分数损失（1 - 最低分数）
+
+        画面中模板位置与降采样网格的相对相位任意，细小/低纹理模板在不利相位下粗匹配分数会明显下降，
+        边缘平坦的模板在粗像素混入反差大的背景时同样如此；
+        结果按（模板名, 尺寸, 倍数）缓存，自定义模板每次重新计算。
+
+        Args:
+            template_gray: 灰度模板（已按显示比例缩放）
+            factor: 降采样倍数
+            template_name: 模板名称（custom_template或None时不缓存）
+
+        Returns:
+            float: 最差相位下的粗匹配分数损失
+        """
+        tpl_h, tpl_w = template_gray.shape[:2]
+        key = (template_name, (tpl_w, tpl_h), factor) if template_name and template_name != "custom_template" else None
+        if key is not None and key in self._pyramid_self_checks:
+            return self._pyramid_self_checks[key]
+
+        coarse_tpl = cv2.resize(template_gray, (tpl_w // factor, tpl_h // factor), interpolation=cv2.INTER_AREA)
+        # 背景未知：分别用延伸边缘（与模板相近的背景）和与模板边缘反差最大的纯色（混入粗像素后影响最大）填充
+        edge_mean = (float(np.mean(template_gray[[0, -1], :])) + float(np.mean(template_gray[:, [0, -1]]))) / 2
+        contrast_value = 255 if edge_mean < 128 else 0
+        borders = [
+            cv2.copyMakeBorder(template_gray, factor, factor, factor, factor, cv2.BORDER_REPLICATE),
+            cv2.copyMakeBorder(
+                template_gray, factor, factor, factor, factor, cv2.BORDER_CONSTANT, value=contrast_value
+            ),
+        ]
+        worst = 1.0
+        for padded in borders:
+            for dy in range(factor):
+                for dx in range(factor):
+                    shifted = padded[dy:, dx:]
+                    coarse = cv2.resize(
+                        shifted,
+                        (shifted.shape[1] // factor, shifted.shape[0] // factor),
+                        interpolation=cv2.INTER_AREA,
+                    )
+                    _, max_val, _, _ = cv2.minMaxLoc(cv2.matchTemplate(coarse, coarse_tpl, self.match_algorithm))
+                    worst = min(worst, float(max_val))
+        loss = 1.0 - worst
+        if key is not None:
+            self._pyramid_self_checks[key] = loss
+            if loss > self.pyramid_max_coarse_loss:
+                self.logger.debug(
+                    f"金字塔自检未通过，该模板不使用金字塔匹配 | 模板: {template_name} | 尺寸: {(tpl_w, tpl_h)} | "
+                    f"倍数: {factor} | 粗匹配分数损失: {loss:.4f} > {self.pyramid_max_coarse_loss:.4f}"
+                )
+        return loss
+
+    def get_pyramid_disabled(self) -> List[Tuple[str, int]]:
+        """
+        获取金字塔自检未通过的模板
+
+        Returns:
+            List[Tuple[str, int]]: [(模板名称, 降采样倍数), ...]
+        """
+        return sorted(
+            {
+                (name, factor)
+                for (name, _, factor), loss in self._pyramid_self_checks.items()
+                if loss > self.pyramid_max_coarse_loss
+            }
+        )
+
+    def _top_candidates(self, result: np.ndarray, count: int, suppress_size: Tuple[int, int]) -> List[Tuple]:
+        """
+        从匹配响应图中取前count个峰值（每取一个即抑制其邻域，结果图会被原地修改）
+
+        Args:
+            result: matchTemplate 响应图
+            count: 候选数量
+            suppress_size: 抑制邻域半径（宽, 高）
+
+        Returns:
+            List[Tuple]: [(位置(x, y), 分数), ...]，按分数降序
+        """
+        candidates = []
+        sup_w, sup_h = suppress_size
+        for _ in range(count):
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if candidates and max_val <= -1.0:
+                break
+            candidates.append((max_loc, float(max_val)))
+            x, y = max_loc
+            result[max(0, y - sup_h) : y + sup_h + 1, max(0, x - sup_w) : x + sup_w + 1] = -1.0
+        return candidates
+
+    def _run_match(
+        self, frame: Dict, template_gray: np.ndarray, threshold: float, factor: int = 1
+    ) -> Tuple[float, Tuple[int, int]]:
+        """
+        执行匹配并返回最高分及其位置（纯cv2计算，可在线程池中并发执行）
+
+        factor > 1 时使用金字塔粗到精匹配：先在降采样图上取若干候选，再在原分辨率的小窗口内精确定位；
+        精匹配未达阈值但粗匹配分数接近阈值时，回退到原分辨率全图匹配，保证结果与全图匹配一致。
+
+        Args:
+            frame: _prepare_match_frame 的返回结果
+            template_gray: 灰度模板
+            threshold: 匹配置信度阈值（用于判断是否需要回退全图匹配）
+            factor: 金字塔降采样倍数（由 _plan_pyramid_factor 计算）
+
+        Returns:
+            Tuple[float, Tuple[int, int]]: (最高匹配分数, 子图内匹配位置)
+        """
+        cropped_gray = frame["cropped_gray"]
+        coarse_gray = frame.get("pyramid_levels", {}).get(factor) if factor > 1 else None
+        if coarse_gray is None:
+            result = cv2.matchTemplate(cropped_gray, template_gray, self.match_algorithm)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return float(max_val), max_loc
+
+        tpl_h, tpl_w = template_gray.shape[:2]
+        search_h, search_w = cropped_gray.shape[:2]
+        coarse_tpl = cv2.resize(template_gray, (tpl_w // factor, tpl_h // factor), interpolation=cv2.INTER_AREA)
+        coarse_result = cv2.matchTemplate(coarse_gray, coarse_tpl, self.match_algorithm)
+        candidates = self._top_candidates(
+            coarse_result, self.pyramid_candidates, (coarse_tpl.shape[1] // 2, coarse_tpl.shape[0] // 2)
+        )
+
+        best_score, best_loc = -1.0, (0, 0)
+        margin = factor * 2
+        for (coarse_x, coarse_y), _ in candidates:
+            x0 = max(0, coarse_x * factor - margin)
+            y0 = max(0, coarse_y * factor - margin)
+            x1 = min(search_w - tpl_w, coarse_x * factor + margin)
+            y1 = min(search_h - tpl_h, coarse_y * factor + margin)
+            window = cropped_gray[y0 : y1 + tpl_h, x0 : x1 + tpl_w]
+            refine_result = cv2.matchTemplate(window, template_gray, self.match_algorithm)
+            _, max_val, _, max_loc = cv2.minMaxLoc(refine_result)
+            if max_val > best_score:
+                best_score, best_loc = float(max_val), (x0 + max_loc[0], y0 + max_loc[1])
+
+        coarse_best = candidates[0][1] if candidates else -1.0
+        if best_score < threshold and coarse_best >= threshold - self.pyramid_fallback_margin:
+            self.logger.debug(
+                f"金字塔匹配结果不确定，回退全图匹配 | 粗匹配分数: {coarse_best:.4f} | "
+                f"精匹配分数: {best_score:.4f} | 阈值: {threshold}"
+            )
+            result = cv2.matchTemplate(cropped_gray, template_gray, self.match_algorithm)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return float(max_val), max_loc
+
+        self.logger.debug(
+            f"金字塔匹配完成 | 降采样倍数: {factor} | 候选数: {len(candidates)} | "
+            f"粗匹配分数: {coarse_best:.4f} | 精匹配分数: {best_score:.4f} | 位置: {best_loc}"
+        )
+        return best_score, best_loc
+
+    def _finalize_match(
+        self,
+        frame: Dict,
+        template_name: str,
+        template_gray: np.ndarray,
+        match_score: float,
+        max_loc: Tuple[int, int],
+        threshold: float,
+        template_orig_size: Tuple[int, int],
+        template_scaled_size: Tuple[int, int],
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        根据匹配分数生成最终结果：坐标换算、调试图保存、日志输出
+
+        Args:
+            frame: _prepare_match_frame 的返回结果
+            template_name: 模板名称
+            template_gray: 参与匹配的灰度模板
+            match_score: 最高匹配分数
+            max_loc: 子图内匹配位置
+            threshold: 匹配置信度阈值
+            template_orig_size: 模板原始尺寸（宽, 高）
+            template_scaled_size: 模板缩放后尺寸（宽, 高）
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: 匹配成功返回统一逻辑坐标的矩形（x,y,w,h），失败返回None
+        """
+        is_fullscreen = frame["is_fullscreen"]
+        self.logger.debug(
+            f"模板匹配完成 | 模板: {template_name} | 最高匹配分数: {match_score:.4f} | 阈值: {threshold} | "
+            f"匹配位置（子图内）: {max_loc}"
+        )
+
+        if match_score < threshold:
+            self.logger.debug(
+                f"模板匹配失败：分数不足 | 模板: {template_name} | 分数: {match_score:.4f} < 阈值: {threshold}"
+            )
+            if self.test_mode:
+                self.debug_saver.save_template_debug(
+                    orig_image=frame["orig_image"],
+                    template_name=template_name,
+                    is_success=False,
+                    match_score=match_score,
+                    threshold=threshold,
+                    is_fullscreen=is_fullscreen,
+                    orig_roi_phys=frame["orig_roi_phys"],
+                    processed_roi=frame["processed_roi"],
+                )
+            return None
+
+        match_x_sub, match_y_sub = max_loc
+        match_bbox_sub = (match_x_sub, match_y_sub, template_gray.shape[1], template_gray.shape[0])
+        match_bbox_phys = self.coord_transformer.apply_roi_offset_to_subcoord(
+            sub_coord=match_bbox_sub, roi_offset_phys=frame["roi_offset_phys"]
+        )
+        center_phys = self.coord_transformer.get_rect_center(match_bbox_phys)
+
+        final_bbox_log = self.coord_transformer.get_unified_logical_rect(match_bbox_phys)
+
+        if self.test_mode:
+            self.debug_saver.save_template_debug(
+                orig_image=frame["orig_image"],
+                template_name=template_name,
+                is_success=True,
+                match_score=match_score,
+                threshold=threshold,
+                is_fullscreen=is_fullscreen,
+                orig_roi_phys=frame["orig_roi_phys"],
+                processed_roi=frame["processed_roi"],
+                match_bbox_phys=match_bbox_phys,
+                center_phys=center_phys,
+                final_bbox_log=final_bbox_log,
+                template_orig_size=template_orig_size,
+                template_scaled_size=template_scaled_size,
+            )
+
+        self.logger.info(
+            f"模板匹配成功 | 模板: {template_name} | 逻辑坐标: {final_bbox_log} | "
+            f"物理坐标: {match_bbox_phys} | 匹配分数: {match_score:.4f} | "
+            f"模式: {'全屏' if is_fullscreen else '窗口'} | 模板缩放比例: {frame['scale_ratio']:.4f}"
+        )
+        return final_bbox_log
+
+    def _prior_search_limit(self, roi: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        """位置先验的最终搜索范围（基准坐标）：调用方ROI，未指定时为整帧"""
+        if roi:
+            return tuple(roi)
+        if self.coord_transformer.is_fullscreen:
+            frame_w, frame_h = self.display_context.screen_physical_res
+        else:
+            frame_w, frame_h = self.original_base_res
+        return (0, 0, frame_w, frame_h)
+
+    def _record_prior(
+        self, template_name: str, bbox_log: Tuple[int, int, int, int], roi: Optional[Tuple[int, int, int, int]]
+    ) -> None:
+        """记录模板匹配成功的位置（逻辑坐标转换为基准坐标后记录）"""
+        if not self.spatial_priors or not bbox_log:
+            return
+        base_rect = self.coord_transformer.convert_current_client_rect_to_original(tuple(bbox_log))
+        self.spatial_priors.record(template_name, base_rect, tuple(roi) if roi else None)
+
+    def _match_with_prior(
+        self,
+        image: np.ndarray,
+        template_name: str,
+        threshold: float,
+        roi: Optional[Tuple[int, int, int, int]],
+    ) -> Optional[Tuple[float, Tuple[int, int, int, int]]]:
+        """
+        在历史匹配位置附近逐级搜索模板
+
+        Args:
+            image: 待匹配的原始图像（BGR格式）
+            template_name: 模板名称
+            threshold: 匹配置信度阈值
+            roi: 调用方指定的ROI（基准坐标），窗口不会超出该范围
+
+        Returns:
+            Optional[Tuple]: 命中返回(匹配分数, 统一逻辑坐标矩形)；无记录或各级窗口均未命中返回None
+        """
+        if not self.spatial_priors:
+            return None
+        windows = self.spatial_priors.search_windows(template_name, self._prior_search_limit(roi))
+        for level, window in enumerate(windows):
+            frame = self._prepare_match_frame(image, window)
+            if frame is None or frame["orig_roi_phys"] is None:
+                break
+            prepared = self._prepare_template_for_frame(frame, template_name)
+            if prepared is None:
+                continue
+            _, template_gray, template_orig_size, template_scaled_size = prepared
+            match_score, max_loc = self._run_match(frame, template_gray, threshold)
+            if match_score < threshold:
+                continue
+            bbox = self._finalize_match(
+                frame=frame,
+                template_name=template_name,
+                template_gray=template_gray,
+                match_score=match_score,
+                max_loc=max_loc,
+                threshold=threshold,
+                template_orig_size=template_orig_size,
+                template_scaled_size=template_scaled_size,
+            )
+            if bbox:
+                self.prior_hits += 1
+                self.logger.debug(f"位置先验命中 | 模板: {template_name} | 层级: {level + 1}/{len(windows)} | 窗口: {window}")
+                self._record_prior(template_name, bbox, roi)
+                return match_score, bbox
+        if windows:
+            self.prior_misses += 1
+            self.logger.debug(f"位置先验未命中，扩大到{'ROI' if roi else '全图'}搜索 | 模板: {template_name}")
+        return None
+
+    def _memo_key(
+        self, image: np.ndarray, roi: Optional[Tuple[int, int, int, int]], *params
+    ) -> Optional[Tuple]:
+        """
+        生成结果记忆化键：ROI裁剪区域指纹 + 显示几何签名 + 查询参数
+
+        Args:
+            image: 待匹配的原始图像
+            roi: 感兴趣区域（逻辑坐标），None表示整图
+            *params: 查询参数（模板名称、阈值等，须可哈希）
+
+        Returns:
+            Optional[Tuple]: 记忆化键，未启用/图像无效时返回None（不缓存）
+        """
+        if not self.result_memo.enabled or image is None or image.size == 0:
+            return None
+        rect = None
+        if roi:
+            image_h, image_w = image.shape[:2]
+            rect, _ = self.coord_transformer.process_roi(
+                roi=roi, boundary_width=image_w, boundary_height=image_h, enable_expand=False
+            )
+        fingerprint = region_fingerprint(image, rect)
+        if fingerprint is None:
+            return None
+        return (fingerprint, tuple(roi) if roi else None, self.display_context.geometry_signature) + params
+
     def match_template(
         self,
         image: np.ndarray,
@@ -200,6 +1086,8 @@ class ImageProcessor:
         """
         在指定图像中匹配模板，支持ROI裁剪和模板分辨率自适应缩放
 
+        ROI区域画面未变化时直接返回上次的匹配结果（模板名称匹配时生效，自定义模板数组不缓存）。
+
         Args:
             image: 待匹配的原始图像（BGR格式）
             template: 模板名称或模板数组（BGR格式）
@@ -209,178 +1097,308 @@ class ImageProcessor:
         Returns:
             Optional[Tuple[int, int, int, int]]: 匹配成功返回统一逻辑坐标的矩形（x,y,w,h），失败返回None
         """
+        key = self._memo_key(image, roi, "match", template, threshold) if isinstance(template, str) else None
+        return self.result_memo.get_or_compute(
+            key, lambda: self._match_template_uncached(image, template, threshold, roi)
+        )
+
+    def _match_template_uncached(
+        self,
+        image: np.ndarray,
+        template: Union[str, np.ndarray],
+        threshold: float,
+        roi: Optional[Tuple[int, int, int, int]],
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """执行单模板匹配（不经过结果记忆化），参数同 match_template"""
         try:
-            is_fullscreen = self.display_context.is_fullscreen
-            ctx = self.display_context
-            self.logger.debug(
-                f"上下文全屏状态: {is_fullscreen} | ROI: {roi} | 阈值: {threshold} | "
-                f"客户区逻辑尺寸: {ctx.client_logical_res} | 屏幕物理尺寸: {ctx.screen_physical_res}"
-            )
+            if isinstance(template, str) and image is not None:
+                prior_hit = self._match_with_prior(image, template, threshold, roi)
+                if prior_hit is not None:
+                    return prior_hit[1]
 
-            if image is None or image.size == 0:
-                self.logger.error("模板匹配失败：输入图像为空或无效")
+            frame = self._prepare_match_frame(image, roi)
+            if frame is None:
                 return None
-            orig_image = image.copy()
-            image_phys_h, image_phys_w = orig_image.shape[:2]
-            orig_roi_phys = None
-            processed_roi = roi
-            roi_offset_phys = (0, 0)
-
-            if isinstance(template, str):
-                template_bgr = self.get_template(template)
-                if template_bgr is None:
-                    self.logger.error(f"模板匹配失败：模板「{template}」不存在或加载失败")
-                    return None
-                template_name = template
-            else:
-                if not isinstance(template, np.ndarray) or template.size == 0:
-                    self.logger.error("模板匹配失败：自定义模板为无效numpy数组")
-                    return None
-                template_bgr = template
-                template_name = "custom_template"
-            template_orig_h, template_orig_w = template_bgr.shape[:2]
-            template_orig_size = (template_orig_w, template_orig_h)
-            self.logger.debug(
-                f"开始模板匹配 | 模板: {template_name} | 原始尺寸: {template_orig_size} | "
-                f"输入图像尺寸: (宽={image_phys_w}, 高={image_phys_h}) | 阈值: {threshold} | "
-                f"ROI: {roi} | 上下文全屏状态: {is_fullscreen}"
+
+            prepared = self._prepare_template_for_frame(frame, template)
+            if prepared is None:
+                return None
+            template_name, template_gray, template_orig_size, template_scaled_size = prepared
+            if self._prefilter_rejects(frame, template_name, template_scaled_size):
+                return None
+
+            factor = self._plan_pyramid_factor(frame, template_gray, template_name)
+            match_score, max_loc = self._run_match(frame, template_gray, threshold, factor)
+            bbox = self._finalize_match(
+                frame=frame,
+                template_name=template_name,
+                template_gray=template_gray,
+                match_score=match_score,
+                max_loc=max_loc,
+                threshold=threshold,
+                template_orig_size=template_orig_size,
+                template_scaled_size=template_scaled_size,
             )
+            if bbox and isinstance(template, str):
+                self._record_prior(template, bbox, roi)
+            return bbox
 
-            cropped_image = orig_image
-            if roi:
-                processed_roi_phys, roi_offset_phys = self.coord_transformer.process_roi(
-                    roi=roi, boundary_width=image_phys_w, boundary_height=image_phys_h, enable_expand=False
-                )
-                if processed_roi_phys:
-                    orig_roi_phys = processed_roi_phys
-                    rx_phys, ry_phys, rw_phys, rh_phys = processed_roi_phys
-                    cropped_image = orig_image[ry_phys : ry_phys + rh_phys, rx_phys : rx_phys + rw_phys]
-                    if cropped_image.size == 0:
-                        self.logger.warning(
-                            f"ROI裁剪后子图为空，使用原图进行匹配 | 原始ROI: {roi} | 处理后ROI物理坐标: {processed_roi_phys}"
-                        )
-                        cropped_image = orig_image
-                        roi_offset_phys = (0, 0)
-                        orig_roi_phys = None
-                    else:
-                        self.logger.debug(
-                            f"ROI裁剪完成 | 子图尺寸: (宽={cropped_image.shape[1]}, 高={cropped_image.shape[0]}) | "
-                            f"原图偏移: {roi_offset_phys} | 裁剪后图像是否有效: {cropped_image.size > 0}"
-                        )
-                else:
-                    processed_roi = None
-                    roi_offset_phys = (0, 0)
-                    orig_roi_phys = None
+        except Exception as e:
+            template_name = template if isinstance(template, str) else "custom_template"
+            self.logger.error(f"模板匹配异常 | 模板: {template_name} | 错误: {str(e)}", exc_info=True)
+            return None
 
-            if is_fullscreen:
-                target_phys_size = self.display_context.screen_physical_res
-            else:
-                target_phys_size = self.display_context.client_physical_res
+    def _nms_peaks(
+        self,
+        result: np.ndarray,
+        threshold: float,
+        box_size: Tuple[int, int],
+        max_results: int,
+        iou_threshold: float,
+    ) -> List[Tuple[Tuple[int, int], float]]:
+        """
+        从匹配响应图中提取全部达到阈值的实例（NumPy向量化非极大值抑制）
 
-            scale_ratio = self.coord_transformer.calculate_template_scale_ratio(
-                target_phys_size=target_phys_size, has_roi=False
-            )
-            self.logger.debug(
-                f"模板缩放比例计算完成 | 基准分辨率: {self.original_base_res} | "
-                f"当前整体物理尺寸: {target_phys_size} | 缩放比例: {scale_ratio:.4f}"
-            )
+        先用3x3膨胀保留局部极大值压缩候选数量，再按分数降序贪心抑制：
+        所有候选框尺寸相同，每轮仅需一次向量化的交并比计算。
 
-            scaled_w = max(self.min_template_size[0], int(round(template_orig_w * scale_ratio)))
-            scaled_h = max(self.min_template_size[1], int(round(template_orig_h * scale_ratio)))
-            scaled_w = min(scaled_w, cropped_image.shape[1] - 2)
-            scaled_h = min(scaled_h, cropped_image.shape[0] - 2)
-            template_scaled_size = (scaled_w, scaled_h)
+        Args:
+            result: matchTemplate 响应图
+            threshold: 匹配置信度阈值
+            box_size: 匹配框尺寸（宽, 高），即缩放后模板尺寸
+            max_results: 最多返回的实例数量
+            iou_threshold: 交并比超过该值的候选视为同一实例
 
-            if scaled_w <= 0 or scaled_h <= 0:
-                self.logger.error(
-                    f"模板缩放失败 | 缩放后尺寸无效: {template_scaled_size} | "
-                    f"子图尺寸: (宽={cropped_image.shape[1]}, 高={cropped_image.shape[0]}) | 比例: {scale_ratio:.4f}"
-                )
-                return None
+        Returns:
+            List[Tuple]: [(子图内位置(x, y), 分数), ...]，按分数降序
+        """
+        local_max = cv2.dilate(result, np.ones((3, 3), dtype=np.uint8))
+        ys, xs = np.nonzero((result >= threshold) & (result >= local_max))
+        if xs.size == 0:
+            return []
+        scores = result[ys, xs]
+        order = np.argsort(-scores, kind="stable")
+        xs, ys, scores = xs[order], ys[order], scores[order]
 
-            interpolation = cv2.INTER_LANCZOS4 if scale_ratio < 1.0 else cv2.INTER_CUBIC
-            scaled_template = cv2.resize(template_bgr, (scaled_w, scaled_h), interpolation=interpolation)
-            self.logger.debug(
-                f"模板缩放完成 | 原始尺寸: {template_orig_size} → 缩放后: {template_scaled_size} | "
-                f"插值方式: {interpolation} | 缩放比例: {scale_ratio:.4f}"
-            )
+        box_w, box_h = box_size
+        box_area = float(box_w * box_h)
+        keep: List[int] = []
+        remaining = np.arange(xs.size)
+        while remaining.size and len(keep) < max_results:
+            best = remaining[0]
+            keep.append(int(best))
+            rest = remaining[1:]
+            inter_w = np.clip(box_w - np.abs(xs[rest] - xs[best]), 0, None)
+            inter_h = np.clip(box_h - np.abs(ys[rest] - ys[best]), 0, None)
+            inter = inter_w * inter_h
+            iou = inter / (2 * box_area - inter)
+            remaining = rest[iou <= iou_threshold]
+        return [((int(xs[i]), int(ys[i])), float(scores[i])) for i in keep]
 
-            cropped_gray = (
-                cv2.cvtColor(cropped_image, cv2.COLOR_BGR2GRAY) if len(cropped_image.shape) == 3 else cropped_image
-            )
-            template_gray = (
-                cv2.cvtColor(scaled_template, cv2.COLOR_BGR2GRAY)
-                if len(scaled_template.shape) == 3
-                else scaled_template
-            )
+    def match_all(
+        self,
+        image: np.ndarray,
+        template: Union[str, np.ndarray],
+        threshold: float = 0.8,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        max_results: int = 50,
+        iou_threshold: float = 0.3,
+    ) -> List[Dict]:
+        """
+        在指定图像中匹配模板的全部实例（单次响应图 + 向量化非极大值抑制）
 
-            if (template_gray.shape[0] > cropped_gray.shape[0]) or (template_gray.shape[1] > cropped_gray.shape[1]):
-                self.logger.error(
-                    f"模板匹配失败：模板尺寸超过子图尺寸 | "
-                    f"模板尺寸: (宽={template_gray.shape[1]}, 高={template_gray.shape[0]}) | "
-                    f"子图尺寸: (宽={cropped_gray.shape[1]}, 高={cropped_gray.shape[0]})"
-                )
-                return None
+        适用于装备格子、奖励列表等重复出现的界面元素，一次截图即可拿到所有位置。
 
-            result = cv2.matchTemplate(cropped_gray, template_gray, self.match_algorithm)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            match_score = max_val
-            self.logger.debug(
-                f"模板匹配完成 | 最高匹配分数: {match_score:.4f} | 阈值: {threshold} | "
-                f"匹配位置（子图内）: {max_loc}"
-            )
+        Args:
+            image: 待匹配的原始图像（BGR格式）
+            template: 模板名称或模板数组（BGR格式）
+            threshold: 匹配置信度阈值，默认0.8
+            roi: 感兴趣区域（逻辑坐标，x,y,w,h），可选
+            max_results: 最多返回的实例数量，默认50
+            iou_threshold: 非极大值抑制的交并比阈值，默认0.3
 
-            if match_score < threshold:
-                self.logger.debug(
-                    f"模板匹配失败：分数不足 | 模板: {template_name} | 分数: {match_score:.4f} < 阈值: {threshold}"
+        Returns:
+            List[Dict]: 按分数降序的实例列表，每项包含 bbox(统一逻辑坐标矩形)、score(匹配分数)；未匹配返回空列表
+        """
+        try:
+            frame = self._prepare_match_frame(image, roi)
+            if frame is None:
+                return []
+
+            prepared = self._prepare_template_for_frame(frame, template)
+            if prepared is None:
+                return []
+            template_name, template_gray, template_orig_size, template_scaled_size = prepared
+
+            result = cv2.matchTemplate(frame["cropped_gray"], template_gray, self.match_algorithm)
+            box_size = (template_gray.shape[1], template_gray.shape[0])
+            peaks = self._nms_peaks(result, threshold, box_size, max(1, max_results), iou_threshold)
+
+            if not peaks:
+                # 复用单实例流程输出失败日志与调试图
+                _, best_score, _, best_loc = cv2.minMaxLoc(result)
+                self._finalize_match(
+                    frame=frame,
+                    template_name=template_name,
+                    template_gray=template_gray,
+                    match_score=float(best_score),
+                    max_loc=best_loc,
+                    threshold=threshold,
+                    template_orig_size=template_orig_size,
+                    template_scaled_size=template_scaled_size,
+                )
+                return []
+
+            matches = []
+            for sub_loc, score in peaks:
+                match_bbox_phys = self.coord_transformer.apply_roi_offset_to_subcoord(
+                    sub_coord=(sub_loc[0], sub_loc[1], box_size[0], box_size[1]),
+                    roi_offset_phys=frame["roi_offset_phys"],
+                )
+                matches.append(
+                    {"bbox": self.coord_transformer.get_unified_logical_rect(match_bbox_phys), "score": score}
                 )
-                if self.test_mode:
-                    self.debug_saver.save_template_debug(
-                        orig_image=orig_image,
-                        template_name=template_name,
-                        is_success=False,
-                        match_score=match_score,
-                        threshold=threshold,
-                        is_fullscreen=is_fullscreen,
-                        orig_roi_phys=orig_roi_phys,
-                        processed_roi=processed_roi,
-                    )
-                return None
 
-            match_x_sub, match_y_sub = max_loc
-            match_bbox_sub = (match_x_sub, match_y_sub, scaled_template.shape[1], scaled_template.shape[0])
-            match_bbox_phys = self.coord_transformer.apply_roi_offset_to_subcoord(
-                sub_coord=match_bbox_sub, roi_offset_phys=roi_offset_phys
+            if self.test_mode:
+                # 调试图仅标注最高分实例，避免多实例时重复落盘
+                self._finalize_match(
+                    frame=frame,
+                    template_name=template_name,
+                    template_gray=template_gray,
+                    match_score=peaks[0][1],
+                    max_loc=peaks[0][0],
+                    threshold=threshold,
+                    template_orig_size=template_orig_size,
+                    template_scaled_size=template_scaled_size,
+                )
+            self.logger.info(
+                f"多实例匹配完成 | 模板: {template_name} | 实例数: {len(matches)} | "
+                f"分数范围: {matches[-1]['score']:.4f}~{matches[0]['score']:.4f} | 阈值: {threshold}"
             )
-            center_phys = self.coord_transformer.get_rect_center(match_bbox_phys)
+            return matches
+
+        except Exception as e:
+            template_name = template if isinstance(template, str) else "custom_template"
+            self.logger.error(f"多实例模板匹配异常 | 模板: {template_name} | 错误: {str(e)}", exc_info=True)
+            return []
 
-            final_bbox_log = self.coord_transformer.get_unified_logical_rect(match_bbox_phys)
+    def _get_match_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """获取（按需创建）多模板匹配线程池"""
+        if self._match_executor is None or self._match_executor_workers != max_workers:
+            if self._match_executor is not None:
+                self._match_executor.shutdown(wait=False)
+            self._match_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="TemplateMatch")
+            self._match_executor_workers = max_workers
+        return self._match_executor
 
-            if self.test_mode:
-                self.debug_saver.save_template_debug(
-                    orig_image=orig_image,
+    def match_templates(
+        self,
+        image: np.ndarray,
+        templates: List[Union[str, np.ndarray]],
+        threshold: float = 0.8,
+        roi: Optional[Tuple[int, int, int, int]] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        批量模板匹配：图像仅预处理一次（ROI裁剪+灰度转换），所有模板共享同一灰度子图
+
+        Args:
+            image: 待匹配的原始图像（BGR格式）
+            templates: 模板名称或模板数组列表
+            threshold: 匹配置信度阈值，默认0.8
+            roi: 感兴趣区域（逻辑坐标，x,y,w,h），可选
+            max_workers: 并发线程数（None使用配置MATCH_WORKERS，<=1为串行）；cv2匹配会释放GIL
+
+        Returns:
+            List[Dict]: 与templates顺序一致的结果列表，每项包含
+                template(模板名称)、score(最高匹配分数，失败为-1.0)、bbox(统一逻辑坐标矩形或None)
+        """
+        key = None
+        if all(isinstance(t, str) for t in templates):
+            key = self._memo_key(image, roi, "batch", tuple(templates), threshold)
+        results = self.result_memo.get_or_compute(
+            key, lambda: self._match_templates_uncached(image, templates, threshold, roi, max_workers)
+        )
+        return [dict(item) for item in results]
+
+    def _match_templates_uncached(
+        self,
+        image: np.ndarray,
+        templates: List[Union[str, np.ndarray]],
+        threshold: float,
+        roi: Optional[Tuple[int, int, int, int]],
+        max_workers: Optional[int],
+    ) -> List[Dict]:
+        """执行批量模板匹配（不经过结果记忆化），参数同 match_templates"""
+        results = [
+            {"template": t if isinstance(t, str) else "custom_template", "score": -1.0, "bbox": None}
+            for t in templates
+        ]
+        try:
+            # 先在各模板的历史位置附近搜索，命中的模板不再参与整块匹配
+            pending = list(range(len(templates)))
+            if self.spatial_priors and image is not None:
+                pending = []
+                for idx, t in enumerate(templates):
+                    prior_hit = self._match_with_prior(image, t, threshold, roi) if isinstance(t, str) else None
+                    if prior_hit is None:
+                        pending.append(idx)
+                    else:
+                        results[idx]["score"], results[idx]["bbox"] = prior_hit
+                if not pending:
+                    return results
+
+            frame = self._prepare_match_frame(image, roi)
+            if frame is None:
+                return results
+
+            # 模板解析与缩放在当前线程完成（涉及缓存），线程池仅执行纯cv2匹配
+            prepared_list = [(idx, self._prepare_template_for_frame(frame, templates[idx])) for idx in pending]
+            jobs = [
+                (idx, prepared)
+                for idx, prepared in prepared_list
+                if prepared is not None and not self._prefilter_rejects(frame, prepared[0], prepared[3])
+            ]
+
+            factors = [self._plan_pyramid_factor(frame, prepared[1], prepared[0]) for _, prepared in jobs]
+
+            workers = self.match_workers if max_workers is None else max_workers
+            if workers > 1 and len(jobs) > 1:
+                executor = self._get_match_executor(workers)
+                scores = list(
+                    executor.map(
+                        lambda job, factor: self._run_match(frame, job[1][1], threshold, factor), jobs, factors
+                    )
+                )
+            else:
+                scores = [
+                    self._run_match(frame, prepared[1], threshold, factor)
+                    for (_, prepared), factor in zip(jobs, factors)
+                ]
+
+            for (idx, prepared), (match_score, max_loc) in zip(jobs, scores):
+                template_name, template_gray, template_orig_size, template_scaled_size = prepared
+                results[idx]["score"] = match_score
+                results[idx]["bbox"] = self._finalize_match(
+                    frame=frame,
                     template_name=template_name,
-                    is_success=True,
+                    template_gray=template_gray,
                     match_score=match_score,
+                    max_loc=max_loc,
                     threshold=threshold,
-                    is_fullscreen=is_fullscreen,
-                    orig_roi_phys=orig_roi_phys,
-                    processed_roi=processed_roi,
-                    match_bbox_phys=match_bbox_phys,
-                    center_phys=center_phys,
-                    final_bbox_log=final_bbox_log,
                     template_orig_size=template_orig_size,
                     template_scaled_size=template_scaled_size,
                 )
+                if results[idx]["bbox"] and isinstance(templates[idx], str):
+                    self._record_prior(template_name, results[idx]["bbox"], roi)
 
-            self.logger.info(
-                f"模板匹配成功 | 模板: {template_name} | 逻辑坐标: {final_bbox_log} | "
-                f"物理坐标: {match_bbox_phys} | 匹配分数: {match_score:.4f} | "
-                f"模式: {'全屏' if is_fullscreen else '窗口'} | 模板缩放比例: {scale_ratio:.4f}"
+            self.logger.debug(
+                f"批量模板匹配完成 | 模板数: {len(templates)} | 并发线程: {workers if len(jobs) > 1 else 1} | "
+                f"分数: {[(r['template'], round(r['score'], 4)) for r in results]}"
             )
-            return final_bbox_log
+            return results
 
         except Exception as e:
-            template_name = template if isinstance(template, str) else "custom_template"
-            self.logger.error(f"模板匹配异常 | 模板: {template_name} | 错误: {str(e)}", exc_info=True)
-            return None
+            template_names = [r["template"] for r in results]
+            self.logger.error(f"批量模板匹配异常 | 模板: {template_names} | 错误: {str(e)}", exc_info=True)
+            return results
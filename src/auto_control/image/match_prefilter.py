@@ -0,0 +1,138 @@
+"""模板匹配预过滤：用颜色分布的包含关系快速排除明显不存在的模板
+
+原理：模板若出现在搜索区域中，其像素必然包含在覆盖该实例的某个局部窗口内。
+将像素按色相/饱和度量化为若干颜色桶（低饱和像素归入"灰色"桶，过暗像素归入"暗色"桶），
+对搜索区域按网格统计各桶计数（积分图），逐窗口计算模板颜色"缺失比例"：
+    缺失比例 = (Σ max(0, 模板期望计数 - 窗口计数) - 窗口暗色盈余) / 模板总计数
+所有窗口的最小缺失比例超过安全阈值时，模板不可能以原色出现，可直接判定未找到。
+
+色相/饱和度对乘性亮度变化不敏感；半透明黑色遮罩会把任意颜色压暗到暗色桶，
+因此窗口中多出的暗色像素可抵扣任意颜色的缺失。窗口按实例尺寸向上取整覆盖，
+背景像素只会增加窗口计数，不会导致漏检。安全阈值需通过 benchmarks.prefilter_validation 在内置模板上验证。
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+HUE_BINS = 12
+SAT_BINS = 3
+GRAY_BIN = HUE_BINS * SAT_BINS  # 低饱和像素
+DARK_BIN = GRAY_BIN + 1  # 过暗像素（色相/饱和度不稳定，且可由任意颜色压暗得到）
+NUM_COLOR_BINS = DARK_BIN + 1
+ACHROMATIC_SAT = 40  # 饱和度低于该值视为灰色（HSV，0-255）
+DARK_VAL = 60  # 亮度低于该值视为暗色
+
+
+def _build_bin_luts() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    构建HSV各通道的查找表，使颜色桶编号可用纯uint8的cv2运算合成：
+    色相 → 色相桶*SAT_BINS；饱和度 → 饱和度桶（灰色像素为200，相加后必然≥GRAY_BIN）；亮度 → 暗色像素为255
+    """
+    values = np.arange(256)
+    hue = np.minimum(values, 179) * HUE_BINS // 180 * SAT_BINS
+    sat = np.where(
+        values < ACHROMATIC_SAT, 200, (values - ACHROMATIC_SAT).clip(0, None) * SAT_BINS // (256 - ACHROMATIC_SAT)
+    )
+    dark = np.where(values < DARK_VAL, 255, 0)
+    return tuple(lut.astype(np.uint8) for lut in (hue, sat, dark))
+
+
+_HUE_LUT, _SAT_LUT, _DARK_LUT = _build_bin_luts()
+
+
+def color_bins(image_bgr: np.ndarray) -> np.ndarray:
+    """
+    将BGR图像的每个像素量化为颜色桶编号
+
+    Args:
+        image_bgr: BGR图像
+
+    Returns:
+        np.ndarray: 与图像同尺寸的桶编号（uint8，取值 0 ~ NUM_COLOR_BINS-1）
+    """
+    hue, sat, val = cv2.split(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV))
+    # 饱和相加：灰色像素（≥200）截断为GRAY_BIN；暗色像素（255）截断为DARK_BIN
+    bins = cv2.min(cv2.add(cv2.LUT(hue, _HUE_LUT), cv2.LUT(sat, _SAT_LUT)), GRAY_BIN)
+    return cv2.min(cv2.max(bins, cv2.LUT(val, _DARK_LUT)), DARK_BIN)
+
+
+def color_signature(template_bgr: np.ndarray) -> np.ndarray:
+    """
+    计算模板颜色签名（各颜色桶的像素占比）
+
+    Args:
+        template_bgr: 模板图像（BGR格式）
+
+    Returns:
+        np.ndarray: 长度为 NUM_COLOR_BINS 的占比数组（float32，和为1）
+    """
+    counts = np.bincount(color_bins(template_bgr).ravel(), minlength=NUM_COLOR_BINS).astype(np.float32)
+    return counts / max(1.0, float(counts.sum()))
+
+
+def cell_histogram_integral(image_bgr: np.ndarray, stride: int, cell: int) -> np.ndarray:
+    """
+    按网格统计颜色桶计数并生成积分图（用于O(1)求任意网格窗口的桶计数）
+
+    Args:
+        image_bgr: 搜索区域图像（BGR格式）
+        stride: 像素采样步长
+        cell: 网格边长（采样后像素）
+
+    Returns:
+        np.ndarray: 积分图，形状 (rows+1, cols+1, NUM_COLOR_BINS)，int32
+    """
+    src_h, src_w = image_bgr.shape[:2]
+    h, w = -(-src_h // stride), -(-src_w // stride)
+    # 最近邻缩放近似按步长取样，比跨步切片后再拷贝更快
+    sampled = cv2.resize(image_bgr, (w, h), interpolation=cv2.INTER_NEAREST) if stride > 1 else image_bgr
+    bins = color_bins(sampled)
+    rows, cols = -(-h // cell), -(-w // cell)
+    cell_ids = (np.arange(h, dtype=np.int32) // cell)[:, None] * (cols * NUM_COLOR_BINS) + (
+        np.arange(w, dtype=np.int32) // cell
+    )[None, :] * NUM_COLOR_BINS
+    counts = np.bincount((cell_ids + bins).ravel(), minlength=rows * cols * NUM_COLOR_BINS).reshape(
+        rows, cols, NUM_COLOR_BINS
+    )
+    integral = np.zeros((rows + 1, cols + 1, NUM_COLOR_BINS), dtype=np.int32)
+    integral[1:, 1:] = counts.cumsum(axis=0).cumsum(axis=1)
+    return integral
+
+
+def min_missing_fraction(
+    integral: np.ndarray, signature: np.ndarray, instance_size: Tuple[int, int], stride: int, cell: int
+) -> float:
+    """
+    计算模板颜色在所有候选窗口中的最小缺失比例
+
+    Args:
+        integral: cell_histogram_integral 的返回结果
+        signature: 模板颜色签名
+        instance_size: 模板实例在搜索区域中的物理尺寸（宽, 高）
+        stride: 像素采样步长（与积分图一致）
+        cell: 网格边长（与积分图一致）
+
+    Returns:
+        float: 最小缺失比例（0表示某窗口完全包含模板颜色分布）
+    """
+    rows, cols = integral.shape[0] - 1, integral.shape[1] - 1
+    inst_w, inst_h = instance_size[0] // stride, instance_size[1] // stride
+    expected = signature * float(inst_w * inst_h)
+    total = float(expected.sum())
+    if total <= 0:
+        return 0.0
+    # 任意位置的实例必落在 (ceil(尺寸/cell)+1) 个网格构成的窗口内
+    win_cols = min(cols, -(-inst_w // cell) + 1)
+    win_rows = min(rows, -(-inst_h // cell) + 1)
+    window_counts = (
+        integral[win_rows:, win_cols:]
+        - integral[:-win_rows, win_cols:]
+        - integral[win_rows:, :-win_cols]
+        + integral[:-win_rows, :-win_cols]
+    )
+    deficit = np.clip(expected - window_counts, 0, None)
+    dark_surplus = np.clip(window_counts[..., DARK_BIN] - expected[DARK_BIN], 0, None)
+    missing = deficit[..., DARK_BIN] + np.clip(deficit[..., :DARK_BIN].sum(axis=2) - dark_surplus, 0, None)
+    return float(missing.min()) / total
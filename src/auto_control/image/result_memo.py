@@ -0,0 +1,200 @@
+"""识别结果记忆化：按ROI区域指纹缓存模板匹配/OCR结果，画面区域未变化时直接返回上次结果
+
+轮询静态界面（等待弹窗、战斗结束检测等）时，每次检查都会对同样的像素重复执行 matchTemplate 或OCR识别。
+这里只对参与识别的ROI裁剪区域计算指纹，ROI外的画面变化不影响命中，即按ROI粒度判断"脏区域"。
+不超过 EXACT_HASH_PIXELS 的区域直接哈希原像素；更大的区域按 INTER_AREA 降采样后哈希，网格随区域尺寸放大，
+每格不超过 FINGERPRINT_CELL 像素见方，计数数字、勾选标记、按钮高亮等小范围变化也会改变指纹。
+降采样指纹仍可能忽略极小的变化（如单个像素），严格模式下每次命中仍重新计算并与缓存结果比对，
+不一致时记录错误并计数，用于测试/验证指纹是否足够灵敏。
+纯numpy/cv2实现，不依赖win32。
+"""
+
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+FINGERPRINT_GRID = 64  # 指纹降采样网格的最小长边像素数
+FINGERPRINT_CELL = 4  # 降采样网格每格对应的最大原像素边长（大区域的网格随尺寸放大）
+EXACT_HASH_PIXELS = 256 * 256  # 不超过该像素数的区域直接哈希原像素
+MISS = object()  # 未命中标记（缓存结果本身可能是None）
+
+
+def region_fingerprint(
+    image: np.ndarray,
+    rect: Optional[Tuple[int, int, int, int]] = None,
+    grid: int = FINGERPRINT_GRID,
+    checksum: bool = False,
+) -> Optional[str]:
+    """
+    计算图像区域的指纹（仅读取裁剪区域；小区域哈希原像素，大区域降采样后哈希）
+
+    Args:
+        image: 原始图像（BGR/灰度）
+        rect: 物理坐标裁剪区域 (x, y, w, h)，None表示整图
+        grid: 降采样网格的最小长边像素数（实际网格按 FINGERPRINT_CELL 随区域尺寸放大）
+        checksum: 降采样时是否附加原像素的crc32校验和（OCR等结果过期即为错误的场景使用，任一像素变化都会改变指纹）
+
+    Returns:
+        Optional[str]: 区域指纹（十六进制），图像/区域无效返回None
+    """
+    if image is None or image.size == 0:
+        return None
+    crop = image
+    if rect:
+        x, y, w, h = rect
+        crop = image[y : y + h, x : x + w]
+        if crop.size == 0:
+            return None
+    crop_h, crop_w = crop.shape[:2]
+    long_side = max(crop_h, crop_w)
+    scale = max(grid, -(-long_side // FINGERPRINT_CELL)) / long_side
+    crc = None
+    if scale < 1.0 and crop_h * crop_w > EXACT_HASH_PIXELS:
+        if checksum:
+            # 逐行累加（每行连续），避免复制非连续的ROI裁剪
+            crc = 0
+            for row in crop:
+                crc = zlib.crc32(np.ascontiguousarray(row), crc)
+        size = (max(1, int(round(crop_w * scale))), max(1, int(round(crop_h * scale))))
+        crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+    digest = hashlib.blake2b(np.ascontiguousarray(crop).tobytes(), digest_size=16)
+    digest.update(f"{crop_w}x{crop_h}x{image.shape[2] if image.ndim == 3 else 1}".encode())
+    if crc is not None:
+        digest.update(crc.to_bytes(4, "little"))
+    return digest.hexdigest()
+
+
+class ResultMemo:
+    """识别结果记忆化缓存（LRU，线程安全）"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        strict: bool = False,
+        enabled: bool = True,
+        logger: Optional[logging.Logger] = None,
+        name: str = "ResultMemo",
+    ):
+        """
+        Args:
+            max_entries: 最大缓存条目数
+            strict: 严格模式（命中时仍重新计算并比对，不一致时记录错误）
+            enabled: 是否启用（禁用时直接计算，不统计）
+            logger: 日志实例
+            name: 缓存名称（用于日志）
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.strict = strict
+        self.enabled = enabled
+        self.logger = logger or logging.getLogger(name)
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.strict_checks = 0
+        self.strict_mismatches = 0
+
+    def get(self, key: Optional[Hashable]) -> Any:
+        """
+        查询缓存结果
+
+        Args:
+            key: 缓存键（None表示不可缓存）
+
+        Returns:
+            Any: 缓存结果，未命中返回 MISS
+        """
+        if not self.enabled or key is None:
+            return MISS
+        with self._lock:
+            if key not in self._entries:
+                return MISS
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Optional[Hashable], value: Any) -> None:
+        """写入缓存结果（超出容量时淘汰最久未使用的条目）"""
+        if not self.enabled or key is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(
+        self,
+        key: Optional[Hashable],
+        compute: Callable[[], Any],
+        store_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        命中时返回缓存结果，否则计算并缓存
+
+        Args:
+            key: 缓存键（None表示不可缓存，直接计算）
+            compute: 计算函数
+            store_if: 可选，判断计算结果是否可缓存（如识别被中断时返回False）
+
+        Returns:
+            Any: 识别结果
+        """
+        if not self.enabled or key is None:
+            return compute()
+        cached = self.get(key)
+        if cached is not MISS:
+            self.hits += 1
+            if not self.strict:
+                return cached
+            fresh = compute()
+            self.strict_checks += 1
+            if fresh != cached:
+                self.strict_mismatches += 1
+                self.logger.error(
+                    f"{self.name}严格模式校验失败：区域指纹相同但结果不同 | 键: {key} | 缓存: {cached} | 实际: {fresh}"
+                )
+                self.put(key, fresh)
+            return fresh
+
+        self.misses += 1
+        result = compute()
+        if store_if is None or store_if(result):
+            self.put(key, result)
+        return result
+
+    def clear(self) -> None:
+        """清空缓存条目（统计保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Union[int, float, bool]]:
+        """
+        获取记忆化统计
+
+        Returns:
+            Dict: 命中/未命中次数、命中率、淘汰次数、条目数、严格模式校验次数与不一致次数
+        """
+        total = self.hits + self.misses
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "size": size,
+            "strict": self.strict,
+            "strict_checks": self.strict_checks,
+            "strict_mismatches": self.strict_mismatches,
+        }
@@ -0,0 +1,305 @@
+"""模板位置先验：记录模板历史匹配位置（基准坐标），优先在历史位置附近搜索
+
+记录文件结构（JSON）：
+    version           格式版本
+    base_resolution   记录时的基准分辨率
+    templates         模板名 → {count, last, bounds, rois, updated}
+        last    最近一次匹配矩形 (x, y, w, h)
+        bounds  全部匹配矩形的外接框 (x0, y0, x1, y1)
+        rois    匹配时使用过的ROI（None表示全图搜索）
+
+离线报告（根据记录建议收紧 config/*/rois.json 中的ROI）：
+    python -m src.auto_control.image.spatial_priors [--priors PATH] [--rois PATH] [--padding 10]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PRIORS_VERSION = 1
+MAX_RECORDED_ROIS = 8  # 每个模板最多记录的不同ROI数量
+MIN_REPORT_SAMPLES = 3  # 报告中给出建议所需的最少匹配次数
+
+
+def _intersect(
+    rect: Tuple[int, int, int, int], limit: Tuple[int, int, int, int]
+) -> Optional[Tuple[int, int, int, int]]:
+    """求两个 (x, y, w, h) 矩形的交集，无交集返回None"""
+    x0 = max(rect[0], limit[0])
+    y0 = max(rect[1], limit[1])
+    x1 = min(rect[0] + rect[2], limit[0] + limit[2])
+    y1 = min(rect[1] + rect[3], limit[1] + limit[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+class SpatialPriorStore:
+    """模板位置先验记录（线程安全，按时间间隔节流落盘）"""
+
+    def __init__(
+        self,
+        path: str,
+        base_resolution: Tuple[int, int],
+        logger: Optional[logging.Logger] = None,
+        save_interval: float = 30.0,
+    ):
+        """
+        Args:
+            path: 记录文件路径
+            base_resolution: 基准分辨率（与记录文件不一致时丢弃旧记录）
+            logger: 日志实例
+            save_interval: 自动落盘的最小间隔（秒）
+        """
+        self.path = path
+        self.base_resolution = tuple(base_resolution)
+        self.logger = logger or logging.getLogger("SpatialPriors")
+        self.save_interval = save_interval
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save_time = time.time()
+        self.load()
+
+    def load(self) -> None:
+        """从文件加载记录（文件缺失/损坏/基准分辨率不一致时从空记录开始）"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"模板位置记录读取失败，重新开始记录 | 路径: {self.path} | 错误: {str(e)}")
+            return
+        if data.get("version") != PRIORS_VERSION or tuple(data.get("base_resolution", ())) != self.base_resolution:
+            self.logger.info(
+                f"模板位置记录版本或基准分辨率不一致，重新开始记录 | "
+                f"记录: {data.get('base_resolution')} | 当前: {self.base_resolution}"
+            )
+            return
+        self._entries = data.get("templates", {})
+        self.logger.debug(f"模板位置记录加载完成 | 模板数: {len(self._entries)}")
+
+    def save(self, force: bool = False) -> bool:
+        """
+        落盘记录（原子替换）
+
+        Args:
+            force: 是否忽略节流间隔立即写入
+
+        Returns:
+            bool: 实际写入返回True
+        """
+        with self._lock:
+            if not self._dirty or (not force and time.time() - self._last_save_time < self.save_interval):
+                return False
+            data = {
+                "version": PRIORS_VERSION,
+                "base_resolution": list(self.base_resolution),
+                "templates": self._entries,
+            }
+            payload = json.dumps(data, ensure_ascii=False, indent=2)
+            self._dirty = False
+            self._last_save_time = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"模板位置记录保存失败 | 路径: {self.path} | 错误: {str(e)}")
+            return False
+
+    def get(self, template_name: str) -> Optional[Dict]:
+        """获取模板的位置记录，无记录返回None"""
+        return self._entries.get(template_name)
+
+    def record(
+        self,
+        template_name: str,
+        base_rect: Tuple[int, int, int, int],
+        roi: Optional[Tuple[int, int, int, int]] = None,
+    ) -> None:
+        """
+        记录一次匹配成功的位置
+
+        Args:
+            template_name: 模板名称
+            base_rect: 匹配矩形（基准坐标，x,y,w,h）
+            roi: 本次搜索使用的ROI（基准坐标），None表示全图
+        """
+        x, y, w, h = (int(v) for v in base_rect)
+        roi_value = list(roi) if roi else None
+        with self._lock:
+            entry = self._entries.get(template_name)
+            if entry is None:
+                entry = {"count": 0, "last": None, "bounds": [x, y, x + w, y + h], "rois": []}
+                self._entries[template_name] = entry
+            bounds = entry["bounds"]
+            entry["bounds"] = [min(bounds[0], x), min(bounds[1], y), max(bounds[2], x + w), max(bounds[3], y + h)]
+            entry["count"] += 1
+            entry["last"] = [x, y, w, h]
+            if roi_value not in entry["rois"] and len(entry["rois"]) < MAX_RECORDED_ROIS:
+                entry["rois"].append(roi_value)
+            entry["updated"] = datetime.datetime.now().isoformat(timespec="seconds")
+            self._dirty = True
+        self.save()
+
+    def search_windows(
+        self,
+        template_name: str,
+        limit: Tuple[int, int, int, int],
+        expand_factors: Tuple[float, ...] = (0.5, 2.0),
+        min_margin: int = 16,
+        max_area_ratio: float = 0.5,
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        根据历史位置生成逐级扩大的搜索窗口（基准坐标）
+
+        第一级围绕最近一次位置，后续各级围绕历史外接框并逐级加大边距；窗口均裁剪到limit内，
+        面积超过limit的max_area_ratio时不再生成（直接搜索limit更划算）。
+
+        Args:
+            template_name: 模板名称
+            limit: 最终搜索范围（调用方ROI或整帧，基准坐标）
+            expand_factors: 各级边距相对模板长边的倍数
+            min_margin: 最小边距（基准像素）
+            max_area_ratio: 窗口面积占limit面积的上限
+
+        Returns:
+            List[Tuple[int, int, int, int]]: 搜索窗口列表（x,y,w,h），无记录返回空列表
+        """
+        entry = self._entries.get(template_name)
+        if not entry or not entry.get("last"):
+            return []
+        x, y, w, h = entry["last"]
+        bx0, by0, bx1, by1 = entry["bounds"]
+        limit_area = limit[2] * limit[3]
+
+        windows: List[Tuple[int, int, int, int]] = []
+        for level, factor in enumerate(expand_factors):
+            margin = max(min_margin * (level + 1), int(max(w, h) * factor))
+            if level == 0:
+                rect = (x - margin, y - margin, w + 2 * margin, h + 2 * margin)
+            else:
+                rect = (bx0 - margin, by0 - margin, bx1 - bx0 + 2 * margin, by1 - by0 + 2 * margin)
+            window = _intersect(rect, limit)
+            # 窗口需明显大于模板，避免缩放后模板被子图尺寸截断
+            if window is None or window[2] < w + min_margin or window[3] < h + min_margin:
+                continue
+            if window[2] * window[3] > limit_area * max_area_ratio:
+                break
+            if windows and window == windows[-1]:
+                continue
+            windows.append(window)
+        return windows
+
+    def build_roi_report(self, rois_config: Dict, padding: int = 10) -> Dict[str, List[Dict]]:
+        """
+        根据记录生成ROI收紧建议
+
+        Args:
+            rois_config: rois.json 内容（{"public": {...}, "tasks": {task: {...}}}）
+            padding: 建议ROI在匹配外接框基础上的留白（基准像素）
+
+        Returns:
+            Dict: {"tighten": 已配置ROI的收紧建议, "full_frame": 全图搜索模板的新ROI建议}
+        """
+        configured: Dict[str, Tuple[int, int, int, int]] = {}
+        for name, value in rois_config.get("public", {}).items():
+            configured[f"public.{name}"] = tuple(value)
+        for task_name, task_rois in rois_config.get("tasks", {}).items():
+            for name, value in task_rois.items():
+                configured[f"{task_name}.{name}"] = tuple(value)
+
+        tighten, full_frame = [], []
+        for roi_key, roi in configured.items():
+            templates = [
+                (name, entry)
+                for name, entry in self._entries.items()
+                if list(roi) in entry.get("rois", []) and entry.get("count", 0) >= MIN_REPORT_SAMPLES
+            ]
+            if not templates:
+                continue
+            x0 = min(e["bounds"][0] for _, e in templates) - padding
+            y0 = min(e["bounds"][1] for _, e in templates) - padding
+            x1 = max(e["bounds"][2] for _, e in templates) + padding
+            y1 = max(e["bounds"][3] for _, e in templates) + padding
+            suggested = _intersect((x0, y0, x1 - x0, y1 - y0), roi)
+            if suggested is None:
+                continue
+            reduction = 1.0 - (suggested[2] * suggested[3]) / max(1, roi[2] * roi[3])
+            tighten.append(
+                {
+                    "roi": roi_key,
+                    "configured": list(roi),
+                    "suggested": list(suggested),
+                    "area_reduction": round(reduction, 3),
+                    "templates": sorted(name for name, _ in templates),
+                    "samples": sum(e["count"] for _, e in templates),
+                }
+            )
+
+        for name, entry in sorted(self._entries.items()):
+            if None not in entry.get("rois", []) or entry.get("count", 0) < MIN_REPORT_SAMPLES:
+                continue
+            bx0, by0, bx1, by1 = entry["bounds"]
+            full_frame.append(
+                {
+                    "template": name,
+                    "suggested": [
+                        max(0, bx0 - padding),
+                        max(0, by0 - padding),
+                        bx1 - bx0 + 2 * padding,
+                        by1 - by0 + 2 * padding,
+                    ],
+                    "samples": entry["count"],
+                }
+            )
+
+        tighten.sort(key=lambda item: item["area_reduction"], reverse=True)
+        return {"tighten": tighten, "full_frame": full_frame}
+
+
+def main() -> None:
+    """命令行入口：输出ROI收紧建议"""
+    from src.core.path_manager import path_manager
+
+    parser = argparse.ArgumentParser(description="根据模板位置记录生成ROI收紧建议")
+    parser.add_argument("--priors", default=path_manager.get("spatial_priors"), help="模板位置记录文件")
+    parser.add_argument("--rois", default=path_manager.get("rois_config"), help="ROI配置文件（rois.json）")
+    parser.add_argument("--padding", type=int, default=10, help="建议ROI的留白（基准像素）")
+    parser.add_argument("--base-resolution", default="1920x1080", help="基准分辨率，格式WxH")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    args = parser.parse_args()
+
+    base_resolution = tuple(int(v) for v in args.base_resolution.lower().split("x"))
+    store = SpatialPriorStore(args.priors, base_resolution)
+    with open(args.rois, "r", encoding="utf-8") as f:
+        rois_config = json.load(f)
+    report = store.build_roi_report(rois_config, padding=args.padding)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"已配置ROI收紧建议（样本数≥{MIN_REPORT_SAMPLES}）：")
+    for item in report["tighten"]:
+        print(
+            f"  {item['roi']:<45} {item['configured']} → {item['suggested']} | "
+            f"面积减少 {item['area_reduction']:.0%} | 样本 {item['samples']} | 模板 {', '.join(item['templates'])}"
+        )
+    print("全图搜索模板的ROI建议：")
+    for item in report["full_frame"]:
+        print(f"  {item['template']:<45} {item['suggested']} | 样本 {item['samples']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""预编译模板图集：将模板目录打包为单个内存映射文件，运行时零解码加载
+
+图集目录结构：
+    atlas.bin   所有模板的原始像素数据（uint8，顺序拼接）
+    index.json  索引：模板名 → 文件信息（大小/修改时间/内容哈希）+ 各变体的偏移与形状
+
+每个模板包含：BGR原图、灰度图、常用分辨率下的缩放灰度图（与ImageProcessor缩放算法一致）。
+离线构建：python -m src.auto_control.image.template_atlas [--template-dir DIR] [--output DIR]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+ATLAS_VERSION = 1
+ATLAS_DATA_FILE = "atlas.bin"
+ATLAS_INDEX_FILE = "index.json"
+DEFAULT_ATLAS_RESOLUTIONS: Tuple[Tuple[int, int], ...] = ((1280, 720), (1920, 1080), (2560, 1440), (3840, 2160))
+DEFAULT_TEMPLATE_EXTENSIONS: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def scan_template_files(template_dir: str, extensions: Iterable[str] = DEFAULT_TEMPLATE_EXTENSIONS) -> Dict[str, str]:
+    """
+    扫描模板目录，生成 模板名 → 文件路径 映射（模板名为相对路径去扩展名，统一使用"/"分隔）
+
+    Args:
+        template_dir: 模板根目录
+        extensions: 模板文件扩展名
+
+    Returns:
+        Dict[str, str]: 模板名 → 文件路径
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    template_paths: Dict[str, str] = {}
+    if not os.path.isdir(template_dir):
+        return template_paths
+
+    for root, dirs, files in os.walk(template_dir):
+        for filename in files:
+            if filename.lower().endswith(extensions):
+                rel_path = os.path.relpath(root, template_dir)
+                template_name = (
+                    os.path.join(rel_path, os.path.splitext(filename)[0]).replace("\\", "/")
+                    if rel_path != "."
+                    else os.path.splitext(filename)[0]
+                )
+                template_paths[template_name] = os.path.join(root, filename)
+    return template_paths
+
+
+def read_template_file(template_path: str) -> Optional[np.ndarray]:
+    """
+    读取模板文件为BGR数组（兼容中文路径）
+
+    Args:
+        template_path: 模板文件路径
+
+    Returns:
+        Optional[np.ndarray]: BGR数组，读取失败返回None
+    """
+    image = cv2.imread(template_path, cv2.IMREAD_COLOR)
+    if image is None and os.path.exists(template_path):
+        # cv2.imread在Windows下不支持非ASCII路径，降级为内存解码
+        data = np.fromfile(template_path, dtype=np.uint8)
+        image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+    return image
+
+
+def load_templates_parallel(template_paths: Dict[str, str], max_workers: int = 4) -> Dict[str, np.ndarray]:
+    """
+    并行读取模板文件（图像解码会释放GIL，线程池即可获得并行收益）
+
+    Args:
+        template_paths: 模板名 → 文件路径
+        max_workers: 线程数
+
+    Returns:
+        Dict[str, np.ndarray]: 读取成功的 模板名 → BGR数组
+    """
+    if not template_paths:
+        return {}
+    names = list(template_paths.keys())
+    workers = max(1, min(max_workers, len(names)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TemplateLoad") as executor:
+        images = list(executor.map(lambda name: read_template_file(template_paths[name]), names))
+    return {name: image for name, image in zip(names, images) if image is not None}
+
+
+def file_content_hash(file_path: str) -> str:
+    """计算文件内容哈希（用于图集过期校验）"""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scale_ratio_for_resolution(resolution: Tuple[int, int], base_resolution: Tuple[int, int]) -> float:
+    """
+    计算指定分辨率下的模板缩放比例（与CoordinateTransformer.calculate_template_scale_ratio一致）
+
+    Args:
+        resolution: 目标物理分辨率（宽, 高）
+        base_resolution: 基准分辨率（宽, 高）
+
+    Returns:
+        float: 缩放比例
+    """
+    return max(0.001, min(resolution[0] / base_resolution[0], resolution[1] / base_resolution[1]))
+
+
+def ratio_key(scale_ratio: float) -> str:
+    """缩放比例 → 索引键（保留4位小数，与缩放模板缓存键一致）"""
+    return f"{round(scale_ratio, 4):.4f}"
+
+
+def scale_template_gray(template_bgr: np.ndarray, scale_ratio: float, min_template_size: Tuple[int, int]) -> np.ndarray:
+    """
+    按ImageProcessor的缩放规则生成灰度模板（先缩放BGR再转灰度，保证与运行时结果逐像素一致）
+
+    Args:
+        template_bgr: 模板原图（BGR）
+        scale_ratio: 缩放比例
+        min_template_size: 缩放后最小尺寸（宽, 高）
+
+    Returns:
+        np.ndarray: 缩放后的灰度模板
+    """
+    scaled_w = max(min_template_size[0], int(round(template_bgr.shape[1] * scale_ratio)))
+    scaled_h = max(min_template_size[1], int(round(template_bgr.shape[0] * scale_ratio)))
+    interpolation = cv2.INTER_LANCZOS4 if scale_ratio < 1.0 else cv2.INTER_CUBIC
+    scaled = cv2.resize(template_bgr, (scaled_w, scaled_h), interpolation=interpolation)
+    return cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
+
+
+class TemplateAtlas:
+    """模板图集：构建（离线）与内存映射读取（运行时）"""
+
+    def __init__(self, atlas_dir: str, logger: Optional[logging.Logger] = None):
+        """
+        初始化模板图集
+
+        Args:
+            atlas_dir: 图集目录（包含atlas.bin和index.json）
+            logger: 日志实例（可选）
+        """
+        self.atlas_dir = atlas_dir
+        self.logger = logger or logging.getLogger("TemplateAtlas")
+        self.index: Dict = {}
+        self.entries: Dict[str, Dict] = {}
+        self._data: Optional[np.memmap] = None
+
+    @property
+    def is_open(self) -> bool:
+        """图集是否已成功打开"""
+        return self._data is not None
+
+    # ------------------------------ 运行时读取 ------------------------------
+    def open(self) -> bool:
+        """
+        打开图集：读取索引并内存映射数据文件（不解码、不拷贝）
+
+        Returns:
+            bool: 打开成功返回True，图集不存在/版本不符/损坏返回False
+        """
+        index_path = os.path.join(self.atlas_dir, ATLAS_INDEX_FILE)
+        data_path = os.path.join(self.atlas_dir, ATLAS_DATA_FILE)
+        if not (os.path.exists(index_path) and os.path.exists(data_path)):
+            self.logger.debug(f"模板图集不存在，使用PNG加载 | 目录: {self.atlas_dir}")
+            return False
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != ATLAS_VERSION:
+                self.logger.warning(
+                    f"模板图集版本不符，忽略图集 | 当前: {index.get('version')} | 需要: {ATLAS_VERSION}"
+                )
+                return False
+            if os.path.getsize(data_path) != index.get("data_size"):
+                self.logger.warning(f"模板图集数据文件大小与索引不一致，忽略图集 | 目录: {self.atlas_dir}")
+                return False
+            self.index = index
+            self.entries = index.get("templates", {})
+            self._data = np.memmap(data_path, dtype=np.uint8, mode="r") if index["data_size"] else None
+            return self._data is not None
+        except Exception as e:
+            self.logger.error(f"打开模板图集失败: {str(e)}", exc_info=True)
+            self.index, self.entries, self._data = {}, {}, None
+            return False
+
+    def find_stale(self, template_paths: Dict[str, str]) -> List[str]:
+        """
+        校验图集与模板文件是否一致，返回需要回退PNG加载的模板名
+
+        先比较文件大小+修改时间（无需读取文件），不一致时再比较内容哈希。
+
+        Args:
+            template_paths: 当前模板目录的 模板名 → 文件路径
+
+        Returns:
+            List[str]: 过期或图集中缺失的模板名
+        """
+        stale = []
+        for name, path in template_paths.items():
+            entry = self.entries.get(name)
+            if entry is None:
+                stale.append(name)
+                continue
+            try:
+                stat = os.stat(path)
+                if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+                    continue
+                if stat.st_size != entry["size"] or file_content_hash(path) != entry["sha1"]:
+                    stale.append(name)
+            except OSError:
+                stale.append(name)
+        return stale
+
+    def _view(self, block: Optional[Dict]) -> Optional[np.ndarray]:
+        """根据偏移/形状从内存映射中取只读视图"""
+        if block is None or self._data is None:
+            return None
+        offset = block["offset"]
+        shape = tuple(block["shape"])
+        size = int(np.prod(shape))
+        return self._data[offset : offset + size].reshape(shape)
+
+    def get_bgr(self, template_name: str) -> Optional[np.ndarray]:
+        """获取模板BGR原图（只读视图）"""
+        entry = self.entries.get(template_name)
+        return self._view(entry["bgr"]) if entry else None
+
+    def get_gray(self, template_name: str) -> Optional[np.ndarray]:
+        """获取模板灰度图（只读视图）"""
+        entry = self.entries.get(template_name)
+        return self._view(entry["gray"]) if entry else None
+
+    def get_scaled_gray(self, template_name: str, scale_ratio: float) -> Optional[np.ndarray]:
+        """
+        获取预计算的缩放灰度模板（只读视图）
+
+        Args:
+            template_name: 模板名称
+            scale_ratio: 缩放比例
+
+        Returns:
+            Optional[np.ndarray]: 命中预计算比例时返回视图，否则None
+        """
+        entry = self.entries.get(template_name)
+        if not entry:
+            return None
+        return self._view(entry["scaled"].get(ratio_key(scale_ratio)))
+
+    # ------------------------------ 离线构建 ------------------------------
+    @classmethod
+    def build(
+        cls,
+        template_dir: str,
+        atlas_dir: str,
+        extensions: Iterable[str] = DEFAULT_TEMPLATE_EXTENSIONS,
+        resolutions: Iterable[Tuple[int, int]] = DEFAULT_ATLAS_RESOLUTIONS,
+        base_resolution: Tuple[int, int] = (1920, 1080),
+        min_template_size: Tuple[int, int] = (10, 10),
+        logger: Optional[logging.Logger] = None,
+    ) -> Dict:
+        """
+        构建模板图集
+
+        Args:
+            template_dir: 模板根目录
+            atlas_dir: 图集输出目录
+            extensions: 模板文件扩展名
+            resolutions: 需要预计算缩放变体的物理分辨率列表
+            base_resolution: 模板采集的基准分辨率
+            min_template_size: 缩放后最小尺寸（与ImageProcessor.min_template_size一致）
+            logger: 日志实例（可选）
+
+        Returns:
+            Dict: 构建摘要（模板数、数据大小、失败列表）
+        """
+        logger = logger or logging.getLogger("TemplateAtlas")
+        template_paths = scan_template_files(template_dir, extensions)
+        images = load_templates_parallel(template_paths)
+        ratios = sorted({ratio_key(scale_ratio_for_resolution(res, base_resolution)) for res in resolutions})
+
+        os.makedirs(atlas_dir, exist_ok=True)
+        data_path = os.path.join(atlas_dir, ATLAS_DATA_FILE)
+        tmp_data_path = data_path + ".tmp"
+        entries: Dict[str, Dict] = {}
+        failed = sorted(set(template_paths) - set(images))
+        offset = 0
+
+        def write_block(f, array: np.ndarray) -> Dict:
+            nonlocal offset
+            array = np.ascontiguousarray(array, dtype=np.uint8)
+            f.write(array.tobytes())
+            block = {"offset": offset, "shape": list(array.shape)}
+            offset += array.nbytes
+            return block
+
+        with open(tmp_data_path, "wb") as f:
+            for name in sorted(images):
+                bgr = images[name]
+                gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                stat = os.stat(template_paths[name])
+                entry = {
+                    "file": os.path.relpath(template_paths[name], template_dir).replace("\\", "/"),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha1": file_content_hash(template_paths[name]),
+                    "bgr": write_block(f, bgr),
+                    "gray": write_block(f, gray),
+                    "scaled": {},
+                }
+                for key in ratios:
+                    scaled = scale_template_gray(bgr, float(key), min_template_size)
+                    # 缩放后尺寸不变（比例1.0）时直接复用灰度图数据块
+                    if scaled.shape == gray.shape and np.array_equal(scaled, gray):
+                        entry["scaled"][key] = entry["gray"]
+                    else:
+                        entry["scaled"][key] = write_block(f, scaled)
+                entries[name] = entry
+
+        index = {
+            "version": ATLAS_VERSION,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "base_resolution": list(base_resolution),
+            "min_template_size": list(min_template_size),
+            "resolutions": [list(res) for res in resolutions],
+            "ratios": ratios,
+            "data_size": offset,
+            "templates": entries,
+        }
+        index_path = os.path.join(atlas_dir, ATLAS_INDEX_FILE)
+        with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        # 先替换数据文件再替换索引，保证读取方不会拿到与数据不匹配的索引（大小校验兜底）
+        os.replace(tmp_data_path, data_path)
+        os.replace(index_path + ".tmp", index_path)
+
+        summary = {"templates": len(entries), "data_size": offset, "ratios": ratios, "failed": failed}
+        logger.info(
+            f"模板图集构建完成 | 模板数: {len(entries)} | 数据大小: {offset / 1024 / 1024:.2f}MB | "
+            f"缩放比例: {ratios} | 失败: {failed} | 目录: {atlas_dir}"
+        )
+        return summary
+
+
+def main() -> None:
+    """命令行入口：离线构建模板图集"""
+    from src.core.path_manager import path_manager
+
+    parser = argparse.ArgumentParser(description="构建预编译模板图集")
+    parser.add_argument("--template-dir", default=path_manager.get("task_template"), help="模板根目录")
+    parser.add_argument("--output", default=path_manager.get("template_atlas"), help="图集输出目录")
+    parser.add_argument(
+        "--resolutions",
+        default=",".join(f"{w}x{h}" for w, h in DEFAULT_ATLAS_RESOLUTIONS),
+        help="预计算缩放变体的分辨率列表，格式：1280x720,1920x1080",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    resolutions = [tuple(int(v) for v in item.lower().split("x")) for item in args.resolutions.split(",") if item]
+    summary = TemplateAtlas.build(args.template_dir, args.output, resolutions=resolutions)
+    print(json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
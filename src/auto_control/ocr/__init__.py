@@ -1,2 +1,3 @@
 from .ocr_config import *
 from .ocr_processor import OCRProcessor
+from .text_scene import TextScene
@@ -1,16 +1,19 @@
 import datetime
 import os
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
 from .ocr_config import get_default_languages
+from src.auto_control.image.result_memo import MISS, ResultMemo, region_fingerprint
 from src.auto_control.ocr.base_ocr import BaseOCR
 from src.auto_control.ocr.easyocr_wrapper import EasyOCRWrapper
 from src.auto_control.ocr.paddleocr_wrapper import PaddleOCRWrapper
+from src.auto_control.ocr.text_scene import TextScene
 from src.auto_control.utils.coordinate_transformer import CoordinateTransformer
-from src.auto_control.utils.debug_image_saver import DebugImageSaver
+from src.auto_control.utils.debug_image_saver import DebugImageSaver, debug_saver_options
 from src.auto_control.utils.display_context import RuntimeDisplayContext
 from src.core.path_manager import path_manager
 
@@ -25,6 +28,8 @@ class OCRProcessor:
     4. 参数统一：基于RuntimeDisplayContext获取全局显示状态，保证数据源唯一
     """
 
+    ROI_EXPAND_PIXEL: int = 10  # 识别区域向四周安全扩展的物理像素数（避免压在ROI边缘的文本被截断）
+
     def __init__(
         self,
         engine: str = "easyocr",
@@ -46,6 +51,8 @@ class OCRProcessor:
             test_mode: 测试模式开关（是否保存调试图片，默认False）
             **kwargs: 引擎扩展参数：
                 - languages: 自定义识别语言组合（如 'ch_tra+eng'）
+                - fuzzy_match: 是否启用模糊匹配（部分匹配）
+                - config: 框架配置（读取调试图格式/压缩级别/队列容量）
         Raises:
             ValueError: 必传参数缺失/类型错误、引擎类型不支持
         """
@@ -74,14 +81,26 @@ class OCRProcessor:
         # 语言配置（默认/自定义）
         self._default_lang = kwargs.pop("languages", None) or get_default_languages(self.engine_type)
 
-        # OCR识别结果缓存
-        self.ocr_cache = {}
-        self.ocr_cache_expire = 3.0  # 缓存过期时间（秒）
-        self.max_ocr_cache_size = 50  # 最大缓存数量
+        config = kwargs.pop("config", None)
+
+        # OCR识别结果记忆化：按识别区域指纹缓存原始识别结果（与目标文本无关），区域未变化时不重复识别
+        self.result_memo = ResultMemo(
+            max_entries=int(getattr(config, "RESULT_MEMO_SIZE", 256) or 1),
+            strict=bool(getattr(config, "RESULT_MEMO_STRICT", False)),
+            enabled=bool(getattr(config, "USE_RESULT_MEMO", True)),
+            logger=self.logger,
+            name="OCR记忆化",
+        )
+        # 最近识别的文本场景：ROI查询可复用同一画面上已识别且覆盖该ROI的场景（如整图场景）
+        self._recent_scenes = deque(maxlen=8)
+        self.scene_reuse_hits = 0
 
         # 调试工具初始化
         self.debug_saver = DebugImageSaver(
-            logger=self.logger, debug_dir=path_manager.get("match_ocr_debug"), test_mode=test_mode
+            logger=self.logger,
+            debug_dir=path_manager.get("match_ocr_debug"),
+            test_mode=test_mode,
+            **debug_saver_options(config),
         )
 
         # 初始化OCR引擎
@@ -121,47 +140,39 @@ class OCRProcessor:
         """
         return self.engine.enable_gpu(enable)
 
-    def _generate_image_hash(self, image: np.ndarray) -> str:
+    def get_memo_stats(self) -> Dict:
         """
-        生成图像的哈希值，用于缓存键
-
-        Args:
-            image: 输入图像（numpy数组）
+        获取OCR结果记忆化统计
 
         Returns:
-            str: 图像的哈希值
+            Dict: 命中/未命中次数、命中率、条目数、严格模式校验结果、覆盖场景复用次数
         """
-        import hashlib
+        return {**self.result_memo.get_stats(), "scene_reuse_hits": self.scene_reuse_hits}
 
-        # 将图像转换为一维数组并计算MD5哈希
-        image_bytes = image.tobytes()
-        return hashlib.md5(image_bytes).hexdigest()
-
-    def _cleanup_ocr_cache(self) -> None:
-        """
-        清理过期的OCR缓存
+    def get_text_scene(
+        self,
+        image: np.ndarray,
+        lang: Optional[str] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Optional[TextScene]:
         """
-        import time
-
-        current_time = time.time()
-
-        # 清理过期缓存
-        expired_keys = [
-            key for key, (_, timestamp) in self.ocr_cache.items() if current_time - timestamp > self.ocr_cache_expire
-        ]
+        识别图像（或ROI区域）中的全部文本，返回文本场景（经结果记忆化，区域未变化时不重复识别）
 
-        for key in expired_keys:
-            del self.ocr_cache[key]
-            self.logger.debug(f"清理过期OCR缓存: {key[:20]}...")
-
-        # 如果缓存数量仍超过最大值，清理最早的缓存
-        if len(self.ocr_cache) > self.max_ocr_cache_size:
-            sorted_keys = sorted(self.ocr_cache.items(), key=lambda x: x[1][1])
+        Args:
+            image: 输入图像（numpy数组）
+            lang: 识别语言（默认使用初始化配置的语言）
+            region: 识别区域ROI (x, y, w, h)（基于原始基准分辨率）
 
-            keys_to_remove = len(self.ocr_cache) - self.max_ocr_cache_size
-            for key, _ in sorted_keys[:keys_to_remove]:
-                del self.ocr_cache[key]
-                self.logger.debug(f"清理OCR缓存: {key[:20]}...")
+        Returns:
+            Optional[TextScene]: 文本场景（文本行坐标为原图物理坐标）；图像无效或识别被中断返回None
+        """
+        if image is None or image.size == 0:
+            self.logger.error("文本识别失败：输入图像无效")
+            return None
+        target_lang = self._resolve_lang(lang)
+        cropped_image, region_offset_phys, orig_region_phys = self._prepare_region(image, region)
+        fingerprint, memo_key = self._scene_key(image, orig_region_phys, target_lang)
+        return self._get_scene(memo_key, fingerprint, cropped_image, target_lang, region_offset_phys, orig_region_phys)
 
     def find_text_position(
         self,
@@ -185,32 +196,8 @@ class OCRProcessor:
             Optional[Tuple[int, int, int, int]]:
                 逻辑坐标矩形 - 匹配成功；None - 匹配失败
         """
-        import time
-
-        current_time = time.time()
-
-        # 清理过期缓存
-        self._cleanup_ocr_cache()
-
         # 1. 语言配置处理
-        target_lang = lang or self._default_lang
-        if target_lang and "ch_sim" not in target_lang:
-            target_lang = f"ch_sim+{target_lang}"
-        elif not target_lang:
-            target_lang = "ch_sim"
-
-        # 2. 生成缓存键
-        image_hash = self._generate_image_hash(image)
-        cache_key = f"{image_hash}_{target_text}_{target_lang}_{min_confidence}_{region}"
-
-        # 3. 检查缓存
-        if cache_key in self.ocr_cache:
-            cached_result, timestamp = self.ocr_cache[cache_key]
-            if current_time - timestamp <= self.ocr_cache_expire:
-                self.logger.debug(f"使用OCR缓存 | 目标文本: '{target_text}'")
-                return cached_result
-
-        # 4. 缓存未命中，继续执行识别
+        target_lang = self._resolve_lang(lang)
 
         # 2. 基础参数校验
         if image is None or image.size == 0:
@@ -223,17 +210,76 @@ class OCRProcessor:
             return None
 
         # 3. 基础参数获取
-        img_h, img_w = image.shape[:2]
-        orig_image = image.copy()
+        # 原图仅以只读方式引用（ROI裁剪为切片视图），标注所需的拷贝由DebugImageSaver在实际落盘时完成
+        orig_image = image
         is_fullscreen = self.display_context.is_fullscreen
 
-        # 4. ROI处理（坐标转换+安全扩展）
+        # 4~5. ROI处理（坐标转换+安全扩展）与图像裁剪
+        cropped_image, region_offset_phys, orig_region_phys = self._prepare_region(orig_image, region)
+
+        # 6. 文本场景：按识别区域（裁剪后子图）指纹缓存整份识别结果，键与目标文本无关，同一子图上查询不同文本
+        #    只识别一次；本区域未缓存时，优先在同一画面上已识别且覆盖本区域的场景（如整图场景）中查找
+        fingerprint, memo_key = self._scene_key(orig_image, orig_region_phys, target_lang)
+        if memo_key is not None and self.result_memo.get(memo_key) is MISS:
+            covering = self._find_in_covering_scene(orig_image, target_text_clean, target_lang, orig_region_phys)
+            if covering is not None:
+                scene, matches, match_type = covering
+                return self._match_text(
+                    orig_image=orig_image,
+                    scene=scene,
+                    matches=matches,
+                    match_type=match_type,
+                    target_text_clean=target_text_clean,
+                    min_confidence=min_confidence,
+                    orig_region_phys=orig_region_phys,
+                    is_fullscreen=is_fullscreen,
+                )
+
+        scene = self._get_scene(memo_key, fingerprint, cropped_image, target_lang, region_offset_phys, orig_region_phys)
+        if scene is None:
+            return None
+        matches, match_type = scene.find(target_text_clean, substring=self.fuzzy_match)
+        return self._match_text(
+            orig_image=orig_image,
+            scene=scene,
+            matches=matches,
+            match_type=match_type,
+            target_text_clean=target_text_clean,
+            min_confidence=min_confidence,
+            orig_region_phys=orig_region_phys,
+            is_fullscreen=is_fullscreen,
+        )
+
+    def _resolve_lang(self, lang: Optional[str]) -> str:
+        """识别语言处理：未指定时使用默认语言，始终包含简体中文"""
+        target_lang = lang or self._default_lang
+        if target_lang and "ch_sim" not in target_lang:
+            return f"ch_sim+{target_lang}"
+        return target_lang or "ch_sim"
+
+    def _prepare_region(
+        self, orig_image: np.ndarray, region: Optional[Tuple[int, int, int, int]]
+    ) -> Tuple[np.ndarray, Tuple[int, int], Optional[Tuple[int, int, int, int]]]:
+        """
+        ROI处理（坐标转换+安全扩展）并裁剪子图
+
+        Args:
+            orig_image: 原始图像
+            region: 识别区域ROI (x, y, w, h)（基于原始基准分辨率）
+
+        Returns:
+            Tuple: (裁剪后的子图, 子图在原图中的物理偏移, 处理后的ROI物理坐标（全图识别时为None）)
+        """
+        img_h, img_w = orig_image.shape[:2]
         processed_region_phys, region_offset_phys = self.coord_transformer.process_roi(
-            roi=region, boundary_width=img_w, boundary_height=img_h, enable_expand=True, expand_pixel=10
+            roi=region,
+            boundary_width=img_w,
+            boundary_height=img_h,
+            enable_expand=True,
+            expand_pixel=self.ROI_EXPAND_PIXEL,
         )
         orig_region_phys = processed_region_phys
 
-        # 5. 图像裁剪
         cropped_image = orig_image
         if processed_region_phys:
             rx_phys, ry_phys, rw_phys, rh_phys = processed_region_phys
@@ -251,13 +297,105 @@ class OCRProcessor:
                 self.logger.debug(f"图像裁剪完成 | 子图尺寸: {cropped_image.shape[1]}x{cropped_image.shape[0]}")
         else:
             self.logger.debug(f"全图识别 | 原图尺寸: {img_w}x{img_h}")
+        return cropped_image, region_offset_phys, orig_region_phys
+
+    def _scene_key(
+        self, orig_image: np.ndarray, orig_region_phys: Optional[Tuple[int, int, int, int]], target_lang: str
+    ) -> Tuple[Optional[str], Optional[Tuple]]:
+        """计算识别区域指纹与文本场景缓存键（记忆化关闭或指纹无效时键为None）"""
+        if not self.result_memo.enabled:
+            return None, None
+        # 过期的文本结果即为识别错误（如计数"3/5"变为"4/5"），指纹附加原像素校验和
+        fingerprint = region_fingerprint(orig_image, orig_region_phys, checksum=True)
+        if not fingerprint:
+            return None, None
+        return fingerprint, (fingerprint, orig_region_phys, target_lang, self.engine_type)
+
+    def _get_scene(
+        self,
+        memo_key: Optional[Tuple],
+        fingerprint: Optional[str],
+        cropped_image: np.ndarray,
+        target_lang: str,
+        region_offset_phys: Tuple[int, int],
+        orig_region_phys: Optional[Tuple[int, int, int, int]],
+    ) -> Optional[TextScene]:
+        """获取文本场景：缓存命中直接返回，否则识别子图并建立索引（识别被中断时不缓存，返回None）"""
+
+        def build_scene() -> Optional[TextScene]:
+            formatted_results = self._recognize(cropped_image, target_lang, region_offset_phys)
+            if formatted_results is None:
+                return None
+            return TextScene(
+                formatted_results,
+                region_phys=orig_region_phys,
+                offset_phys=region_offset_phys,
+                fingerprint=fingerprint,
+                lang=target_lang,
+            )
+
+        scene = self.result_memo.get_or_compute(
+            memo_key,
+            build_scene,
+            store_if=lambda result: result is not None and not (self.stop_event and self.stop_event.is_set()),
+        )
+        if scene is not None and fingerprint and not any(s is scene for s in list(self._recent_scenes)):
+            self._recent_scenes.append(scene)
+        return scene
+
+    def _find_in_covering_scene(
+        self,
+        orig_image: np.ndarray,
+        target_text_clean: str,
+        target_lang: str,
+        orig_region_phys: Optional[Tuple[int, int, int, int]],
+    ) -> Optional[Tuple[TextScene, List[Dict], str]]:
+        """
+        在最近识别且覆盖本区域的文本场景中查找目标文本（场景区域指纹须与当前画面一致）
+
+        只复用找到的匹配：覆盖场景中未找到时仍对本区域单独识别，避免大区域识别的分行差异导致漏检。
+
+        Returns:
+            Optional[Tuple[TextScene, List[Dict], str]]: (场景, 匹配的文本行, 匹配类型)；未找到返回None
+        """
+        if orig_region_phys is None:
+            return None
+        for scene in reversed(list(self._recent_scenes)):
+            if scene.lang != target_lang or scene.region_phys == orig_region_phys or not scene.covers(orig_region_phys):
+                continue
+            if region_fingerprint(orig_image, scene.region_phys, checksum=True) != scene.fingerprint:
+                continue
+            matches, match_type = scene.find(target_text_clean, substring=self.fuzzy_match, region=orig_region_phys)
+            if not matches:
+                return None
+            self.scene_reuse_hits += 1
+            self.logger.debug(
+                f"复用覆盖场景 | 目标文本: '{target_text_clean}' | 场景区域: {scene.region_phys or '全图'} | "
+                f"查询区域: {orig_region_phys}"
+            )
+            return scene, matches, match_type
+        return None
+
+    def _recognize(
+        self, cropped_image: np.ndarray, target_lang: str, region_offset_phys: Tuple[int, int]
+    ) -> Optional[List[Dict]]:
+        """
+        对裁剪后的子图执行OCR识别（不经过结果记忆化）
+
+        Args:
+            cropped_image: ROI裁剪后的子图
+            target_lang: 识别语言
+            region_offset_phys: 子图在原图中的物理偏移
 
-        # 6. OCR识别前检查是否需要停止
+        Returns:
+            Optional[List[Dict]]: 识别结果列表（text/bbox/bbox_orig_phys/confidence），识别被中断返回None
+        """
+        # 7. OCR识别前检查是否需要停止
         if self.stop_event and self.stop_event.is_set():
             self.logger.debug("OCR识别被中断：收到停止信号")
             return None
 
-        # 7. OCR识别
+        # 8. OCR识别
         formatted_results = []
 
         # 根据引擎类型选择不同的识别方法
@@ -369,55 +507,53 @@ class OCRProcessor:
                     }
                 )
 
-        # 8. 匹配逻辑：精确匹配 + 部分匹配（如果启用）
-        best_match_phys = None
-        highest_confidence = 0.0
-        exact_matches = []
-        partial_matches = []
-        target_text_normalized = target_text_clean.replace(" ", "")
-
-        for res in formatted_results:
-            res_text_normalized = res["text"].replace(" ", "")
-
-            # 精确匹配
-            if res_text_normalized == target_text_normalized:
-                exact_matches.append(res)
-                if res["confidence"] > highest_confidence:
-                    highest_confidence = res["confidence"]
-                self.logger.debug(
-                    f"精确匹配文本: '{res['text']}' | 置信度: {res['confidence']:.4f} | "
-                    f"达标({min_confidence}): {'是' if res['confidence'] >= min_confidence else '否'} | "
-                    f"物理坐标: {res['bbox_orig_phys']}"
-                )
-            # 部分匹配：目标文本是识别文本的子字符串（仅当启用模糊匹配时）
-            elif self.fuzzy_match and target_text_normalized in res_text_normalized:
-                partial_matches.append(res)
-                if res["confidence"] > highest_confidence:
-                    highest_confidence = res["confidence"]
-                self.logger.debug(
-                    f"部分匹配文本: '{res['text']}' | 置信度: {res['confidence']:.4f} | "
-                    f"达标({min_confidence}): {'是' if res['confidence'] >= min_confidence else '否'} | "
-                    f"物理坐标: {res['bbox_orig_phys']}"
-                )
+        return formatted_results
 
-        # 9. 匹配结果处理
-        match_info = ""
-        best_matches = []
-
-        # 优先使用精确匹配结果
-        if exact_matches:
-            best_matches = exact_matches
-            match_type = "精确匹配"
-        # 精确匹配失败时使用部分匹配结果
-        elif partial_matches:
-            best_matches = partial_matches
-            match_type = "部分匹配"
-        else:
+    def _match_text(
+        self,
+        orig_image: np.ndarray,
+        scene: TextScene,
+        matches: List[Dict],
+        match_type: str,
+        target_text_clean: str,
+        min_confidence: float,
+        orig_region_phys: Optional[Tuple[int, int, int, int]],
+        is_fullscreen: bool,
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        从文本场景的匹配结果中选出目标文本并转换为逻辑坐标
+
+        Args:
+            orig_image: 原始图像
+            scene: 文本场景
+            matches: 场景中匹配目标文本的文本行（精确匹配优先，见 TextScene.find）
+            match_type: 匹配类型（"精确匹配"/"部分匹配"，未匹配时为空）
+            target_text_clean: 去除首尾空白的目标文本
+            min_confidence: 最小置信度阈值
+            orig_region_phys: 处理后的ROI物理坐标（全图识别时为None）
+            is_fullscreen: 是否全屏
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: 逻辑坐标矩形 - 匹配成功；None - 匹配失败
+        """
+        # 9. 匹配日志（场景内的查询区域：覆盖场景只标注本区域内的文本行）
+        region_lines = scene.lines if scene.region_phys == orig_region_phys else scene.query_region(orig_region_phys)
+        region_offset_phys = scene.offset_phys
+        highest_confidence = max((res["confidence"] for res in matches), default=0.0)
+        for res in matches:
+            self.logger.debug(
+                f"{match_type}文本: '{res['text']}' | 置信度: {res['confidence']:.4f} | "
+                f"达标({min_confidence}): {'是' if res['confidence'] >= min_confidence else '否'} | "
+                f"物理坐标: {res['bbox_orig_phys']}"
+            )
+
+        # 10. 匹配结果处理
+        if not matches:
             # 未找到匹配
-            all_recognized = [f"{r['text']}({r['confidence']:.2f})" for r in formatted_results]
+            all_recognized = [f"{r['text']}({r['confidence']:.2f})" for r in region_lines]
             self.logger.warning(
                 f"未找到目标文本: '{target_text_clean}' | 识别结果: {all_recognized} | "
-                f"阈值: {min_confidence} | 子图尺寸: {cropped_image.shape[1]}x{cropped_image.shape[0]}"
+                f"阈值: {min_confidence} | 识别区域: {orig_region_phys or '全图'}"
             )
 
             # 测试模式保存失败调试图
@@ -429,7 +565,7 @@ class OCRProcessor:
                     match_score=highest_confidence,
                     min_confidence=min_confidence,
                     is_fullscreen=is_fullscreen,
-                    ocr_results=formatted_results,
+                    ocr_results=region_lines,
                     target_bbox_phys=None,
                     orig_region_phys=orig_region_phys,
                     region_offset_phys=region_offset_phys,
@@ -437,11 +573,11 @@ class OCRProcessor:
             return None
 
         # 从最佳匹配中选择置信度最高的结果
-        best_match = max(best_matches, key=lambda x: x["confidence"])
+        best_match = max(matches, key=lambda x: x["confidence"])
         best_match_phys = best_match["bbox_orig_phys"]
         match_info = f"匹配类型: {match_type} | 置信度: {best_match['confidence']:.4f}"
 
-        # 10. 测试模式保存成功调试图
+        # 11. 测试模式保存成功调试图
         if self.test_mode:
             self.debug_saver.save_ocr_debug(
                 orig_image=orig_image,
@@ -450,13 +586,13 @@ class OCRProcessor:
                 match_score=best_match["confidence"],
                 min_confidence=min_confidence,
                 is_fullscreen=is_fullscreen,
-                ocr_results=formatted_results,
+                ocr_results=region_lines,
                 target_bbox_phys=best_match_phys,
                 orig_region_phys=orig_region_phys,
                 region_offset_phys=region_offset_phys,
             )
 
-        # 11. 最终坐标处理（物理→逻辑转换+边界限制）
+        # 12. 最终坐标处理（物理→逻辑转换+边界限制）
         if best_match_phys:
             # 物理坐标→统一逻辑坐标
             final_bbox_log = self.coord_transformer.get_unified_logical_rect(best_match_phys)
@@ -478,17 +614,8 @@ class OCRProcessor:
             self.logger.info(
                 f"找到目标文本 | 文本: '{target_text_clean}' | {match_info} | "
                 f"逻辑坐标: {final_bbox_log} | "
-                f"匹配数: {len(exact_matches)} | 显示模式: {'全屏' if is_fullscreen else '窗口'}"
+                f"匹配数: {len(matches)} | 显示模式: {'全屏' if is_fullscreen else '窗口'}"
             )
 
-            # 更新缓存
-            self.ocr_cache[cache_key] = (final_bbox_log, current_time)
-            self.logger.debug(f"更新OCR缓存 | 键: {cache_key[:20]}...")
-
             return final_bbox_log
-        else:
-            # 更新缓存，即使未找到匹配结果
-            self.ocr_cache[cache_key] = (None, current_time)
-            self.logger.debug(f"更新OCR缓存 | 键: {cache_key[:20]}... | 结果: None")
-
-            return None
+        return None
@@ -0,0 +1,219 @@
+"""文本场景索引：一次OCR识别的全部文本行，按规范化文本与位置建立索引，供多个文本查询复用
+
+同一画面上依次判断"文本X是否存在"（每日任务、PVP、通行证奖励等流程）时，每个查询都应基于同一份识别结果，
+而不是各自执行一次 readtext。TextScene 保存一次识别（整图或ROI子图）的所有文本行（文本、物理坐标、置信度），
+提供：
+    精确匹配   规范化文本（去空格）→ 文本行 的字典索引
+    子串匹配   目标文本为识别文本的子串（与 OCRProcessor 的部分匹配语义一致）
+    相似匹配   difflib 相似度不低于阈值（识别个别字符错误时使用）
+    区域查询   物理坐标均匀网格索引，按文本行中心点筛选落在区域内的文本行
+纯Python实现，不依赖OCR引擎。
+"""
+
+import difflib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+GRID_CELL = 128  # 位置网格单元边长（物理像素）
+
+
+def normalize_text(text: str) -> str:
+    """文本规范化（去除首尾及中间空格，与 OCRProcessor 的匹配规则一致）"""
+    return (text or "").strip().replace(" ", "")
+
+
+def _center(bbox: Tuple[int, int, int, int]) -> Tuple[int, int]:
+    x, y, w, h = bbox
+    return x + w // 2, y + h // 2
+
+
+def _contains(rect: Tuple[int, int, int, int], point: Tuple[int, int]) -> bool:
+    x, y, w, h = rect
+    return x <= point[0] < x + w and y <= point[1] < y + h
+
+
+class TextScene:
+    """一次OCR识别结果的文本场景（只读，线程安全）"""
+
+    def __init__(
+        self,
+        lines: List[Dict],
+        region_phys: Optional[Tuple[int, int, int, int]] = None,
+        offset_phys: Tuple[int, int] = (0, 0),
+        fingerprint: Optional[str] = None,
+        lang: Optional[str] = None,
+        cell: int = GRID_CELL,
+    ):
+        """
+        Args:
+            lines: 识别结果列表（text/bbox/bbox_orig_phys/confidence，bbox为子图坐标）
+            region_phys: 识别区域的原图物理坐标 (x, y, w, h)，None表示整图
+            offset_phys: 识别子图在原图中的物理偏移
+            fingerprint: 识别区域指纹（用于判断场景是否仍与当前画面一致）
+            lang: 识别语言
+            cell: 位置网格单元边长（物理像素）
+        """
+        self.lines: List[Dict] = list(lines)
+        self.region_phys = tuple(region_phys) if region_phys else None
+        self.offset_phys = tuple(offset_phys)
+        self.fingerprint = fingerprint
+        self.lang = lang
+        self.cell = max(1, int(cell))
+
+        self._normalized: List[str] = [normalize_text(line["text"]) for line in self.lines]
+        self._exact: Dict[str, List[int]] = {}
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        for idx, (text, line) in enumerate(zip(self._normalized, self.lines)):
+            self._exact.setdefault(text, []).append(idx)
+            cx, cy = _center(line["bbox_orig_phys"])
+            self._grid.setdefault((cx // self.cell, cy // self.cell), []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.lines)
+
+    def __eq__(self, other) -> bool:
+        # 严格模式校验比较识别内容，不比较指纹等元数据
+        if not isinstance(other, TextScene):
+            return NotImplemented
+        return self.lines == other.lines
+
+    def __repr__(self) -> str:
+        return f"TextScene(lines={len(self.lines)}, region={self.region_phys}, texts={self._normalized})"
+
+    @property
+    def texts(self) -> List[str]:
+        """识别到的原始文本列表"""
+        return [line["text"] for line in self.lines]
+
+    def covers(self, rect_phys: Optional[Tuple[int, int, int, int]]) -> bool:
+        """
+        判断场景识别区域是否完整覆盖指定区域
+
+        Args:
+            rect_phys: 原图物理坐标区域，None表示整图
+
+        Returns:
+            bool: 覆盖返回True
+        """
+        if self.region_phys is None:
+            return True
+        if rect_phys is None:
+            return False
+        x, y, w, h = self.region_phys
+        rx, ry, rw, rh = rect_phys
+        return x <= rx and y <= ry and rx + rw <= x + w and ry + rh <= y + h
+
+    def _candidates(self, region: Optional[Tuple[int, int, int, int]]) -> List[int]:
+        """区域内（中心点落在区域内）的文本行下标，None表示全部"""
+        if region is None:
+            return list(range(len(self.lines)))
+        x, y, w, h = region
+        if w <= 0 or h <= 0:
+            return []
+        indices = []
+        for gx in range(x // self.cell, (x + w - 1) // self.cell + 1):
+            for gy in range(y // self.cell, (y + h - 1) // self.cell + 1):
+                indices.extend(self._grid.get((gx, gy), ()))
+        return sorted(idx for idx in indices if _contains(region, _center(self.lines[idx]["bbox_orig_phys"])))
+
+    def query_region(self, region: Tuple[int, int, int, int]) -> List[Dict]:
+        """
+        查询中心点落在区域内的文本行
+
+        Args:
+            region: 原图物理坐标区域 (x, y, w, h)
+
+        Returns:
+            List[Dict]: 文本行列表（按识别顺序）
+        """
+        return [self.lines[idx] for idx in self._candidates(region)]
+
+    def find_exact(self, text: str, region: Optional[Tuple[int, int, int, int]] = None) -> List[Dict]:
+        """
+        精确匹配（规范化后文本相同）
+
+        Args:
+            text: 目标文本
+            region: 可选，原图物理坐标区域（只返回中心点落在区域内的文本行）
+
+        Returns:
+            List[Dict]: 匹配的文本行列表
+        """
+        indices = self._exact.get(normalize_text(text), [])
+        if region is not None:
+            allowed = set(self._candidates(region))
+            indices = [idx for idx in indices if idx in allowed]
+        return [self.lines[idx] for idx in indices]
+
+    def find_substring(self, text: str, region: Optional[Tuple[int, int, int, int]] = None) -> List[Dict]:
+        """
+        子串匹配（目标文本是识别文本的子串，不含精确匹配）
+
+        Args:
+            text: 目标文本
+            region: 可选，原图物理坐标区域
+
+        Returns:
+            List[Dict]: 匹配的文本行列表
+        """
+        target = normalize_text(text)
+        if not target:
+            return []
+        return [
+            self.lines[idx]
+            for idx in self._candidates(region)
+            if target != self._normalized[idx] and target in self._normalized[idx]
+        ]
+
+    def find_fuzzy(
+        self, text: str, cutoff: float = 0.8, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        相似匹配（difflib相似度不低于阈值）
+
+        Args:
+            text: 目标文本
+            cutoff: 相似度阈值（0~1）
+            region: 可选，原图物理坐标区域
+
+        Returns:
+            List[Tuple[Dict, float]]: (文本行, 相似度) 列表，按相似度降序
+        """
+        target = normalize_text(text)
+        if not target:
+            return []
+        matcher = difflib.SequenceMatcher(b=target, autojunk=False)
+        scored = []
+        for idx in self._candidates(region):
+            matcher.set_seq1(self._normalized[idx])
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((self.lines[idx], round(ratio, 4)))
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def find(
+        self, text: str, substring: bool = True, region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Tuple[List[Dict], str]:
+        """
+        按 OCRProcessor 的匹配规则查找：优先精确匹配，无结果时使用子串匹配
+
+        Args:
+            text: 目标文本
+            substring: 是否允许子串匹配
+            region: 可选，原图物理坐标区域
+
+        Returns:
+            Tuple[List[Dict], str]: (匹配的文本行列表, 匹配类型 "精确匹配"/"部分匹配"/"")
+        """
+        exact = self.find_exact(text, region)
+        if exact:
+            return exact, "精确匹配"
+        if substring:
+            partial = self.find_substring(text, region)
+            if partial:
+                return partial, "部分匹配"
+        return [], ""
@@ -0,0 +1,89 @@
+"""时钟模块：统一核心层与任务脚本的计时与等待，非实时设备（录制回放等）下使用虚拟时钟快进
+
+系统时钟直接使用 time.time() 与 stop_event.wait()。
+虚拟时钟的当前时间 = 真实时间 + 累计快进量：sleep/延迟立即返回并把等待时长计入快进量，
+因此超时判断、剩余超时计算与实时运行完全一致（等待与识别/截图的实际耗时都计入超时），
+只是等待不再占用真实时间。
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class Clock(ABC):
+    """时钟接口：提供当前时间与可中断的等待"""
+
+    is_virtual = False
+
+    @abstractmethod
+    def time(self) -> float:
+        """当前时间戳（秒，与time.time()同基准）"""
+        pass
+
+    @abstractmethod
+    def sleep(self, secs: float, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        等待指定时长
+
+        Args:
+            secs: 等待时长（秒），<=0时仅检查中断
+            stop_event: 中断事件，置位时立即结束等待
+
+        Returns:
+            bool: 等待被中断返回True，正常结束返回False
+        """
+        pass
+
+
+class SystemClock(Clock):
+    """系统时钟：真实时间与真实等待（实时设备默认）"""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, secs: float, stop_event: Optional[threading.Event] = None) -> bool:
+        if secs <= 0:
+            return bool(stop_event and stop_event.is_set())
+        if stop_event is not None:
+            return stop_event.wait(timeout=secs)
+        time.sleep(secs)
+        return False
+
+
+class VirtualClock(Clock):
+    """虚拟时钟：等待立即返回并推进快进量，真实耗时照常计入（线程安全）"""
+
+    is_virtual = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._offset = 0.0
+        self._sleeps = 0
+
+    def time(self) -> float:
+        return time.time() + self._offset
+
+    def sleep(self, secs: float, stop_event: Optional[threading.Event] = None) -> bool:
+        if stop_event is not None and stop_event.is_set():
+            return True
+        self.advance(secs)
+        # 让出GIL，避免轮询循环饿死截图/录制等后台线程
+        time.sleep(0)
+        return False
+
+    def advance(self, secs: float) -> None:
+        """推进快进量（负值忽略）"""
+        with self._lock:
+            self._offset += max(0.0, secs)
+            self._sleeps += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """快进统计：累计快进秒数与等待次数"""
+        with self._lock:
+            return {"skipped_s": round(self._offset, 3), "sleeps": self._sleeps}
+
+
+# 未显式注入时钟时使用的默认系统时钟
+SYSTEM_CLOCK = SystemClock()
@@ -2,9 +2,16 @@ import time
 from typing import List, Optional, Tuple, Union
 
 import numpy as np
-import win32api
-import win32con
-import win32gui
+
+# win32仅用于全屏判定与客户区→屏幕映射，非Windows环境（离线基准测试/回放）下降级
+try:
+    import win32api
+    import win32con
+    import win32gui
+
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
 
 from src.auto_control.utils.display_context import RuntimeDisplayContext
 
@@ -111,6 +118,11 @@ class CoordinateTransformer:
             self._fullscreen_cache = False
             self._fullscreen_cache_time = current_time
             return False
+        if not WIN32_AVAILABLE:
+            # 非Windows环境无法查询窗口，以显示上下文状态为准
+            self._fullscreen_cache = bool(ctx.is_fullscreen)
+            self._fullscreen_cache_time = current_time
+            return self._fullscreen_cache
 
         try:
             # 获取窗口与屏幕基础参数
@@ -409,6 +421,37 @@ class CoordinateTransformer:
         )
         return (new_x, new_y, new_w, new_h)
 
+    def convert_current_client_rect_to_original(self, rect: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """
+        统一逻辑矩形 → 原始基准矩形（process_roi 的逆变换：全屏直接映射，窗口按轴对齐缩放）
+
+        Args:
+            rect: 统一逻辑矩形 (x, y, w, h)（get_unified_logical_rect 的输出）
+        Returns:
+            Tuple[int, int, int, int]: 原始基准矩形（基于original_base_res，尺寸≥1）
+        """
+        x, y, w, h = rect
+        if w <= 0 or h <= 0:
+            self.logger.error(f"矩形转换失败：无效尺寸 {rect}")
+            return rect
+
+        if self.is_fullscreen:
+            return (x, y, w, h)
+
+        ctx = self._display_context
+        orig_w, orig_h = ctx.original_base_res
+        curr_logical_w, curr_logical_h = ctx.client_logical_res
+        if orig_w <= 0 or orig_h <= 0 or curr_logical_w <= 0 or curr_logical_h <= 0:
+            self.logger.error(
+                f"矩形转换失败：无效分辨率 | 原始: {orig_w}x{orig_h} | 逻辑: {curr_logical_w}x{curr_logical_h}"
+            )
+            return rect
+
+        scale_x = orig_w / curr_logical_w
+        scale_y = orig_h / curr_logical_h
+        new_w, new_h = self._ensure_positive_size(int(round(w * scale_x)), int(round(h * scale_y)))
+        return (int(round(x * scale_x)), int(round(y * scale_y)), new_w, new_h)
+
     def convert_client_physical_rect_to_logical(self, rect: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
         """
         客户区物理矩形 → 客户区逻辑矩形（逆DPI缩放）
@@ -1,7 +1,11 @@
 import datetime
+import functools
 import logging
 import os
-from typing import Dict, List, Optional, Tuple, TypeGuard, Union
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, TypeGuard, Union
 
 import cv2
 import numpy as np
@@ -15,6 +19,29 @@ except ImportError:
     PIL_AVAILABLE = False
     logging.warning("PIL库未安装，中文文本将使用CV2默认字体（可能显示乱码）")
 
+# 支持的调试图编码格式 → 文件扩展名
+DEBUG_IMAGE_FORMATS: Dict[str, str] = {"png": ".png", "jpg": ".jpg", "webp": ".webp"}
+DEBUG_IMAGE_EXTENSIONS: Tuple[str, ...] = tuple(DEBUG_IMAGE_FORMATS.values())
+
+
+def debug_saver_options(config: Optional[object]) -> Dict[str, Union[str, int]]:
+    """
+    从框架配置读取调试图保存参数（配置缺失时使用默认值）
+
+    Args:
+        config: 配置对象（AutoConfig或任意带同名属性的对象，可为None）
+
+    Returns:
+        Dict: DebugImageSaver的关键字参数
+    """
+    return {
+        "image_format": getattr(config, "DEBUG_IMAGE_FORMAT", "png"),
+        "png_compression": getattr(config, "DEBUG_PNG_COMPRESSION", 3),
+        "image_quality": getattr(config, "DEBUG_IMAGE_QUALITY", 90),
+        "queue_size": getattr(config, "DEBUG_QUEUE_SIZE", 8),
+        "capture_size": getattr(config, "DEBUG_CAPTURE_SIZE", 5),
+    }
+
 
 class DebugImageSaver:
     """公共调试图保存工具类：统一模板匹配/OCR识别的调试图标注风格和保存逻辑"""
@@ -26,6 +53,12 @@ class DebugImageSaver:
         test_mode: bool = False,
         custom_style: Optional[Dict] = None,
         chinese_font_path: str = "simhei.ttf",
+        image_format: str = "png",
+        png_compression: int = 3,
+        image_quality: int = 90,
+        queue_size: int = 8,
+        async_write: bool = True,
+        capture_size: int = 5,
     ):
         """
         初始化调试图保存工具
@@ -34,11 +67,49 @@ class DebugImageSaver:
         :param test_mode: 测试模式（是否清空历史图）
         :param custom_style: 自定义样式（覆盖默认样式，格式同self.style）
         :param chinese_font_path: 中文字体文件路径（如simhei.ttf）
+        :param image_format: 调试图编码格式（png/jpg/webp）
+        :param png_compression: PNG压缩级别（0-9，越大越慢）
+        :param image_quality: JPG/WebP质量（1-100）
+        :param queue_size: 后台写入队列容量（满时丢弃最早的调试图）
+        :param async_write: 是否在后台线程标注并写盘（False时在调用线程同步完成）
+        :param capture_size: 每个捕获范围保留的最近调试图数量（仅失败时落盘）
         """
         self.logger = logger
         self.debug_dir = debug_dir
         self.test_mode = test_mode
         self.chinese_font_path = chinese_font_path
+        self._font_cache: Dict[int, object] = {}  # 字号 → 字体（避免每行文本重复加载字体文件）
+        self._font_missing_warned = False
+
+        # 编码参数
+        self.image_format = str(image_format or "png").lower()
+        if self.image_format not in DEBUG_IMAGE_FORMATS:
+            self.logger.warning(f"不支持的调试图格式'{image_format}'，使用png，合法格式：{list(DEBUG_IMAGE_FORMATS)}")
+            self.image_format = "png"
+        self.image_ext = DEBUG_IMAGE_FORMATS[self.image_format]
+        if self.image_format == "png":
+            self.imwrite_params = [cv2.IMWRITE_PNG_COMPRESSION, max(0, min(9, int(png_compression)))]
+        elif self.image_format == "jpg":
+            self.imwrite_params = [cv2.IMWRITE_JPEG_QUALITY, max(1, min(100, int(image_quality)))]
+        else:
+            self.imwrite_params = [cv2.IMWRITE_WEBP_QUALITY, max(1, min(100, int(image_quality)))]
+
+        # 后台写入：有界队列（满时丢弃最早项），自动化线程只入队不等待磁盘I/O
+        self.async_write = async_write
+        self.queue_size = max(1, int(queue_size))
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self.written_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+        # 失败捕获范围（按线程嵌套）：范围内的调试图只保留原图引用与元数据（不标注、不拷贝），
+        # 最外层范围失败时才落盘最近capture_size张，成功时直接丢弃
+        self.capture_size = max(1, int(capture_size))
+        self._capture_local = threading.local()
+        self.discarded_count = 0
 
         # 确保调试目录存在
         os.makedirs(self.debug_dir, exist_ok=True)
@@ -111,7 +182,7 @@ class DebugImageSaver:
                     raise ValueError(f"样式'{key}'格式错误，需为((r,g,b), font_scale, thickness, line_type)")
 
     def _clear_debug_dir(self) -> None:
-        """清空调试目录下的所有PNG格式调试图（复用原有逻辑，增强异常处理）"""
+        """清空调试目录下的所有调试图（复用原有逻辑，增强异常处理）"""
         try:
             total_count = 0
             deleted_count = 0
@@ -121,7 +192,7 @@ class DebugImageSaver:
                 file_path = os.path.join(self.debug_dir, filename)
                 if not os.path.isfile(file_path):
                     continue
-                if filename.lower().endswith(".png"):
+                if filename.lower().endswith(DEBUG_IMAGE_EXTENSIONS):
                     total_count += 1
                     try:
                         os.remove(file_path)
@@ -196,51 +267,59 @@ class DebugImageSaver:
 
             # 优先绘制中文，失败则降级为CV2默认
             if any(ord(c) > 127 for c in line) and PIL_AVAILABLE:
-                # 修复：传入img副本，避免原数组被破坏
                 self._draw_chinese_text(img, line, (pos[0], y_offset), style_key)
             else:
                 self._draw_text(img, line, (pos[0], y_offset), style_key)
             y_offset += 20  # 行间距
 
-    def _draw_chinese_text(self, img: np.ndarray, text: str, pos: Tuple[int, int], style_key: str) -> None:
-        """绘制中文文本（修复黑块问题：通道匹配+避免直接覆盖原数组）"""
-        try:
-            color, font_scale, thickness, _ = self.style[style_key]
-            img_h, img_w = img.shape[:2]
-            # 1. 处理通道数：确保是3通道BGR
-            if len(img.shape) == 2:  # 灰度图转3通道
-                img_rgb = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
-            else:  # BGR转RGB
-                img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-            # 2. 创建PIL图片（基于副本，避免修改原数组）
-            pil_img = Image.fromarray(img_rgb).copy()
-            draw = ImageDraw.Draw(pil_img)
-
-            # 3. 加载中文字体（限制字体大小，避免越界）
-            font_size = int(12 * font_scale)
-            font_size = min(font_size, 16)  # 最大字体限制为16，防止黑块
+    def _get_font(self, font_size: int):
+        """按字号获取中文字体（每个字号只加载一次；字体缺失时使用默认字体，只告警一次）"""
+        font = self._font_cache.get(font_size)
+        if font is None:
             try:
                 font = ImageFont.truetype(self.chinese_font_path, font_size)
             except (FileNotFoundError, OSError):
-                self.logger.warning(f"中文字体文件'{self.chinese_font_path}'未找到，使用默认字体")
+                if not self._font_missing_warned:
+                    self.logger.warning(f"中文字体文件'{self.chinese_font_path}'未找到，使用默认字体")
+                    self._font_missing_warned = True
                 font = ImageFont.load_default()
+            self._font_cache[font_size] = font
+        return font
 
-            # 4. 校验绘制坐标（避免越界）
+    def _draw_chinese_text(self, img: np.ndarray, text: str, pos: Tuple[int, int], style_key: str) -> None:
+        """
+        绘制中文文本：仅截取文本所在的小条带交给PIL绘制后写回原图，避免整帧颜色转换与PIL往返
+        条带直接以BGR字节构建PIL图像，填充色按通道反序传入，无需BGR↔RGB转换
+        """
+        try:
+            color = self.style[style_key][0]
+            font_scale = self.style[style_key][1]
+            img_h, img_w = img.shape[:2]
+
+            # 1. 获取字体（限制字体大小，避免越界）
+            font_size = min(int(12 * font_scale), 16)  # 最大字体限制为16，防止黑块
+            font = self._get_font(font_size)
+
+            # 2. 校验绘制坐标（避免越界）
             draw_x = max(0, min(pos[0], img_w - 10))
             draw_y = max(0, min(pos[1], img_h - 10))
 
-            # 5. 绘制文本（使用tuple(color)确保PIL兼容）
-            draw.text((draw_x, draw_y), text, fill=tuple(color), font=font)
+            # 3. 计算文本条带范围
+            left, top, right, bottom = font.getbbox(text)
+            x0, y0 = max(0, draw_x + int(left)), max(0, draw_y + int(top))
+            x1, y1 = min(img_w, draw_x + int(right) + 1), min(img_h, draw_y + int(bottom) + 1)
+            if x1 <= x0 or y1 <= y0:
+                return
+            strip = img[y0:y1, x0:x1]
 
-            # 6. 转换回CV2格式并合并到原图（修复直接赋值问题）
-            pil_img_np = np.array(pil_img)
-            if len(img.shape) == 2:  # 灰度图还原
-                pil_img_bgr = cv2.cvtColor(pil_img_np, cv2.COLOR_RGB2GRAY)
-                img[:] = pil_img_bgr
-            else:  # 3通道还原
-                pil_img_bgr = cv2.cvtColor(pil_img_np, cv2.COLOR_RGB2BGR)
-                img[:] = pil_img_bgr
+            # 4. 在条带上绘制并写回（灰度图按亮度公式换算填充值）
+            if strip.ndim == 2:
+                fill = int(round(0.299 * color[0] + 0.587 * color[1] + 0.114 * color[2]))
+            else:
+                fill = tuple(int(c) for c in reversed(color))
+            pil_strip = Image.fromarray(np.ascontiguousarray(strip))
+            ImageDraw.Draw(pil_strip).text((draw_x - x0, draw_y - y0), text, fill=fill, font=font)
+            strip[:] = np.asarray(pil_strip)
 
         except Exception as e:
             self.logger.warning(f"绘制中文文本失败，降级为CV2默认绘制 | 错误: {str(e)}")
@@ -268,6 +347,151 @@ class DebugImageSaver:
         except Exception as e:
             self.logger.warning(f"绘制文本失败 | 文本: {text} | 错误: {str(e)}")
 
+    def _build_save_path(self, prefix: str) -> str:
+        """按调用时刻生成调试图保存路径（时间戳在入队时确定，与实际写盘时间无关）"""
+        timestamp = datetime.datetime.now().strftime("%H%M%S%f")[:-3]
+        return os.path.join(self.debug_dir, f"{prefix}_{timestamp}{self.image_ext}")
+
+    def _capture_stack(self) -> List[deque]:
+        """获取当前线程的捕获范围栈"""
+        stack = getattr(self._capture_local, "stack", None)
+        if stack is None:
+            stack = self._capture_local.stack = []
+        return stack
+
+    def begin_capture(self) -> None:
+        """开始一个失败捕获范围（当前线程，可嵌套）"""
+        self._capture_stack().append(deque(maxlen=self.capture_size))
+
+    def end_capture(self, failed: bool) -> int:
+        """
+        结束当前线程最内层的失败捕获范围
+        :param failed: 范围内的等待/步骤是否最终失败
+        :return: 本次提交写盘的调试图数量
+        """
+        stack = self._capture_stack()
+        if not stack:
+            return 0
+        ring = stack.pop()
+        if not failed:
+            with self._cond:
+                self.discarded_count += len(ring)
+            return 0
+        if stack:
+            # 外层范围仍可能成功（如重试），交由外层决定是否落盘
+            stack[-1].extend(ring)
+            return 0
+        count = len(ring)
+        for job in ring:
+            self._enqueue(job)
+        return count
+
+    def save_capture(self) -> int:
+        """
+        立即落盘当前线程所有捕获范围中暂存的调试图（显式请求）
+        :return: 提交写盘的调试图数量
+        """
+        count = 0
+        for ring in self._capture_stack():
+            while ring:
+                self._enqueue(ring.popleft())
+                count += 1
+        return count
+
+    def _submit(self, save_path: str, render: Callable[[], np.ndarray], desc: str) -> None:
+        """
+        提交调试图任务：处于捕获范围内时只暂存，否则直接入队写盘
+        :param save_path: 保存路径
+        :param render: 标注函数（返回待保存的图像）
+        :param desc: 任务描述（用于日志）
+        """
+        job = (save_path, render, desc)
+        stack = self._capture_stack()
+        if stack:
+            ring = stack[-1]
+            if len(ring) == ring.maxlen:
+                with self._cond:
+                    self.discarded_count += 1
+            ring.append(job)
+            return
+        self._enqueue(job)
+
+    def _enqueue(self, job: Tuple[str, Callable[[], np.ndarray], str]) -> None:
+        """调试图任务入队：异步模式下立即返回，队列已满时丢弃最早的任务"""
+        if not self.async_write:
+            self._process_job(job)
+            return
+        with self._cond:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop, name="DebugImageWriter", daemon=True)
+                self._writer.start()
+            if len(self._queue) >= self.queue_size:
+                dropped_path = self._queue.popleft()[0]
+                self.dropped_count += 1
+                self.logger.debug(f"调试图写入队列已满，丢弃最早的调试图: {os.path.basename(dropped_path)}")
+            self._queue.append(job)
+            self._cond.notify_all()
+
+    def _writer_loop(self) -> None:
+        """后台写入线程：依次标注并写盘"""
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._queue.popleft()
+                self._in_flight += 1
+            try:
+                self._process_job(job)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _process_job(self, job: Tuple[str, Callable[[], np.ndarray], str]) -> None:
+        """执行单个调试图任务（标注+编码写盘），异常只记录日志"""
+        save_path, render, desc = job
+        try:
+            debug_img = render()
+            if not cv2.imwrite(save_path, debug_img, self.imwrite_params):
+                raise IOError("cv2.imwrite返回False")
+            with self._cond:
+                self.written_count += 1
+            self.logger.debug(f"调试图已保存: {save_path}")
+        except Exception as e:
+            with self._cond:
+                self.failed_count += 1
+            self.logger.error(f"保存调试图失败 | {desc} | 路径: {save_path} | 错误: {str(e)}", exc_info=True)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        等待队列中的调试图全部写盘（系统停止时调用）
+        :param timeout: 最长等待时间（秒）
+        :return: 全部写完返回True，超时返回False
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(f"调试图写入超时，剩余未写入: {len(self._queue) + self._in_flight}")
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取调试图写入统计
+        :return: 已写入/已丢弃（队列满）/写入失败/待写入数量，以及因等待成功而免于写盘的数量
+        """
+        with self._cond:
+            return {
+                "written": self.written_count,
+                "dropped": self.dropped_count,
+                "failed": self.failed_count,
+                "pending": len(self._queue) + self._in_flight,
+                "discarded": self.discarded_count,
+            }
+
     def save_template_debug(
         self,
         orig_image: np.ndarray,
@@ -286,96 +510,120 @@ class DebugImageSaver:
     ) -> None:
         """
         保存模板匹配调试图（对应ImageProcessor的需求，参数完全不变）
+        调用线程只做校验与入队，拷贝、标注和写盘在后台写入线程完成（原图以只读方式引用）
         """
-        try:
-            # 基础参数校验
-            if orig_image is None or len(orig_image.shape) < 2:
-                self.logger.error("原始图像为空或格式错误，跳过保存")
-                return
-            debug_img = orig_image.copy()
-            img_h, img_w = debug_img.shape[:2]
-            timestamp = datetime.datetime.now().strftime("%H%M%S%f")[:-3]
-            safe_name = template_name.replace("/", "_").replace("\\", "_").replace(" ", "_")
-            img_type = "match_success" if is_success else "match_fail"
-            save_path = os.path.join(self.debug_dir, f"{img_type}_{safe_name}_{timestamp}.png")
-
-            # 1. 标注ROI区域（增加合法性校验）
-            if self._is_valid_bbox(orig_roi_phys) and self._is_bbox_in_image(orig_roi_phys, img_h, img_w):
-                rx, ry, rw, rh = orig_roi_phys
-                color, thickness, line_type = self.style["roi_rect"][:3]
-                cv2.rectangle(debug_img, (rx, ry), (rx + rw, ry + rh), color, int(thickness), int(line_type))
-                self._draw_text_wrap(debug_img, "Original ROI", (rx + 5, ry + 20), "text_info")
-                # 窗口模式标注逻辑坐标
-                if not is_fullscreen and self._is_valid_bbox(processed_roi):
-                    self._draw_text_wrap(debug_img, f"ROI(Log): {processed_roi}", (rx + 5, ry + 40), "text_small")
-            elif orig_roi_phys:
-                self.logger.warning(f"无效的ROI坐标: {orig_roi_phys}，跳过ROI标注")
-
-            # 2. 标注顶部状态信息（自动换行）
-            top_texts = [
-                f"Template: {template_name}",
-                f"Status: {'Match Success' if is_success else 'Match Failed'}",
-                f"Score: {match_score:.4f} | Threshold: {threshold}",
-                f"Mode: {'Fullscreen' if is_fullscreen else 'Window'}",
-            ]
-            text_style = "text_success" if is_success else "text_fail"
-            y_offset = 30
-            for text in top_texts:
-                self._draw_text_wrap(debug_img, text, (10, y_offset), text_style)
+        # 基础参数校验
+        if orig_image is None or len(orig_image.shape) < 2:
+            self.logger.error("原始图像为空或格式错误，跳过保存")
+            return
+        safe_name = template_name.replace("/", "_").replace("\\", "_").replace(" ", "_")
+        img_type = "match_success" if is_success else "match_fail"
+        render = functools.partial(
+            self._render_template_debug,
+            orig_image,
+            template_name,
+            is_success,
+            match_score,
+            threshold,
+            is_fullscreen,
+            orig_roi_phys,
+            processed_roi,
+            match_bbox_phys,
+            center_phys,
+            final_bbox_log,
+            template_orig_size,
+            template_scaled_size,
+        )
+        self._submit(self._build_save_path(f"{img_type}_{safe_name}"), render, f"模板: {template_name}")
+
+    def _render_template_debug(
+        self,
+        orig_image: np.ndarray,
+        template_name: str,
+        is_success: bool,
+        match_score: float,
+        threshold: float,
+        is_fullscreen: bool,
+        orig_roi_phys: Optional[Tuple[int, int, int, int]],
+        processed_roi: Optional[Tuple[int, int, int, int]],
+        match_bbox_phys: Optional[Tuple[int, int, int, int]],
+        center_phys: Optional[Tuple[int, int]],
+        final_bbox_log: Optional[Tuple[int, int, int, int]],
+        template_orig_size: Optional[Tuple[int, int]],
+        template_scaled_size: Optional[Tuple[int, int]],
+    ) -> np.ndarray:
+        """标注模板匹配调试图（在写入线程执行），返回待保存的图像"""
+        # 上游匹配流程不拷贝原图，此处为唯一拷贝点（仅在实际保存调试图时发生）
+        debug_img = orig_image.copy()
+        img_h, img_w = debug_img.shape[:2]
+
+        # 1. 标注ROI区域（增加合法性校验）
+        if self._is_valid_bbox(orig_roi_phys) and self._is_bbox_in_image(orig_roi_phys, img_h, img_w):
+            rx, ry, rw, rh = orig_roi_phys
+            color, thickness, line_type = self.style["roi_rect"][:3]
+            cv2.rectangle(debug_img, (rx, ry), (rx + rw, ry + rh), color, int(thickness), int(line_type))
+            self._draw_text_wrap(debug_img, "Original ROI", (rx + 5, ry + 20), "text_info")
+            # 窗口模式标注逻辑坐标
+            if not is_fullscreen and self._is_valid_bbox(processed_roi):
+                self._draw_text_wrap(debug_img, f"ROI(Log): {processed_roi}", (rx + 5, ry + 40), "text_small")
+        elif orig_roi_phys:
+            self.logger.warning(f"无效的ROI坐标: {orig_roi_phys}，跳过ROI标注")
+
+        # 2. 标注顶部状态信息（自动换行）
+        top_texts = [
+            f"Template: {template_name}",
+            f"Status: {'Match Success' if is_success else 'Match Failed'}",
+            f"Score: {match_score:.4f} | Threshold: {threshold}",
+            f"Mode: {'Fullscreen' if is_fullscreen else 'Window'}",
+        ]
+        text_style = "text_success" if is_success else "text_fail"
+        y_offset = 30
+        for text in top_texts:
+            self._draw_text_wrap(debug_img, text, (10, y_offset), text_style)
+            y_offset += 20
+
+        # 3. 匹配成功：标注匹配区域、中心坐标、详细参数（增加合法性校验）
+        if is_success:
+            # 匹配区域矩形（红色：选中的ROI）
+            if self._is_valid_bbox(match_bbox_phys) and self._is_bbox_in_image(match_bbox_phys, img_h, img_w):
+                mx, my, mw, mh = match_bbox_phys
+                color, thickness, line_type = self.style["match_rect"][:3]
+                cv2.rectangle(debug_img, (mx, my), (mx + mw, my + mh), color, int(thickness), int(line_type))
+                self._draw_text_wrap(debug_img, "Matched Area", (mx + 5, my + 20), "text_info")
+            elif match_bbox_phys:
+                self.logger.warning(f"无效的匹配区域坐标: {match_bbox_phys}，跳过标注")
+
+            # 中心坐标点（绿色）
+            if self._is_valid_point(center_phys) and 0 <= center_phys[0] < img_w and 0 <= center_phys[1] < img_h:
+                cx, cy = center_phys
+                color, radius, thickness, line_type = self.style["center_point"][:4]
+                cv2.circle(debug_img, (cx, cy), int(radius), color, int(thickness), int(line_type))
+                self._draw_text_wrap(debug_img, f"Center(Phys): ({cx},{cy})", (cx + 10, cy - 10), "text_small")
+            elif center_phys:
+                self.logger.warning(f"无效的中心坐标: {center_phys}，跳过中心标注")
+
+            # 底部详细参数（自动换行）
+            bottom_texts = []
+            if self._is_valid_bbox(match_bbox_phys):
+                bottom_texts.append(f"Matched(Phys): {match_bbox_phys}")
+            if self._is_valid_bbox(final_bbox_log):
+                bottom_texts.append(f"Matched(Log): {final_bbox_log}")
+            if template_orig_size and template_scaled_size:
+                # 优化：将长文本拆分为两行，避免单行过长
+                bottom_texts.append(f"Template: Orig({template_orig_size[0]},{template_orig_size[1]})")
+                bottom_texts.append(f"Scaled: {template_scaled_size[0]}x{template_scaled_size[1]}")
+
+            # 优化：计算底部文本所需的最小高度，确保有足够空间
+            max_lines = min(len(bottom_texts), 3)  # 最多显示3行底部文本
+            required_height = max_lines * 20  # 每行20像素
+            start_y = max(30 + len(top_texts) * 20, img_h - required_height - 10)  # 确保不与顶部文本重叠
+            
+            y_offset = start_y
+            for text in bottom_texts[:max_lines]:  # 只显示前3行
+                self._draw_text_wrap(debug_img, text, (10, y_offset), "text_info")
                 y_offset += 20
 
-            # 3. 匹配成功：标注匹配区域、中心坐标、详细参数（增加合法性校验）
-            if is_success:
-                # 匹配区域矩形（红色：选中的ROI）
-                if self._is_valid_bbox(match_bbox_phys) and self._is_bbox_in_image(match_bbox_phys, img_h, img_w):
-                    mx, my, mw, mh = match_bbox_phys
-                    color, thickness, line_type = self.style["match_rect"][:3]
-                    cv2.rectangle(debug_img, (mx, my), (mx + mw, my + mh), color, int(thickness), int(line_type))
-                    self._draw_text_wrap(debug_img, "Matched Area", (mx + 5, my + 20), "text_info")
-                elif match_bbox_phys:
-                    self.logger.warning(f"无效的匹配区域坐标: {match_bbox_phys}，跳过标注")
-
-                # 中心坐标点（绿色）
-                if self._is_valid_point(center_phys) and 0 <= center_phys[0] < img_w and 0 <= center_phys[1] < img_h:
-                    cx, cy = center_phys
-                    color, radius, thickness, line_type = self.style["center_point"][:4]
-                    cv2.circle(debug_img, (cx, cy), int(radius), color, int(thickness), int(line_type))
-                    self._draw_text_wrap(debug_img, f"Center(Phys): ({cx},{cy})", (cx + 10, cy - 10), "text_small")
-                elif center_phys:
-                    self.logger.warning(f"无效的中心坐标: {center_phys}，跳过中心标注")
-
-                # 底部详细参数（自动换行）
-                bottom_texts = []
-                if self._is_valid_bbox(match_bbox_phys):
-                    bottom_texts.append(f"Matched(Phys): {match_bbox_phys}")
-                if self._is_valid_bbox(final_bbox_log):
-                    bottom_texts.append(f"Matched(Log): {final_bbox_log}")
-                if template_orig_size and template_scaled_size:
-                    # 优化：将长文本拆分为两行，避免单行过长
-                    bottom_texts.append(f"Template: Orig({template_orig_size[0]},{template_orig_size[1]})")
-                    bottom_texts.append(f"Scaled: {template_scaled_size[0]}x{template_scaled_size[1]}")
-
-                # 优化：计算底部文本所需的最小高度，确保有足够空间
-                max_lines = min(len(bottom_texts), 3)  # 最多显示3行底部文本
-                required_height = max_lines * 20  # 每行20像素
-                start_y = max(30 + len(top_texts) * 20, img_h - required_height - 10)  # 确保不与顶部文本重叠
-                
-                y_offset = start_y
-                for text in bottom_texts[:max_lines]:  # 只显示前3行
-                    self._draw_text_wrap(debug_img, text, (10, y_offset), "text_info")
-                    y_offset += 20
-
-            # 保存图片（增强异常处理，添加压缩参数避免黑块）
-            try:
-                cv2.imwrite(save_path, debug_img, [cv2.IMWRITE_PNG_COMPRESSION, 9])
-                self.logger.debug(f"模板匹配调试图已保存: {save_path}")
-            except cv2.error as e:
-                self.logger.error(f"CV2保存图片失败 | 路径: {save_path} | 错误: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"保存图片失败 | 路径: {save_path} | 错误: {str(e)}")
-
-        except Exception as e:
-            self.logger.error(f"保存模板匹配调试图异常 | 模板: {template_name} | 错误: {str(e)}", exc_info=True)
+        return debug_img
 
     def save_ocr_debug(
         self,
@@ -392,123 +640,139 @@ class DebugImageSaver:
     ) -> None:
         """
         保存OCR识别调试图（对应OCRProcessor的需求，参数完全不变）
+        调用线程只做校验与入队，拷贝、标注和写盘在后台写入线程完成（原图以只读方式引用）
         """
-        try:
-            # 基础参数校验
-            if orig_image is None or len(orig_image.shape) < 2:
-                self.logger.error("原始图像为空或格式错误，跳过保存")
-                return
-            if not isinstance(ocr_results, list):
-                self.logger.error("OCR结果非列表类型，跳过保存")
-                return
-
-            # 修复：创建深度拷贝，避免原图像被修改导致黑块
-            debug_img = orig_image.copy()
-            img_h, img_w = debug_img.shape[:2]
-            timestamp = datetime.datetime.now().strftime("%H%M%S%f")[:-3]
-            safe_text = target_text.strip().replace("/", "_").replace("\\", "_").replace(" ", "_")[:50]  # 限制长度
-            img_type = "ocr_success" if is_success else "ocr_fail"
-            save_path = os.path.join(self.debug_dir, f"{img_type}_{safe_text}_{timestamp}.png")
-
-            # 1. 标注筛选区域（region）（蓝色：传的ROI）
-            if self._is_valid_bbox(orig_region_phys) and self._is_bbox_in_image(orig_region_phys, img_h, img_w):
-                rx, ry, rw, rh = orig_region_phys
-                color, thickness, line_type = self.style["roi_rect"][:3]
-                cv2.rectangle(debug_img, (rx, ry), (rx + rw, ry + rh), color, int(thickness), int(line_type))
-                self._draw_text_wrap(debug_img, "OCR Region", (rx + 5, ry + 20), "text_info")
-            elif orig_region_phys:
-                self.logger.warning(f"无效的OCR区域坐标: {orig_region_phys}，跳过区域标注")
-
-            # 2. 标注所有OCR识别结果（红色：选中的ROI）
-            for idx, res in enumerate(ocr_results):
-                # 校验OCR结果格式
-                if not isinstance(res, dict) or "bbox" not in res or "text" not in res or "confidence" not in res:
-                    self.logger.warning(f"第{idx}个OCR结果格式错误: {res}，跳过标注")
-                    continue
-                bbox = res["bbox"]
-                if not self._is_valid_bbox(bbox):
-                    self.logger.warning(f"第{idx}个OCR结果bbox无效: {bbox}，跳过标注")
-                    continue
-
-                x_sub, y_sub, w_sub, h_sub = bbox
-                # 还原到原图物理坐标（加上区域偏移）
-                x_orig = x_sub + region_offset_phys[0]
-                y_orig = y_sub + region_offset_phys[1]
-                # 校验还原后的坐标是否在图片内（更严格）
-                if not (
-                    0 <= x_orig < img_w and 0 <= y_orig < img_h and x_orig + w_sub <= img_w and y_orig + h_sub <= img_h
-                ):
-                    self.logger.warning(
-                        f"第{idx}个OCR结果还原后坐标超出图片范围: ({x_orig},{y_orig},{w_sub},{h_sub})，跳过标注"
-                    )
-                    continue
-
-                text = res["text"].strip()
-                conf = res["confidence"]
+        # 基础参数校验
+        if orig_image is None or len(orig_image.shape) < 2:
+            self.logger.error("原始图像为空或格式错误，跳过保存")
+            return
+        if not isinstance(ocr_results, list):
+            self.logger.error("OCR结果非列表类型，跳过保存")
+            return
+        safe_text = target_text.strip().replace("/", "_").replace("\\", "_").replace(" ", "_")[:50]  # 限制长度
+        img_type = "ocr_success" if is_success else "ocr_fail"
+        render = functools.partial(
+            self._render_ocr_debug,
+            orig_image,
+            target_text,
+            is_success,
+            match_score,
+            min_confidence,
+            is_fullscreen,
+            list(ocr_results),
+            target_bbox_phys,
+            orig_region_phys,
+            region_offset_phys,
+        )
+        self._submit(self._build_save_path(f"{img_type}_{safe_text}"), render, f"目标文本: {target_text}")
+
+    def _render_ocr_debug(
+        self,
+        orig_image: np.ndarray,
+        target_text: str,
+        is_success: bool,
+        match_score: float,
+        min_confidence: float,
+        is_fullscreen: bool,
+        ocr_results: List[Dict],
+        target_bbox_phys: Optional[Tuple[int, int, int, int]],
+        orig_region_phys: Optional[Tuple[int, int, int, int]],
+        region_offset_phys: Tuple[int, int],
+    ) -> np.ndarray:
+        """标注OCR识别调试图（在写入线程执行），返回待保存的图像"""
+        # 创建拷贝，避免原图像被修改（上游OCR流程不拷贝原图，此处为唯一拷贝点）
+        debug_img = orig_image.copy()
+        img_h, img_w = debug_img.shape[:2]
+
+        # 1. 标注筛选区域（region）（蓝色：传的ROI）
+        if self._is_valid_bbox(orig_region_phys) and self._is_bbox_in_image(orig_region_phys, img_h, img_w):
+            rx, ry, rw, rh = orig_region_phys
+            color, thickness, line_type = self.style["roi_rect"][:3]
+            cv2.rectangle(debug_img, (rx, ry), (rx + rw, ry + rh), color, int(thickness), int(line_type))
+            self._draw_text_wrap(debug_img, "OCR Region", (rx + 5, ry + 20), "text_info")
+        elif orig_region_phys:
+            self.logger.warning(f"无效的OCR区域坐标: {orig_region_phys}，跳过区域标注")
+
+        # 2. 标注所有OCR识别结果（红色：选中的ROI）
+        for idx, res in enumerate(ocr_results):
+            # 校验OCR结果格式
+            if not isinstance(res, dict) or "bbox" not in res or "text" not in res or "confidence" not in res:
+                self.logger.warning(f"第{idx}个OCR结果格式错误: {res}，跳过标注")
+                continue
+            bbox = res["bbox"]
+            if not self._is_valid_bbox(bbox):
+                self.logger.warning(f"第{idx}个OCR结果bbox无效: {bbox}，跳过标注")
+                continue
 
-                # 绘制识别文本框（红色，限制厚度）
-                color, thickness, line_type = self.style["match_rect"][:3]
-                thickness = min(int(thickness), 2)  # 最大厚度2，防止黑块
-                cv2.rectangle(
-                    debug_img, (x_orig, y_orig), (x_orig + w_sub, y_orig + h_sub), color, thickness, int(line_type)
-                )
-                # 标注文本内容和置信度（绿色文字）
-                text_y = y_orig - 10 if (y_orig - 10) > 10 else (y_orig + h_sub + 20)
-                text_pos = (x_orig + 5, text_y)
-                self._draw_text_wrap(debug_img, f"{text} ({conf:.2f})", text_pos, "text_small")
-
-            # 3. 标注目标文本（红色：选中的ROI，绿色文字）
-            if (
-                is_success
-                and self._is_valid_bbox(target_bbox_phys)
-                and self._is_bbox_in_image(target_bbox_phys, img_h, img_w)
+            x_sub, y_sub, w_sub, h_sub = bbox
+            # 还原到原图物理坐标（加上区域偏移）
+            x_orig = x_sub + region_offset_phys[0]
+            y_orig = y_sub + region_offset_phys[1]
+            # 校验还原后的坐标是否在图片内（更严格）
+            if not (
+                0 <= x_orig < img_w and 0 <= y_orig < img_h and x_orig + w_sub <= img_w and y_orig + h_sub <= img_h
             ):
-                tx, ty, tw, th = target_bbox_phys
-                color, thickness, line_type = self.style["target_rect"][:3]
-                thickness = min(int(thickness), 2)  # 限制厚度
-                cv2.rectangle(debug_img, (tx, ty), (tx + tw, ty + th), color, thickness, int(line_type))
-                self._draw_text_wrap(debug_img, f"Target: {target_text}", (tx + 5, ty + 20), "text_success")
-                # 标注目标文本中心坐标（绿色）
-                cx = tx + tw // 2
-                cy = ty + th // 2
-                if 0 <= cx < img_w and 0 <= cy < img_h:
-                    circle_color, radius, circle_thickness, line_type = self.style["center_point"][:4]
-                    radius = min(int(radius), 4)  # 限制半径
-                    cv2.circle(debug_img, (cx, cy), radius, circle_color, int(circle_thickness), int(line_type))
-                    self._draw_text_wrap(debug_img, f"Center(Phys): ({cx},{cy})", (cx + 10, cy - 10), "text_small")
-                else:
-                    self.logger.warning(f"目标文本中心坐标超出图片范围: ({cx},{cy})，跳过中心标注")
-            elif is_success and target_bbox_phys:
-                self.logger.warning(f"无效的目标文本bbox: {target_bbox_phys}，跳过目标标注")
-
-            # 4. 标注顶部状态信息（绿色文字）
-            top_texts = [
-                f"Target Text: '{target_text}'",
-                f"Status: {'Found' if is_success else 'Not Found'}",
-                f"Match Score: {match_score:.4f} | Min Confidence: {min_confidence}",
-                f"OCR Results Count: {len(ocr_results)} | Mode: {'Fullscreen' if is_fullscreen else 'Window'}",
-            ]
-            text_style = "text_success" if is_success else "text_fail"
-            y_offset = 30
-            for text in top_texts:
-                self._draw_text_wrap(debug_img, text, (10, y_offset), text_style)
-                y_offset += 20
-
-            # 5. 标注底部辅助信息（绿色文字）
-            bottom_texts = [f"Image Size(Phys): {img_w}x{img_h}", f"Region Offset: {region_offset_phys}"]
-            y_offset = img_h - 30
-            for text in reversed(bottom_texts):
-                self._draw_text_wrap(debug_img, text, (10, y_offset), "text_info")
-                y_offset -= 20
+                self.logger.warning(
+                    f"第{idx}个OCR结果还原后坐标超出图片范围: ({x_orig},{y_orig},{w_sub},{h_sub})，跳过标注"
+                )
+                continue
 
-            # 保存图片（增强异常处理，添加压缩参数避免黑块）
-            try:
-                cv2.imwrite(save_path, debug_img, [cv2.IMWRITE_PNG_COMPRESSION, 9])
-                self.logger.debug(f"OCR调试图已保存: {save_path}")
-            except cv2.error as e:
-                self.logger.error(f"CV2保存图片失败 | 路径: {save_path} | 错误: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"保存图片失败 | 路径: {save_path} | 错误: {str(e)}")
+            text = res["text"].strip()
+            conf = res["confidence"]
 
-        except Exception as e:
-            self.logger.error(f"保存OCR调试图异常 | 目标文本: {target_text} | 错误: {str(e)}", exc_info=True)
+            # 绘制识别文本框（红色，限制厚度）
+            color, thickness, line_type = self.style["match_rect"][:3]
+            thickness = min(int(thickness), 2)  # 最大厚度2，防止黑块
+            cv2.rectangle(
+                debug_img, (x_orig, y_orig), (x_orig + w_sub, y_orig + h_sub), color, thickness, int(line_type)
+            )
+            # 标注文本内容和置信度（绿色文字）
+            text_y = y_orig - 10 if (y_orig - 10) > 10 else (y_orig + h_sub + 20)
+            text_pos = (x_orig + 5, text_y)
+            self._draw_text_wrap(debug_img, f"{text} ({conf:.2f})", text_pos, "text_small")
+
+        # 3. 标注目标文本（红色：选中的ROI，绿色文字）
+        if (
+            is_success
+            and self._is_valid_bbox(target_bbox_phys)
+            and self._is_bbox_in_image(target_bbox_phys, img_h, img_w)
+        ):
+            tx, ty, tw, th = target_bbox_phys
+            color, thickness, line_type = self.style["target_rect"][:3]
+            thickness = min(int(thickness), 2)  # 限制厚度
+            cv2.rectangle(debug_img, (tx, ty), (tx + tw, ty + th), color, thickness, int(line_type))
+            self._draw_text_wrap(debug_img, f"Target: {target_text}", (tx + 5, ty + 20), "text_success")
+            # 标注目标文本中心坐标（绿色）
+            cx = tx + tw // 2
+            cy = ty + th // 2
+            if 0 <= cx < img_w and 0 <= cy < img_h:
+                circle_color, radius, circle_thickness, line_type = self.style["center_point"][:4]
+                radius = min(int(radius), 4)  # 限制半径
+                cv2.circle(debug_img, (cx, cy), radius, circle_color, int(circle_thickness), int(line_type))
+                self._draw_text_wrap(debug_img, f"Center(Phys): ({cx},{cy})", (cx + 10, cy - 10), "text_small")
+            else:
+                self.logger.warning(f"目标文本中心坐标超出图片范围: ({cx},{cy})，跳过中心标注")
+        elif is_success and target_bbox_phys:
+            self.logger.warning(f"无效的目标文本bbox: {target_bbox_phys}，跳过目标标注")
+
+        # 4. 标注顶部状态信息（绿色文字）
+        top_texts = [
+            f"Target Text: '{target_text}'",
+            f"Status: {'Found' if is_success else 'Not Found'}",
+            f"Match Score: {match_score:.4f} | Min Confidence: {min_confidence}",
+            f"OCR Results Count: {len(ocr_results)} | Mode: {'Fullscreen' if is_fullscreen else 'Window'}",
+        ]
+        text_style = "text_success" if is_success else "text_fail"
+        y_offset = 30
+        for text in top_texts:
+            self._draw_text_wrap(debug_img, text, (10, y_offset), text_style)
+            y_offset += 20
+
+        # 5. 标注底部辅助信息（绿色文字）
+        bottom_texts = [f"Image Size(Phys): {img_w}x{img_h}", f"Region Offset: {region_offset_phys}"]
+        y_offset = img_h - 30
+        for text in reversed(bottom_texts):
+            self._draw_text_wrap(debug_img, text, (10, y_offset), "text_info")
+            y_offset -= 20
+
+        return debug_img
@@ -94,6 +94,24 @@ class RuntimeDisplayContext:
 
         return min(curr_w / orig_w, curr_h / orig_h)
 
+    @property
+    def geometry_signature(self) -> Tuple:
+        """
+        几何状态签名：影响模板缩放/坐标转换的全部参数组合。
+        用途：依赖显示几何的缓存（如缩放模板缓存）通过比较签名判断是否需要失效，
+        兼容直接修改字段（如 is_fullscreen）而未经过 update_from_window 的场景。
+        """
+        return (
+            self.is_fullscreen,
+            round(self.dpi_scale, 4),
+            self.client_logical_width,
+            self.client_logical_height,
+            self.client_physical_width,
+            self.client_physical_height,
+            self.screen_physical_width,
+            self.screen_physical_height,
+        )
+
     @property
     def logical_to_physical_ratio(self) -> float:
         """
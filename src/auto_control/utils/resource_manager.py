@@ -3,6 +3,7 @@ import shutil
 import time
 from typing import List, Optional
 
+from src.auto_control.utils.debug_image_saver import DEBUG_IMAGE_EXTENSIONS
 from src.auto_control.utils.logger import Logger
 
 
@@ -94,7 +95,7 @@ class ResourceManager:
             self.logger.debug(f"开始清理{dir_type}目录: {dir_path}")
 
             if dir_type == "template_debug" or dir_type == "ocr_debug":
-                # 清理调试图片（仅PNG文件）
+                # 清理调试图片（仅调试图格式文件）
                 self._cleanup_debug_images(dir_path, dir_type)
             elif dir_type == "log":
                 # 清理旧日志（由Logger类自行处理）
@@ -121,8 +122,8 @@ class ResourceManager:
                 if not os.path.isfile(file_path):
                     continue
 
-                # 只清理PNG文件
-                if filename.lower().endswith(".png"):
+                # 只清理调试图文件
+                if filename.lower().endswith(DEBUG_IMAGE_EXTENSIONS):
                     total_count += 1
                     try:
                         os.remove(file_path)
@@ -3,8 +3,6 @@
 包含每日任务和每周任务的奖励领取功能
 """
 
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout, click_back
 from src.auto_tasks.utils.roi_config import roi_config
@@ -23,12 +21,12 @@ def daily_missions(auto: Auto, timeout: int = 300) -> bool:
     logger = auto.get_task_logger("daily_missions")
     logger.info("开始领取每日任务")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
 
     # 1. 返回主界面
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
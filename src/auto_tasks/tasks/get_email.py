@@ -3,8 +3,6 @@
 包含邮件的检查和奖励领取功能
 """
 
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout, click_back
 from src.auto_tasks.utils.roi_config import roi_config
@@ -24,14 +22,14 @@ def get_email(auto: Auto, timeout: int = 300) -> bool:
     logger.info("开始领取邮件")
 
     # 记录任务开始时间，用于计算剩余超时
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 进入邮箱界面
@@ -66,11 +64,11 @@ def get_email(auto: Auto, timeout: int = 300) -> bool:
     chain.then().custom_step(claim_email_step)
 
     # 4. 从邮箱界面返回
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: click_back(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 5. 最终返回主界面确认
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, min(10, remaining_timeout)), timeout=min(10, remaining_timeout))
 
     # 执行任务链
@@ -1,5 +1,3 @@
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout
 from src.auto_tasks.utils.roi_config import roi_config
@@ -19,14 +17,14 @@ def get_guild(auto: Auto, timeout: int = 300) -> bool:
     logger.info("开始领取公会奖励")
 
     # 记录任务开始时间，用于计算剩余超时
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 点击公会标识，进入公会界面
@@ -38,7 +36,7 @@ def get_guild(auto: Auto, timeout: int = 300) -> bool:
     .template_click("public/返回键1", roi=roi_config.get_roi("back_button"))
 
     # 6. 最终返回主界面确认
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, min(10, remaining_timeout)), timeout=min(10, remaining_timeout))
 
     # 执行任务链
@@ -3,8 +3,6 @@
 包含PVP竞技场的奖励领取和战斗功能
 """
 
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout, click_back, enter_map_select
 from src.auto_tasks.utils.roi_config import roi_config
@@ -24,14 +22,14 @@ def get_pvp(auto: Auto, timeout: int = 600) -> bool:
     logger.info("开始PVP奖励领取流程")
 
     # 记录任务开始时间，用于计算剩余超时
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 进入地图选择
@@ -179,7 +177,7 @@ def get_pvp(auto: Auto, timeout: int = 600) -> bool:
         """按键返回并返回主界面的自定义步骤"""
         auto.key_press("h")
         auto.sleep(2)
-        remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+        remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
         return back_to_main(auto, remaining_timeout)
     chain.then().custom_step(return_main_step)
 
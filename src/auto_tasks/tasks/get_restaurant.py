@@ -3,8 +3,6 @@
 包含餐厅奖励的领取和升级功能
 """
 
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout, click_back
 from src.auto_tasks.utils.roi_config import roi_config
@@ -22,13 +20,13 @@ def get_restaurant(auto: Auto, timeout: int = 600, is_upgrade: bool = False) ->
 
     logger = auto.get_task_logger("get_restaurant")
     logger.info("开始领取餐厅奖励")
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
 
     # 1. 返回主界面
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
@@ -52,7 +50,7 @@ def get_restaurant(auto: Auto, timeout: int = 600, is_upgrade: bool = False) ->
             roi=roi_config.get_roi("obtain_restaurant_reward", "get_restaurant"),
         ):
             logger.info("点击获得")
-            remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+            remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
             if click_back(auto, remaining_timeout):
                 logger.info("领取成功")
             else:
@@ -103,7 +101,7 @@ def get_restaurant(auto: Auto, timeout: int = 600, is_upgrade: bool = False) ->
             auto.click(pos_1, click_time=2, coord_type="LOGICAL")
             auto.sleep(1)
             auto.key_press("h")
-            remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+            remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
             return back_to_main(auto, remaining_timeout)
         else:
             # 处理画面关闭和返回
@@ -111,7 +109,7 @@ def get_restaurant(auto: Auto, timeout: int = 600, is_upgrade: bool = False) ->
                 logger.info("点击画面关闭")
                 auto.click(pos, click_time=2)
             else:
-                remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+                remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
                 click_back(auto, remaining_timeout)
                 logger.info("点击返回")
                 auto.sleep(1)
@@ -2,7 +2,6 @@
 
 包含装备的强化和分解功能
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import (
@@ -24,13 +23,13 @@ def intensive_decomposition(auto: Auto, timeout: int = 600) -> bool:
     logger = auto.get_task_logger("intensive_decomposition")
     logger.info("开始装备强化分解流程")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
 
     # ===========================================
     # 分解阶段 (decomposition phase)
@@ -104,7 +103,7 @@ def intensive_decomposition(auto: Auto, timeout: int = 600) -> bool:
     # ===========================================
     
     # 11. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 12. 打开背包
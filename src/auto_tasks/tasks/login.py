@@ -2,7 +2,6 @@
 
 包含游戏登录和返回主界面的功能
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, back_to_map, calculate_remaining_timeout
@@ -23,7 +22,7 @@ def login(auto: Auto, timeout: int = 300) -> bool:
     logger.info("开始登录流程")
 
     # 记录任务开始时间，用于计算剩余超时
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
@@ -47,15 +46,15 @@ def login(auto: Auto, timeout: int = 300) -> bool:
     )
 
     # 3. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 4. 处理弹窗，返回地图
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_map(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 5. 返回主界面，完成登录
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 执行任务链
@@ -3,8 +3,6 @@
 包含抽抽乐活动的抽奖功能
 """
 
-import time
-
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import back_to_main, calculate_remaining_timeout
 
@@ -22,14 +20,14 @@ def lucky_draw(auto: Auto, timeout: int = 400, target_count: int = 7) -> bool:
     try:
         logger = auto.get_task_logger("lucky_draw")
         logger.info("开始抽抽乐")
-        start_time = time.time()
+        start_time = auto.clock.time()
 
         # 使用任务链替代状态机
         chain = auto.chain()
         chain.set_total_timeout(timeout)
 
         # 1. 返回主界面
-        remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+        remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
         chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
         # 2. 进入抽抽乐活动
@@ -103,7 +101,7 @@ def lucky_draw(auto: Auto, timeout: int = 400, target_count: int = 7) -> bool:
         chain.then().custom_step(lucky_draw_loop, timeout=300)
 
         # 4. 返回主界面
-        remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+        remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
         chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
         # 执行任务链
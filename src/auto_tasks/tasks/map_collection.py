@@ -2,7 +2,6 @@
 
 包含地图探索和奖励收集功能
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import (
@@ -24,14 +23,14 @@ def map_collection(auto: Auto, timeout: int = 600) -> bool:
     logger = auto.get_task_logger("get_map_collection")
     logger.info("开始地图奖励收集流程")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面并进入地图选择
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     def enter_map_step() -> bool:
         """进入地图选择的自定义步骤"""
         return back_to_main(auto, remaining_timeout) and enter_map_select(auto, remaining_timeout)
@@ -85,7 +84,7 @@ def map_collection(auto: Auto, timeout: int = 600) -> bool:
     )
 
     # 6. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 执行任务链
@@ -2,7 +2,6 @@
 
 包含活动关卡的扫荡功能
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import (
@@ -23,14 +22,14 @@ def pass_activity(auto: Auto, timeout: int = 600, level_name: str = "第15关")
     logger = auto.get_task_logger("pass_activity")
     logger.info("开始活动关卡扫荡流程")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 点击活动关卡坐标
@@ -124,14 +123,14 @@ def pass_activity(auto: Auto, timeout: int = 600, level_name: str = "第15关")
             logger.info("未找到快速战斗按钮,跳过")
         
         # 返回
-        remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+        remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
         click_back(auto, remaining_timeout)
         logger.info("领取奖励")
         return True
     chain.then().custom_step(handle_boss_step)
 
     # 9. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 执行任务链
@@ -2,7 +2,6 @@
 
 包含通行证奖励的领取功能
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import (
@@ -24,7 +23,7 @@ def pass_rewards(auto: Auto, timeout: int = 600) -> bool:
     logger = auto.get_task_logger("pass_rewards")
     logger.info("开始通行证奖励领取流程")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 奖励位置配置
     # 从roi_config获取奖励位置
@@ -42,7 +41,7 @@ def pass_rewards(auto: Auto, timeout: int = 600) -> bool:
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 进入通行证界面
@@ -93,7 +92,7 @@ def pass_rewards(auto: Auto, timeout: int = 600) -> bool:
     chain.then().custom_step(collect_rewards_step)
 
     # 4. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 执行任务链
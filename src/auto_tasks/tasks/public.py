@@ -3,24 +3,27 @@
 包含各种任务共享的函数，如超时计算、返回主界面、返回地图等
 """
 
-import time
+from typing import Optional
 
 from src.auto_control.core.auto import Auto
+from src.auto_control.utils.clock import SYSTEM_CLOCK, Clock
 from src.auto_tasks.utils.roi_config import roi_config
 
 
-def calculate_remaining_timeout(timeout: int, start_time: float) -> int:
+def calculate_remaining_timeout(timeout: int, start_time: float, clock: Optional[Clock] = None) -> int:
     """
     计算剩余超时时间
 
     Args:
         timeout: 原始超时时间(秒)
-        start_time: 任务开始时间戳
+        start_time: 任务开始时间戳（与clock同基准，通常为auto.clock.time()）
+        clock: 计时时钟，默认系统时钟
 
     Returns:
         int: 剩余超时时间(秒)，最小值为0
     """
-    return max(0, timeout - int(time.time() - start_time)) if timeout > 0 else 0
+    now = (clock or SYSTEM_CLOCK).time()
+    return max(0, timeout - int(now - start_time)) if timeout > 0 else 0
 
 
 def back_to_main(auto: Auto, timeout: int = 30) -> bool:
@@ -94,10 +97,10 @@ def back_to_map(auto: Auto, timeout: int = 30) -> bool:
         bool: 是否成功返回地图
     """
     logger = auto.logger.create_task_logger("back_to_map")
-    start_time = time.time()
+    start_time = auto.clock.time()
     try:
         while True:
-            if timeout > 0 and time.time() - start_time >= timeout:
+            if timeout > 0 and auto.clock.time() - start_time >= timeout:
                 logger.warning(f"返回地图失败，已达超时时间 {timeout} 秒")
                 return False
 
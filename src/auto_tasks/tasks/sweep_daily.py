@@ -2,7 +2,6 @@
 
 包含每日快速狩猎的扫荡功能，包括饭团和火炬的使用
 """
-import time
 
 from src.auto_control.core.auto import Auto
 from src.auto_tasks.tasks.public import (
@@ -24,14 +23,14 @@ def sweep_daily(auto: Auto, timeout: int = 600, onigiri: str = "第九关", torc
     logger = auto.get_task_logger("sweep_daily")
     logger.info("开始每日扫荡")
 
-    start_time = time.time()
+    start_time = auto.clock.time()
 
     # 使用任务链替代状态机
     chain = auto.chain()
     chain.set_total_timeout(timeout)
 
     # 1. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 2. 进入扫荡界面
@@ -67,7 +66,7 @@ def sweep_daily(auto: Auto, timeout: int = 600, onigiri: str = "第九关", torc
                 verify={"type": "exist", "target": "public/返回键1"},
             ):
                 logger.info("点击狩猎按钮")
-                remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+                remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
                 if not click_back(auto, remaining_timeout):
                     auto.text_click("取消")
                     logger.info("米饭已用完")
@@ -105,7 +104,7 @@ def sweep_daily(auto: Auto, timeout: int = 600, onigiri: str = "第九关", torc
             ):
                 logger.info("点击狩猎按钮")
                 auto.sleep(3)
-                remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+                remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
                 if not click_back(auto, remaining_timeout):
                     auto.text_click("取消")
                     logger.info("火把已用完")
@@ -114,7 +113,7 @@ def sweep_daily(auto: Auto, timeout: int = 600, onigiri: str = "第九关", torc
     chain.then().custom_step(torch_hunt_step)
 
     # 10. 返回主界面
-    remaining_timeout = calculate_remaining_timeout(timeout, start_time)
+    remaining_timeout = calculate_remaining_timeout(timeout, start_time, auto.clock)
     chain.then().custom_step(lambda: back_to_main(auto, remaining_timeout), timeout=remaining_timeout)
 
     # 执行任务链
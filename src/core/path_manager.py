@@ -56,6 +56,11 @@ class PathManager:
         self.gui_log_path = os.path.join(self.dynamic_base, "gui_log")  # GUI日志目录
 
         self.ocr_model_path = os.path.join(self.dynamic_base, "ocr_models")  # OCR模型存储目录
+        self.template_atlas_path = os.path.join(self.dynamic_base, "template_atlas")  # 预编译模板图集目录
+        self.spatial_priors_path = os.path.join(self.dynamic_base, "spatial_priors.json")  # 模板历史位置记录
+        self.screenshot_strategy_path = os.path.join(self.dynamic_base, "screenshot_strategy.json")  # 截图策略检测结果
+        self.recordings_path = os.path.join(self.dynamic_base, "recordings")  # 回放录制目录
+        self.sessions_path = os.path.join(self.dynamic_base, "sessions")  # 会话录制归档目录
 
         # 收集所有需要创建的目录路径
         dirs_to_create = [
@@ -93,6 +98,11 @@ class PathManager:
             "match_temple_debug": self.match_temple_debug_path,
             "match_ocr_debug": self.match_ocr_debug_path,
             "ocr_model": self.ocr_model_path,
+            "template_atlas": self.template_atlas_path,
+            "spatial_priors": self.spatial_priors_path,
+            "screenshot_strategy": self.screenshot_strategy_path,
+            "recordings": self.recordings_path,
+            "sessions": self.sessions_path,
             "gui_log": self.gui_log_path,
         }
         return path_map.get(path_key, "")
@@ -51,6 +51,8 @@ def load_task_modules():
                         "function": task_func,
                         "description": doc,
                         "parameters": params,
+                        # 模板预加载清单：模块可定义PRELOAD_TEMPLATES覆盖，默认预加载同名模板目录和公共模板
+                        "preload": list(getattr(module, "PRELOAD_TEMPLATES", [f"{module_name}/", "public/"])),
                     }
             except Exception as e:
                 logger.error(f"加载任务模块 {module_name} 失败: {str(e)}")  # 记录加载失败的模块
@@ -94,6 +94,11 @@ class TaskWorker(QThread):
                         # 从UI设置获取全局任务链重试次数
                         chain_retry = self.auto_instance.settings_manager.get_setting("retry_count", 0) if hasattr(self.auto_instance, "settings_manager") else 0
                     
+                    # 预加载任务模板，避免首次匹配时的冷加载
+                    preload = task_info.get("preload")
+                    if preload:
+                        self.auto_instance.preload_templates(preload)
+
                     task_success = False
                     retry_count = 0
                     